@@ -6,11 +6,49 @@ Sacred Library Search Interface
 
 import json
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+def format_result(quote):
+    """Short display form of a quote"""
+    return {
+        'quote_id': quote['quote_id'],
+        'text': quote['text'][:200] + "..." if len(quote['text']) > 200 else quote['text'],
+        'source': f"{quote['source_book']} - {quote['chapter']}",
+        'language': quote['language']
+    }
+
+def search_packed(packed_dir, query, language=None, book=None, limit=10):
+    """Search the packed library (built by scripts/pack_sacred_library.py)"""
+    from core.sacred_library_packed import PackedSacredLibrary
+    
+    library = PackedSacredLibrary(packed_dir)
+    results = []
+    for code in library.language_codes():
+        if language and code != language:
+            continue
+        packed = library._language(code)
+        for index in packed.matching_indices([query.lower()]):
+            quote = packed.quote(index)
+            if book and book.lower() not in quote['source_book'].lower():
+                continue
+            results.append(format_result(quote))
+            if len(results) >= limit:
+                return results
+    return results
+
 def search_quotes(query, language=None, book=None, limit=10):
     """Search quotes in the Sacred Library"""
     sacred_dir = Path("sacred_library_files")
+    
+    from core.sacred_library_packed import PackedSacredLibrary
+    
+    packed_dir = sacred_dir / "packed"
+    if PackedSacredLibrary.is_current(packed_dir, sacred_dir / "quotes"):
+        return search_packed(packed_dir, query, language, book, limit)
+    
     results = []
     
     # Search through all quote files
@@ -30,12 +68,7 @@ def search_quotes(query, language=None, book=None, limit=10):
             
             # Search in text
             if query.lower() in quote['text'].lower():
-                results.append({
-                    'quote_id': quote['quote_id'],
-                    'text': quote['text'][:200] + "..." if len(quote['text']) > 200 else quote['text'],
-                    'source': f"{quote['source_book']} - {quote['chapter']}",
-                    'language': quote['language']
-                })
+                results.append(format_result(quote))
                 
                 if len(results) >= limit:
                     break
@@ -46,8 +79,6 @@ def search_quotes(query, language=None, book=None, limit=10):
     return results
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python search_sacred_library.py <query> [language] [book]")
         print("Example: python search_sacred_library.py meditation en")
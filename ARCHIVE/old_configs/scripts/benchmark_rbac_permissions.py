@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+RBAC Permission Check Benchmark
+Measures permission checks per second for the database-backed path
+(profile query + auth lookup per check) versus the cached profile path and
+the local JWT-claims path.
+
+Supabase is replaced by an in-memory client with a configurable simulated
+round-trip latency, so no credentials or network are needed.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-only-secret-key-not-for-production")
+
+from core.rbac_system import RBACSystem, UserTier, Permission
+
+
+class FakeQuery:
+    """Minimal chainable query builder that sleeps for a simulated round-trip"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        # select/eq/gt/update/insert all just chain
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.round_trips += 1
+        time.sleep(self.client.latency)
+        if self.table == "user_profiles":
+            return SimpleNamespace(data=[self.client.profile_row], error=None)
+        return SimpleNamespace(data=[], error=None)
+
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.round_trips = 0
+        self.profile_row = {
+            "user_id": "bench-user",
+            "person_id": "bench-person",
+            "tier": UserTier.PRO.value,
+            "subscription_status": "active",
+            "subscription_expires": datetime.now() + timedelta(days=30),
+            "custom_permissions": [],
+            "metadata": {},
+            "is_active": True,
+            "last_login": None,
+            "created_at": datetime.now(),
+            "identity_registry": {"name": "Benchmark User"},
+        }
+        self.auth = SimpleNamespace(admin=SimpleNamespace(get_user_by_id=self._get_user_by_id))
+
+    def _get_user_by_id(self, user_id):
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(user=SimpleNamespace(email="bench@example.com"))
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def build_rbac(latency: float) -> RBACSystem:
+    """Create an RBACSystem wired to the fake client without touching Supabase"""
+    rbac = RBACSystem.__new__(RBACSystem)
+    fake = FakeSupabase(latency)
+    rbac.supabase = fake
+    rbac.service_role_client = fake
+    rbac.jwt_secret = os.environ["JWT_SECRET_KEY"]
+    rbac.jwt_algorithm = "HS256"
+    rbac.profile_cache_ttl = RBACSystem.PROFILE_CACHE_TTL
+    rbac.revocation_refresh_interval = RBACSystem.REVOCATION_REFRESH_INTERVAL
+    rbac._profile_cache = {}
+    rbac._claims_cache = {}
+    rbac._revoked_sessions = set()
+    rbac._revocations_loaded_at = 0.0
+    rbac._revocation_lock = asyncio.Lock()
+    return rbac
+
+
+async def run_checks(label: str, check, iterations: int, client: FakeSupabase):
+    """Run a permission check repeatedly and print throughput"""
+    client.round_trips = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        assert await check()
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<32} {iterations / elapsed:>12,.0f} checks/sec   "
+          f"{client.round_trips:>6} round-trips")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark RBAC permission checks")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Simulated Supabase round-trip latency")
+    args = parser.parse_args()
+
+    rbac = build_rbac(args.latency_ms / 1000)
+    client = rbac.service_role_client
+    permission = Permission.ACCESS_HYLOZOICS_AGENT
+
+    print("\n" + "=" * 70)
+    print("🔐 RBAC PERMISSION CHECK BENCHMARK")
+    print("=" * 70)
+    print(f"Iterations: {args.iterations}   Simulated latency: {args.latency_ms} ms\n")
+
+    # Before: every check re-fetches the profile (table query + auth lookup)
+    before_iterations = max(1, min(args.iterations, 200))
+    await run_checks(
+        "Database lookup per check",
+        lambda: _uncached_check(rbac, permission),
+        before_iterations,
+        client,
+    )
+
+    # After: cached profile
+    rbac.invalidate_user_profile("bench-user")
+    await run_checks(
+        "Cached profile (TTL)",
+        lambda: rbac.has_permission("bench-user", permission),
+        args.iterations,
+        client,
+    )
+
+    # After: signed claims, revocation set refreshed periodically
+    token = await rbac._create_session("bench-user")
+    await run_checks(
+        "Local JWT claims",
+        lambda: rbac.has_session_permission(token, permission),
+        args.iterations,
+        client,
+    )
+
+
+async def _uncached_check(rbac: RBACSystem, permission: Permission) -> bool:
+    """Permission check with the profile cache bypassed (pre-cache behaviour)"""
+    rbac.invalidate_user_profile("bench-user")
+    return await rbac.has_permission("bench-user", permission)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Sacred Library Retrieval Benchmark
+Offline relevance and latency comparison over a labeled query set
+(sacred_library_files/eval/retrieval_queries.json):
+
+1. Keyword scan (LocalSacredLibrary.search_quotes - the old per-keyword path)
+2. BM25 over the prebuilt lexical index
+3. BM25 with cross-language term expansion (hylozoics_terms.json)
+4. EnhancedSacredLibrary.enhanced_search (BM25 + vector, fused with RRF)
+
+Vector search only takes part when PINECONE_API_KEY is set, and LLM query
+expansion stays off unless --llm-expansion is given, so by default the
+benchmark needs no network.
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.sacred_library_local import local_sacred_library
+from core.sacred_library_enhanced import EnhancedSacredLibrary
+from core.sacred_library_retrieval import load_or_build_index, result_key
+from core.hylozoics_terms import get_term_index
+
+
+def is_relevant(item: dict, result: dict) -> bool:
+    """Known-item queries list quote ids; cross-language topic queries name a term the quote must contain"""
+    if result_key(result) in item.get('relevant', ()):
+        return True
+    term = item.get('relevant_containing')
+    return bool(term) and term in result.get('content', '').lower() and \
+        result.get('metadata', {}).get('language', '').lower() == item.get('language')
+
+
+async def evaluate(label: str, search, queries: list, k: int):
+    """Run every query through `search` (sync or async) and print recall@k, MRR and latency"""
+    hits, reciprocal_ranks, latencies = 0, [], []
+
+    for item in queries:
+        start = time.perf_counter()
+        results = search(item)
+        if asyncio.iscoroutine(results):
+            results = await results
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        rank = next((i for i, result in enumerate(results, start=1) if is_relevant(item, result)), None)
+        if rank and rank <= k:
+            hits += 1
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{label:<28} recall@{k}: {hits / len(queries):>5.2f}   MRR: {statistics.mean(reciprocal_ranks):>5.2f}   "
+          f"p50: {statistics.median(latencies):>8.2f} ms   p95: {p95:>8.2f} ms")
+
+
+async def main():
+    default_queries = Path(__file__).parent.parent / "sacred_library_files" / "eval" / "retrieval_queries.json"
+    parser = argparse.ArgumentParser(description="Benchmark Sacred Library retrieval quality and latency")
+    parser.add_argument("--queries", default=str(default_queries))
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--llm-expansion", action="store_true", help="Enable GPT query expansion (network)")
+    args = parser.parse_args()
+
+    with open(args.queries, 'r', encoding='utf-8') as f:
+        queries = json.load(f)['queries']
+
+    library = EnhancedSacredLibrary(use_llm_expansion=args.llm_expansion)
+
+    start = time.perf_counter()
+    index = load_or_build_index(library.sacred_dir)
+    terms = get_term_index()
+    # Share the loaded index so hybrid latency excludes the one-off load
+    library.lexical_index, library._lexical_index_loaded = index, True
+    print("\n" + "=" * 90)
+    print("🔍 SACRED LIBRARY RETRIEVAL BENCHMARK")
+    print("=" * 90)
+    print(f"Queries: {len(queries)}   Index: {len(index)} quotes, {len(index.postings)} terms "
+          f"(loaded in {time.perf_counter() - start:.2f}s)   "
+          f"Vector: {'on' if library.pinecone_client else 'off'}   "
+          f"LLM expansion: {'on' if args.llm_expansion else 'off'}\n")
+
+    await evaluate("Keyword scan (before)",
+                   lambda item: local_sacred_library.search_quotes(item['query'], language=item.get('language'), limit=args.k),
+                   queries, args.k)
+    await evaluate("BM25",
+                   lambda item: index.search(item['query'], language=item.get('language'), limit=args.k),
+                   queries, args.k)
+
+    await evaluate("BM25 + term expansion",
+                   lambda item: index.search(item['query'], language=item.get('language'), limit=args.k,
+                                             extra_terms=terms.expansion_terms(item['query'])),
+                   queries, args.k)
+
+    await evaluate("Hybrid (enhanced_search)",
+                   lambda item: library.enhanced_search(item['query'], limit=args.k,
+                                                        target_language=item.get('language', 'en')),
+                   queries, args.k)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Sacred Quote Upload Benchmark
+Uploads the Sacred Library quote files to a local PostgREST-compatible stub
+and reports rows/sec for:
+
+1. One insert request per quote (the old upload path)
+2. BulkQuoteLoader paged upserts with bounded concurrency
+3. Re-running the bulk load (idempotent on quote_id - row count must not change)
+
+The stub adds a configurable latency per request and can fail a fraction of
+requests with 503 to exercise the retry path. No Supabase project is needed.
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.sacred_quote_loader import BulkQuoteLoader, SACRED_QUOTES_TABLE
+from direct_supabase_uploader import load_quote_rows
+
+
+class PostgRESTStub(ThreadingHTTPServer):
+    """Just enough of PostgREST's insert/upsert behaviour for uploads"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, fail_rate: float, seed: int = 7):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.tables = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict = None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        url = urlparse(self.path)
+        table = url.path.rsplit("/", 1)[-1]
+        conflict = parse_qs(url.query).get("on_conflict", [None])[0]
+        upsert = "merge-duplicates" in self.headers.get("Prefer", "")
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        rows = body if isinstance(body, list) else [body]
+
+        time.sleep(server.latency)
+        with server.lock:
+            server.requests += 1
+            if server.random.random() < server.fail_rate:
+                return self._reply(503, {"message": "stub: service unavailable"})
+
+            stored = server.tables.setdefault(table, {})
+            key_column = conflict or "quote_id"
+            if not upsert and any(row[key_column] in stored for row in rows):
+                return self._reply(409, {"message": "duplicate key value violates unique constraint"})
+            for row in rows:
+                stored[row[key_column]] = {**stored.get(row[key_column], {}), **row}
+
+        self._reply(201)
+
+
+def per_row_upload(stub: PostgRESTStub, rows: list) -> float:
+    """One POST per quote, sequentially"""
+    start = time.perf_counter()
+    with httpx.Client() as client:
+        for row in rows:
+            client.post(f"{stub.url}/rest/v1/{SACRED_QUOTES_TABLE}_per_row", json=row)
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Sacred Library uploads against a local stub")
+    parser.add_argument("--limit", type=int, default=2000, help="Quotes to upload")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated latency per request")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="Fraction of requests answered with 503")
+    parser.add_argument("--page-size", type=int, default=250)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    rows = load_quote_rows(Path(__file__).parent.parent / "sacred_library_files" / "quotes", args.limit)
+
+    stub = PostgRESTStub(args.latency_ms / 1000, args.fail_rate)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    print("\n" + "=" * 70)
+    print("🏛️  SACRED QUOTE UPLOAD BENCHMARK")
+    print("=" * 70)
+    print(f"Quotes: {len(rows)}   Simulated latency: {args.latency_ms} ms   "
+          f"Failure rate: {args.fail_rate:.0%}   Page size: {args.page_size}\n")
+
+    per_row_rows = rows[:min(len(rows), 200)]
+    elapsed = per_row_upload(stub, per_row_rows)
+    print(f"{'One insert per quote (before)':<34} {len(per_row_rows) / elapsed:>9,.0f} rows/sec   "
+          f"({len(per_row_rows)} quotes)")
+
+    loader = BulkQuoteLoader(stub.url, "benchmark-key", page_size=args.page_size,
+                             max_concurrency=args.concurrency, retry_backoff=0.05)
+    report = await loader.load(rows)
+    if report.failed_pages:
+        report = await loader.retry_failed(report)
+    print(f"{'Bulk upsert':<34} {report.rows_per_second:>9,.0f} rows/sec   "
+          f"{report.requests} requests, {len(report.failed_pages)} failed pages")
+
+    report = await loader.load(rows)
+    stored = len(stub.tables.get(SACRED_QUOTES_TABLE, {}))
+    print(f"{'Bulk upsert again (idempotent)':<34} {report.rows_per_second:>9,.0f} rows/sec   "
+          f"{stored} rows stored")
+
+    print(f"\nRow count matches quotes: {'✅' if stored == len(rows) else '❌'}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
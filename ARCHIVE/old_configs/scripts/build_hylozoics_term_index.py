@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Hylozoics Term Index Builder
+============================
+
+Builds the multilingual term dictionary used for cross-language query
+expansion (sacred_library_files/hylozoics_terms.json) from the Laurency
+dictionaries downloaded by download_all_dictionaries.py.
+
+Swedish and English headwords are aligned in two passes:
+1. identical headwords (Sanskrit terms, chakras, ...)
+2. matching citation references - both editions cite the same K/P
+   paragraphs (KOV/DVS in Swedish), so entries whose references overlap
+   most are translations of each other
+
+The dictionaries have no German edition, so German forms come from the
+curated seed table below, which also takes precedence over the alignment.
+"""
+
+import re
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+DICTIONARY_DIR = Path("laurency_organized/04_Terminology_Dictionary/MultiLanguage")
+OUTPUT_FILE = Path("sacred_library_files/hylozoics_terms.json")
+
+# Minimum reference overlap (Jaccard) for aligning two headwords
+MIN_REFERENCE_OVERLAP = 0.5
+
+# Longer "headwords" are definition text that was upper-cased in the source
+MAX_FORM_WORDS = 5
+
+# Curated core terms: (sv, en, de, concept)
+SEED_TERMS = [
+    (["medvetenhet"], ["consciousness"], ["Bewußtsein", "Bewusstsein"], "fundamental property of all existence"),
+    (["monad"], ["monad"], ["Monade"], "ultimate unit of consciousness"),
+    (["hölje"], ["envelope"], ["Hülle"], "temporary vehicle of consciousness"),
+    (["rike"], ["kingdom"], ["Reich"], "stage of evolutionary development"),
+    (["naturrike"], ["natural kingdom"], ["Naturreich"], ""),
+    (["materia"], ["matter"], ["Materie"], ""),
+    (["rörelse"], ["motion"], ["Bewegung"], ""),
+    (["kausalhölje"], ["causal envelope"], ["Kausalhülle"], ""),
+    (["emotionalhölje"], ["emotional envelope"], ["Emotionalhülle"], ""),
+    (["mentalhölje"], ["mental envelope"], ["Mentalhülle"], ""),
+    (["kausalvärld"], ["causal world"], ["Kausalwelt"], ""),
+    (["mentalvärld"], ["mental world"], ["Mentalwelt"], ""),
+    (["emotionalvärld"], ["emotional world"], ["Emotionalwelt"], ""),
+    (["hylozoik"], ["hylozoics"], ["Hylozoik"], "the esoteric system of Pythagoras as presented by Laurency"),
+    (["evolution"], ["evolution"], ["Evolution"], ""),
+    (["involution"], ["involution"], ["Involution"], ""),
+    (["triad"], ["triad"], ["Triade"], ""),
+    (["reinkarnation"], ["reincarnation"], ["Reinkarnation"], ""),
+    (["esoterik"], ["esoterics"], ["Esoterik"], ""),
+    (["verklighet"], ["reality"], ["Wirklichkeit"], ""),
+    (["enhet"], ["unity"], ["Einheit"], ""),
+    (["kollektivmedvetenhet"], ["collective consciousness"], ["Kollektivbewußtsein", "Kollektivbewusstsein"], ""),
+    (["planethierarki"], ["planetary hierarchy"], ["Planetenhierarchie"], ""),
+    (["skördelag"], ["law of reaping"], ["Gesetz der Saat und Ernte"], ""),
+    (["själ"], ["soul"], ["Seele"], ""),
+    (["lag"], ["law"], ["Gesetz"], ""),
+]
+
+# Upper-case headword at the start of a line, possibly several words or comma-separated
+HEADWORD = re.compile(
+    r"^((?:[A-ZÅÄÖÜ0-9][A-ZÅÄÖÜ0-9\-’']*)(?:[ ,]+(?:[A-ZÅÄÖÜ0-9][A-ZÅÄÖÜ0-9\-’']*))*)(?=\s|$|:)"
+)
+# K 1.2.3 / P 1.2.3 in English, KOV / DVS in Swedish
+REFERENCE = re.compile(r"\b(KOV|DVS|K|P)\s*(\d+)\s*\.\s*(\d+)\s*\.\s*(\d+)")
+REFERENCE_BOOK = {'KOV': 'K', 'DVS': 'P', 'K': 'K', 'P': 'P'}
+# A line ending like this continues a cross reference ("Se också RUPA, ARUPA")
+CROSS_REFERENCE_ENDINGS = (',', 'jämför', 'Se', 'se', 'och', 'and', 'see', 'See')
+STOPWORDS = {'the', 'of', 'and', 'or', 'a', 'an', 'av', 'och', 'det', 'den', 'de', 'en', 'ett', 'som', 'se'}
+
+# Sections of the clean text files start after the letter index
+DICTIONARY_SOURCES = {
+    'en': ("english/dictionary_english_clean.txt", "Z"),
+    'sv': ("swedish/dictionary_swedish_clean.txt", "Å"),
+}
+
+
+def read_dictionary(path: Path, start_marker: str) -> List[Tuple[str, str, Set[Tuple[str, ...]]]]:
+    """(headword, definition, references) for every entry in a clean dictionary text"""
+    # The Swedish text was decoded as Latin-2 somewhere along the way
+    text = path.read_text(encoding='utf-8').replace('ĺ', 'å').replace('Ĺ', 'Å')
+    lines = text.split('\n')
+    start = max(i for i, line in enumerate(lines[:200]) if line.strip().startswith(start_marker)) + 1
+
+    entries = []
+    current = None
+    previous = ''
+    for line in lines[start:]:
+        line = line.strip()
+        if not line:
+            continue
+
+        match = HEADWORD.match(line)
+        is_headword = (
+            match
+            and not previous.endswith(CROSS_REFERENCE_ENDINGS)
+            and sum(ch.isalpha() for ch in match.group(1)) >= 2
+            and not REFERENCE.match(line)
+        )
+        if is_headword:
+            headword = match.group(1).strip(' ,')
+            rest = line[match.end():].strip(' :')
+            if current and not current['body_started']:
+                # Headword wrapped over two lines
+                current['headword'] += ' ' + headword
+                if rest:
+                    current['body'].append(rest)
+            else:
+                current = {'headword': headword, 'body': [rest] if rest else [], 'body_started': bool(rest)}
+                entries.append(current)
+        elif current:
+            current['body'].append(line)
+            current['body_started'] = True
+        previous = line
+
+    result = []
+    for entry in entries:
+        if entry['headword'].startswith(('AND ', 'OCH ')):
+            continue
+        body = ' '.join(entry['body'])
+        references = {(REFERENCE_BOOK[book], part, chapter, paragraph)
+                      for book, part, chapter, paragraph in REFERENCE.findall(body)}
+        result.append((entry['headword'], body, references))
+    return result
+
+
+def headword_forms(headword: str) -> List[str]:
+    """Search forms of a dictionary headword ("REAPING, THE LAW OF" -> "law of reaping", "reaping")"""
+    headword = headword.lower()
+    parts = [part.strip() for part in headword.split(',') if part.strip()]
+    forms = []
+
+    if len(parts) == 2 and (len(parts[1].split()) == 1 or parts[1].split()[-1] in STOPWORDS):
+        first, second = parts
+        if second.startswith('the '):
+            second = second[4:]
+        # "X, Y" is an inverted heading: "superphysical knowledge", "law of reaping";
+        # X on its own is the head noun ("knowledge", "reaping")
+        forms.extend([f"{second} {first}", first])
+    else:
+        # Alternative names: "ENVELOPES, MONAD ENVELOPES"
+        forms.extend(parts)
+
+    cleaned = []
+    for form in forms:
+        form = ' '.join(form.split())
+        if (len(form) >= 3 and len(form.split()) <= MAX_FORM_WORDS
+                and form not in STOPWORDS and form not in cleaned):
+            cleaned.append(form)
+    return cleaned
+
+
+def first_sentence(text: str, max_length: int = 160) -> str:
+    # Drop leading cross references and source notes ("See EGO", "(Skt, T.B.)")
+    text = re.sub(r'^(?:See [A-ZÅÄÖ\- ]+\b\s*|\([^)]*\)\s*)+', '', text).lstrip('"“ ')
+    sentence = re.split(r'(?<=[.!?])\s', text, maxsplit=1)[0].strip()
+    return sentence if len(sentence) <= max_length else sentence[:max_length].rsplit(' ', 1)[0] + '…'
+
+
+def align_dictionaries(swedish: List[tuple], english: List[tuple]) -> List[Tuple[int, int, float]]:
+    """Greedy one-to-one alignment on identical headwords, then reference overlap"""
+    candidates = []
+    for i, (sv_head, _, sv_refs) in enumerate(swedish):
+        for j, (en_head, _, en_refs) in enumerate(english):
+            if sv_head == en_head:
+                candidates.append((2.0, i, j))
+            elif sv_refs and en_refs:
+                shared = len(sv_refs & en_refs)
+                if shared:
+                    candidates.append((shared / len(sv_refs | en_refs), i, j))
+
+    candidates.sort(reverse=True)
+    used_sv, used_en, pairs = set(), set(), []
+    for score, i, j in candidates:
+        if score < MIN_REFERENCE_OVERLAP or i in used_sv or j in used_en:
+            continue
+        used_sv.add(i)
+        used_en.add(j)
+        pairs.append((i, j, score))
+    return pairs
+
+
+def build_terms(dictionary_dir: Path) -> Tuple[List[Dict], Dict[str, int]]:
+    parsed = {
+        language: read_dictionary(dictionary_dir / file_name, marker)
+        for language, (file_name, marker) in DICTIONARY_SOURCES.items()
+    }
+    pairs = align_dictionaries(parsed['sv'], parsed['en'])
+
+    terms: List[Dict] = []
+    by_form: Dict[Tuple[str, str], Dict] = {}
+
+    def add(entry: Dict):
+        for language in ('sv', 'en', 'de'):
+            for form in entry[language]:
+                by_form.setdefault((language, form.lower()), entry)
+        terms.append(entry)
+
+    for sv, en, de, concept in SEED_TERMS:
+        add({'sv': list(sv), 'en': list(en), 'de': list(de), 'concept': concept})
+
+    aligned = 0
+    for i, j, _ in pairs:
+        sv_forms = headword_forms(parsed['sv'][i][0])
+        en_forms = headword_forms(parsed['en'][j][0])
+        if not sv_forms or not en_forms:
+            continue
+
+        concept = first_sentence(parsed['en'][j][1])
+        seeded = next((by_form[key] for key in
+                       [('sv', form) for form in sv_forms] + [('en', form) for form in en_forms]
+                       if key in by_form), None)
+        if seeded:
+            # Curated translations win; the dictionary only fills in a missing description
+            if not seeded['concept'] and set(en_forms) & set(seeded['en']):
+                seeded['concept'] = concept
+            continue
+
+        add({'sv': sv_forms, 'en': en_forms, 'de': [], 'concept': concept})
+        aligned += 1
+
+    stats = {
+        'english_entries': len(parsed['en']),
+        'swedish_entries': len(parsed['sv']),
+        'aligned_pairs': len(pairs),
+        'seed_terms': len(SEED_TERMS),
+        'terms': len(terms),
+    }
+    return terms, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Hylozoics cross-language term index")
+    parser.add_argument("--dictionary-dir", default=str(DICTIONARY_DIR))
+    parser.add_argument("--output", default=str(OUTPUT_FILE))
+    args = parser.parse_args()
+
+    print("📚 Building Hylozoics term index...")
+    terms, stats = build_terms(Path(args.dictionary_dir))
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': 1,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'source': "The Basic Esoteric Dictionary (en) / Esoterisk ordbok (sv) + curated seed terms",
+            'stats': stats,
+            'terms': terms,
+        }, f, ensure_ascii=False, indent=1)
+
+    print(f"   English entries: {stats['english_entries']}")
+    print(f"   Swedish entries: {stats['swedish_entries']}")
+    print(f"   Aligned sv↔en:   {stats['aligned_pairs']}")
+    print(f"✅ {stats['terms']} terms written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,23 +7,25 @@ Discovers and downloads ALL books in ALL 9 languages from laurency.com
 Uses the navigation menu structure to find all content systematically
 """
 
-import requests
+import sys
 from bs4 import BeautifulSoup
 import urllib.parse
 from pathlib import Path
 import json
 import os
 from datetime import datetime
-import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.download_engine import DownloadEngine, DownloadJob, print_progress, summarize_results
 
 class CompleteMultiLangHarvester:
     def __init__(self, output_dir: str = "laurency_complete"):
         self.base_url = "https://www.laurency.com"
         self.output_dir = Path(output_dir)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Pooled concurrent client; the manifest lets re-runs skip unchanged PDFs
+        self.engine = DownloadEngine(self.output_dir / "download_manifest.json")
         
         # Language configurations based on the navigation menu
         self.languages = {
@@ -109,10 +111,10 @@ class CompleteMultiLangHarvester:
         try:
             # Get navigation frame
             nav_url = f"{self.base_url}/{lang_info['nav_frame']}"
-            response = self.session.get(nav_url, timeout=15)
+            response = self.engine.fetch_pages_sync([nav_url])[nav_url]
             
-            if response.status_code != 200:
-                print(f"  ❌ Navigation not accessible: {response.status_code}")
+            if response is None:
+                print(f"  ❌ Navigation not accessible")
                 return None
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -122,6 +124,7 @@ class CompleteMultiLangHarvester:
             
             books = []
             dictionaries = []
+            toc_pages = []
             
             for option in options:
                 value = option.get('value')
@@ -148,11 +151,15 @@ class CompleteMultiLangHarvester:
                 # Check if it's a book table of contents
                 if any(book_word in text.lower() for book_word in ['knowledge', 'philosopher', 'way of', 'explanation']):
                     # This is a table of contents page - explore it for PDFs
-                    toc_url = urllib.parse.urljoin(nav_url, value)
-                    book_pdfs = self.discover_book_pdfs(toc_url, text, lang_info['path'])
-                    if book_pdfs:
-                        books.extend(book_pdfs)
-                        print(f"  📚 Book Series: {text} ({len(book_pdfs)} chapters)")
+                    toc_pages.append((urllib.parse.urljoin(nav_url, value), text))
+            
+            # Fetch all table of contents pages of the language concurrently
+            toc_responses = self.engine.fetch_pages_sync(toc_url for toc_url, _ in toc_pages)
+            for toc_url, text in toc_pages:
+                book_pdfs = self.discover_book_pdfs(toc_responses[toc_url], toc_url, text, lang_info['path'])
+                if book_pdfs:
+                    books.extend(book_pdfs)
+                    print(f"  📚 Book Series: {text} ({len(book_pdfs)} chapters)")
             
             language_content = {
                 'language_code': lang_code,
@@ -170,11 +177,10 @@ class CompleteMultiLangHarvester:
             print(f"  💥 Error discovering {lang_info['name']}: {e}")
             return None
     
-    def discover_book_pdfs(self, toc_url: str, series_title: str, lang_path: str):
-        """Discover PDF files from a table of contents page"""
+    def discover_book_pdfs(self, response, toc_url: str, series_title: str, lang_path: str):
+        """Discover PDF files from a fetched table of contents page"""
         try:
-            response = self.session.get(toc_url, timeout=10)
-            if response.status_code != 200:
+            if response is None:
                 return []
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -228,6 +234,7 @@ class CompleteMultiLangHarvester:
             books_dir.mkdir(exist_ok=True)
             
             # Group books by series
+            jobs = []
             series_groups = {}
             for book in content['books']:
                 series = book['series']
@@ -239,45 +246,46 @@ class CompleteMultiLangHarvester:
                 series_dir = books_dir / series.replace(' ', '_').replace('/', '_')
                 series_dir.mkdir(exist_ok=True)
                 
-                print(f"  📚 Downloading {series} ({len(books)} chapters)")
-                
+                print(f"  📚 {series} ({len(books)} chapters)")
                 for book in books:
-                    try:
-                        print(f"    📄 {book['title']}")
-                        response = self.session.get(book['url'], timeout=30)
-                        response.raise_for_status()
-                        
-                        # Save PDF
-                        pdf_file = series_dir / book['filename']
-                        with open(pdf_file, 'wb') as f:
-                            f.write(response.content)
-                        
-                        downloaded_files.append({
-                            'type': 'book',
-                            'series': series,
-                            'title': book['title'],
-                            'filename': book['filename'],
-                            'path': str(pdf_file),
-                            'size': len(response.content),
-                            'url': book['url']
-                        })
-                        
-                        # Small delay to be respectful
-                        time.sleep(0.5)
-                        
-                    except Exception as e:
-                        print(f"    ❌ Failed to download {book['title']}: {e}")
+                    jobs.append(DownloadJob(url=book['url'], path=series_dir / book['filename'],
+                                            metadata={**book, 'series': series}))
+            
+            # All chapters of the language in one concurrent batch
+            results = self.engine.download_all_sync(jobs, progress=print_progress)
+            for result in results:
+                book = result.job.metadata
+                if not result.ok:
+                    print(f"    ❌ Failed to download {book['title']}: {result.error}")
+                    continue
+                downloaded_files.append({
+                    'type': 'book',
+                    'series': book['series'],
+                    'title': book['title'],
+                    'filename': book['filename'],
+                    'path': str(result.job.path),
+                    'size': result.size,
+                    'url': book['url'],
+                    'status': result.status
+                })
+            
+            summary = summarize_results(results)
+            print(f"  📦 {summary.get('downloaded', 0)} new, {summary.get('resumed', 0)} resumed, "
+                  f"{summary.get('not_modified', 0) + summary.get('existing', 0)} unchanged, "
+                  f"{summary['bytes_transferred']:,} bytes transferred")
         
         # Download dictionaries
         if content['dictionaries']:
             dict_dir = lang_dir / "Dictionaries"
             dict_dir.mkdir(exist_ok=True)
             
+            dict_responses = self.engine.fetch_pages_sync(item['url'] for item in content['dictionaries'])
             for dict_item in content['dictionaries']:
                 try:
                     print(f"  📖 Downloading {dict_item['title']}")
-                    response = self.session.get(dict_item['url'], timeout=15)
-                    response.raise_for_status()
+                    response = dict_responses[dict_item['url']]
+                    if response is None:
+                        raise RuntimeError("page not available")
                     
                     # Save HTML dictionary
                     dict_file = dict_dir / f"dictionary_{lang_code}.html"
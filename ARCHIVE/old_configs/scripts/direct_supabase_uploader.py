@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 """
 DIRECT SUPABASE SACRED LIBRARY UPLOADER
-Uses simple table operations to upload Sacred Library
+Bulk upserts the Sacred Library quote files into hylozoics_sacred_quotes
 """
 
 import os
 import json
 import sys
+import asyncio
+import argparse
 from pathlib import Path
 from datetime import datetime
 from supabase import create_client, Client
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.sacred_quote_loader import BulkQuoteLoader
+
 def load_environment():
     """Load environment variables from production.env"""
     env_path = Path(__file__).parent.parent / "config" / "production.env"
@@ -42,8 +49,35 @@ def test_connection(supabase: Client):
         print(f"❌ Supabase connection failed: {e}")
         return False
 
-def upload_quotes_to_existing_table(supabase: Client):
-    """Upload quotes to an existing table (like teaching_materials)"""
+def load_quote_rows(quotes_dir: Path, limit: int = None) -> list:
+    """Read quote files into hylozoics_sacred_quotes rows"""
+    rows = []
+    for quote_file in sorted(quotes_dir.glob("*.json"))[:limit]:
+        try:
+            with open(quote_file, 'r', encoding='utf-8') as f:
+                quote_data = json.load(f)
+            
+            rows.append({
+                'quote_id': quote_data['quote_id'],
+                'text': quote_data['text'],
+                'source_book': quote_data.get('source_book', 'Hylozoics'),
+                'chapter': quote_data.get('chapter', 'Unknown'),
+                'language': quote_data.get('language', 'en'),
+                'author': quote_data.get('author', 'Henry T. Laurency'),
+                'tradition': quote_data.get('tradition', 'Hylozoics'),
+                'verified': quote_data.get('verified', True),
+                'metadata': quote_data.get('metadata', {})
+            })
+            
+        except Exception as e:
+            print(f"⚠️  Error processing {quote_file.name}: {e}")
+            continue
+    
+    return rows
+
+def upload_quotes(supabase_url: str, supabase_key: str, limit: int = None,
+                  page_size: int = 500, concurrency: int = 4) -> bool:
+    """Bulk upsert Sacred Library quotes into hylozoics_sacred_quotes"""
     sacred_dir = Path(__file__).parent.parent / "sacred_library_files"
     quotes_dir = sacred_dir / "quotes"
     
@@ -60,69 +94,30 @@ def upload_quotes_to_existing_table(supabase: Client):
             master_index = json.load(f)
         print(f"📊 Master index shows {master_index['total_quotes']} quotes")
     
-    # Get all quote files
-    quote_files = list(quotes_dir.glob("*.json"))
-    print(f"📝 Found {len(quote_files)} quote files to upload")
+    rows = load_quote_rows(quotes_dir, limit)
+    print(f"📝 Loaded {len(rows)} quotes to upload")
     
-    uploaded_count = 0
-    batch_size = 50  # Smaller batches
+    # Multi-row upserts on quote_id - safe to re-run
+    loader = BulkQuoteLoader(supabase_url, supabase_key, page_size=page_size, max_concurrency=concurrency)
+    report = asyncio.run(loader.load(rows))
     
-    # Process in batches
-    for i in range(0, min(100, len(quote_files)), batch_size):  # Start with just 100 for testing
-        batch_files = quote_files[i:i + batch_size]
-        batch_data = []
-        
-        for quote_file in batch_files:
-            try:
-                with open(quote_file, 'r', encoding='utf-8') as f:
-                    quote_data = json.load(f)
-                
-                # Prepare data for teaching_materials table
-                upload_data = {
-                    'content': quote_data['text'],
-                    'title': f"{quote_data['metadata']['book']} - Chunk {quote_data['metadata']['chunk_index']}",
-                    'category': 'hylozoics_sacred',
-                    'source_file': quote_data['metadata']['source_file'],
-                    'language': quote_data['metadata']['language'],
-                    'metadata': {
-                        'book': quote_data['metadata']['book'],
-                        'chunk_index': quote_data['metadata']['chunk_index'],
-                        'confidence_score': quote_data['metadata'].get('confidence_score', 1.0),
-                        'sacred_library': True,
-                        'verbatim_quote': True
-                    }
-                }
-                
-                batch_data.append(upload_data)
-                
-            except Exception as e:
-                print(f"⚠️  Error processing {quote_file.name}: {e}")
-                continue
-        
-        # Upload batch to Supabase
-        if batch_data:
-            try:
-                result = supabase.table('teaching_materials').insert(batch_data).execute()
-                uploaded_count += len(batch_data)
-                print(f"✅ Uploaded batch {i//batch_size + 1}: {len(batch_data)} quotes (Total: {uploaded_count})")
-                
-            except Exception as e:
-                print(f"❌ Batch upload failed: {e}")
-                print(f"Error details: {str(e)}")
-                # Try individual uploads for this batch
-                for idx, item in enumerate(batch_data):
-                    try:
-                        result = supabase.table('teaching_materials').insert(item).execute()
-                        uploaded_count += 1
-                        if idx % 10 == 0:
-                            print(f"  ✅ Individual upload {idx + 1}/{len(batch_data)}")
-                    except Exception as individual_error:
-                        print(f"⚠️  Individual upload failed: {individual_error}")
-    
-    print(f"\n🎉 Upload complete! {uploaded_count} quotes uploaded to Supabase")
-    return uploaded_count > 0
+    if report.failed_pages:
+        print(f"🔁 Retrying {len(report.failed_pages)} failed pages...")
+        report = asyncio.run(loader.retry_failed(report))
+    
+    for failed in report.failed_pages:
+        print(f"❌ Page {failed.index} ({len(failed.rows)} quotes) failed: {failed.error}")
+    
+    print(f"\n🎉 Upload complete! {report.summary()}")
+    return report.rows_loaded > 0 and not report.failed_pages
 
 def main():
+    parser = argparse.ArgumentParser(description="Upload the Sacred Library to hylozoics_sacred_quotes")
+    parser.add_argument("--limit", type=int, default=None, help="Only upload the first N quotes")
+    parser.add_argument("--page-size", type=int, default=500, help="Rows per upsert request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Upsert requests in flight")
+    args = parser.parse_args()
+    
     print("🏛️  DIRECT SUPABASE SACRED LIBRARY UPLOADER")
     print("=" * 50)
     
@@ -150,8 +145,8 @@ def main():
         print("❌ Connection test failed")
         sys.exit(1)
     
-    # Upload quotes to existing table
-    if upload_quotes_to_existing_table(supabase):
+    # Upload quotes
+    if upload_quotes(supabase_url, supabase_key, args.limit, args.page_size, args.concurrency):
         print("\n🎉 Sacred Library successfully uploaded to Supabase!")
     else:
         print("\n❌ Upload failed")
@@ -7,20 +7,22 @@ Downloads and organizes Laurency PDFs by book series, volume, and chapter
 Perfect structure for Sacred Library integration
 """
 
-import os
-import requests
+import sys
 from pathlib import Path
-import time
 import json
 from datetime import datetime
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.download_engine import (
+    DownloadEngine, DownloadJob, DownloadResult, print_progress, summarize_results
+)
+
 class OrganizedLaurencyDownloader:
     def __init__(self, output_dir: str = "laurency_organized"):
         self.output_dir = Path(output_dir)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.engine = DownloadEngine(self.output_dir / "metadata" / "download_manifest.json")
         
         # Discovered PDF structure
         self.pdf_structure = {
@@ -136,71 +138,30 @@ class OrganizedLaurencyDownloader:
         
         print(f"✅ Directory structure created in {self.output_dir}")
     
-    def download_pdf(self, base_url: str, pdf_info: dict, target_dir: Path) -> bool:
-        """Download a single PDF with proper naming"""
-        url = f"{base_url}/{pdf_info['url']}"
-        filename = f"{pdf_info['title']}.pdf"
-        target_path = target_dir / filename
-        
-        # Skip if already exists
-        if target_path.exists():
-            print(f"⏭️  Skipping existing: {filename}")
-            return True
-        
-        try:
-            print(f"📥 Downloading: {pdf_info['title']}")
-            response = self.session.get(url, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(target_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\r📥 Progress: {progress:.1f}%", end='', flush=True)
-            
-            print(f"\n✅ Downloaded: {filename} ({downloaded:,} bytes)")
-            
-            # Log successful download
-            self.download_log.append({
-                "book": pdf_info.get("book", "unknown"),
-                "chapter": pdf_info["chapter"],
-                "title": pdf_info["title"],
-                "url": url,
-                "local_path": str(target_path),
-                "size_bytes": downloaded,
-                "timestamp": datetime.now().isoformat(),
-                "success": True
-            })
-            
-            return True
-            
-        except Exception as e:
-            print(f"\n❌ Failed to download {filename}: {e}")
-            
-            # Remove partial file
-            if target_path.exists():
-                target_path.unlink()
-            
-            # Log failed download
-            self.download_log.append({
-                "book": pdf_info.get("book", "unknown"),
-                "chapter": pdf_info["chapter"],
-                "title": pdf_info["title"],
-                "url": url,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat(),
-                "success": False
-            })
-            
-            return False
+    def pdf_job(self, base_url: str, pdf_info: dict, target_dir: Path) -> DownloadJob:
+        """Download job for one chapter PDF, named by its title"""
+        return DownloadJob(
+            url=f"{base_url}/{pdf_info['url']}",
+            path=target_dir / f"{pdf_info['title']}.pdf",
+            metadata=pdf_info,
+        )
+    
+    def log_result(self, result: DownloadResult):
+        """Record a download result in the download log"""
+        pdf_info = result.job.metadata
+        entry = {
+            "book": pdf_info.get("book", "unknown"),
+            "chapter": pdf_info["chapter"],
+            "title": pdf_info["title"],
+            "url": result.job.url,
+            "timestamp": datetime.now().isoformat(),
+            "success": result.ok
+        }
+        if result.ok:
+            entry.update({"local_path": str(result.job.path), "size_bytes": result.size, "status": result.status})
+        else:
+            entry["error"] = result.error
+        self.download_log.append(entry)
     
     def download_all_books(self):
         """Download all books in organized structure"""
@@ -209,38 +170,37 @@ class OrganizedLaurencyDownloader:
         print("🚀 Starting organized download of Laurency's works...")
         print(f"📚 Total books: {len(self.pdf_structure)}")
         
-        total_successful = 0
-        total_failed = 0
-        
+        jobs = []
         for book_key, book_info in self.pdf_structure.items():
-            print(f"\n📖 Downloading: {book_info['description']}")
-            print(f"📁 Directory: {book_info['directory']}")
-            print(f"📄 Chapters: {len(book_info['pdfs'])}")
-            
+            print(f"📖 {book_info['description']} - {len(book_info['pdfs'])} chapters -> {book_info['directory']}")
             target_dir = self.output_dir / book_info["directory"]
-            
-            book_successful = 0
-            book_failed = 0
-            
             for pdf_info in book_info["pdfs"]:
                 # Add book info to pdf_info for logging
-                pdf_info_with_book = {**pdf_info, "book": book_key}
-                
-                if self.download_pdf(base_url, pdf_info_with_book, target_dir):
-                    book_successful += 1
-                    total_successful += 1
-                else:
-                    book_failed += 1
-                    total_failed += 1
-                
-                # Be respectful to the server
-                time.sleep(1)
-            
+                jobs.append(self.pdf_job(base_url, {**pdf_info, "book": book_key}, target_dir))
+        
+        # Concurrent, with conditional GETs for files downloaded on earlier runs
+        print(f"\n📥 Downloading {len(jobs)} PDFs...")
+        results = self.engine.download_all_sync(jobs, progress=print_progress)
+        
+        book_counts = {}
+        for result in results:
+            self.log_result(result)
+            counts = book_counts.setdefault(result.job.metadata["book"], [0, 0])
+            counts[0 if result.ok else 1] += 1
+        
+        for book_key, (book_successful, book_failed) in book_counts.items():
             print(f"📊 {book_key}: {book_successful} successful, {book_failed} failed")
         
+        total_successful = sum(counts[0] for counts in book_counts.values())
+        total_failed = sum(counts[1] for counts in book_counts.values())
+        summary = summarize_results(results)
+        
         print(f"\n🎉 Download complete!")
-        print(f"✅ Total successful: {total_successful}")
+        print(f"✅ Total successful: {total_successful} "
+              f"({summary.get('downloaded', 0)} new, {summary.get('resumed', 0)} resumed, "
+              f"{summary.get('not_modified', 0) + summary.get('existing', 0)} unchanged)")
         print(f"❌ Total failed: {total_failed}")
+        print(f"📦 Transferred: {summary['bytes_transferred']:,} bytes")
         
         return total_successful, total_failed
     
@@ -12,28 +12,35 @@ Usage:
 
 import os
 import sys
-import requests
 from bs4 import BeautifulSoup
 import urllib.parse
-import time
 import json
 from pathlib import Path
 from typing import List, Dict, Optional
 import re
 from datetime import datetime
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.download_engine import (
+    DownloadEngine, DownloadJob, DownloadResult, print_progress, summarize_results
+)
+
 class LaurencyPDFDownloader:
     def __init__(self, base_url: str = "https://www.laurency.com", output_dir: str = "laurency_pdfs"):
         self.base_url = base_url
         self.output_dir = Path(output_dir)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
         
         # Create directory structure
         self.create_directories()
         
+        # Shared pooled client for pages and PDFs; the manifest makes re-runs incremental
+        self.engine = DownloadEngine(
+            self.output_dir / "metadata" / "download_manifest.json",
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+        )
+        
         # Download tracking
         self.pdf_links = []
         self.download_log = []
@@ -54,24 +61,19 @@ class LaurencyPDFDownloader:
             
         print(f"✅ Created PDF directory structure in {self.output_dir}")
     
-    def fetch_page(self, url: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page"""
-        for attempt in range(max_retries):
-            try:
-                print(f"🔍 Fetching: {url} (attempt {attempt + 1})")
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                time.sleep(1)  # Be respectful
-                return soup
-                
-            except requests.RequestException as e:
-                print(f"❌ Error fetching {url}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-                else:
-                    return None
+    def fetch_pages(self, urls: List[str]) -> Dict[str, BeautifulSoup]:
+        """Fetch and parse several web pages concurrently; failed pages are left out"""
+        for url in urls:
+            print(f"🔍 Fetching: {url}")
+        responses = self.engine.fetch_pages_sync(urls)
+        
+        pages = {}
+        for url, response in responses.items():
+            if response is None:
+                print(f"❌ Error fetching {url}")
+            else:
+                pages[url] = BeautifulSoup(response.content, 'html.parser')
+        return pages
     
     def discover_pdf_links(self) -> List[Dict[str, str]]:
         """Find all PDF links on the site"""
@@ -91,29 +93,23 @@ class LaurencyPDFDownloader:
             f"{self.base_url}/texts.html"
         ]
         
-        visited_pages = set()
+        # Entry points first, then the pages they link to - each level is one concurrent batch
+        entry_pages = self.fetch_pages(entry_points)
+        visited_pages = set(entry_points)
         
-        for entry_point in entry_points:
-            if entry_point in visited_pages:
-                continue
-                
-            soup = self.fetch_page(entry_point)
-            if soup:
-                visited_pages.add(entry_point)
-                
-                # Find PDF links on this page
-                page_pdfs = self.extract_pdf_links(soup, entry_point)
-                pdf_links.extend(page_pdfs)
-                
-                # Also look for links to other pages that might contain PDFs
-                other_pages = self.find_other_relevant_pages(soup, entry_point)
-                for page_url in other_pages:
-                    if page_url not in visited_pages:
-                        page_soup = self.fetch_page(page_url)
-                        if page_soup:
-                            visited_pages.add(page_url)
-                            more_pdfs = self.extract_pdf_links(page_soup, page_url)
-                            pdf_links.extend(more_pdfs)
+        other_pages = []
+        for page_url, soup in entry_pages.items():
+            # Find PDF links on this page
+            pdf_links.extend(self.extract_pdf_links(soup, page_url))
+            
+            # Also look for links to other pages that might contain PDFs
+            for other_url in self.find_other_relevant_pages(soup, page_url):
+                if other_url not in visited_pages:
+                    visited_pages.add(other_url)
+                    other_pages.append(other_url)
+        
+        for page_url, soup in self.fetch_pages(other_pages).items():
+            pdf_links.extend(self.extract_pdf_links(soup, page_url))
         
         # Remove duplicates
         unique_pdfs = []
@@ -250,9 +246,8 @@ class LaurencyPDFDownloader:
         
         return book_info
     
-    def download_pdf(self, pdf_info: Dict[str, str]) -> bool:
-        """Download a single PDF file"""
-        url = pdf_info['url']
+    def pdf_job(self, pdf_info: Dict[str, str]) -> DownloadJob:
+        """Download job for a PDF, placed by language and named by book"""
         language = pdf_info['language']
         filename = pdf_info['filename']
         
@@ -272,76 +267,33 @@ class LaurencyPDFDownloader:
             safe_title = re.sub(r'[-\s]+', '_', safe_title)
             filename = f"{safe_title}_{filename}"
         
-        local_path = target_dir / filename
-        
-        # Skip if already exists
-        if local_path.exists():
-            print(f"⏭️  Skipping existing: {filename}")
-            return True
-        
-        try:
-            print(f"📥 Downloading: {filename}")
-            response = self.session.get(url, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\r📥 Progress: {progress:.1f}%", end='', flush=True)
-            
-            print(f"\n✅ Downloaded: {filename} ({downloaded:,} bytes)")
-            
-            # Log successful download
-            self.download_log.append({
-                **pdf_info,
-                'local_path': str(local_path),
-                'size_bytes': downloaded,
-                'timestamp': datetime.now().isoformat(),
-                'success': True
-            })
-            
-            return True
-            
-        except Exception as e:
-            print(f"\n❌ Failed to download {filename}: {e}")
-            self.download_log.append({
-                **pdf_info,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat(),
-                'success': False
-            })
-            return False
+        return DownloadJob(url=pdf_info['url'], path=target_dir / filename, metadata=pdf_info)
+    
+    def log_result(self, result: DownloadResult):
+        """Record a download result in the download log"""
+        entry = {**result.job.metadata, 'timestamp': datetime.now().isoformat(), 'success': result.ok}
+        if result.ok:
+            entry.update({'local_path': str(result.job.path), 'size_bytes': result.size, 'status': result.status})
+        else:
+            entry['error'] = result.error
+        self.download_log.append(entry)
     
     def download_all_pdfs(self, pdf_links: List[Dict[str, str]]):
         """Download all discovered PDFs"""
         print(f"\n📥 Starting download of {len(pdf_links)} PDFs...")
         
-        successful = 0
-        failed = 0
-        
-        for i, pdf_info in enumerate(pdf_links, 1):
-            print(f"\n[{i}/{len(pdf_links)}] ", end='')
-            
-            if self.download_pdf(pdf_info):
-                successful += 1
-            else:
-                failed += 1
-            
-            # Be respectful to the server
-            time.sleep(2)
+        results = self.engine.download_all_sync([self.pdf_job(pdf_info) for pdf_info in pdf_links],
+                                                progress=print_progress)
+        for result in results:
+            self.log_result(result)
         
+        summary = summarize_results(results)
         print(f"\n🎉 Download complete!")
-        print(f"✅ Successful: {successful}")
-        print(f"❌ Failed: {failed}")
+        print(f"✅ Successful: {sum(result.ok for result in results)} "
+              f"({summary.get('downloaded', 0)} new, {summary.get('resumed', 0)} resumed, "
+              f"{summary.get('not_modified', 0) + summary.get('existing', 0)} unchanged)")
+        print(f"❌ Failed: {summary.get('failed', 0)}")
+        print(f"📦 Transferred: {summary['bytes_transferred']:,} bytes")
     
     def save_metadata(self, pdf_links: List[Dict[str, str]]):
         """Save metadata about discovered and downloaded PDFs"""
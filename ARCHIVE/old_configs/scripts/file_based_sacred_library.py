@@ -8,16 +8,25 @@ Later can be migrated to Supabase when tables are ready
 """
 
 import os
+import sys
 import json
-import fitz  # PyMuPDF
 from pathlib import Path
 import openai
 import time
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 import hashlib
 from datetime import datetime
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.pdf_pages import PdfPage, iter_pdf_pages, iter_pdf_documents
+from core.sacred_library_packed import convert_quote_directory
+
+SENTENCE_END = re.compile(r'[.!?]+')
+
+
 class FileSacredLibrary:
     def __init__(self, output_dir: str = "sacred_library_files"):
         # Initialize OpenAI for future embedding use
@@ -35,10 +44,15 @@ class FileSacredLibrary:
         
         # Configuration
         self.chunk_size = 800
+        self.save_batch_size = 50  # Chunks written per batch while a PDF streams in
+        
+        # Open index files (by_language / by_book JSONL), kept open for the whole build
+        self.index_writers = {}
         
         # Processing stats
         self.stats = {
             'pdfs_processed': 0,
+            'pages_extracted': 0,
             'chunks_created': 0,
             'quotes_saved': 0,
             'languages_found': set(),
@@ -60,84 +74,95 @@ class FileSacredLibrary:
             'hungarian_Magyar': 'hu'
         }
     
-    def extract_text_from_pdf(self, pdf_path: Path) -> str:
-        """Extract text from PDF using PyMuPDF"""
-        try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            
-            # Clean text
-            text = re.sub(r'\s+', ' ', text)
-            text = text.replace('ﬁ', 'fi').replace('ﬂ', 'fl')
-            text = text.replace('"', '"').replace('"', '"')
-            
-            return text.strip()
-            
-        except Exception as e:
-            self.stats['errors'].append(f"PDF extraction failed: {pdf_path} - {e}")
-            return ""
+    def extract_pages_from_pdf(self, pdf_path: Path, workers: Optional[int] = 1) -> Iterator[PdfPage]:
+        """Cleaned pages of one PDF, streamed (large PDFs spread over `workers` processes)"""
+        return self.track_pages(iter_pdf_pages([pdf_path], workers=workers), pdf_path)
     
-    def create_text_chunks(self, text: str, metadata: Dict) -> List[Dict]:
-        """Split text into meaningful chunks"""
-        chunks = []
-        sentences = re.split(r'[.!?]+', text)
-        
+    def track_pages(self, pages: Iterable[PdfPage], pdf_path: Path) -> Iterator[PdfPage]:
+        """Pass pages through, counting them and recording extraction errors"""
+        for page in pages:
+            if page.error:
+                self.stats['errors'].append(f"PDF extraction failed: {pdf_path} - {page.error}")
+            if page.number:
+                self.stats['pages_extracted'] += 1
+                yield page
+    
+    def iter_sentences(self, pages: Iterable[PdfPage]) -> Iterator[Tuple[str, int]]:
+        """(sentence, page number it starts on); sentences may run across page breaks"""
+        carry, carry_page = "", 0
+        for page in pages:
+            if not page.text:
+                continue
+            pieces = SENTENCE_END.split(page.text)
+            first_page = carry_page if carry else page.number
+            if carry:
+                pieces[0] = carry + " " + pieces[0]
+            for i, piece in enumerate(pieces[:-1]):
+                yield piece, first_page if i == 0 else page.number
+            carry, carry_page = pieces[-1], first_page if len(pieces) == 1 else page.number
+        if carry:
+            yield carry, carry_page
+    
+    def make_chunk(self, text: str, chunk_num: int, pages: Tuple[int, int], metadata: Dict) -> Dict:
+        return {
+            'quote_id': f"{metadata['file_id']}_chunk_{chunk_num:03d}",
+            'text': text.strip(),
+            'source_book': metadata['book_series'],
+            'chapter': metadata['filename'].replace('.pdf', ''),
+            'language': metadata['language_code'],
+            'author': 'Henry T. Laurency',
+            'tradition': 'Hylozoics',
+            'verified': True,
+            'metadata': {
+                'file_path': str(metadata['file_path']),
+                'chunk_number': chunk_num,
+                'page_start': pages[0],
+                'page_end': pages[1],
+                'extraction_date': datetime.now().isoformat()
+            }
+        }
+    
+    def iter_text_chunks(self, pages: Iterable[PdfPage], metadata: Dict) -> Iterator[Dict]:
+        """Split page text into sentence-aligned chunks as the pages arrive"""
         current_chunk = ""
+        chunk_pages = None
         chunk_num = 1
+        text_length = 0
         
-        for sentence in sentences:
+        for sentence, page_number in self.iter_sentences(pages):
             sentence = sentence.strip()
             if not sentence:
                 continue
+            text_length += len(sentence)
             
-            # If adding this sentence would exceed chunk size, save current chunk
+            # If adding this sentence would exceed chunk size, emit current chunk
             if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
-                chunk_id = f"{metadata['file_id']}_chunk_{chunk_num:03d}"
-                
-                chunks.append({
-                    'quote_id': chunk_id,
-                    'text': current_chunk.strip(),
-                    'source_book': metadata['book_series'],
-                    'chapter': metadata['filename'].replace('.pdf', ''),
-                    'language': metadata['language_code'],
-                    'author': 'Henry T. Laurency',
-                    'tradition': 'Hylozoics',
-                    'verified': True,
-                    'metadata': {
-                        'file_path': str(metadata['file_path']),
-                        'chunk_number': chunk_num,
-                        'extraction_date': datetime.now().isoformat()
-                    }
-                })
-                
+                yield self.make_chunk(current_chunk, chunk_num, chunk_pages, metadata)
                 current_chunk = sentence
+                chunk_pages = (page_number, page_number)
                 chunk_num += 1
             else:
                 current_chunk += " " + sentence
+                chunk_pages = (chunk_pages[0] if chunk_pages else page_number, page_number)
         
-        # Don't forget the last chunk
-        if current_chunk.strip():
-            chunk_id = f"{metadata['file_id']}_chunk_{chunk_num:03d}"
-            chunks.append({
-                'quote_id': chunk_id,
-                'text': current_chunk.strip(),
-                'source_book': metadata['book_series'],
-                'chapter': metadata['filename'].replace('.pdf', ''),
-                'language': metadata['language_code'],
-                'author': 'Henry T. Laurency',
-                'tradition': 'Hylozoics',
-                'verified': True,
-                'metadata': {
-                    'file_path': str(metadata['file_path']),
-                    'chunk_number': chunk_num,
-                    'extraction_date': datetime.now().isoformat()
-                }
-            })
-        
-        return chunks
+        # Don't forget the last chunk - unless the whole PDF had no meaningful text
+        if current_chunk.strip() and text_length >= 100:
+            yield self.make_chunk(current_chunk, chunk_num, chunk_pages, metadata)
+    
+    def _index_writer(self, index_file: Path):
+        """Buffered append handle for a JSONL index, opened once per build"""
+        writer = self.index_writers.get(index_file)
+        if writer is None:
+            index_file.parent.mkdir(exist_ok=True)
+            writer = open(index_file, 'a', encoding='utf-8', buffering=1024 * 1024)
+            self.index_writers[index_file] = writer
+        return writer
+    
+    def close_index_writers(self):
+        """Flush and close all JSONL index files"""
+        for writer in self.index_writers.values():
+            writer.close()
+        self.index_writers = {}
     
     def save_quotes_to_files(self, chunks: List[Dict]) -> int:
         """Save quotes to organized file system"""
@@ -150,20 +175,16 @@ class FileSacredLibrary:
                 with open(quote_file, 'w', encoding='utf-8') as f:
                     json.dump(chunk, f, indent=2, ensure_ascii=False)
                 
+                line = json.dumps(chunk, ensure_ascii=False) + '\n'
+                
                 # Add to language index
-                lang_dir = self.output_dir / "by_language" / chunk['language']
-                lang_dir.mkdir(exist_ok=True)
-                lang_index = lang_dir / "quotes.jsonl"
-                with open(lang_index, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+                lang_index = self.output_dir / "by_language" / chunk['language'] / "quotes.jsonl"
+                self._index_writer(lang_index).write(line)
                 
                 # Add to book index
                 book_name = chunk['source_book'].replace(' ', '_').replace('/', '_')
-                book_dir = self.output_dir / "by_book" / book_name
-                book_dir.mkdir(exist_ok=True)
-                book_index = book_dir / "quotes.jsonl"
-                with open(book_index, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+                book_index = self.output_dir / "by_book" / book_name / "quotes.jsonl"
+                self._index_writer(book_index).write(line)
                 
                 # Track stats
                 self.stats['languages_found'].add(chunk['language'])
@@ -177,8 +198,13 @@ class FileSacredLibrary:
         self.stats['quotes_saved'] += saved_count
         return saved_count
     
-    def process_pdf_file(self, pdf_path: Path, language: str, book_series: str) -> bool:
-        """Process a single PDF file"""
+    def process_pdf_file(self, pdf_path: Path, language: str, book_series: str,
+                         pages: Optional[Iterable[PdfPage]] = None) -> bool:
+        """Process a single PDF file (pages may come from worker processes)
+
+        Chunks are saved in small batches as pages stream in, so only a few
+        pages of text are held in memory at a time.
+        """
         print(f"  📚 Processing: {pdf_path.name}")
         
         try:
@@ -193,25 +219,31 @@ class FileSacredLibrary:
                 'book_series': book_series or 'Unknown Series'
             }
             
-            # Extract text
-            text = self.extract_text_from_pdf(pdf_path)
-            if not text or len(text) < 100:
-                print(f"    ❌ No meaningful text extracted")
-                return False
+            if pages is None:
+                pages = self.extract_pages_from_pdf(pdf_path)
             
-            # Create chunks
-            chunks = self.create_text_chunks(text, metadata)
-            if not chunks:
-                print(f"    ❌ No chunks created")
-                return False
+            # Chunk and save incrementally
+            chunk_count = 0
+            saved_count = 0
+            batch = []
+            for chunk in self.iter_text_chunks(pages, metadata):
+                batch.append(chunk)
+                if len(batch) >= self.save_batch_size:
+                    saved_count += self.save_quotes_to_files(batch)
+                    chunk_count += len(batch)
+                    batch = []
+            if batch:
+                saved_count += self.save_quotes_to_files(batch)
+                chunk_count += len(batch)
             
-            print(f"    📝 Created {len(chunks)} text chunks")
+            if not chunk_count:
+                print(f"    ❌ No meaningful text extracted")
+                return False
             
-            # Save to files
-            saved_count = self.save_quotes_to_files(chunks)
+            print(f"    📝 Created {chunk_count} text chunks")
             
             self.stats['pdfs_processed'] += 1
-            self.stats['chunks_created'] += len(chunks)
+            self.stats['chunks_created'] += chunk_count
             
             print(f"    ✅ Saved {saved_count} quotes to Sacred Library")
             return True
@@ -327,8 +359,34 @@ if __name__ == "__main__":
         
         print(f"🔍 Search interface created: {search_file}")
     
-    def run_build(self, collection_dir: Path = Path("laurency_ultimate"), max_files: int = 50):
-        """Build file-based Sacred Library"""
+    def detect_language(self, pdf_path: Path) -> str:
+        """Determine language from path"""
+        for lang in self.language_map.keys():
+            if lang in str(pdf_path):
+                return lang
+        return "english_English"  # default
+    
+    def detect_book_series(self, pdf_path: Path) -> str:
+        """Determine book series from path"""
+        if "Knowledge" in str(pdf_path):
+            return "Knowledge of Life"
+        elif "Philosopher" in str(pdf_path):
+            return "The Philosopher's Stone"
+        elif "Explanation" in str(pdf_path):
+            return "The Explanation"
+        elif "Way" in str(pdf_path):
+            return "The Way of Man"
+        return "Unknown Series"
+    
+    def run_build(self, collection_dir: Path = Path("laurency_ultimate"), max_files: int = 50,
+                  workers: Optional[int] = None):
+        """Build file-based Sacred Library
+
+        Pages are extracted in a process pool (`workers` processes, default
+        one per CPU) - whole small PDFs per worker, large PDFs split into
+        page batches. Chunking and index writes stay in this process and
+        consume pages in order as they arrive.
+        """
         print("🏛️  FILE-BASED SACRED LIBRARY BUILDER")
         print("=" * 60)
         print(f"🎯 Building Sacred Library from {max_files} sample files")
@@ -344,37 +402,28 @@ if __name__ == "__main__":
         print(f"📋 Processing {len(sample_pdfs)} files")
         
         processed_count = 0
+        # Pages arrive as they are extracted, so this times extract, chunk and save together
+        build_start = time.perf_counter()
         
-        for pdf_path in sample_pdfs:
-            # Determine language from path
-            language = "english_English"  # default
-            for lang in self.language_map.keys():
-                if lang in str(pdf_path):
-                    language = lang
-                    break
-            
-            # Determine book series from path
-            book_series = "Unknown Series"
-            if "Knowledge" in str(pdf_path):
-                book_series = "Knowledge of Life"
-            elif "Philosopher" in str(pdf_path):
-                book_series = "The Philosopher's Stone"
-            elif "Explanation" in str(pdf_path):
-                book_series = "The Explanation"
-            elif "Way" in str(pdf_path):
-                book_series = "The Way of Man"
-            
-            # Process the file
-            if self.process_pdf_file(pdf_path, language, book_series):
-                processed_count += 1
-            
-            # Small delay
-            time.sleep(0.1)
+        try:
+            for pdf_path, pages in iter_pdf_documents(sample_pdfs, workers=workers):
+                if self.process_pdf_file(pdf_path, self.detect_language(pdf_path),
+                                         self.detect_book_series(pdf_path),
+                                         pages=self.track_pages(pages, pdf_path)):
+                    processed_count += 1
+        finally:
+            self.close_index_writers()
+        
+        build_seconds = time.perf_counter() - build_start
+        pages_per_second = self.stats['pages_extracted'] / build_seconds if build_seconds else 0.0
         
         # Create indices and search interface
         self.create_master_index()
         self.create_search_interface()
         
+        # Repack so LocalSacredLibrary and the search script serve the new quotes
+        packed_counts = convert_quote_directory(self.output_dir / "quotes", self.output_dir / "packed")
+        
         # Final summary
         end_time = datetime.now()
         duration = end_time - start_time
@@ -383,8 +432,10 @@ if __name__ == "__main__":
         print("=" * 50)
         print(f"⏱️  Total time: {duration}")
         print(f"📚 PDFs processed: {self.stats['pdfs_processed']}")
+        print(f"📄 Pages extracted: {self.stats['pages_extracted']} ({pages_per_second:.1f} pages/sec end-to-end incl. chunking and saving)")
         print(f"📝 Text chunks created: {self.stats['chunks_created']}")
         print(f"🏛️  Sacred quotes saved: {self.stats['quotes_saved']}")
+        print(f"📦 Packed library: {sum(packed_counts.values())} quotes")
         print(f"🌐 Languages: {len(self.stats['languages_found'])}")
         print(f"📖 Books: {len(self.stats['books_found'])}")
         
@@ -398,8 +449,17 @@ if __name__ == "__main__":
         return processed_count > 0
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build the file-based Sacred Library")
+    parser.add_argument("--collection-dir", default="laurency_ultimate")
+    parser.add_argument("--max-files", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="PDF extraction processes (default: one per CPU; 1 = in-process)")
+    args = parser.parse_args()
+    
     builder = FileSacredLibrary()
-    success = builder.run_build(max_files=50)
+    success = builder.run_build(Path(args.collection_dir), max_files=args.max_files, workers=args.workers)
     
     if success:
         print("\n🎉 Sacred Library successfully built!")
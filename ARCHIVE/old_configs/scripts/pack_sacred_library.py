@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Pack Sacred Library
+===================
+
+Convert sacred_library_files/quotes/*.json (one file per quote) into the
+packed per-language format read by LocalSacredLibrary and
+search_sacred_library.py. Re-run after adding quotes.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.sacred_library_packed import PackedSacredLibrary, convert_quote_directory
+
+
+def main():
+    project_root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Pack per-quote JSON files into the packed Sacred Library")
+    parser.add_argument("--quotes-dir", default=str(project_root / "sacred_library_files" / "quotes"))
+    parser.add_argument("--output-dir", default=str(project_root / "sacred_library_files" / "packed"))
+    args = parser.parse_args()
+
+    print("📦 Packing Sacred Library")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    counts = convert_quote_directory(Path(args.quotes_dir), Path(args.output_dir))
+    elapsed = time.perf_counter() - start
+
+    for language, count in sorted(counts.items()):
+        print(f"   {language}: {count} quotes")
+    print(f"✅ Packed {sum(counts.values())} quotes in {elapsed:.2f}s → {args.output_dir}")
+
+    # Sanity check: cold open + full scan of the packed library
+    start = time.perf_counter()
+    library = PackedSacredLibrary(Path(args.output_dir))
+    scanned = sum(1 for _ in library.iter_quotes())
+    library.close()
+    print(f"🔍 Full scan of packed library: {scanned} quotes in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
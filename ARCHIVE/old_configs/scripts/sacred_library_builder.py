@@ -8,9 +8,10 @@ a dual-mode Sacred Library (Relational + Vector databases)
 """
 
 import os
+import sys
 import json
-import PyPDF2
-import fitz  # PyMuPDF - better PDF text extraction
+import asyncio
+from collections import deque
 from pathlib import Path
 import openai
 import pinecone
@@ -19,36 +20,158 @@ import uuid
 from datetime import datetime
 import time
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator
 import hashlib
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.sacred_quote_loader import BulkQuoteLoader
+from core.pdf_pages import PdfPage, iter_pdf_pages, iter_pdf_documents
+
+BUILD_OUTPUT_DIR = Path(__file__).parent.parent / "sacred_library_files"
+BUILD_MANIFEST_FILE = BUILD_OUTPUT_DIR / "SACRED_LIBRARY_BUILD_MANIFEST.json"
+BUILD_REPORT_FILE = "SACRED_LIBRARY_BUILD_REPORT.json"
+
+
+def file_content_hash(pdf_path: Path) -> str:
+    """SHA-256 of the file contents, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """What has been built from which PDF, keyed by path relative to the collection
+
+    Each entry records the content hash, the chunk ids uploaded for it and
+    whether the upload finished. The manifest is rewritten (atomically)
+    after every file, so an interrupted build resumes where it stopped.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Path, build_params: Dict):
+        self.path = Path(path)
+        self.build_params = build_params
+        self.files: Dict[str, Dict] = {}
+        self.params_changed = False
+        
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data.get('files', {})
+            # Different chunking/embedding settings invalidate every entry
+            self.params_changed = data.get('build_params') != build_params
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.VERSION,
+                'updated_at': datetime.now().isoformat(),
+                'build_params': self.build_params,
+                'files': self.files
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+    
+    def content_hash(self, key: str, pdf_path: Path) -> str:
+        """Content hash, reusing the recorded one when size and mtime are unchanged"""
+        stat = pdf_path.stat()
+        entry = self.files.get(key)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['content_hash']
+        return file_content_hash(pdf_path)
+    
+    def mark_in_progress(self, key: str, pdf_path: Path, content_hash: str, chunk_ids: List[str]):
+        stat = pdf_path.stat()
+        # Chunks of an earlier build whose deletion failed stay on record until it succeeds
+        stale_chunk_ids = self.files.get(key, {}).get('stale_chunk_ids', [])
+        self.files[key] = {
+            'content_hash': content_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'chunk_ids': chunk_ids,
+            'complete': False,
+            'built_at': datetime.now().isoformat()
+        }
+        if stale_chunk_ids:
+            self.files[key]['stale_chunk_ids'] = stale_chunk_ids
+        self.save()
+    
+    def mark_complete(self, key: str):
+        self.files[key]['complete'] = True
+        self.save()
+    
+    def remove(self, key: str):
+        self.files.pop(key, None)
+        self.save()
+    
+    def set_stale_chunks(self, key: str, chunk_ids: List[str]):
+        """Record chunks that still have to be deleted (clears the record when empty)"""
+        entry = self.files[key]
+        if chunk_ids:
+            entry['stale_chunk_ids'] = chunk_ids
+        else:
+            entry.pop('stale_chunk_ids', None)
+        self.save()
+
+
 class SacredLibraryBuilder:
-    def __init__(self):
-        # Initialize APIs
-        self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.supabase: Client = create_client(
-            os.getenv('SUPABASE_URL'),
-            os.getenv('SUPABASE_ANON_KEY')
-        )
-        
-        # Initialize Pinecone
-        pinecone.init(
-            api_key=os.getenv('PINECONE_API_KEY'),
-            environment=os.getenv('PINECONE_ENV')
-        )
-        self.pinecone_index = pinecone.Index('hylozoics-sacred-library')
+    def __init__(self, connect: bool = True, manifest_path: Path = BUILD_MANIFEST_FILE):
+        if connect:
+            # Initialize APIs
+            self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.supabase: Client = create_client(
+                os.getenv('SUPABASE_URL'),
+                os.getenv('SUPABASE_ANON_KEY')
+            )
+            
+            # Initialize Pinecone
+            pinecone.init(
+                api_key=os.getenv('PINECONE_API_KEY'),
+                environment=os.getenv('PINECONE_ENV')
+            )
+            self.pinecone_index = pinecone.Index('hylozoics-sacred-library')
+            
+            # Paged multi-row upserts instead of one insert request per quote
+            self.quote_loader = BulkQuoteLoader(
+                os.getenv('SUPABASE_URL'),
+                os.getenv('SUPABASE_ANON_KEY'),
+                page_size=int(os.getenv('SACRED_UPLOAD_PAGE_SIZE', 500)),
+                max_concurrency=int(os.getenv('SACRED_UPLOAD_CONCURRENCY', 4))
+            )
         
         # Configuration
         self.embedding_model = "text-embedding-3-large"
         self.chunk_size = 1000  # Characters per chunk
         self.overlap_size = 200  # Overlap between chunks
+        self.extraction_workers = int(os.getenv('SACRED_EXTRACTION_WORKERS', os.cpu_count() or 4))
+        
+        # Incremental build state
+        self.manifest = BuildManifest(manifest_path, {
+            'chunk_size': self.chunk_size,
+            'overlap_size': self.overlap_size,
+            'embedding_model': self.embedding_model
+        })
         
         # Processing stats
         self.stats = {
             'pdfs_processed': 0,
+            'pages_extracted': 0,
+            # Wall time of the language builds, including embedding and uploads
+            'build_seconds': 0.0,
+            # Time the main process spent blocked waiting for extracted pages
+            'extraction_wait_seconds': 0.0,
             'chunks_created': 0,
             'embeddings_created': 0,
             'quotes_uploaded': 0,
+            'pdfs_skipped': 0,
+            'pdfs_removed': 0,
+            'chunks_deleted': 0,
             'errors': []
         }
         
@@ -79,96 +202,104 @@ class SacredLibraryBuilder:
             'Explanation': 'The Explanation'
         }
     
-    def extract_text_from_pdf(self, pdf_path: Path) -> str:
-        """Extract text from PDF using PyMuPDF for better quality"""
-        try:
-            print(f"    📄 Extracting text from: {pdf_path.name}")
-            
-            # Try PyMuPDF first (better quality)
-            try:
-                doc = fitz.open(pdf_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text()
-                doc.close()
-                
-                if len(text.strip()) > 100:  # Good extraction
-                    return text
-            except Exception as e:
-                print(f"      ⚠️  PyMuPDF failed, trying PyPDF2: {e}")
-            
-            # Fallback to PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                
-                return text
-                
-        except Exception as e:
-            print(f"      ❌ PDF extraction failed: {e}")
-            self.stats['errors'].append(f"PDF extraction failed: {pdf_path} - {e}")
-            return ""
+    def extract_pages_from_pdf(self, pdf_path: Path) -> Iterator[PdfPage]:
+        """Cleaned pages of one PDF, streamed; large PDFs are spread over the worker pool"""
+        print(f"    📄 Extracting text from: {pdf_path.name}")
+        return self.track_pages(iter_pdf_pages([pdf_path], workers=self.extraction_workers), pdf_path)
+    
+    def track_pages(self, pages: Iterable[PdfPage], pdf_path: Path) -> Iterator[PdfPage]:
+        """Pass pages through, counting them, timing the wait for them and recording extraction errors"""
+        pages = iter(pages)
+        while True:
+            wait_start = time.perf_counter()
+            page = next(pages, None)
+            self.stats['extraction_wait_seconds'] += time.perf_counter() - wait_start
+            if page is None:
+                return
+            if page.error:
+                print(f"      ❌ PDF extraction failed for {pdf_path.name}: {page.error}")
+                self.stats['errors'].append(f"PDF extraction failed: {pdf_path} - {page.error}")
+            if page.number:
+                self.stats['pages_extracted'] += 1
+                yield page
     
     def clean_text(self, text: str) -> str:
-        """Clean and normalize extracted text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove page numbers and headers/footers
-        text = re.sub(r'\n\d+\n', '\n', text)
+        """Page text cleanup on top of core.pdf_pages.clean_page_text"""
+        # Running "Page N" markers inside the text
         text = re.sub(r'Page \d+', '', text)
-        
-        # Fix common PDF extraction issues
-        text = text.replace('ﬁ', 'fi').replace('ﬂ', 'fl')
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
-        
-        return text.strip()
+        return re.sub(r'\s+', ' ', text).strip()
     
-    def create_text_chunks(self, text: str, metadata: Dict) -> List[Dict]:
-        """Split text into chunks for processing"""
-        chunks = []
-        text_length = len(text)
-        
-        start = 0
+    def iter_text_chunks(self, pages: Iterable[PdfPage], metadata: Dict) -> Iterator[Dict]:
+        """Split page text into overlapping chunks as the pages arrive
+
+        Produces the same windows as chunking the whole text at once, but
+        only the not yet chunked tail (about a chunk plus a page) is held
+        in memory. Each chunk records the pages it spans.
+        """
+        buffer = ""
+        offset = 0  # Position of buffer[0] in the whole text
+        page_starts = deque()  # (position, page number) for pages still in the buffer
         chunk_num = 1
         
-        while start < text_length:
-            end = min(start + self.chunk_size, text_length)
-            
-            # Try to break at sentence boundary
-            if end < text_length:
-                sentence_break = text.rfind('.', start, end)
-                if sentence_break > start + self.chunk_size // 2:
-                    end = sentence_break + 1
-            
-            chunk_text = text[start:end].strip()
-            
-            if len(chunk_text) > 50:  # Only meaningful chunks
-                chunk_id = f"{metadata['file_id']}_chunk_{chunk_num:03d}"
+        def page_at(position: int) -> int:
+            number = page_starts[0][1]
+            for start, page_number in page_starts:
+                if start > position:
+                    break
+                number = page_number
+            return number
+        
+        def take(final: bool) -> Iterator[Dict]:
+            nonlocal buffer, offset, chunk_num
+            # Until the last page is in, only cut chunks that have text after them
+            while buffer and (final or len(buffer) > self.chunk_size):
+                end = min(self.chunk_size, len(buffer))
                 
-                chunks.append({
-                    'chunk_id': chunk_id,
-                    'text': chunk_text,
-                    'metadata': {
-                        **metadata,
-                        'chunk_number': chunk_num,
-                        'total_chunks': 0,  # Will update later
-                        'start_char': start,
-                        'end_char': end
+                # Try to break at sentence boundary
+                if end < len(buffer):
+                    sentence_break = buffer.rfind('.', 0, end)
+                    if sentence_break > self.chunk_size // 2:
+                        end = sentence_break + 1
+                
+                chunk_text = buffer[:end].strip()
+                if len(chunk_text) > 50:  # Only meaningful chunks
+                    yield {
+                        'chunk_id': f"{metadata['file_id']}_chunk_{chunk_num:03d}",
+                        'text': chunk_text,
+                        'metadata': {
+                            **metadata,
+                            'chunk_number': chunk_num,
+                            'total_chunks': 0,  # Known once the PDF is done
+                            'start_char': offset,
+                            'end_char': offset + end,
+                            'page_start': page_at(offset),
+                            'page_end': page_at(offset + end - 1)
+                        }
                     }
-                })
+                    chunk_num += 1
                 
-                chunk_num += 1
-            
-            start = end - self.overlap_size if end < text_length else end
+                advance = end - self.overlap_size if end < len(buffer) else end
+                buffer, offset = buffer[advance:], offset + advance
+                while len(page_starts) > 1 and page_starts[1][0] <= offset:
+                    page_starts.popleft()
+        
+        for page in pages:
+            text = self.clean_text(page.text)
+            if not text:
+                continue
+            if offset or buffer:
+                buffer += ' '
+            page_starts.append((offset + len(buffer), page.number))
+            buffer += text
+            yield from take(final=False)
         
-        # Update total chunks count
+        yield from take(final=True)
+    
+    def create_text_chunks(self, pages: Iterable[PdfPage], metadata: Dict) -> List[Dict]:
+        """All chunks of one PDF, with total_chunks filled in"""
+        chunks = list(self.iter_text_chunks(pages, metadata))
         for chunk in chunks:
             chunk['metadata']['total_chunks'] = len(chunks)
-        
         return chunks
     
     def create_embeddings(self, chunks: List[Dict]) -> List[Dict]:
@@ -211,40 +342,39 @@ class SacredLibraryBuilder:
         """Upload chunks to Supabase Sacred Library"""
         print(f"    🏛️  Uploading {len(chunks)} quotes to Sacred Library...")
         
-        uploaded_count = 0
-        
+        rows = []
         for chunk in chunks:
-            try:
-                # Create sacred library entry
-                quote_data = {
-                    'quote_id': chunk['chunk_id'],
-                    'text': chunk['text'],
-                    'source_book': chunk['metadata']['book_series'],
-                    'chapter': chunk['metadata']['filename'].replace('.pdf', ''),
-                    'language': chunk['metadata']['language_code'],
-                    'author': 'Henry T. Laurency',
-                    'tradition': 'Hylozoics',
-                    'verified': True,
-                    'hylozoics_terms': [],  # TODO: Extract terms
-                    'metadata': {
-                        'file_path': chunk['metadata']['file_path'],
-                        'chunk_number': chunk['metadata']['chunk_number'],
-                        'total_chunks': chunk['metadata']['total_chunks'],
-                        'extraction_date': datetime.now().isoformat()
-                    }
+            # Create sacred library entry
+            rows.append({
+                'quote_id': chunk['chunk_id'],
+                'text': chunk['text'],
+                'source_book': chunk['metadata']['book_series'],
+                'chapter': chunk['metadata']['filename'].replace('.pdf', ''),
+                'language': chunk['metadata']['language_code'],
+                'author': 'Henry T. Laurency',
+                'tradition': 'Hylozoics',
+                'verified': True,
+                'hylozoics_terms': [],  # TODO: Extract terms
+                'metadata': {
+                    'file_path': chunk['metadata']['file_path'],
+                    'chunk_number': chunk['metadata']['chunk_number'],
+                    'total_chunks': chunk['metadata']['total_chunks'],
+                    'page_start': chunk['metadata']['page_start'],
+                    'page_end': chunk['metadata']['page_end'],
+                    'extraction_date': datetime.now().isoformat()
                 }
-                
-                # Upload to Supabase
-                result = self.supabase.table('hylozoics_sacred_quotes').insert(quote_data).execute()
-                
-                if result.data:
-                    uploaded_count += 1
-                
-            except Exception as e:
-                print(f"      ❌ Supabase upload failed: {e}")
-                self.stats['errors'].append(f"Supabase upload failed: {chunk['chunk_id']} - {e}")
-                continue
-        
+            })
+        
+        # Upsert on quote_id, so re-uploading a file is idempotent
+        report = self.quote_loader.load_sync(rows)
+        if report.failed_pages:
+            # Give only the failed pages one more round before reporting them
+            report = asyncio.run(self.quote_loader.retry_failed(report))
+        for failed in report.failed_pages:
+            print(f"      ❌ Supabase upload failed for page {failed.index}: {failed.error}")
+            self.stats['errors'].append(f"Supabase upload failed: {len(failed.rows)} quotes - {failed.error}")
+        
+        uploaded_count = report.rows_loaded
         self.stats['quotes_uploaded'] += uploaded_count
         print(f"      ✅ Uploaded {uploaded_count} quotes to Sacred Library")
         return uploaded_count
@@ -264,7 +394,8 @@ class SacredLibraryBuilder:
                         'book': chunk['metadata']['book_series'],
                         'language': chunk['metadata']['language_code'],
                         'filename': chunk['metadata']['filename'],
-                        'chunk_num': chunk['metadata']['chunk_number']
+                        'chunk_num': chunk['metadata']['chunk_number'],
+                        'page': chunk['metadata']['page_start']
                     }
                 })
         
@@ -288,13 +419,42 @@ class SacredLibraryBuilder:
             self.stats['errors'].append(f"Pinecone upload failed: {e}")
             return 0
     
-    def process_pdf_file(self, pdf_path: Path, language: str, book_series: str) -> bool:
-        """Process a single PDF file through the complete pipeline"""
+    def delete_chunks(self, chunk_ids: List[str]) -> List[str]:
+        """Remove previously uploaded chunks from Supabase and Pinecone
+
+        Returns the ids whose batch failed, so they can be retried later.
+        """
+        failed = []
+        batch_size = 100
+        
+        for i in range(0, len(chunk_ids), batch_size):
+            batch = chunk_ids[i:i + batch_size]
+            try:
+                self.supabase.table('hylozoics_sacred_quotes').delete().in_('quote_id', batch).execute()
+                self.pinecone_index.delete(ids=batch)
+            except Exception as e:
+                print(f"      ❌ Chunk deletion failed: {e}")
+                self.stats['errors'].append(f"Chunk deletion failed for batch {i}: {e}")
+                failed.extend(batch)
+        
+        self.stats['chunks_deleted'] += len(chunk_ids) - len(failed)
+        return failed
+    
+    def process_pdf_file(self, pdf_path: Path, language: str, book_series: str,
+                         pages: Optional[Iterable[PdfPage]] = None, manifest_key: Optional[str] = None,
+                         content_hash: Optional[str] = None) -> bool:
+        """Process a single PDF file through the complete pipeline
+
+        `pages` streams in from the extraction workers when the caller runs
+        them; chunking consumes it page by page. With `manifest_key` the file
+        is checkpointed in the build manifest before and after its uploads.
+        """
         print(f"  📚 Processing: {pdf_path.name}")
         
         try:
-            # Create file metadata
-            file_id = hashlib.md5(str(pdf_path).encode()).hexdigest()[:12]
+            # IDs derive from the file contents, so moving a PDF keeps its chunk ids
+            content_hash = content_hash or file_content_hash(pdf_path)
+            file_id = content_hash[:12]
             metadata = {
                 'file_id': file_id,
                 'file_path': str(pdf_path),
@@ -305,23 +465,24 @@ class SacredLibraryBuilder:
                 'processed_date': datetime.now().isoformat()
             }
             
-            # Extract text
-            text = self.extract_text_from_pdf(pdf_path)
-            if not text or len(text) < 100:
-                print(f"    ❌ No meaningful text extracted")
-                return False
-            
-            # Clean text
-            text = self.clean_text(text)
-            
-            # Create chunks
-            chunks = self.create_text_chunks(text, metadata)
+            # Extract and chunk page by page
+            if pages is None:
+                pages = self.extract_pages_from_pdf(pdf_path)
+            chunks = self.create_text_chunks(pages, metadata)
             if not chunks:
-                print(f"    ❌ No chunks created")
+                print(f"    ❌ No meaningful text extracted")
+                if manifest_key:
+                    # Record it with no chunks so the next run skips it until the file changes
+                    self.manifest.mark_in_progress(manifest_key, pdf_path, content_hash, [])
+                    self.manifest.mark_complete(manifest_key)
                 return False
             
             print(f"    📝 Created {len(chunks)} text chunks")
             
+            if manifest_key:
+                self.manifest.mark_in_progress(manifest_key, pdf_path, content_hash,
+                                               [chunk['chunk_id'] for chunk in chunks])
+            
             # Create embeddings
             embedded_chunks = self.create_embeddings(chunks)
             
@@ -329,6 +490,12 @@ class SacredLibraryBuilder:
             supabase_count = self.upload_to_supabase(embedded_chunks)
             pinecone_count = self.upload_to_pinecone(embedded_chunks)
             
+            if manifest_key:
+                if supabase_count == len(chunks) and pinecone_count == len(chunks):
+                    self.manifest.mark_complete(manifest_key)
+                else:
+                    print(f"    ⚠️  Partial upload - will be redone on the next run")
+            
             self.stats['pdfs_processed'] += 1
             self.stats['chunks_created'] += len(chunks)
             
@@ -340,8 +507,14 @@ class SacredLibraryBuilder:
             self.stats['errors'].append(f"Processing failed: {pdf_path} - {e}")
             return False
     
-    def process_language_collection(self, language_dir: Path) -> Dict:
-        """Process all PDFs in a language directory"""
+    def process_language_collection(self, language_dir: Path,
+                                    pdf_files: Optional[List[Path]] = None,
+                                    collection_dir: Optional[Path] = None,
+                                    content_hashes: Optional[Dict[str, str]] = None) -> Dict:
+        """Process PDFs in a language directory (all of them unless `pdf_files` is given)
+
+        With `collection_dir` each file is checkpointed in the build manifest.
+        """
         language = language_dir.name
         print(f"\n🌐 Processing {language}")
         print("=" * 50)
@@ -355,34 +528,117 @@ class SacredLibraryBuilder:
         }
         
         # Find all PDF files
-        pdf_files = list(language_dir.rglob("*.pdf"))
+        if pdf_files is None:
+            pdf_files = list(language_dir.rglob("*.pdf"))
         language_stats['pdfs_found'] = len(pdf_files)
+        content_hashes = content_hashes or {}
         
         print(f"📁 Found {len(pdf_files)} PDF files")
         
-        # Process each PDF
-        for pdf_path in pdf_files:
-            # Determine book series from directory structure
-            book_series = "Unknown Series"
-            for series_key, series_name in self.series_map.items():
-                if series_key.lower() in str(pdf_path).lower():
-                    book_series = series_name
-                    break
+        pages_before = self.stats['pages_extracted']
+        build_start = time.perf_counter()
+        
+        # Pages are extracted in worker processes (large PDFs split into page
+        # batches) while chunking, embedding and uploads run here
+        for pdf_path, pages in iter_pdf_documents(pdf_files, workers=self.extraction_workers):
+            book_series = self.detect_book_series(pdf_path)
             
             # Track by series
             if book_series not in language_stats['books_by_series']:
                 language_stats['books_by_series'][book_series] = 0
             
             # Process the PDF
-            if self.process_pdf_file(pdf_path, language, book_series):
+            manifest_key = str(pdf_path.relative_to(collection_dir)) if collection_dir else None
+            if self.process_pdf_file(pdf_path, language, book_series, pages=self.track_pages(pages, pdf_path),
+                                     manifest_key=manifest_key,
+                                     content_hash=content_hashes.get(manifest_key)):
                 language_stats['pdfs_processed'] += 1
                 language_stats['books_by_series'][book_series] += 1
         
-        print(f"✅ {language} complete: {language_stats['pdfs_processed']}/{language_stats['pdfs_found']} PDFs processed")
+        elapsed = time.perf_counter() - build_start
+        pages = self.stats['pages_extracted'] - pages_before
+        self.stats['build_seconds'] += elapsed
+        language_stats['pages_extracted'] = pages
+        # End-to-end rate: extraction, chunking, embedding and uploads together
+        language_stats['pages_per_second'] = round(pages / elapsed, 1) if elapsed else 0.0
+        
+        print(f"✅ {language} complete: {language_stats['pdfs_processed']}/{language_stats['pdfs_found']} PDFs processed "
+              f"({pages} pages, {language_stats['pages_per_second']} pages/sec end-to-end)")
         return language_stats
     
-    def run_complete_build(self, collection_dir: Path = Path("laurency_ultimate")):
-        """Run the complete Sacred Library build process"""
+    def detect_book_series(self, pdf_path: Path) -> str:
+        """Determine book series from directory structure"""
+        for series_key, series_name in self.series_map.items():
+            if series_key.lower() in str(pdf_path).lower():
+                return series_name
+        return "Unknown Series"
+    
+    def plan_build(self, collection_dir: Path) -> Dict:
+        """Compare the collection against the build manifest
+
+        Returns the manifest keys that are new, changed (including
+        unfinished uploads from an interrupted run), moved, unchanged and
+        removed, plus their content hashes.
+        """
+        plan = {'new': [], 'changed': [], 'moved': {}, 'unchanged': [], 'removed': [], 'hashes': {}}
+        
+        language_dirs = [d for d in collection_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+        current = {}
+        for lang_dir in language_dirs:
+            for pdf_path in lang_dir.rglob("*.pdf"):
+                key = str(pdf_path.relative_to(collection_dir))
+                current[key] = self.manifest.content_hash(key, pdf_path)
+        plan['hashes'] = current
+        
+        previous = {} if self.manifest.params_changed else self.manifest.files
+        missing = {key: entry for key, entry in self.manifest.files.items() if key not in current}
+        missing_by_hash = {entry['content_hash']: key for key, entry in missing.items()
+                           if entry.get('complete') and not self.manifest.params_changed}
+        seen_hashes = {}
+        
+        for key, content_hash in sorted(current.items()):
+            entry = previous.get(key)
+            if content_hash in seen_hashes:
+                # Identical copy of a file already in this build - same chunk ids, skip it
+                plan['unchanged'].append(key)
+            elif entry and entry['content_hash'] == content_hash and entry.get('complete'):
+                plan['unchanged'].append(key)
+            elif key in self.manifest.files:
+                plan['changed'].append(key)
+            elif content_hash in missing_by_hash:
+                plan['moved'][missing_by_hash.pop(content_hash)] = key
+            else:
+                plan['new'].append(key)
+            seen_hashes[content_hash] = key
+        
+        moved_from = set(plan['moved'])
+        plan['removed'] = sorted(key for key in missing if key not in moved_from)
+        return plan
+    
+    def print_plan(self, plan: Dict):
+        """Print what a build would do, without touching anything"""
+        if self.manifest.params_changed:
+            print("⚠️  Chunking/embedding parameters changed - every PDF will be rebuilt")
+        
+        print(f"\n📋 Build plan:")
+        print(f"  ➕ New:       {len(plan['new'])}")
+        print(f"  🔄 Changed:   {len(plan['changed'])}")
+        print(f"  🚚 Moved:     {len(plan['moved'])}")
+        print(f"  🗑️  Removed:   {len(plan['removed'])}")
+        print(f"  ✅ Unchanged: {len(plan['unchanged'])}")
+        
+        for key in plan['new']:
+            print(f"  + {key}")
+        for key in plan['changed']:
+            print(f"  ~ {key}")
+        for old_key, new_key in plan['moved'].items():
+            print(f"  > {old_key} -> {new_key}")
+        for key in plan['removed']:
+            chunk_count = len(self.manifest.files[key].get('chunk_ids', []))
+            print(f"  - {key} ({chunk_count} chunks)")
+    
+    def run_complete_build(self, collection_dir: Path = Path("laurency_ultimate"), dry_run: bool = False):
+        """Run the Sacred Library build, only touching PDFs that changed since the last run"""
         print("🏛️  SACRED LIBRARY BUILDER")
         print("=" * 60)
         print("🎯 Building dual-mode Sacred Library from complete Hylozoics collection")
@@ -390,24 +646,70 @@ class SacredLibraryBuilder:
         
         start_time = datetime.now()
         
-        # Find all language directories
-        language_dirs = [d for d in collection_dir.iterdir() if d.is_dir() and not d.name.startswith('.')]
+        plan = self.plan_build(collection_dir)
+        self.print_plan(plan)
         
-        print(f"\n🌍 Found {len(language_dirs)} language collections:")
-        for lang_dir in language_dirs:
-            pdf_count = len(list(lang_dir.rglob("*.pdf")))
-            print(f"  📚 {lang_dir.name}: {pdf_count} PDFs")
+        if dry_run:
+            print("\n🔍 Dry run - nothing extracted, uploaded or deleted")
+            return plan
+        
+        # Moved files keep their chunk ids; only the manifest entry follows them
+        for old_key, new_key in plan['moved'].items():
+            self.manifest.files[new_key] = self.manifest.files.pop(old_key)
+        if plan['moved']:
+            self.manifest.save()
+        
+        # Retry deletions that failed in earlier runs, sparing chunks the entry uses now
+        rebuilding = set(plan['removed'] + plan['changed'])
+        for key, entry in list(self.manifest.files.items()):
+            if key in rebuilding or not entry.get('stale_chunk_ids'):
+                continue
+            current_ids = set(entry.get('chunk_ids', []))
+            stale_ids = [chunk_id for chunk_id in entry['stale_chunk_ids'] if chunk_id not in current_ids]
+            print(f"🗑️  Retrying deletion of {len(stale_ids)} stale chunks for {key}")
+            self.manifest.set_stale_chunks(key, self.delete_chunks(stale_ids))
+        
+        # Drop chunks of removed PDFs, and stale chunks of changed ones before rebuilding.
+        # Ids whose deletion fails stay in the manifest entry so the next run retries them.
+        for key in plan['removed'] + plan['changed']:
+            entry = self.manifest.files[key]
+            chunk_ids = list(dict.fromkeys(entry.get('chunk_ids', []) + entry.get('stale_chunk_ids', [])))
+            print(f"🗑️  Deleting {len(chunk_ids)} stale chunks for {key}")
+            failed = self.delete_chunks(chunk_ids)
+            if not failed:
+                self.manifest.remove(key)
+            elif key in plan['removed']:
+                # Still missing on the next run, so it is planned as removed again
+                entry.update({'chunk_ids': failed, 'complete': False})
+                self.manifest.set_stale_chunks(key, [])
+            else:
+                entry['complete'] = False
+                self.manifest.set_stale_chunks(key, failed)
+        self.stats['pdfs_removed'] += len(plan['removed'])
+        self.stats['pdfs_skipped'] += len(plan['unchanged']) + len(plan['moved'])
+        
+        # Group the PDFs to build by language directory
+        to_build: Dict[str, List[Path]] = {}
+        for key in sorted(plan['new'] + plan['changed']):
+            to_build.setdefault(Path(key).parts[0], []).append(collection_dir / key)
+        
+        print(f"\n🌍 {len(to_build)} language collections with PDFs to build:")
+        for language, pdf_files in to_build.items():
+            print(f"  📚 {language}: {len(pdf_files)} PDFs")
         
         # Process each language
         all_language_stats = []
         
-        for lang_dir in language_dirs:
+        for language, pdf_files in to_build.items():
             try:
-                lang_stats = self.process_language_collection(lang_dir)
+                lang_stats = self.process_language_collection(
+                    collection_dir / language, pdf_files=pdf_files,
+                    collection_dir=collection_dir, content_hashes=plan['hashes']
+                )
                 all_language_stats.append(lang_stats)
             except Exception as e:
-                print(f"❌ Failed to process {lang_dir.name}: {e}")
-                self.stats['errors'].append(f"Language processing failed: {lang_dir.name} - {e}")
+                print(f"❌ Failed to process {language}: {e}")
+                self.stats['errors'].append(f"Language processing failed: {language} - {e}")
         
         # Final summary
         end_time = datetime.now()
@@ -418,6 +720,13 @@ class SacredLibraryBuilder:
         print(f"⏱️  Total time: {duration}")
         print(f"🌐 Languages processed: {len(all_language_stats)}")
         print(f"📚 PDFs processed: {self.stats['pdfs_processed']}")
+        print(f"⏭️  PDFs unchanged: {self.stats['pdfs_skipped']}")
+        print(f"🗑️  PDFs removed: {self.stats['pdfs_removed']} ({self.stats['chunks_deleted']} chunks deleted)")
+        pages_per_second = (self.stats['pages_extracted'] / self.stats['build_seconds']
+                            if self.stats['build_seconds'] else 0.0)
+        print(f"📄 Pages extracted: {self.stats['pages_extracted']} "
+              f"({pages_per_second:.1f} pages/sec end-to-end incl. embedding and uploads, "
+              f"{self.stats['extraction_wait_seconds']:.1f}s waiting on extraction)")
         print(f"📝 Text chunks created: {self.stats['chunks_created']}")
         print(f"🧠 Embeddings created: {self.stats['embeddings_created']}")
         print(f"🏛️  Sacred quotes uploaded: {self.stats['quotes_uploaded']}")
@@ -435,23 +744,46 @@ class SacredLibraryBuilder:
             'language_stats': all_language_stats
         }
         
-        report_file = Path("SACRED_LIBRARY_BUILD_REPORT.json")
+        report_file = self.manifest.path.parent / BUILD_REPORT_FILE
+        report_file.parent.mkdir(parents=True, exist_ok=True)
         with open(report_file, 'w') as f:
             json.dump(report, f, indent=2)
         
         print(f"📋 Detailed report saved: {report_file}")
         print(f"🏛️  Your Sacred Library is ready for queries!")
+        return plan
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build the Sacred Library (incremental)")
+    parser.add_argument("--collection-dir", default="laurency_ultimate")
+    parser.add_argument("--manifest", default=str(BUILD_MANIFEST_FILE),
+                        help="Build manifest path; the build report is written next to it")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only print which PDFs would be built, moved or removed")
+    args = parser.parse_args()
+    
     # Check for required environment variables
     required_vars = ['OPENAI_API_KEY', 'SUPABASE_URL', 'SUPABASE_ANON_KEY', 'PINECONE_API_KEY', 'PINECONE_ENV']
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
-    if missing_vars:
+    if missing_vars and not args.dry_run:
         print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
         print("Please set these in your environment before running.")
         exit(1)
     
+    # Earlier versions kept the manifest in the working directory
+    legacy_manifest = Path(BUILD_MANIFEST_FILE.name)
+    manifest_path = Path(args.manifest)
+    if legacy_manifest.exists() and not manifest_path.exists():
+        if args.dry_run:
+            manifest_path = legacy_manifest
+        else:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(legacy_manifest, manifest_path)
+            print(f"📦 Moved build manifest to {manifest_path}")
+    
     # Build Sacred Library
-    builder = SacredLibraryBuilder()
-    builder.run_complete_build()
+    builder = SacredLibraryBuilder(connect=not args.dry_run, manifest_path=manifest_path)
+    builder.run_complete_build(Path(args.collection_dir), dry_run=args.dry_run)
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Test the shared download engine against a local HTTP fixture server
+(no network): concurrent downloads, per-host limits, conditional GETs,
+range resume after an interrupted transfer, .part files answered with
+416, gzip-encoded bodies, and the persistent manifest.
+"""
+import sys
+import gzip
+import time
+import asyncio
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to Python path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.download_engine import DownloadEngine, DownloadJob
+
+
+class LaurencyFixtureServer(ThreadingHTTPServer):
+    """Serves in-memory files with ETag/Last-Modified, 304s and byte ranges"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.files = {}
+        # Paths whose next full response is cut off halfway through the body
+        self.interrupt = set()
+        # Paths served gzip-encoded even when the client asks for identity
+        self.gzip = set()
+        self.requests = []
+        self.bytes_sent = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def publish(self, path: str, body: bytes, modified: float = 1_600_000_000):
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self.files[path] = (body, etag, formatdate(modified, usegmt=True))
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests, self.bytes_sent, self.max_active = [], 0, 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, headers: dict, body: bytes = b"", cut_at: int = None):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        payload = body if cut_at is None else body[:cut_at]
+        self.wfile.write(payload)
+        with self.server.lock:
+            self.server.bytes_sent += len(payload)
+        if cut_at is not None:
+            self.wfile.flush()
+            self.close_connection = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.latency)
+            self._respond()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self):
+        server = self.server
+        if self.path not in server.files:
+            return self._send(404, {}, b"not found")
+        body, etag, last_modified = server.files[self.path]
+        validators = {"ETag": etag, "Last-Modified": last_modified}
+
+        if self.headers.get("If-None-Match") == etag or (
+                not self.headers.get("If-None-Match") and self.headers.get("If-Modified-Since") == last_modified):
+            return self._send(304, validators)
+
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (etag, last_modified):
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                return self._send(416, {"Content-Range": f"bytes */{len(body)}"})
+            return self._send(206, {**validators, "Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"},
+                              body[start:])
+
+        if self.path in server.gzip:
+            validators["Content-Encoding"] = "gzip"
+            body = gzip.compress(body)
+        cut_at = len(body) // 2 if self.path in server.interrupt else None
+        server.interrupt.discard(self.path)
+        self._send(200, validators, body, cut_at)
+
+
+def make_pdf(n: int) -> bytes:
+    return b"%PDF-1.4\n" + f"Laurency chapter {n}\n".encode() * (2000 + 37 * n)
+
+
+def chapter_jobs(server: LaurencyFixtureServer, target: Path, count: int):
+    return [DownloadJob(url=f"{server.url}/L1e/kl1_{n}.pdf", path=target / f"kl1_{n}.pdf") for n in range(1, count + 1)]
+
+
+async def test_fresh_and_conditional(server: LaurencyFixtureServer, workdir: Path) -> bool:
+    """First run downloads everything concurrently; a re-run only revalidates"""
+    print("\n📥 Testing fresh download and conditional re-run...")
+    for n in range(1, 13):
+        server.publish(f"/L1e/kl1_{n}.pdf", make_pdf(n))
+    target, manifest = workdir / "fresh", workdir / "fresh_manifest.json"
+
+    server.latency = 0.05
+    server.reset_stats()
+    start = time.perf_counter()
+    results = await DownloadEngine(manifest, max_concurrency=8, per_host_limit=4).download_all(
+        chapter_jobs(server, target, 12))
+    elapsed = time.perf_counter() - start
+
+    if [r.status for r in results] != ["downloaded"] * 12:
+        print(f"❌ Unexpected statuses: {[r.status for r in results]}")
+        return False
+    if any(r.job.path.read_bytes() != make_pdf(n) for n, r in enumerate(results, 1)):
+        print("❌ Downloaded content differs from the server's")
+        return False
+    if server.max_active > 4:
+        print(f"❌ Per-host limit exceeded: {server.max_active} concurrent requests")
+        return False
+    print(f"✅ 12 PDFs in {elapsed:.2f}s (sequential would be ≥{12 * server.latency:.2f}s), "
+          f"max {server.max_active} concurrent")
+
+    server.reset_stats()
+    results = await DownloadEngine(manifest).download_all(chapter_jobs(server, target, 12))
+    if [r.status for r in results] != ["not_modified"] * 12 or server.bytes_sent:
+        print(f"❌ Re-run transferred {server.bytes_sent} bytes: {[r.status for r in results]}")
+        return False
+    if not all("If-None-Match" in headers for _, headers in server.requests):
+        print("❌ Re-run requests were not conditional")
+        return False
+    print("✅ Re-run: 12 × 304 Not Modified, 0 body bytes")
+
+    server.publish("/L1e/kl1_3.pdf", make_pdf(3) + b"revised\n")
+    results = await DownloadEngine(manifest).download_all(chapter_jobs(server, target, 12))
+    changed = [r.job.path.name for r in results if r.status == "downloaded"]
+    if changed != ["kl1_3.pdf"] or not results[2].job.path.read_bytes().endswith(b"revised\n"):
+        print(f"❌ Changed file not picked up: {changed}")
+        return False
+    print("✅ Only the changed PDF was downloaded again")
+    return True
+
+
+async def test_resume(server: LaurencyFixtureServer, workdir: Path) -> bool:
+    """An interrupted transfer continues with a Range request on the next run"""
+    print("\n⏯️  Testing range resume...")
+    body = make_pdf(99) * 5
+    server.publish("/Fke/Fke.pdf", body)
+    server.latency = 0
+    manifest = workdir / "resume_manifest.json"
+    job = DownloadJob(url=f"{server.url}/Fke/Fke.pdf", path=workdir / "resume" / "Fke.pdf")
+
+    server.interrupt.add("/Fke/Fke.pdf")
+    results = await DownloadEngine(manifest, max_retries=0).download_all([job])
+    part = job.path.with_name("Fke.pdf.part")
+    if results[0].status != "failed" or not part.exists() or job.path.exists():
+        print(f"❌ Interrupted transfer should leave only a .part file ({results[0].status})")
+        return False
+    kept = part.stat().st_size
+    print(f"✅ Interrupted run kept {kept:,} of {len(body):,} bytes")
+
+    server.reset_stats()
+    results = await DownloadEngine(manifest).download_all([job])
+    range_header = server.requests[0][1].get("Range")
+    if results[0].status != "resumed" or job.path.read_bytes() != body or part.exists():
+        print(f"❌ Resume failed: {results[0].status}")
+        return False
+    if results[0].bytes_transferred != len(body) - kept:
+        print(f"❌ Resume transferred {results[0].bytes_transferred} bytes")
+        return False
+    print(f"✅ Resumed with '{range_header}', transferred {results[0].bytes_transferred:,} bytes")
+    return True
+
+
+async def test_unsatisfiable_range(server: LaurencyFixtureServer, workdir: Path) -> bool:
+    """A .part file answered with 416 is finalised if complete, otherwise restarted"""
+    print("\n🧩 Testing 416 on resume...")
+    body = make_pdf(42)
+    server.publish("/L3e/kl3_1.pdf", body)
+    _, etag, last_modified = server.files["/L3e/kl3_1.pdf"]
+    server.latency = 0
+    manifest = workdir / "range_manifest.json"
+    job = DownloadJob(url=f"{server.url}/L3e/kl3_1.pdf", path=workdir / "range" / "kl3_1.pdf")
+    part = job.path.with_name("kl3_1.pdf.part")
+    part.parent.mkdir(parents=True)
+
+    for label, part_body, expected_status in [
+        ("complete .part", body, "resumed"),
+        ("stale .part", body + b"bytes from an older revision\n", "downloaded"),
+    ]:
+        engine = DownloadEngine(manifest, retry_backoff=0)
+        engine.manifest.update(job.url, path=str(job.path), etag=etag, last_modified=last_modified, complete=False)
+        engine.manifest.save()
+        job.path.unlink(missing_ok=True)
+        part.write_bytes(part_body)
+
+        server.reset_stats()
+        results = await DownloadEngine(manifest, retry_backoff=0).download_all([job])
+        if results[0].status != expected_status or job.path.read_bytes() != body or part.exists():
+            print(f"❌ {label}: {results[0].status} {results[0].error}")
+            return False
+        if not DownloadEngine(manifest).manifest.get(job.url).get("complete"):
+            print(f"❌ {label}: manifest entry not marked complete")
+            return False
+        print(f"✅ {label}: {results[0].status} after {len(server.requests)} request(s)")
+    return True
+
+
+async def test_gzip_encoding(server: LaurencyFixtureServer, workdir: Path) -> bool:
+    """Bodies the server compresses despite Accept-Encoding: identity are decoded and kept"""
+    print("\n🗜️  Testing gzip-encoded responses...")
+    body = make_pdf(7) * 3
+    server.publish("/L4e/kl4_1.pdf", body)
+    server.gzip.add("/L4e/kl4_1.pdf")
+    server.latency = 0
+    job = DownloadJob(url=f"{server.url}/L4e/kl4_1.pdf", path=workdir / "gzip" / "kl4_1.pdf")
+
+    server.reset_stats()
+    results = await DownloadEngine(workdir / "gzip_manifest.json", retry_backoff=0).download_all([job])
+    if results[0].status != "downloaded" or job.path.read_bytes() != body:
+        print(f"❌ gzip download: {results[0].status} {results[0].error}")
+        return False
+    if server.requests[0][1].get("Accept-Encoding") != "identity":
+        print("❌ Download did not ask for identity encoding")
+        return False
+    print(f"✅ {server.bytes_sent:,} gzip bytes on the wire, {len(body):,} bytes saved")
+
+    server.interrupt.add("/L4e/kl4_1.pdf")
+    job.path.unlink()
+    results = await DownloadEngine(workdir / "gzip_interrupted.json", max_retries=0).download_all([job])
+    if results[0].status != "failed" or job.path.with_name("kl4_1.pdf.part").exists():
+        print("❌ Interrupted gzip transfer should fail without keeping a .part file")
+        return False
+    print("✅ Interrupted gzip transfer dropped its .part file")
+    return True
+
+
+async def test_existing_and_missing(server: LaurencyFixtureServer, workdir: Path) -> bool:
+    """Files from before the manifest are kept; missing URLs fail without retries"""
+    print("\n📂 Testing pre-existing files and missing URLs...")
+    server.publish("/L2e/kl2_1.pdf", make_pdf(1))
+    existing = workdir / "existing" / "kl2_1.pdf"
+    existing.parent.mkdir(parents=True)
+    existing.write_bytes(b"downloaded by an older harvester")
+
+    server.reset_stats()
+    engine = DownloadEngine(workdir / "existing_manifest.json", retry_backoff=0)
+    results = await engine.download_all([
+        DownloadJob(url=f"{server.url}/L2e/kl2_1.pdf", path=existing),
+        DownloadJob(url=f"{server.url}/missing.pdf", path=workdir / "existing" / "missing.pdf"),
+    ])
+    if [r.status for r in results] != ["existing", "failed"] or len(server.requests) != 1:
+        print(f"❌ Unexpected: {[r.status for r in results]}, {len(server.requests)} requests")
+        return False
+    print("✅ Pre-existing file kept without a request; 404 failed after one attempt")
+
+    server.publish("/side.htm", "<option value='kl1.htm'>Kunskap om verkligheten</option>".encode())
+    pages = await engine.fetch_pages([f"{server.url}/side.htm", f"{server.url}/nope.htm"])
+    if "verkligheten" not in pages[f"{server.url}/side.htm"].text or pages[f"{server.url}/nope.htm"] is not None:
+        print("❌ fetch_pages returned unexpected results")
+        return False
+    print("✅ fetch_pages: page text returned, missing page is None")
+    return True
+
+
+async def main():
+    print("\n" + "=" * 60)
+    print("🧪 DOWNLOAD ENGINE TESTING")
+    print("=" * 60)
+    print("Local fixture server - no network needed")
+
+    server = LaurencyFixtureServer()
+    tests = [
+        ("Fresh + Conditional Downloads", test_fresh_and_conditional),
+        ("Range Resume", test_resume),
+        ("416 on Resume", test_unsatisfiable_range),
+        ("Gzip Encoding", test_gzip_encoding),
+        ("Existing Files + Page Fetch", test_existing_and_missing),
+    ]
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for test_name, test_func in tests:
+            print(f"\n▶️  {test_name}...")
+            if not await test_func(server, Path(workdir)):
+                all_passed = False
+                break
+    server.shutdown()
+
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✅ ALL TESTS PASSED!")
+    else:
+        print("❌ SOME TESTS FAILED")
+    print("=" * 60)
+    return all_passed
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(0 if asyncio.run(main()) else 1)
+    except KeyboardInterrupt:
+        print("\n● Testing stopped by user")
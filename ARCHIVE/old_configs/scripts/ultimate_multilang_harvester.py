@@ -7,24 +7,26 @@ The definitive script to discover and download ALL Hylozoics content
 in ALL available languages by properly parsing navigation menus
 """
 
-import requests
+import sys
 from bs4 import BeautifulSoup
 import urllib.parse
 from pathlib import Path
 import json
 import os
 from datetime import datetime
-import time
 import re
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.download_engine import DownloadEngine, DownloadJob, print_progress, summarize_results
+
 class UltimateMultiLangHarvester:
     def __init__(self, output_dir: str = "laurency_ultimate"):
         self.base_url = "https://www.laurency.com"
         self.output_dir = Path(output_dir)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Pooled concurrent client; the manifest lets re-runs skip unchanged PDFs
+        self.engine = DownloadEngine(self.output_dir / "download_manifest.json")
         
         # Language configurations
         self.languages = {
@@ -110,10 +112,10 @@ class UltimateMultiLangHarvester:
         try:
             # Get navigation frame
             nav_url = f"{self.base_url}/{lang_info['nav_frame']}"
-            response = self.session.get(nav_url, timeout=15)
+            response = self.engine.fetch_pages_sync([nav_url])[nav_url]
             
-            if response.status_code != 200:
-                print(f"  ❌ Navigation not accessible: {response.status_code}")
+            if response is None:
+                print(f"  ❌ Navigation not accessible")
                 return None
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -123,6 +125,7 @@ class UltimateMultiLangHarvester:
             
             books = []
             dictionaries = []
+            toc_pages = []
             
             print(f"  🔍 Found {len(options)} navigation options")
             
@@ -164,13 +167,17 @@ class UltimateMultiLangHarvester:
                     len(text) > 5):  # Meaningful title
                     
                     # This could be a book TOC - explore it
-                    toc_url = urllib.parse.urljoin(nav_url, value)
-                    book_pdfs = self.discover_book_pdfs(toc_url, text, lang_info['path'])
-                    if book_pdfs:
-                        books.extend(book_pdfs)
-                        print(f"  📚 Book Series: {text} ({len(book_pdfs)} chapters)")
-                    else:
-                        print(f"  🔍 Checked: {text} (no PDFs found)")
+                    toc_pages.append((urllib.parse.urljoin(nav_url, value), text))
+            
+            # Fetch all table of contents pages of the language concurrently
+            toc_responses = self.engine.fetch_pages_sync(toc_url for toc_url, _ in toc_pages)
+            for toc_url, text in toc_pages:
+                book_pdfs = self.discover_book_pdfs(toc_responses[toc_url], toc_url, text, lang_info['path'])
+                if book_pdfs:
+                    books.extend(book_pdfs)
+                    print(f"  📚 Book Series: {text} ({len(book_pdfs)} chapters)")
+                else:
+                    print(f"  🔍 Checked: {text} (no PDFs found)")
             
             language_content = {
                 'language_code': lang_code,
@@ -188,12 +195,11 @@ class UltimateMultiLangHarvester:
             print(f"  💥 Error discovering {lang_info['name']}: {e}")
             return None
     
-    def discover_book_pdfs(self, toc_url: str, series_title: str, lang_path: str):
-        """Discover PDF files from a table of contents page"""
+    def discover_book_pdfs(self, response, toc_url: str, series_title: str, lang_path: str):
+        """Discover PDF files from a fetched table of contents page"""
         try:
             print(f"    🔍 Exploring: {series_title}")
-            response = self.session.get(toc_url, timeout=10)
-            if response.status_code != 200:
+            if response is None:
                 return []
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -254,6 +260,7 @@ class UltimateMultiLangHarvester:
             books_dir.mkdir(exist_ok=True)
             
             # Group books by series
+            jobs = []
             series_groups = {}
             for book in content['books']:
                 series = book['series']
@@ -267,45 +274,46 @@ class UltimateMultiLangHarvester:
                 series_dir = books_dir / safe_series
                 series_dir.mkdir(exist_ok=True)
                 
-                print(f"  📚 Downloading {series} ({len(books)} chapters)")
-                
-                for i, book in enumerate(books, 1):
-                    try:
-                        print(f"    📄 {i:2d}/{len(books)} {book['title']}")
-                        response = self.session.get(book['url'], timeout=30)
-                        response.raise_for_status()
-                        
-                        # Save PDF
-                        pdf_file = series_dir / book['filename']
-                        with open(pdf_file, 'wb') as f:
-                            f.write(response.content)
-                        
-                        downloaded_files.append({
-                            'type': 'book',
-                            'series': series,
-                            'title': book['title'],
-                            'filename': book['filename'],
-                            'path': str(pdf_file),
-                            'size': len(response.content),
-                            'url': book['url']
-                        })
-                        
-                        # Respectful delay
-                        time.sleep(0.5)
-                        
-                    except Exception as e:
-                        print(f"    ❌ Failed: {book['title']} - {e}")
+                print(f"  📚 {series} ({len(books)} chapters)")
+                for book in books:
+                    jobs.append(DownloadJob(url=book['url'], path=series_dir / book['filename'],
+                                            metadata={**book, 'series': series}))
+            
+            # All chapters of the language in one concurrent batch
+            results = self.engine.download_all_sync(jobs, progress=print_progress)
+            for result in results:
+                book = result.job.metadata
+                if not result.ok:
+                    print(f"    ❌ Failed: {book['title']} - {result.error}")
+                    continue
+                downloaded_files.append({
+                    'type': 'book',
+                    'series': book['series'],
+                    'title': book['title'],
+                    'filename': book['filename'],
+                    'path': str(result.job.path),
+                    'size': result.size,
+                    'url': book['url'],
+                    'status': result.status
+                })
+            
+            summary = summarize_results(results)
+            print(f"  📦 {summary.get('downloaded', 0)} new, {summary.get('resumed', 0)} resumed, "
+                  f"{summary.get('not_modified', 0) + summary.get('existing', 0)} unchanged, "
+                  f"{summary['bytes_transferred']:,} bytes transferred")
         
         # Download dictionaries
         if content['dictionaries']:
             dict_dir = lang_dir / "Dictionaries"
             dict_dir.mkdir(exist_ok=True)
             
+            dict_responses = self.engine.fetch_pages_sync(item['url'] for item in content['dictionaries'])
             for dict_item in content['dictionaries']:
                 try:
                     print(f"  📖 Downloading {dict_item['title']}")
-                    response = self.session.get(dict_item['url'], timeout=15)
-                    response.raise_for_status()
+                    response = dict_responses[dict_item['url']]
+                    if response is None:
+                        raise RuntimeError("page not available")
                     
                     # Save HTML dictionary
                     dict_file = dict_dir / f"dictionary_{lang_code}.html"
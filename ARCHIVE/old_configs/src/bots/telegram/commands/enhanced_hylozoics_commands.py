@@ -225,6 +225,8 @@ class EnhancedHylozoicsCommands:
             await self._show_study_progress(query)
         elif data == "hyl_about_enhanced":
             await self._show_about_enhanced(query)
+        elif data == "hyl_insight_stats":
+            await self._show_insight_stats(query)
         elif data.startswith("hyl_reask_"):
             await self._handle_reask(query, data)
         elif data.startswith("hyl_cross_compare_"):
@@ -456,12 +458,47 @@ This system combines the authenticity of sacred text preservation with the power
             [InlineKeyboardButton("🎯 Try Dual Mode", callback_data="hyl_ask_dual")],
             [InlineKeyboardButton("🏛️ Sacred Only Mode", callback_data="hyl_ask_sacred")],
             [InlineKeyboardButton("🔍 Vector Only Mode", callback_data="hyl_ask_vector")],
+            [InlineKeyboardButton("📈 Insight Cache Stats", callback_data="hyl_insight_stats")],
             [InlineKeyboardButton("← Back to Library", callback_data="hyl_main")]
         ]
         
         reply_markup = InlineKeyboardMarkup(keyboard)
         await query.edit_message_text(about_text, reply_markup=reply_markup, parse_mode='Markdown')
     
+    def _format_insight_stats(self) -> str:
+        """Vector insight cache hit rate and generation latency"""
+        stats = self.library.get_insight_stats()
+        
+        top_quotes = "\n".join(f"• `{quote_id}` - {hits} requests" for quote_id, hits in stats["top_quotes"])
+        
+        return f"""◆ Vector Insight Cache ◆
+
+📊 **Requests:** {stats['requests']}
+• Cache hits: {stats['cache_hits']}
+• Shared in-flight: {stats['shared_inflight']}
+• Hit rate: {stats['hit_rate']:.0%}
+
+⏱️ **Generation:**
+• Generated: {stats['generated']} ({stats['precomputed']} precomputed)
+• Failures: {stats['failures']}
+• Latency p50: {stats['generation_p50_ms']:.0f} ms
+• Latency p95: {stats['generation_p95_ms']:.0f} ms
+
+🗂️ **Cache:** {stats['cache_size']} insights, {stats['tracked_keys']} tracked questions
+
+🔥 **Most Requested Quotes:**
+{top_quotes or "• None yet"}"""
+    
+    async def _show_insight_stats(self, query):
+        """Show vector insight cache metrics"""
+        keyboard = [
+            [InlineKeyboardButton("🔄 Refresh", callback_data="hyl_insight_stats")],
+            [InlineKeyboardButton("← Back to Library", callback_data="hyl_main")]
+        ]
+        
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await query.edit_message_text(self._format_insight_stats(), reply_markup=reply_markup, parse_mode='Markdown')
+    
     def _split_response(self, response: str, max_length: int = 4000) -> List[str]:
         """Split long responses into multiple messages"""
         if len(response) <= max_length:
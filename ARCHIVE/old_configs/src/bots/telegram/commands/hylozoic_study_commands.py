@@ -17,10 +17,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from database.operations import db
 from core.ai_engine import BecomingOneAI
+from core.sacred_library_catalog import get_browse_catalog, STUDY_TOPICS
 
 # Initialize AI engine for study sessions
 study_ai = BecomingOneAI()
 
+# Random quotes and topic pages come from the in-memory browse catalog
+browse_catalog = get_browse_catalog()
+TOPIC_QUOTES_PER_PAGE = 3
+
 async def enter_hylozoic_study_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Enter Hylozoic Study Room - focused learning mode"""
     user = update.effective_user
@@ -92,8 +97,9 @@ async def hylozoic_study_callback_handler(update: Update, context: ContextTypes.
         elif action == "study_exit":
             await handle_exit_study(query, context)
         elif action.startswith("study_topic_"):
-            topic = action.replace("study_topic_", "")
-            await handle_topic_study(query, context, topic)
+            # study_topic_<topic> or study_topic_<topic>_p<page>
+            topic, _, page = action.replace("study_topic_", "").partition("_p")
+            await handle_topic_study(query, context, topic, int(page or 0))
         
     except Exception as e:
         logger.error(f"Error handling study callback: {e}")
@@ -159,15 +165,10 @@ Type your question now...""",
 async def handle_random_quote(query, context):
     """Provide a random Hylozoic quote"""
     try:
-        # Get a random quote from Sacred Library
-        result = db.client.table('teaching_materials').select(
-            'content, title, metadata'
-        ).eq(
-            'material_type', 'sacred_quote'
-        ).limit(1).execute()
+        # Next quote on this chat's walk through the shuffled ring
+        quote = browse_catalog.random_quote(str(query.message.chat_id))
         
-        if result.data:
-            quote = result.data[0]
+        if quote:
             content = quote['content']
             chapter = quote['metadata'].get('chapter', 'Unknown')
             language = quote['metadata'].get('language', 'unknown')
@@ -255,32 +256,22 @@ Continue your journey of understanding! 🏛️""",
         parse_mode='Markdown'
     )
 
-async def handle_topic_study(query, context, topic):
-    """Handle specific topic study"""
-    # This would search for quotes related to the specific topic
-    # and present them in a structured way
-    
-    topic_searches = {
-        'consciousness': 'consciousness awareness mind',
-        'development': 'development evolution growth',
-        'mind': 'mind thinking thought mental',
-        'love': 'love emotion feeling heart',
-        'purpose': 'purpose will goal aim',
-        'energy': 'energy power force',
-        'reincarnation': 'reincarnation rebirth incarnation',
-        'cosmic': 'cosmic universe order law'
-    }
-    
-    search_term = topic_searches.get(topic, topic)
+async def handle_topic_study(query, context, topic, page=0):
+    """Handle specific topic study - pages through the topic's precomputed quotes"""
+    result = browse_catalog.topic_page(topic, page, TOPIC_QUOTES_PER_PAGE)
     
     try:
-        # Search Sacred Library for topic
-        quotes = await study_ai.search_sacred_library(search_term, limit=3)
+        if result.total:
+            quotes = result.items
+        else:
+            # Catalog unavailable - fall back to a live search
+            search_term = STUDY_TOPICS.get(topic, topic)
+            quotes = await study_ai.search_sacred_library(search_term, limit=3)
         
         if quotes:
             topic_message = f"📖 **STUDYING: {topic.upper()}**\n\nHere are authentic Hylozoic teachings on this topic:\n\n"
             
-            for i, quote in enumerate(quotes, 1):
+            for i, quote in enumerate(quotes, result.page * TOPIC_QUOTES_PER_PAGE + 1):
                 content = quote['content']
                 if len(content) > 200:
                     content = content[:200] + "..."
@@ -291,9 +282,11 @@ async def handle_topic_study(query, context, topic):
                 topic_message += f"**{i}. {chapter} ({language.upper()})**\n"
                 topic_message += f'"{content}"\n\n'
             
+            # "More Quotes" moves to the next page, wrapping back to the first
+            next_page = result.page + 1 if result.has_next else 0
             keyboard = [
                 [
-                    InlineKeyboardButton("🔍 More Quotes", callback_data=f"study_topic_{topic}"),
+                    InlineKeyboardButton("🔍 More Quotes", callback_data=f"study_topic_{topic}_p{next_page}"),
                     InlineKeyboardButton("💬 Ask Question", callback_data="study_ask_question")
                 ],
                 [
@@ -4,6 +4,7 @@ Access to Hylozoics Sacred Library through Telegram bot
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -15,12 +16,23 @@ import json
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from database.operations import SupabaseClient
+from core.sacred_library_catalog import get_browse_catalog, CatalogPage
+
+LANGUAGE_NAMES = {
+    'sv': "🇸🇪 Swedish",
+    'de': "🇩🇪 German",
+}
 
 class SacredLibraryCommands:
     """Telegram commands for Sacred Library access"""
     
+    QUOTES_PER_PAGE = 3
+    BOOKS_PER_PAGE = 10
+    
     def __init__(self):
         self.db = SupabaseClient()
+        # Browse menus page through the in-memory catalog - no DB round-trips
+        self.catalog = get_browse_catalog()
     
     async def sacred_search(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Search Sacred Library for quotes"""
@@ -128,13 +140,18 @@ class SacredLibraryCommands:
         await query.answer()
         
         try:
-            if query.data == "sacred_lang_sv":
-                await self._show_language_quotes(query, "sv", "🇸🇪 Swedish")
-            elif query.data == "sacred_lang_de":
-                await self._show_language_quotes(query, "de", "🇩🇪 German")
-            elif query.data == "sacred_books_all":
-                await self._show_all_books(query)
-            elif query.data == "sacred_search_help":
+            # Paged callbacks end in _p<page>
+            match = re.match(r"^(.*?)(?:_p(\d+))?$", query.data)
+            action, page = match.group(1), int(match.group(2) or 0)
+            
+            if action in ("sacred_lang_sv", "sacred_lang_de"):
+                language = action[-2:]
+                await self._show_language_quotes(query, language, LANGUAGE_NAMES[language], page)
+            elif action in ("sacred_books_all", "sacred_books"):
+                await self._show_all_books(query, page)
+            elif action.startswith("sacred_book_"):
+                await self._show_book_quotes(query, int(action[len("sacred_book_"):]), page)
+            elif action == "sacred_search_help":
                 await self._show_search_help(query)
                 
         except Exception as e:
@@ -143,69 +160,94 @@ class SacredLibraryCommands:
                 parse_mode='Markdown'
             )
     
-    async def _show_language_quotes(self, query, language: str, language_name: str):
-        """Show quotes for specific language"""
-        result = self.db.client.table('teaching_materials').select(
-            'content, title, metadata'
-        ).eq(
-            'material_type', 'sacred_quote'
-        ).eq(
-            'metadata->>language', language
-        ).limit(3).execute()
+    def _format_quotes(self, title: str, result: CatalogPage) -> str:
+        response = f"🏛️ **{title}**\n\n"
         
-        if not result.data:
-            await query.edit_message_text(
-                f"❌ No quotes found for {language_name}",
-                parse_mode='Markdown'
-            )
-            return
-        
-        response = f"🏛️ **{language_name} Sacred Library**\n\n"
-        
-        for i, quote in enumerate(result.data):
+        start = result.page * self.QUOTES_PER_PAGE
+        for i, quote in enumerate(result.items, start=start + 1):
             chapter = quote['metadata'].get('chapter', 'Unknown')
             content = quote['content']
             if len(content) > 150:
                 content = content[:150] + "..."
             
-            response += f"**{i+1}. {chapter}**\n"
+            response += f"**{i}. {chapter}**\n"
             response += f"💬 {content}\n\n"
         
-        response += f"🏛️ *Showing 3 of many {language_name} quotes*\n"
+        response += f"🏛️ *Page {result.page + 1} of {result.total_pages} ({result.total} quotes)*\n"
         response += "Use `/sacred <term>` to search for specific topics"
-        
-        await query.edit_message_text(response, parse_mode='Markdown')
+        return response
+    
+    def _page_buttons(self, prefix: str, result: CatalogPage) -> List[InlineKeyboardButton]:
+        buttons = []
+        if result.has_previous:
+            buttons.append(InlineKeyboardButton("◀️ Previous", callback_data=f"{prefix}_p{result.page - 1}"))
+        if result.has_next:
+            buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"{prefix}_p{result.page + 1}"))
+        return buttons
     
-    async def _show_all_books(self, query):
-        """Show available books/chapters"""
-        result = self.db.client.table('teaching_materials').select(
-            'metadata'
-        ).eq(
-            'material_type', 'sacred_quote'
-        ).limit(50).execute()
+    async def _show_language_quotes(self, query, language: str, language_name: str, page: int = 0):
+        """Show a page of quotes for a specific language"""
+        result = self.catalog.language_page(language, page, self.QUOTES_PER_PAGE)
         
-        chapters = set()
-        languages = set()
+        if not result.total:
+            await query.edit_message_text(
+                f"❌ No quotes found for {language_name}",
+                parse_mode='Markdown'
+            )
+            return
+        
+        keyboard = []
+        page_buttons = self._page_buttons(f"sacred_lang_{language}", result)
+        if page_buttons:
+            keyboard.append(page_buttons)
+        keyboard.append([InlineKeyboardButton("📚 All Books", callback_data="sacred_books_all")])
         
-        for record in result.data:
-            if 'chapter' in record['metadata']:
-                chapters.add(record['metadata']['chapter'])
-            if 'language' in record['metadata']:
-                languages.add(record['metadata']['language'])
+        await query.edit_message_text(
+            self._format_quotes(f"{language_name} Sacred Library", result),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode='Markdown'
+        )
+    
+    async def _show_all_books(self, query, page: int = 0):
+        """Show a page of available books/chapters"""
+        result = self.catalog.books_page(page, self.BOOKS_PER_PAGE)
         
         response = "📚 **Sacred Library Collection**\n\n"
-        response += f"🌐 **Languages:** {', '.join(sorted(languages))}\n\n"
-        response += f"📖 **Available Books/Chapters:**\n"
+        response += f"🌐 **Languages:** {', '.join(sorted(self.catalog.languages))}\n\n"
+        response += f"📖 **Available Books/Chapters** ({result.total}):\n"
         
-        for chapter in sorted(list(chapters))[:10]:  # Show first 10
-            response += f"• {chapter}\n"
+        keyboard = []
+        for book_number, name, count in result.items:
+            response += f"• {name} - {count} quotes\n"
+            keyboard.append([InlineKeyboardButton(f"📖 {name}", callback_data=f"sacred_book_{book_number}")])
         
-        if len(chapters) > 10:
-            response += f"• ... and {len(chapters) - 10} more\n"
+        page_buttons = self._page_buttons("sacred_books", result)
+        if page_buttons:
+            keyboard.append(page_buttons)
         
         response += "\n🔍 Use `/sacred <term>` to search specific content"
         
-        await query.edit_message_text(response, parse_mode='Markdown')
+        await query.edit_message_text(response, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    
+    async def _show_book_quotes(self, query, book_number: int, page: int = 0):
+        """Show a page of quotes from one book, in reading order"""
+        result = self.catalog.book_page(book_number, page, self.QUOTES_PER_PAGE)
+        
+        if not result.total:
+            await query.edit_message_text("❌ Book not found", parse_mode='Markdown')
+            return
+        
+        keyboard = []
+        page_buttons = self._page_buttons(f"sacred_book_{book_number}", result)
+        if page_buttons:
+            keyboard.append(page_buttons)
+        keyboard.append([InlineKeyboardButton("📚 All Books", callback_data="sacred_books_all")])
+        
+        await query.edit_message_text(
+            self._format_quotes(self.catalog.book_names[book_number], result),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+            parse_mode='Markdown'
+        )
     
     async def _show_search_help(self, query):
         """Show search help"""
@@ -215,7 +257,7 @@ class SacredLibraryCommands:
         response += "• `/sacred consciousness` - Search consciousness topics\n"
         response += "• `/sacred kunskap` - Swedish for 'knowledge'\n\n"
         response += "**Available content:**\n"
-        response += "• 4,871 authentic quotes\n"
+        response += f"• {len(self.catalog):,} authentic quotes\n"
         response += "• Swedish and German languages\n"
         response += "• Multiple Hylozoics books\n\n"
         response += "🏛️ *All quotes are verbatim from Henry T. Laurency*"
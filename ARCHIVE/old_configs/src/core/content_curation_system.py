@@ -24,7 +24,7 @@ import re
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from .knowledge_management_system import BecomingOneKnowledgeSystem, ContentType, ContentSource
 
@@ -87,10 +87,29 @@ class ProcessedContent:
 class ContentCurationAgent:
     """AI agent that automatically curates and processes content"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Segments shorter than this are packed together into one LLM request
+    SHORT_SEGMENT_CHARS = 400
+    
+    def __init__(self,
+                 max_concurrent_requests: int = 8,
+                 pack_short_segments: bool = True,
+                 pack_max_chars: int = 2000,
+                 pack_max_segments: int = 6,
+                 cache_file: Optional[str] = None):
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.knowledge_system = BecomingOneKnowledgeSystem()
         
+        # Segment analysis throughput settings
+        self.max_concurrent_requests = max_concurrent_requests
+        self.pack_short_segments = pack_short_segments
+        self.pack_max_chars = pack_max_chars
+        self.pack_max_segments = pack_max_segments
+        
+        # AI analyses keyed by segment hash; optionally persisted between runs
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._segment_cache: Dict[str, Dict[str, Any]] = self._load_segment_cache()
+        self.cache_stats = {"hits": 0, "misses": 0, "llm_requests": 0}
+        
         # Speaker identification patterns
         self.speaker_patterns = {
             "johan": [
@@ -152,11 +171,8 @@ class ContentCurationAgent:
         # 2. Segment the content
         raw_segments = self._segment_content(content, format_type)
         
-        # 3. Process each segment with AI
-        processed_segments = []
-        for segment_text in raw_segments:
-            segment = await self._process_segment(segment_text, format_type)
-            processed_segments.append(segment)
+        # 3. Process segments with AI (concurrently, original order preserved)
+        processed_segments = await self._process_segments(raw_segments, format_type)
         
         # 4. Categorize segments
         teaching_segments = [s for s in processed_segments 
@@ -185,20 +201,87 @@ class ContentCurationAgent:
             metadata={"original_file": os.path.basename(file_path)}
         )
     
-    async def _process_segment(self, segment_text: str, format_type: ContentFormat) -> ContentSegment:
-        """Process a single segment with AI analysis"""
+    async def _process_segments(self, raw_segments: List[str], format_type: ContentFormat) -> List[ContentSegment]:
+        """Analyze all segments through a bounded pool of concurrent LLM requests"""
         
-        # Generate segment ID
-        segment_id = hashlib.sha256(segment_text.encode()).hexdigest()[:12]
+        results: List[Optional[ContentSegment]] = [None] * len(raw_segments)
         
-        # AI analysis prompt
-        analysis_prompt = f"""
-        Analyze this content segment from a Becoming One™ workshop/presentation:
+        # Cached segments need no request at all
+        pending = []
+        for index, segment_text in enumerate(raw_segments):
+            cached = self._segment_cache.get(self._segment_cache_key(segment_text, format_type))
+            if cached is not None:
+                self.cache_stats["hits"] += 1
+                results[index] = self._build_segment(segment_text, cached)
+            else:
+                self.cache_stats["misses"] += 1
+                pending.append(index)
         
-        Content: "{segment_text}"
-        Format: {format_type.value}
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async def run_batch(indices: List[int]):
+            async with semaphore:
+                texts = [raw_segments[i] for i in indices]
+                if len(texts) == 1:
+                    segments = [await self._process_segment(texts[0], format_type)]
+                else:
+                    segments = await self._process_segment_pack(texts, format_type)
+            for index, segment in zip(indices, segments):
+                results[index] = segment
         
-        Identify:
+        await asyncio.gather(*(run_batch(batch) for batch in self._plan_batches(raw_segments, pending)))
+        
+        self._save_segment_cache()
+        return results
+    
+    def _plan_batches(self, raw_segments: List[str], pending: List[int]) -> List[List[int]]:
+        """Group runs of short neighbouring segments into packs; long ones go alone"""
+        
+        batches: List[List[int]] = []
+        pack: List[int] = []
+        pack_chars = 0
+        
+        for index in pending:
+            length = len(raw_segments[index])
+            if not self.pack_short_segments or length >= self.SHORT_SEGMENT_CHARS:
+                batches.append([index])
+                continue
+            
+            if pack and (pack_chars + length > self.pack_max_chars or
+                         len(pack) >= self.pack_max_segments):
+                batches.append(pack)
+                pack, pack_chars = [], 0
+            pack.append(index)
+            pack_chars += length
+        
+        if pack:
+            batches.append(pack)
+        return batches
+    
+    def _segment_cache_key(self, segment_text: str, format_type: ContentFormat) -> str:
+        return hashlib.sha256(f"{format_type.value}\n{segment_text}".encode()).hexdigest()
+    
+    def _load_segment_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_file or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable segment cache {self.cache_file}: {e}")
+            return {}
+    
+    def _save_segment_cache(self):
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_suffix(".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._segment_cache, f)
+        os.replace(temp_file, self.cache_file)
+    
+    def _analysis_prompt_fields(self) -> str:
+        return """
         1. Speaker: Is this Johan, Marianne, a participant, or unknown?
         2. Category: Teaching content, question, feedback, insight, or discussion?
         3. Themes: What Becoming One™ themes are present?
@@ -206,10 +289,10 @@ class ContentCurationAgent:
         5. Feeling states: Any feeling-states mentioned or implied?
         6. Anchor types: Any emotional anchors discussed?
         7. Short-form potential: Rate 0-1 how suitable this is for a short video clip
-        8. Confidence: How confident are you in this analysis (0-1)?
-        
-        Return JSON:
-        {{
+        8. Confidence: How confident are you in this analysis (0-1)?"""
+    
+    def _analysis_json_schema(self) -> str:
+        return """{
             "speaker": "johan|marianne|participant|unknown",
             "category": "johan_teaching|marianne_teaching|joint_teaching|participant_question|participant_feedback|participant_insight|community_discussion|technical_content|unknown",
             "themes": ["theme1", "theme2"],
@@ -219,10 +302,26 @@ class ContentCurationAgent:
             "short_form_potential": 0.8,
             "confidence": 0.9,
             "reasoning": "Brief explanation of the analysis"
-        }}
+        }"""
+    
+    async def _process_segment(self, segment_text: str, format_type: ContentFormat) -> ContentSegment:
+        """Process a single segment with AI analysis"""
+        
+        # AI analysis prompt
+        analysis_prompt = f"""
+        Analyze this content segment from a Becoming One™ workshop/presentation:
+        
+        Content: "{segment_text}"
+        Format: {format_type.value}
+        
+        Identify:{self._analysis_prompt_fields()}
+        
+        Return JSON:
+        {self._analysis_json_schema()}
         """
         
         try:
+            self.cache_stats["llm_requests"] += 1
             response = await self.openai_client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[
@@ -235,37 +334,100 @@ class ContentCurationAgent:
             
             # Parse AI response
             analysis = json.loads(response.choices[0].message.content)
-            
-            # Create segment
-            segment = ContentSegment(
-                segment_id=segment_id,
-                content=segment_text,
-                speaker=analysis.get("speaker", "unknown"),
-                category=ContentCategory(analysis.get("category", "unknown")),
-                confidence=analysis.get("confidence", 0.0),
-                themes=analysis.get("themes", []),
-                concepts=analysis.get("concepts", []),
-                feeling_states=analysis.get("feeling_states", []),
-                anchor_types=analysis.get("anchor_types", []),
-                short_form_potential=analysis.get("short_form_potential", 0.0),
-                metadata={"ai_reasoning": analysis.get("reasoning", "")}
-            )
+            segment = self._build_segment(segment_text, analysis)
+            self._segment_cache[self._segment_cache_key(segment_text, format_type)] = analysis
             
         except Exception as e:
-            # Fallback to pattern-based analysis
-            segment = ContentSegment(
-                segment_id=segment_id,
-                content=segment_text,
-                speaker=self._detect_speaker_patterns(segment_text),
-                category=self._detect_category_patterns(segment_text),
-                confidence=0.5,
-                themes=self._extract_themes_patterns(segment_text),
-                concepts=self._extract_concepts_patterns(segment_text),
-                metadata={"processing_error": str(e)}
-            )
+            segment = self._fallback_segment(segment_text, e)
         
         return segment
     
+    async def _process_segment_pack(self, segment_texts: List[str], format_type: ContentFormat) -> List[ContentSegment]:
+        """Analyze several short segments in one LLM request"""
+        
+        numbered = "\n\n".join(
+            f'Segment {i}: "{text}"' for i, text in enumerate(segment_texts, 1)
+        )
+        analysis_prompt = f"""
+        Analyze each of these {len(segment_texts)} content segments from a Becoming One™ workshop/presentation.
+        Analyze every segment on its own.
+        
+        {numbered}
+        
+        Format: {format_type.value}
+        
+        For each segment identify:{self._analysis_prompt_fields()}
+        
+        Return JSON with exactly one entry per segment, in order:
+        {{
+            "segments": [
+                {self._analysis_json_schema()}
+            ]
+        }}
+        """
+        
+        try:
+            self.cache_stats["llm_requests"] += 1
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-4-turbo-preview",
+                messages=[
+                    {"role": "system", "content": "You are an expert at analyzing Becoming One™ content and identifying speakers, themes, and teaching value."},
+                    {"role": "user", "content": analysis_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=400 * len(segment_texts) + 400
+            )
+            
+            analyses = json.loads(response.choices[0].message.content).get("segments", [])
+            if len(analyses) != len(segment_texts):
+                raise ValueError(f"Expected {len(segment_texts)} analyses, got {len(analyses)}")
+            
+            segments = []
+            for segment_text, analysis in zip(segment_texts, analyses):
+                segments.append(self._build_segment(segment_text, analysis))
+                self._segment_cache[self._segment_cache_key(segment_text, format_type)] = analysis
+            return segments
+            
+        except Exception:
+            # Misaligned or unparseable pack - analyze the segments individually
+            return [await self._process_segment(text, format_type) for text in segment_texts]
+    
+    def _build_segment(self, segment_text: str, analysis: Dict[str, Any]) -> ContentSegment:
+        """Create a segment from an AI analysis"""
+        
+        try:
+            category = ContentCategory(analysis.get("category", "unknown"))
+        except ValueError:
+            category = ContentCategory.UNKNOWN
+        
+        return ContentSegment(
+            segment_id=hashlib.sha256(segment_text.encode()).hexdigest()[:12],
+            content=segment_text,
+            speaker=analysis.get("speaker", "unknown"),
+            category=category,
+            confidence=analysis.get("confidence", 0.0),
+            themes=analysis.get("themes", []),
+            concepts=analysis.get("concepts", []),
+            feeling_states=analysis.get("feeling_states", []),
+            anchor_types=analysis.get("anchor_types", []),
+            short_form_potential=analysis.get("short_form_potential", 0.0),
+            metadata={"ai_reasoning": analysis.get("reasoning", "")}
+        )
+    
+    def _fallback_segment(self, segment_text: str, error: Exception) -> ContentSegment:
+        """Pattern-based analysis when the AI call fails"""
+        
+        return ContentSegment(
+            segment_id=hashlib.sha256(segment_text.encode()).hexdigest()[:12],
+            content=segment_text,
+            speaker=self._detect_speaker_patterns(segment_text),
+            category=self._detect_category_patterns(segment_text),
+            confidence=0.5,
+            themes=self._extract_themes_patterns(segment_text),
+            concepts=self._extract_concepts_patterns(segment_text),
+            metadata={"processing_error": str(error)}
+        )
+    
     def _read_file(self, file_path: str) -> str:
         """Read content from file"""
         try:
@@ -0,0 +1,352 @@
+"""
+Download Engine
+===============
+Shared concurrent, resumable file downloader for the Laurency harvesters.
+
+- one pooled httpx.AsyncClient, with a global and a per-host concurrency limit
+- conditional GETs: files already in the manifest are revalidated with
+  If-None-Match / If-Modified-Since, and a 304 costs no body transfer
+- range resume: bytes go to <file>.part; an interrupted download continues
+  with Range/If-Range instead of starting over
+- a JSON manifest (url -> path, validators, size) persisted next to the
+  downloads, so re-runs only fetch what changed
+
+HTML pages (navigation menus, tables of contents) go through fetch_pages,
+which shares the same client and limits but keeps nothing on disk.
+"""
+
+import os
+import json
+import time
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Callable
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+MANIFEST_VERSION = 1
+
+# Responses worth retrying; anything else in 4xx is a missing/bad URL
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+@dataclass
+class DownloadJob:
+    """A URL to fetch into a local file; metadata is passed through to the result"""
+    url: str
+    path: Path
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one job
+
+    status: downloaded | resumed | not_modified | existing | failed
+    """
+    job: DownloadJob
+    status: str
+    size: int = 0
+    bytes_transferred: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+class DownloadManifest:
+    """url -> {path, etag, last_modified, size, complete, updated_at}, saved atomically"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = 0
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable download manifest {self.path}: {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def update(self, url: str, **values):
+        entry = self.entries.setdefault(url, {})
+        entry.update(values, updated_at=datetime.now().isoformat(timespec='seconds'))
+        self._dirty += 1
+
+    def save(self, force: bool = True):
+        if not self._dirty and not force:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
+
+
+class DownloadEngine:
+    """Concurrent, conditional, resumable downloads with a persistent manifest"""
+
+    # Manifest is flushed after this many updates (and always at the end of a run)
+    MANIFEST_SAVE_EVERY = 10
+
+    def __init__(
+        self,
+        manifest_path: Path,
+        max_concurrency: int = 8,
+        per_host_limit: int = 4,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        chunk_size: int = 64 * 1024,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.manifest = DownloadManifest(manifest_path)
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.chunk_size = chunk_size
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._limits_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=limits,
+                                 follow_redirects=True)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; each *_sync call runs a new one
+        loop = asyncio.get_running_loop()
+        if loop is not self._limits_loop:
+            self._host_limits, self._limits_loop = {}, loop
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    def _record(self, url: str, **values):
+        self.manifest.update(url, **values)
+        if self.manifest._dirty >= self.MANIFEST_SAVE_EVERY:
+            self.manifest.save()
+
+    def _request_headers(self, job: DownloadJob, part_path: Path) -> Dict[str, str]:
+        """Conditional / range headers for the job's current local state"""
+        entry = self.manifest.get(job.url) or {}
+        etag, last_modified = entry.get('etag'), entry.get('last_modified')
+
+        if entry.get('complete') and job.path.exists() and job.path.stat().st_size == entry.get('size'):
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            return headers
+
+        if part_path.exists() and (etag or last_modified):
+            # If-Range: the server sends the whole file instead if it changed meanwhile
+            return {'Range': f"bytes={part_path.stat().st_size}-", 'If-Range': etag or last_modified}
+
+        return {}
+
+    async def _fetch(self, client: httpx.AsyncClient, job: DownloadJob) -> DownloadResult:
+        """One attempt; raises httpx errors for the retry loop"""
+        part_path = job.path.with_name(job.path.name + '.part')
+        # Identity encoding keeps .part offsets in the byte units Range uses
+        headers = {'Accept-Encoding': 'identity', **self._request_headers(job, part_path)}
+        start = time.perf_counter()
+
+        async with client.stream('GET', job.url, headers=headers) as response:
+            if response.status_code == 304:
+                return DownloadResult(job, "not_modified", size=job.path.stat().st_size,
+                                      seconds=time.perf_counter() - start)
+            if response.status_code == 416 and part_path.exists():
+                return self._finish_unsatisfiable_range(job, part_path, response, start)
+            if response.status_code not in (200, 206):
+                raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request,
+                                            response=response)
+
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            resumed = response.status_code == 206
+            offset = part_path.stat().st_size if resumed else 0
+            if resumed and not response.headers.get('content-range', '').startswith(f"bytes {offset}-"):
+                # Partial file can't be trusted - start over on the next attempt
+                part_path.unlink()
+                raise httpx.ReadError(f"Unexpected Content-Range: {response.headers.get('content-range')}")
+
+            # Remember the validators before the body arrives, so an interrupted
+            # transfer can be resumed next time
+            self._record(job.url, path=str(job.path), etag=etag, last_modified=last_modified, complete=False)
+
+            job.path.parent.mkdir(parents=True, exist_ok=True)
+            transferred = 0
+            try:
+                with open(part_path, 'ab' if resumed else 'wb') as f:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        f.write(chunk)
+                        transferred += len(chunk)
+
+                # Content-Length counts the bytes on the wire, which differ from the
+                # decoded ones if the server compressed the body anyway
+                expected = response.headers.get('content-length')
+                if expected is not None and response.num_bytes_downloaded != int(expected):
+                    raise httpx.ReadError(f"Incomplete body: {response.num_bytes_downloaded} of {expected} bytes")
+            except (httpx.HTTPError, OSError):
+                if response.headers.get('content-encoding', 'identity') != 'identity' and part_path.exists():
+                    # Decoded bytes can't be resumed with a Range on the encoded body
+                    part_path.unlink()
+                raise
+
+        os.replace(part_path, job.path)
+        size = job.path.stat().st_size
+        self._record(job.url, path=str(job.path), etag=etag, last_modified=last_modified,
+                     size=size, complete=True)
+        return DownloadResult(job, "resumed" if resumed else "downloaded", size=size,
+                              bytes_transferred=transferred, seconds=time.perf_counter() - start)
+
+    def _finish_unsatisfiable_range(self, job: DownloadJob, part_path: Path, response: httpx.Response,
+                                    start: float) -> DownloadResult:
+        """Handle a 416 on resume: the .part file is either already complete or unusable
+
+        A transfer that finished but was never renamed asks for bytes past
+        the end. If the .part size matches the total in Content-Range
+        ('bytes */<total>') or the size in the manifest, it is finalised;
+        otherwise it is deleted and the next attempt starts over.
+        """
+        part_size = part_path.stat().st_size
+        content_range = response.headers.get('content-range', '')
+        total = content_range.rpartition('/')[2] if content_range.startswith('bytes */') else ''
+        expected = int(total) if total.isdigit() else (self.manifest.get(job.url) or {}).get('size')
+
+        if expected is not None and part_size == expected:
+            os.replace(part_path, job.path)
+            entry = self.manifest.get(job.url) or {}
+            self._record(job.url, path=str(job.path), etag=entry.get('etag'),
+                         last_modified=entry.get('last_modified'), size=part_size, complete=True)
+            return DownloadResult(job, "resumed", size=part_size, seconds=time.perf_counter() - start)
+
+        part_path.unlink()
+        raise httpx.ReadError(f"Range not satisfiable for {part_size}-byte partial file "
+                              f"(Content-Range: {content_range or 'missing'})")
+
+    async def download(self, client: httpx.AsyncClient, job: DownloadJob) -> DownloadResult:
+        """Fetch one job with retries, honouring the global and per-host limits"""
+        job.path = Path(job.path)
+        entry = self.manifest.get(job.url)
+        if entry is None and job.path.exists():
+            # Downloaded before the manifest existed - nothing to revalidate against
+            size = job.path.stat().st_size
+            self._record(job.url, path=str(job.path), etag=None, last_modified=None, size=size, complete=True)
+            return DownloadResult(job, "existing", size=size)
+        if entry and entry.get('complete') and job.path.exists() and \
+                not (entry.get('etag') or entry.get('last_modified')):
+            return DownloadResult(job, "existing", size=job.path.stat().st_size)
+
+        error = ""
+        async with self._host_limit(job.url):
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                try:
+                    return await self._fetch(client, job)
+                except httpx.HTTPStatusError as e:
+                    error = str(e)
+                    if e.response.status_code not in RETRYABLE_STATUS and e.response.status_code < 500:
+                        break
+                except (httpx.HTTPError, OSError) as e:
+                    error = f"{type(e).__name__}: {e}"
+
+        logger.warning(f"Download failed: {job.url} ({error})")
+        return DownloadResult(job, "failed", error=error)
+
+    async def download_all(self, jobs: Iterable[DownloadJob],
+                           progress: Optional[Callable[[DownloadResult], None]] = None) -> List[DownloadResult]:
+        """Run all jobs concurrently; results come back in job order"""
+        jobs = list(jobs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(client: httpx.AsyncClient, job: DownloadJob) -> DownloadResult:
+            async with semaphore:
+                result = await self.download(client, job)
+            if progress:
+                progress(result)
+            return result
+
+        try:
+            async with self._client() as client:
+                return await asyncio.gather(*(run(client, job) for job in jobs))
+        finally:
+            self.manifest.save()
+
+    def download_all_sync(self, jobs: Iterable[DownloadJob],
+                          progress: Optional[Callable[[DownloadResult], None]] = None) -> List[DownloadResult]:
+        """Blocking wrapper for the (synchronous) harvester scripts"""
+        return asyncio.run(self.download_all(jobs, progress))
+
+
+    async def fetch_pages(self, urls: Iterable[str]) -> Dict[str, Optional[httpx.Response]]:
+        """GET several pages concurrently; url -> response (None if it failed or wasn't 200)"""
+        urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(client: httpx.AsyncClient, url: str) -> Optional[httpx.Response]:
+            async with semaphore, self._host_limit(url):
+                for attempt in range(self.max_retries + 1):
+                    if attempt:
+                        await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                    try:
+                        response = await client.get(url)
+                    except httpx.HTTPError as e:
+                        logger.debug(f"Page fetch failed: {url} ({type(e).__name__}: {e})")
+                        continue
+                    if response.status_code == 200:
+                        return response
+                    if response.status_code not in RETRYABLE_STATUS:
+                        break
+            logger.warning(f"Could not fetch page: {url}")
+            return None
+
+        async with self._client() as client:
+            responses = await asyncio.gather(*(fetch(client, url) for url in urls))
+        return dict(zip(urls, responses))
+
+    def fetch_pages_sync(self, urls: Iterable[str]) -> Dict[str, Optional[httpx.Response]]:
+        return asyncio.run(self.fetch_pages(urls))
+
+
+def summarize_results(results: List[DownloadResult]) -> Dict[str, Any]:
+    """Counts per status plus bytes transferred"""
+    summary: Dict[str, Any] = {}
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    summary['bytes_transferred'] = sum(result.bytes_transferred for result in results)
+    return summary
+
+
+def print_progress(result: DownloadResult):
+    """Default one-line progress callback for the harvester scripts"""
+    icons = {'downloaded': '📥', 'resumed': '⏯️ ', 'not_modified': '✔️ ', 'existing': '⏭️ ', 'failed': '❌'}
+    name = result.job.path.name
+    if result.ok:
+        print(f"    {icons[result.status]} {result.status:<12} {name} ({result.size:,} bytes)")
+    else:
+        print(f"    {icons['failed']} failed       {name} - {result.error}")
@@ -0,0 +1,161 @@
+"""
+Hylozoics Term Index
+====================
+Cross-language query expansion for the Sacred Library without an LLM.
+
+The multilingual term dictionary (sacred_library_files/hylozoics_terms.json,
+built by scripts/build_hylozoics_term_index.py from the Laurency
+dictionaries) is loaded into a character trie. A query is scanned once;
+every Hylozoics term found in it expands to its Swedish, English and
+German forms, so an English question also matches Swedish and German
+quotes.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from loguru import logger
+
+TERMS_FILE = Path(__file__).parent.parent.parent / "sacred_library_files" / "hylozoics_terms.json"
+TERM_LANGUAGES = ("sv", "en", "de")
+
+# Forms at least this long also match as the start of a longer word, which
+# covers inflections and compounds ("medvetenheten", "envelopes", "Bewußtseins")
+MIN_PREFIX_MATCH = 5
+
+_TERMINAL = "\0"
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class TermTrie:
+    """Character trie over lower-cased term forms, each mapped to term ids"""
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+        self.size = 0
+
+    def insert(self, form: str, term_id: int):
+        node = self.root
+        for char in form.lower():
+            node = node.setdefault(char, {})
+        ids = node.setdefault(_TERMINAL, [])
+        if term_id not in ids:
+            ids.append(term_id)
+            self.size += 1
+
+    def longest_match(self, text: str, start: int) -> Optional[Tuple[int, List[int]]]:
+        """(end, term ids) of the longest form starting at `start`, or None
+
+        A match must end at a word boundary unless the form is long enough
+        to count as the stem of a longer word.
+        """
+        node, best = self.root, None
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                break
+            ids = node.get(_TERMINAL)
+            if ids:
+                at_boundary = end + 1 == len(text) or not text[end + 1].isalnum()
+                if at_boundary or end + 1 - start >= MIN_PREFIX_MATCH:
+                    best = (end + 1, ids)
+        return best
+
+    def find(self, text: str) -> List[int]:
+        """Term ids found in the text, in order of appearance"""
+        text = text.lower()
+        found: List[int] = []
+        i = 0
+        while i < len(text):
+            if not text[i].isalnum() or (i and text[i - 1].isalnum()):
+                i += 1
+                continue
+            match = self.longest_match(text, i)
+            if match:
+                end, ids = match
+                found.extend(term_id for term_id in ids if term_id not in found)
+                i = end
+            else:
+                i += 1
+        return found
+
+
+class HylozoicsTermIndex:
+    """Multilingual Hylozoics terms with trie lookup"""
+
+    def __init__(self, terms: List[Dict[str, Any]]):
+        self.terms = terms
+        self.trie = TermTrie()
+        for term_id, term in enumerate(terms):
+            for language in TERM_LANGUAGES:
+                for form in term.get(language, []):
+                    self.trie.insert(form, term_id)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @classmethod
+    def load(cls, path: Path = TERMS_FILE) -> "HylozoicsTermIndex":
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                terms = json.load(f).get('terms', [])
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read Hylozoics term index {path}: {e}")
+            terms = []
+        return cls(terms)
+
+    def find_terms(self, query: str) -> List[Dict[str, Any]]:
+        """Dictionary entries mentioned in the query"""
+        return [self.terms[term_id] for term_id in self.trie.find(query)]
+
+    def expansion_terms(self, query: str, languages: Tuple[str, ...] = TERM_LANGUAGES) -> List[str]:
+        """Forms of every term in the query, in all languages, that the query doesn't already contain"""
+        query_words = set(WORD_PATTERN.findall(query.lower()))
+        expansions: List[str] = []
+        seen = set()
+        for term in self.find_terms(query):
+            for language in languages:
+                for form in term.get(language, []):
+                    key = form.lower()
+                    if key not in seen and not set(WORD_PATTERN.findall(key)) <= query_words:
+                        seen.add(key)
+                        expansions.append(form)
+        return expansions
+
+    def expand(self, query: str) -> str:
+        """The query followed by its cross-language expansions"""
+        return " ".join([query] + self.expansion_terms(query))
+
+    def translate(self, term: str, language: str) -> Optional[str]:
+        """Primary form of `term` in `language`, if the term is known"""
+        for entry in self.find_terms(term):
+            forms = entry.get(language)
+            if forms:
+                return forms[0]
+        return None
+
+    def term_mappings(self) -> Dict[str, Dict[str, str]]:
+        """Swedish term -> {"en", "de", "concept"} (EnhancedHylozoicsLibrary format)"""
+        mappings = {}
+        for term in self.terms:
+            if not term.get('sv'):
+                continue
+            mappings.setdefault(term['sv'][0], {
+                "en": (term.get('en') or [""])[0],
+                "de": (term.get('de') or [""])[0],
+                "concept": term.get('concept', ""),
+            })
+        return mappings
+
+
+_term_index: Optional[HylozoicsTermIndex] = None
+
+
+def get_term_index() -> HylozoicsTermIndex:
+    """Shared term index, loaded on first use"""
+    global _term_index
+    if _term_index is None:
+        _term_index = HylozoicsTermIndex.load()
+        logger.info(f"Loaded {len(_term_index)} Hylozoics terms ({_term_index.trie.size} forms)")
+    return _term_index
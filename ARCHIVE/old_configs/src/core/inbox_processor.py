@@ -18,6 +18,7 @@ import os
 import json
 import asyncio
 import hashlib
+import heapq
 import shutil
 import uuid
 from typing import Dict, List, Optional, Any, Tuple
@@ -27,10 +28,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 import re
 import time
+import itertools
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from .knowledge_management_system import BecomingOneKnowledgeSystem, ContentType, ContentSource
 
@@ -65,25 +67,44 @@ class ProcessedFile:
 class InboxProcessor:
     """AI agent that processes all content dropped in INBOX folder"""
     
-    def __init__(self, inbox_folder: str):
+    # File type groups: each has its own concurrency limit and queue priority
+    FILE_TYPE_GROUPS = {
+        "text": {'.txt', '.md', '.json'},
+        "document": {'.docx', '.pdf'},
+        "media": {'.mp3', '.wav', '.m4a', '.mp4', '.mov', '.avi'},
+    }
+    DEFAULT_TYPE_LIMITS = {"text": 4, "document": 2, "media": 1}
+    TYPE_PRIORITY = {"text": 0, "document": 1, "media": 2}  # Lower runs first
+    
+    def __init__(self,
+                 inbox_folder: str,
+                 num_workers: int = 4,
+                 type_limits: Optional[Dict[str, int]] = None):
         self.inbox_folder = Path(inbox_folder)
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.knowledge_system = BecomingOneKnowledgeSystem()
         
         # Create folder structure
         self._setup_folders()
         
-        # Processing queue
-        self.processing_queue = asyncio.Queue()
-        self.is_processing = False
+        # Processing queue: (type priority, file size, sequence, path)
+        self.processing_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.num_workers = num_workers
+        self.type_limits = {**self.DEFAULT_TYPE_LIMITS, **(type_limits or {})}
+        self.active_counts = {group: 0 for group in self.FILE_TYPE_GROUPS}
+        self._deferred: Dict[str, List[Tuple[int, int, int, str]]] = {
+            group: [] for group in self.FILE_TYPE_GROUPS
+        }
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Persistent queue state so a restart resumes queued and in-flight work
+        self.queue_state_file = self.inbox_folder / "logs" / "queue_state.json"
+        self.queue_state: Dict[str, Dict[str, Any]] = {}
         
         # File type handlers
-        self.supported_extensions = {
-            '.txt', '.md', '.docx', '.pdf',  # Documents
-            '.mp3', '.wav', '.m4a',          # Audio files
-            '.mp4', '.mov', '.avi',          # Video files
-            '.json'                          # Structured data
-        }
+        self.supported_extensions = set().union(*self.FILE_TYPE_GROUPS.values())
     
     def _setup_folders(self):
         """Create organized folder structure"""
@@ -104,19 +125,18 @@ class InboxProcessor:
         print(f"📁 INBOX system ready at: {self.inbox_folder}")
         print("   Drop files here for automatic processing!")
     
-    def start_watching(self):
+    async def start_watching(self):
         """Start watching the INBOX folder"""
+        await self.start_workers()
+        
         event_handler = InboxFileHandler(self)
         observer = Observer()
         
         observer.schedule(event_handler, str(self.inbox_folder), recursive=False)
         observer.start()
         
-        # Start processing queue
-        asyncio.create_task(self._process_queue())
-        
         print(f"👁️  Watching INBOX: {self.inbox_folder}")
-        print("🤖 AI processor is active!")
+        print(f"🤖 AI processor is active! ({self.num_workers} workers)")
         print("\n" + "="*60)
         print("USAGE:")
         print("1. Drop any file in the INBOX folder")
@@ -129,30 +149,123 @@ class InboxProcessor:
         
         try:
             while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
+                await asyncio.sleep(3600)
+        except (KeyboardInterrupt, asyncio.CancelledError):
             observer.stop()
             observer.join()
+            await self.stop_workers()
             print("🛑 INBOX processor stopped")
     
-    async def _process_queue(self):
-        """Process files from the queue"""
+    async def start_workers(self):
+        """Resume persisted queue state and start the worker pool"""
+        if self._workers:
+            return
+        
+        self.loop = asyncio.get_running_loop()
+        await self._restore_queue_state()
+        
+        self._workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.num_workers)
+        ]
+    
+    async def stop_workers(self):
+        """Cancel workers; queue state stays on disk for the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+    
+    def _file_type_group(self, file_path: Path) -> str:
+        suffix = file_path.suffix.lower()
+        for group, extensions in self.FILE_TYPE_GROUPS.items():
+            if suffix in extensions:
+                return group
+        return "document"
+    
+    async def _worker(self, worker_id: int):
+        """Take the highest-priority file whose type still has a free slot"""
         while True:
+            item = await self.processing_queue.get()
+            _, _, _, file_path = item
+            group = self._file_type_group(Path(file_path))
+            
+            if self.active_counts[group] >= self.type_limits[group]:
+                # This type is at its limit - park the file and pick up something else
+                heapq.heappush(self._deferred[group], item)
+                self.processing_queue.task_done()
+                continue
+            
+            self.active_counts[group] += 1
             try:
-                if not self.processing_queue.empty() and not self.is_processing:
-                    file_path = await self.processing_queue.get()
-                    await self._process_file(file_path)
-                    self.processing_queue.task_done()
-                else:
-                    await asyncio.sleep(1)
+                self._update_queue_state(file_path, status="in_flight", worker=worker_id)
+                await self._process_file(file_path)
             except Exception as e:
-                print(f"❌ Queue processing error: {e}")
-                await asyncio.sleep(5)
+                print(f"❌ Worker {worker_id} error on {Path(file_path).name}: {e}")
+            finally:
+                self.active_counts[group] -= 1
+                self._remove_queue_state(file_path)
+                if self._deferred[group]:
+                    self.processing_queue.put_nowait(heapq.heappop(self._deferred[group]))
+                self.processing_queue.task_done()
     
-    async def add_file_to_queue(self, file_path: str):
-        """Add file to processing queue"""
-        await self.processing_queue.put(file_path)
-        print(f"📥 Queued for processing: {Path(file_path).name}")
+    async def add_file_to_queue(self, file_path: str) -> bool:
+        """Add file to processing queue (False if it is already queued or in flight)"""
+        file_path = str(Path(file_path))
+        if file_path in self.queue_state:
+            return False
+        
+        path = Path(file_path)
+        group = self._file_type_group(path)
+        size = path.stat().st_size if path.exists() else 0
+        
+        self._update_queue_state(file_path, status="queued", group=group, size=size,
+                                 queued_at=datetime.now().isoformat())
+        await self.processing_queue.put((self.TYPE_PRIORITY[group], size, next(self._sequence), file_path))
+        print(f"📥 Queued for processing: {path.name}")
+        return True
+    
+    def _update_queue_state(self, file_path: str, **fields):
+        self.queue_state.setdefault(file_path, {}).update(fields)
+        self._save_queue_state()
+    
+    def _remove_queue_state(self, file_path: str):
+        if self.queue_state.pop(file_path, None) is not None:
+            self._save_queue_state()
+    
+    def _save_queue_state(self):
+        """Atomically persist queued and in-flight files"""
+        temp_file = self.queue_state_file.with_suffix(".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.queue_state, f, indent=2)
+        os.replace(temp_file, self.queue_state_file)
+    
+    async def _restore_queue_state(self):
+        """Re-queue work left over from a previous run"""
+        if not self.queue_state_file.exists():
+            return
+        
+        try:
+            with open(self.queue_state_file, 'r', encoding='utf-8') as f:
+                saved_state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Could not read queue state: {e}")
+            return
+        
+        resumed = 0
+        for file_path, entry in saved_state.items():
+            # In-flight files were already moved into processing/
+            processing_path = entry.get("processing_path")
+            if entry.get("status") == "in_flight" and processing_path and Path(processing_path).exists():
+                file_path = processing_path
+            elif not Path(file_path).exists():
+                continue
+            
+            if await self.add_file_to_queue(file_path):
+                resumed += 1
+        
+        if resumed:
+            print(f"🔁 Resumed {resumed} files from previous run")
     
     async def _process_file(self, file_path: str):
         """Process a single file with AI"""
@@ -163,14 +276,14 @@ class InboxProcessor:
             print(f"❌ File not found: {file_path}")
             return
         
-        self.is_processing = True
-        
         try:
             print(f"\n🔄 Processing: {file_path.name}")
             
-            # Move to processing folder
+            # Move to processing folder (resumed files are already there)
             processing_path = self.inbox_folder / "processing" / file_path.name
-            shutil.move(str(file_path), str(processing_path))
+            if file_path != processing_path:
+                shutil.move(str(file_path), str(processing_path))
+                self._update_queue_state(str(file_path), processing_path=str(processing_path))
             
             # Process the file
             result = await self._analyze_and_categorize_content(processing_path)
@@ -217,9 +330,6 @@ class InboxProcessor:
             await self._log_processing_result(result)
             
             print(f"❌ Failed to process {file_path.name}: {e}")
-        
-        finally:
-            self.is_processing = False
     
     async def _analyze_and_categorize_content(self, file_path: Path) -> ProcessedFile:
         """Main AI analysis of the content"""
@@ -528,7 +638,11 @@ class InboxProcessor:
 
 
 class InboxFileHandler(FileSystemEventHandler):
-    """Handles file system events in the INBOX folder"""
+    """Handles file system events in the INBOX folder
+    
+    Watchdog calls these handlers from its own thread, so work is handed to
+    the processor's event loop with run_coroutine_threadsafe.
+    """
     
     def __init__(self, processor: InboxProcessor):
         self.processor = processor
@@ -541,7 +655,7 @@ class InboxFileHandler(FileSystemEventHandler):
             
             if self._should_process_file(file_path):
                 # Add delay to ensure file is fully written
-                asyncio.create_task(self._delayed_process(str(file_path)))
+                self._schedule(str(file_path))
     
     def on_moved(self, event):
         """Handle file moves (like drag and drop completion)"""
@@ -549,7 +663,10 @@ class InboxFileHandler(FileSystemEventHandler):
             file_path = Path(event.dest_path)
             
             if self._should_process_file(file_path):
-                asyncio.create_task(self._delayed_process(str(file_path)))
+                self._schedule(str(file_path))
+    
+    def _schedule(self, file_path: str):
+        asyncio.run_coroutine_threadsafe(self._delayed_process(file_path), self.processor.loop)
     
     def _should_process_file(self, file_path: Path) -> bool:
         """Check if file should be processed"""
@@ -594,11 +711,17 @@ async def main():
         action="store_true",
         help="Process existing files in INBOX folder"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files processed concurrently (default: 4)"
+    )
     
     args = parser.parse_args()
     
     # Create processor
-    processor = InboxProcessor(args.inbox_folder)
+    processor = InboxProcessor(args.inbox_folder, num_workers=args.workers)
     
     # Process existing files if requested
     if args.process_existing:
@@ -612,7 +735,7 @@ async def main():
         print("✅ Existing files queued for processing")
     
     # Start watching
-    processor.start_watching()
+    await processor.start_watching()
 
 
 if __name__ == "__main__":
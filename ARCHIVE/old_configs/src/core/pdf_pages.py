@@ -0,0 +1,179 @@
+"""
+PDF Page Extraction
+===================
+Streaming, page-level text extraction for the Sacred Library builders.
+
+Pages are yielded one at a time, cleaned and numbered, instead of one
+concatenated string per PDF - so chunks can carry page numbers for
+citations, and memory stays bounded by a few pages.
+
+With worker processes, small PDFs are extracted one per worker and large
+ones are split into page batches spread over the pool. Only a small
+window of batches is in flight at a time, and results are yielded in
+document and page order.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Iterable, Iterator, Tuple
+
+import fitz  # PyMuPDF
+
+try:
+    import PyPDF2
+except ImportError:  # Fallback extractor is optional
+    PyPDF2 = None
+
+# PDFs with at least this many pages are split into batches across workers
+PARALLEL_MIN_PAGES = 64
+# Pages per batch sent to a worker
+PAGE_BATCH = 16
+# Batches in flight per worker - bounds how many pages are held in memory
+BATCHES_PER_WORKER = 2
+
+# A header/footer line holding only a page number ("12", "- 12 -", "Page 12")
+PAGE_NUMBER_LINE = re.compile(r'^\s*(?:page\s*)?[-–]?\s*\d+\s*[-–]?\s*$', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+CHARACTER_FIXES = str.maketrans({'ﬁ': 'fi', 'ﬂ': 'fl', '“': '"', '”': '"', '‘': "'", '’': "'"})
+
+
+@dataclass
+class PdfPage:
+    """Cleaned text of one page; number is 1-based (0 marks a document that failed)"""
+    source: str
+    number: int
+    text: str
+    page_count: int
+    error: Optional[str] = None
+
+
+def clean_page_text(text: str) -> str:
+    """Drop page-number header/footer lines, fix ligatures and quotes, collapse whitespace"""
+    lines = text.splitlines()
+    while lines and (not lines[0].strip() or PAGE_NUMBER_LINE.match(lines[0])):
+        lines.pop(0)
+    while lines and (not lines[-1].strip() or PAGE_NUMBER_LINE.match(lines[-1])):
+        lines.pop()
+    return WHITESPACE.sub(' ', ' '.join(lines)).translate(CHARACTER_FIXES).strip()
+
+
+def pdf_page_count(pdf_path: str) -> Optional[int]:
+    """Page count, or None if PyMuPDF cannot open the file"""
+    try:
+        with fitz.open(pdf_path) as doc:
+            return doc.page_count
+    except Exception:
+        return None
+
+
+def _pypdf2_page_range(pdf_path: str, start: int, stop: Optional[int]) -> List[PdfPage]:
+    with open(pdf_path, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        count = len(reader.pages)
+        stop = count if stop is None else min(stop, count)
+        return [PdfPage(pdf_path, n + 1, clean_page_text(reader.pages[n].extract_text() or ""), count)
+                for n in range(start, stop)]
+
+
+def extract_page_range(pdf_path: str, start: int = 0, stop: Optional[int] = None) -> List[PdfPage]:
+    """Pages [start, stop) of one PDF - runs in a worker process
+
+    PyMuPDF first, PyPDF2 as fallback. A PDF that neither can read comes
+    back as a single page numbered 0 carrying the error.
+    """
+    try:
+        with fitz.open(pdf_path) as doc:
+            count = doc.page_count
+            stop = count if stop is None else min(stop, count)
+            return [PdfPage(pdf_path, n + 1, clean_page_text(doc[n].get_text()), count)
+                    for n in range(start, stop)]
+    except Exception as e:
+        error = f"PyMuPDF failed: {e}"
+
+    if PyPDF2 is not None:
+        try:
+            return _pypdf2_page_range(pdf_path, start, stop)
+        except Exception as e:
+            error = f"{error}; PyPDF2 failed: {e}"
+    return [PdfPage(pdf_path, 0, "", 0, error)]
+
+
+def _iter_document_pages(pdf_path: str) -> Iterator[PdfPage]:
+    """One PDF, one page at a time, in this process"""
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception:
+        yield from extract_page_range(pdf_path)
+        return
+    with doc:
+        for n in range(doc.page_count):
+            try:
+                text = doc[n].get_text()
+            except Exception as e:
+                yield PdfPage(pdf_path, n + 1, "", doc.page_count, f"Page {n + 1} failed: {e}")
+                continue
+            yield PdfPage(pdf_path, n + 1, clean_page_text(text), doc.page_count)
+
+
+def _page_ranges(pdf_paths: List[str], batch_pages: int,
+                 parallel_min_pages: int) -> Iterator[Tuple[str, int, Optional[int]]]:
+    """Work units: whole small PDFs, page batches of large ones"""
+    for pdf_path in pdf_paths:
+        count = pdf_page_count(pdf_path)
+        if count is None or count < parallel_min_pages:
+            yield pdf_path, 0, None
+        else:
+            for start in range(0, count, batch_pages):
+                yield pdf_path, start, start + batch_pages
+
+
+def iter_pdf_pages(pdf_paths: Iterable, workers: Optional[int] = None,
+                   batch_pages: int = PAGE_BATCH,
+                   parallel_min_pages: int = PARALLEL_MIN_PAGES) -> Iterator[PdfPage]:
+    """Cleaned pages of all PDFs, in order
+
+    workers: extraction processes (default one per CPU); 1 extracts in
+    this process, page by page.
+    """
+    pdf_paths = [str(path) for path in pdf_paths]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for pdf_path in pdf_paths:
+            yield from _iter_document_pages(pdf_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for unit in _page_ranges(pdf_paths, batch_pages, parallel_min_pages):
+            in_flight.append(pool.submit(extract_page_range, *unit))
+            if len(in_flight) >= workers * BATCHES_PER_WORKER:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def iter_pdf_documents(pdf_paths: Iterable, workers: Optional[int] = None,
+                       **kwargs) -> Iterator[Tuple[Path, Iterator[PdfPage]]]:
+    """(pdf path, its pages) for every PDF, in order
+
+    Like itertools.groupby, each page iterator must be consumed before
+    the next document is requested; leftover pages are skipped.
+    """
+    pdf_paths = list(pdf_paths)
+    stream = iter_pdf_pages(pdf_paths, workers, **kwargs)
+    pending = [next(stream, None)]
+
+    def pages_of(source: str) -> Iterator[PdfPage]:
+        while pending[0] is not None and pending[0].source == source:
+            page, pending[0] = pending[0], next(stream, None)
+            yield page
+
+    for pdf_path in pdf_paths:
+        pages = pages_of(str(pdf_path))
+        yield Path(pdf_path), pages
+        for _ in pages:
+            pass
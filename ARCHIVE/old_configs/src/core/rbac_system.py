@@ -4,10 +4,14 @@ Implements comprehensive user authentication, authorization, and tier management
 """
 
 import os
+import time
+import uuid
 import asyncio
-from typing import Optional, Dict, Any, List
-from enum import Enum
-from dataclasses import dataclass
+import functools
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Set, Tuple, Iterable, Mapping
+from enum import Enum, IntFlag
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 
@@ -63,20 +67,74 @@ class Permission(Enum):
     ANALYTICS_ACCESS = "analytics_access"
 
 
-@dataclass
+# One bit per Permission, in declaration order. Only append new permissions
+# to the Permission enum; bits are never persisted (tokens and the database
+# store permission names), so the order only has to be stable per process.
+PermissionFlag = IntFlag("PermissionFlag", [perm.name for perm in Permission])
+
+PERMISSION_BITS: Dict[Permission, int] = {
+    perm: int(PermissionFlag[perm.name]) for perm in Permission
+}
+
+
+def permissions_to_mask(permissions: Iterable[Any]) -> int:
+    """OR together Permission members or permission value strings, skipping unknown ones"""
+    mask = 0
+    for perm in permissions:
+        if not isinstance(perm, Permission):
+            try:
+                perm = Permission(perm)
+            except ValueError:
+                logger.warning(f"Invalid permission: {perm}")
+                continue
+        mask |= PERMISSION_BITS[perm]
+    return mask
+
+
+def mask_to_permissions(mask: int) -> Tuple[Permission, ...]:
+    """Expand a permission bitmask back into Permission members"""
+    return tuple(perm for perm, bit in PERMISSION_BITS.items() if mask & bit)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Turn a Supabase timestamp (ISO string or datetime) into a naive local datetime"""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        # fromisoformat only accepts a trailing "Z" from Python 3.11 on
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        # Expiry checks compare against the naive datetime.now()
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+@dataclass(frozen=True)
 class UserProfile:
-    """Complete user profile with authentication and authorization data"""
+    """Complete user profile with authentication and authorization data
+    
+    Profiles are immutable so cached instances can be shared across requests.
+    """
     person_id: str
     email: Optional[str]
     name: Optional[str]
     tier: UserTier
-    permissions: List[Permission]
+    permission_mask: int
     subscription_status: str  # active, expired, cancelled, trial
     subscription_expires: Optional[datetime]
     created_at: datetime
     last_login: Optional[datetime]
     is_active: bool
-    metadata: Dict[str, Any]
+    metadata: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    
+    @property
+    def permissions(self) -> Tuple[Permission, ...]:
+        """Effective permissions as Permission members"""
+        return mask_to_permissions(self.permission_mask)
+    
+    def has(self, permission: Permission) -> bool:
+        """Single bitwise check against the effective permission mask"""
+        return bool(self.permission_mask & PERMISSION_BITS[permission])
 
 
 class RBACSystem:
@@ -84,12 +142,12 @@ class RBACSystem:
     
     # Tier-based permission mapping
     TIER_PERMISSIONS = {
-        UserTier.FREE: [
+        UserTier.FREE: (
             Permission.BASIC_CHAT,
             Permission.PERSONALITY_ANALYSIS,
             Permission.EVENT_LOGGING,
-        ],
-        UserTier.PREMIUM: [
+        ),
+        UserTier.PREMIUM: (
             Permission.BASIC_CHAT,
             Permission.PERSONALITY_ANALYSIS,
             Permission.EVENT_LOGGING,
@@ -97,8 +155,8 @@ class RBACSystem:
             Permission.VOICE_ANALYSIS,
             Permission.PREMIUM_GROUPS,
             Permission.ACCESS_FOURTH_WAY_AGENT,
-        ],
-        UserTier.PRO: [
+        ),
+        UserTier.PRO: (
             Permission.BASIC_CHAT,
             Permission.PERSONALITY_ANALYSIS,
             Permission.EVENT_LOGGING,
@@ -113,8 +171,8 @@ class RBACSystem:
             Permission.ACCESS_FOURTH_WAY_AGENT,
             Permission.ACCESS_HYLOZOICS_AGENT,
             Permission.ACCESS_NEVILLE_AGENT,
-        ],
-        UserTier.MASTER: [
+        ),
+        UserTier.MASTER: (
             # All PRO permissions plus:
             Permission.BASIC_CHAT,
             Permission.PERSONALITY_ANALYSIS,
@@ -134,12 +192,20 @@ class RBACSystem:
             Permission.ACCESS_HYLOZOICS_AGENT,
             Permission.ACCESS_NEVILLE_AGENT,
             Permission.ACCESS_AMANITA_RESEARCH_AGENT,
-        ],
-        UserTier.ADMIN: [
-            # All permissions
-            *list(Permission)
-        ]
+        ),
+        UserTier.ADMIN: tuple(Permission)  # All permissions
+    }
+    
+    # Precomputed tier bitmasks - permission checks are a single AND
+    TIER_PERMISSION_MASKS: Dict[UserTier, int] = {
+        tier: permissions_to_mask(perms) for tier, perms in TIER_PERMISSIONS.items()
     }
+    FREE_PERMISSION_MASK = TIER_PERMISSION_MASKS[UserTier.FREE]
+    
+    # Cache settings (seconds)
+    PROFILE_CACHE_TTL = 60
+    PROFILE_CACHE_MAX_SIZE = 10000
+    REVOCATION_REFRESH_INTERVAL = 30
     
     def __init__(self):
         self.supabase: Client = create_client(
@@ -154,6 +220,18 @@ class RBACSystem:
         self.jwt_secret = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
         self.jwt_algorithm = "HS256"
         
+        # Local session/permission caches - signed JWT claims are trusted
+        # locally, only revocations and profile refreshes touch the database
+        self.profile_cache_ttl = float(os.getenv("RBAC_PROFILE_CACHE_TTL", self.PROFILE_CACHE_TTL))
+        self.revocation_refresh_interval = float(
+            os.getenv("RBAC_REVOCATION_REFRESH_INTERVAL", self.REVOCATION_REFRESH_INTERVAL)
+        )
+        self._profile_cache: Dict[str, Tuple[float, UserProfile]] = {}
+        self._claims_cache: Dict[str, Dict[str, Any]] = {}
+        self._revoked_sessions: Set[str] = set()
+        self._revocations_loaded_at: float = 0.0
+        self._revocation_lock = asyncio.Lock()
+        
         logger.info("RBAC System initialized")
     
     async def create_user_tables(self):
@@ -198,6 +276,7 @@ class RBACSystem:
             device_info JSONB DEFAULT '{}',
             ip_address INET,
             is_active BOOLEAN DEFAULT true,
+            revoked_reason TEXT,
             created_at TIMESTAMPTZ DEFAULT NOW()
         );
         """
@@ -382,7 +461,7 @@ class RBACSystem:
                 await self._update_last_login(user_id)
                 
                 # Create session token
-                session_token = await self._create_session(user_id)
+                session_token = await self._create_session(user_id, profile)
                 
                 logger.info(f"User authenticated: {email}")
                 
@@ -392,8 +471,40 @@ class RBACSystem:
             logger.error(f"Authentication failed: {e}")
             return None
     
-    async def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
-        """Get complete user profile with permissions"""
+    async def get_user_profile(self, user_id: str, use_cache: bool = True) -> Optional[UserProfile]:
+        """Get complete user profile with permissions (cached for a short TTL)"""
+        
+        if use_cache:
+            cached = self._profile_cache.get(user_id)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+        
+        profile = await self._fetch_user_profile(user_id)
+        if profile is not None:
+            self._cache_profile(user_id, profile)
+        return profile
+    
+    def _cache_profile(self, user_id: str, profile: UserProfile):
+        """Store a resolved profile in the local TTL cache"""
+        
+        if len(self._profile_cache) >= self.PROFILE_CACHE_MAX_SIZE:
+            now = time.monotonic()
+            self._profile_cache = {
+                uid: entry for uid, entry in self._profile_cache.items() if entry[0] > now
+            }
+            if len(self._profile_cache) >= self.PROFILE_CACHE_MAX_SIZE:
+                # Still full of live entries - drop the oldest insertion
+                self._profile_cache.pop(next(iter(self._profile_cache)))
+        
+        self._profile_cache[user_id] = (time.monotonic() + self.profile_cache_ttl, profile)
+    
+    def invalidate_user_profile(self, user_id: str):
+        """Drop a cached profile after its tier or subscription changed"""
+        
+        self._profile_cache.pop(user_id, None)
+    
+    async def _fetch_user_profile(self, user_id: str) -> Optional[UserProfile]:
+        """Load user profile from Supabase (table query + auth lookup)"""
         
         try:
             # Get profile data
@@ -423,30 +534,24 @@ class RBACSystem:
             email = user_result.user.email if user_result.user else None
             name = profile_data.get("identity_registry", {}).get("name")
             
-            # Determine permissions based on tier
+            # Tier mask plus any custom permissions OR-ed in for this user
             tier = UserTier(profile_data["tier"])
-            permissions = self.TIER_PERMISSIONS.get(tier, [])
-            
-            # Add any custom permissions
-            custom_permissions = profile_data.get("custom_permissions", [])
-            for perm_str in custom_permissions:
-                try:
-                    permissions.append(Permission(perm_str))
-                except ValueError:
-                    logger.warning(f"Invalid custom permission: {perm_str}")
+            permission_mask = self.TIER_PERMISSION_MASKS.get(tier, 0) | permissions_to_mask(
+                profile_data.get("custom_permissions") or []
+            )
             
             return UserProfile(
                 person_id=profile_data["person_id"],
                 email=email,
                 name=name,
                 tier=tier,
-                permissions=permissions,
+                permission_mask=permission_mask,
                 subscription_status=profile_data["subscription_status"],
-                subscription_expires=profile_data.get("subscription_expires"),
-                created_at=profile_data["created_at"],
-                last_login=profile_data.get("last_login"),
+                subscription_expires=parse_timestamp(profile_data.get("subscription_expires")),
+                created_at=parse_timestamp(profile_data["created_at"]),
+                last_login=parse_timestamp(profile_data.get("last_login")),
                 is_active=profile_data["is_active"],
-                metadata=profile_data.get("metadata", {})
+                metadata=MappingProxyType(dict(profile_data.get("metadata") or {}))
             )
             
         except Exception as e:
@@ -460,16 +565,53 @@ class RBACSystem:
         if not profile or not profile.is_active:
             return False
         
+        return self._check_permission(
+            permission,
+            profile.permission_mask,
+            profile.subscription_status,
+            profile.subscription_expires
+        )
+    
+    async def has_session_permission(self, session_token: str, permission: Permission) -> bool:
+        """Check a permission using only the signed session claims (no database access)"""
+        
+        claims = await self.get_session_claims(session_token)
+        if not claims:
+            return False
+        
+        # Tokens issued before claims were embedded fall back to the profile lookup
+        if "permissions" not in claims:
+            return await self.has_permission(claims.get("user_id"), permission)
+        
+        expires = claims.get("subscription_expires")
+        return self._check_permission(
+            permission,
+            claims["permission_mask"],
+            claims.get("subscription_status", "expired"),
+            datetime.fromtimestamp(expires) if expires else None
+        )
+    
+    def _check_permission(
+        self,
+        permission: Permission,
+        permission_mask: int,
+        subscription_status: str,
+        subscription_expires: Optional[datetime]
+    ) -> bool:
+        """Shared permission rule for profiles and session claims"""
+        
+        bit = PERMISSION_BITS[permission]
+        
         # Check subscription status for paid permissions
-        if permission not in self.TIER_PERMISSIONS[UserTier.FREE]:
-            if profile.subscription_status not in ["active", "trial"]:
+        if not bit & self.FREE_PERMISSION_MASK:
+            if subscription_status not in ["active", "trial"]:
                 return False
             
             # Check if trial/subscription is expired
-            if profile.subscription_expires and datetime.now() > profile.subscription_expires:
+            if subscription_expires and datetime.now() > subscription_expires:
                 return False
         
-        return permission in profile.permissions
+        return bool(permission_mask & bit)
     
     async def upgrade_user_tier(
         self, 
@@ -512,6 +654,9 @@ class RBACSystem:
             if profile_result.error:
                 raise Exception(f"Profile update failed: {profile_result.error}")
             
+            self.invalidate_user_profile(user_id)
+            await self.revoke_user_sessions(user_id)
+            
             # Record subscription history
             history_data = {
                 "user_id": user_id,
@@ -576,6 +721,9 @@ class RBACSystem:
             update_data
         ).eq("user_id", user_id).execute()
         
+        self.invalidate_user_profile(user_id)
+        await self.revoke_user_sessions(user_id)
+        
         # Record expiration in history
         history_data = {
             "user_id": user_id,
@@ -597,23 +745,48 @@ class RBACSystem:
             "last_login": datetime.now().isoformat()
         }).eq("user_id", user_id).execute()
     
-    async def _create_session(self, user_id: str) -> str:
-        """Create session token for user"""
+    async def _create_session(self, user_id: str, profile: Optional[UserProfile] = None) -> str:
+        """Create session token for user
+        
+        The token carries the user's tier, effective permissions and
+        subscription state as signed claims, so requests can be authorized
+        locally without a database round-trip.
+        """
+        
+        if profile is None:
+            profile = await self.get_user_profile(user_id)
+        
+        now = datetime.now()
+        expires_at = now + timedelta(hours=24)
         
         # Generate JWT token
         payload = {
             "user_id": user_id,
-            "exp": datetime.now() + timedelta(hours=24),
-            "iat": datetime.now()
+            "jti": str(uuid.uuid4()),
+            "exp": expires_at,
+            "iat": now
         }
         
+        if profile:
+            subscription_expires = parse_timestamp(profile.subscription_expires)
+            payload.update({
+                "tier": profile.tier.value,
+                "permissions": [perm.value for perm in profile.permissions],
+                "subscription_status": profile.subscription_status,
+                "subscription_expires": (
+                    int(subscription_expires.timestamp()) if subscription_expires else None
+                ),
+                "is_active": profile.is_active
+            })
+        
         session_token = jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
         
         # Store session in database
         session_data = {
+            "session_id": payload["jti"],
             "user_id": user_id,
             "session_token": session_token,
-            "expires_at": (datetime.now() + timedelta(hours=24)).isoformat(),
+            "expires_at": expires_at.isoformat(),
             "is_active": True
         }
         
@@ -621,36 +794,168 @@ class RBACSystem:
         
         return session_token
     
-    async def validate_session(self, session_token: str) -> Optional[str]:
-        """Validate session token and return user_id"""
+    async def _refresh_revocations(self, force: bool = False):
+        """Reload the set of revoked (inactive, unexpired) session ids"""
         
-        try:
-            # Decode JWT
-            payload = jwt.decode(session_token, self.jwt_secret, algorithms=[self.jwt_algorithm])
-            user_id = payload.get("user_id")
-            
-            # Check session in database
-            result = self.service_role_client.table("user_sessions").select("*").eq(
-                "session_token", session_token
-            ).eq("is_active", True).execute()
+        if not force and time.monotonic() - self._revocations_loaded_at < self.revocation_refresh_interval:
+            return
+        
+        async with self._revocation_lock:
+            # Another request may have refreshed while we waited
+            if not force and time.monotonic() - self._revocations_loaded_at < self.revocation_refresh_interval:
+                return
             
-            if result.data and len(result.data) > 0:
-                session = result.data[0]
+            try:
+                result = self.service_role_client.table("user_sessions").select(
+                    "session_id"
+                ).eq("is_active", False).gt(
+                    "expires_at", datetime.now().isoformat()
+                ).execute()
+                
+                self._revoked_sessions = {row["session_id"] for row in (result.data or [])}
                 
-                # Check if session is expired
-                expires_at = datetime.fromisoformat(session["expires_at"].replace('Z', '+00:00'))
-                if datetime.now() < expires_at:
-                    return user_id
-                else:
-                    # Deactivate expired session
-                    self.service_role_client.table("user_sessions").update({
-                        "is_active": False
-                    }).eq("session_id", session["session_id"]).execute()
+            except Exception as e:
+                # Keep the previous set; a stale revocation list beats failing every request
+                logger.warning(f"Revocation list refresh failed: {e}")
             
-            return None
+            self._revocations_loaded_at = time.monotonic()
+    
+    async def get_session_claims(self, session_token: str) -> Optional[Dict[str, Any]]:
+        """Verify a session token locally and return its claims"""
+        
+        payload = self._claims_cache.get(session_token)
+        if payload is None or payload["exp"] <= time.time():
+            try:
+                # Signature and expiry are verified by the JWT library
+                payload = jwt.decode(session_token, self.jwt_secret, algorithms=[self.jwt_algorithm])
+            except jwt.InvalidTokenError:
+                self._claims_cache.pop(session_token, None)
+                return None
             
+            # Token claims carry permission names; resolve the mask once per token
+            if "permissions" in payload:
+                payload["permission_mask"] = permissions_to_mask(payload["permissions"])
+            
+            if len(self._claims_cache) >= self.PROFILE_CACHE_MAX_SIZE:
+                self._claims_cache.clear()
+            self._claims_cache[session_token] = payload
+        
+        await self._refresh_revocations()
+        
+        if payload.get("jti") in self._revoked_sessions:
+            return None
+        if not payload.get("is_active", True):
+            return None
+        
+        return payload
+    
+    async def validate_session(self, session_token: str) -> Optional[str]:
+        """Validate session token and return user_id"""
+        
+        claims = await self.get_session_claims(session_token)
+        return claims.get("user_id") if claims else None
+    
+    async def revoke_session(self, session_token: str) -> bool:
+        """Revoke a session immediately in this process and in the database"""
+        
+        try:
+            payload = jwt.decode(
+                session_token,
+                self.jwt_secret,
+                algorithms=[self.jwt_algorithm],
+                options={"verify_exp": False}
+            )
+        except jwt.InvalidTokenError:
+            return False
+        
+        session_id = payload.get("jti")
+        if session_id:
+            self._revoked_sessions.add(session_id)
+        self._claims_cache.pop(session_token, None)
+        
+        self.service_role_client.table("user_sessions").update({
+            "is_active": False,
+            "revoked_reason": "revoked"
+        }).eq("session_token", session_token).execute()
+        
+        return True
+    
+    async def revoke_user_sessions(self, user_id: str) -> List[str]:
+        """Revoke every live session of a user after their tier or subscription changed
+        
+        Session tokens carry the tier, permissions and subscription state as
+        signed claims, so they must not outlive a change to any of them. The
+        sessions are marked as revoked for a claims change, which lets
+        refresh_session reissue them with the new claims.
+        """
+        
+        result = self.service_role_client.table("user_sessions").select(
+            "session_id"
+        ).eq("user_id", user_id).eq("is_active", True).gt(
+            "expires_at", datetime.now().isoformat()
+        ).execute()
+        
+        session_ids = [row["session_id"] for row in (result.data or [])]
+        if not session_ids:
+            return []
+        
+        self.service_role_client.table("user_sessions").update({
+            "is_active": False,
+            "revoked_reason": "claims_changed"
+        }).in_("session_id", session_ids).execute()
+        
+        self._revoked_sessions.update(session_ids)
+        self._claims_cache = {
+            token: claims for token, claims in self._claims_cache.items()
+            if claims.get("user_id") != user_id
+        }
+        
+        logger.info(f"Revoked {len(session_ids)} session(s) for user {user_id} after a claims change")
+        return session_ids
+    
+    async def refresh_session(self, session_token: str) -> Optional[str]:
+        """Exchange a live session token for one carrying the user's current claims
+        
+        Works for tokens revoked by revoke_user_sessions, so clients whose
+        tier or subscription changed can pick up a new token without logging
+        in again. Tokens that expired, were revoked outright or were already
+        exchanged are refused.
+        """
+        
+        try:
+            payload = jwt.decode(session_token, self.jwt_secret, algorithms=[self.jwt_algorithm])
         except jwt.InvalidTokenError:
             return None
+        
+        session_id = payload.get("jti")
+        user_id = payload.get("user_id")
+        if not session_id or not user_id:
+            return None
+        
+        result = self.service_role_client.table("user_sessions").select(
+            "is_active, revoked_reason"
+        ).eq("session_id", session_id).execute()
+        
+        if not result.data:
+            return None
+        
+        session = result.data[0]
+        if not session["is_active"] and session.get("revoked_reason") != "claims_changed":
+            return None
+        
+        profile = await self.get_user_profile(user_id, use_cache=False)
+        if not profile or not profile.is_active:
+            return None
+        
+        # Retire the old session first so it cannot be exchanged twice
+        self.service_role_client.table("user_sessions").update({
+            "is_active": False,
+            "revoked_reason": "reissued"
+        }).eq("session_id", session_id).execute()
+        self._revoked_sessions.add(session_id)
+        self._claims_cache.pop(session_token, None)
+        
+        return await self._create_session(user_id, profile)
     
     async def get_tier_pricing(self) -> Dict[str, Dict[str, Any]]:
         """Get pricing information for all tiers"""
@@ -714,10 +1019,22 @@ class RBACSystem:
         pass
 
 
+_rbac_instance: Optional[RBACSystem] = None
+
+
+def get_rbac_system() -> RBACSystem:
+    """Shared RBACSystem so profile and revocation caches survive across requests"""
+    global _rbac_instance
+    if _rbac_instance is None:
+        _rbac_instance = RBACSystem()
+    return _rbac_instance
+
+
 # Decorator for permission checking
 def require_permission(permission: Permission):
     """Decorator to check user permissions before executing function"""
     def decorator(func):
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # Extract user_id from args/kwargs
             user_id = kwargs.get('user_id') or (args[1] if len(args) > 1 else None)
@@ -725,7 +1042,7 @@ def require_permission(permission: Permission):
             if not user_id:
                 raise Exception("User ID required for permission check")
             
-            rbac = RBACSystem()
+            rbac = get_rbac_system()
             if not await rbac.has_permission(user_id, permission):
                 raise Exception(f"Permission denied: {permission.value}")
             
@@ -751,7 +1068,7 @@ class SimpleRBAC:
     """Simple RBAC system for Enhanced Telegram Bot"""
     
     def __init__(self):
-        self.users: Dict[str, 'UserProfile'] = {}
+        self.users: Dict[str, 'SimpleUserProfile'] = {}
         logger.info("SimpleRBAC system initialized")
     
     def has_permission(self, user_id: str, permission: Permission) -> bool:
@@ -775,8 +1092,8 @@ class SimpleRBAC:
 
 
 @dataclass
-class UserProfile:
-    """User profile for RBAC system"""
+class SimpleUserProfile:
+    """User profile for SimpleRBAC (kept separate from the Supabase-backed UserProfile)"""
     user_id: str
     name: str
     tier: UserTier
@@ -10,19 +10,26 @@ Features:
 - Vector Mode: AI synthesis and cross-references
 - Multi-language support (Swedish, English, German)
 - Cross-library concept mapping
+- Vector insights memoized per quote/question cluster, popular ones precomputed
 """
 
 import os
+import re
+import time
 import uuid
 import json
+import asyncio
+import statistics
+from collections import Counter, deque
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 from supabase import create_client, Client
 from ..integrations.pinecone_client import PineconeClient
-from openai import OpenAI
+from ..hylozoics_terms import get_term_index
+from openai import AsyncOpenAI
 from loguru import logger
 
 
@@ -33,6 +40,13 @@ class Language(Enum):
     GERMAN = "de"       # Secondary translation
 
 
+LANGUAGE_NAMES = {
+    Language.SWEDISH: "Swedish",
+    Language.ENGLISH: "English",
+    Language.GERMAN: "German",
+}
+
+
 class ResponseMode(Enum):
     """Response modes for the library"""
     SACRED_ONLY = "sacred_only"           # Only exact quotes
@@ -85,6 +99,7 @@ class VectorInsight:
     synthesis_summary: str              # AI synthesis of the concept
     study_suggestions: List[str]        # Recommended follow-up reading
     confidence_score: float             # AI confidence in analysis
+    parse_failed: bool = False          # Fallback returned when no analysis could be produced
     
     def format_for_display(self) -> str:
         """Format insights for user display"""
@@ -110,6 +125,73 @@ class VectorInsight:
         return text
 
 
+# (primary quote id, question cluster, language)
+InsightKey = Tuple[str, str, str]
+
+# Words that don't change what a question is about
+QUESTION_STOPWORDS = {
+    # English
+    "what", "does", "about", "according", "explain", "describe", "tell", "please", "there",
+    "their", "which", "where", "when", "with", "from", "that", "this", "into", "mean", "meaning",
+    "hylozoics", "laurency",
+    # Swedish
+    "vad", "säger", "enligt", "förklara", "beskriv", "innebär", "betyder", "om", "hur", "varför",
+    # German
+    "was", "sagt", "über", "nach", "erkläre", "beschreibe", "bedeutet", "warum", "wie",
+}
+
+
+def question_cluster(question: str) -> str:
+    """Normalized question cluster for insight caching
+
+    Questions that mention the same Hylozoics terms share a cluster
+    ("What is consciousness?" / "Explain consciousness"); otherwise the
+    cluster is the set of content-word stems.
+    """
+    terms = [
+        term for term in get_term_index().find_terms(question)
+        if not any(form.lower() in QUESTION_STOPWORDS for form in term.get('en', []))
+    ]
+    if terms:
+        names = sorted({(term.get('sv') or term.get('en') or [""])[0] for term in terms})
+        return "terms:" + "|".join(names)
+
+    stems = sorted({
+        word[:6] for word in re.findall(r"\w+", question.lower())
+        if len(word) > 3 and word not in QUESTION_STOPWORDS
+    })
+    return "words:" + "|".join(stems)
+
+
+@dataclass
+class InsightMetrics:
+    """Vector insight cache counters and generation latency"""
+    requests: int = 0
+    cache_hits: int = 0
+    shared_inflight: int = 0            # waited on a generation already running
+    generated: int = 0
+    precomputed: int = 0
+    failures: int = 0
+    parse_failures: int = 0             # unparseable responses, cached briefly
+    generation_ms: deque = field(default_factory=lambda: deque(maxlen=500))
+    
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.generation_ms)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "shared_inflight": self.shared_inflight,
+            "hit_rate": (self.cache_hits + self.shared_inflight) / self.requests if self.requests else 0.0,
+            "generated": self.generated,
+            "precomputed": self.precomputed,
+            "failures": self.failures,
+            "parse_failures": self.parse_failures,
+            "generation_p50_ms": statistics.median(latencies) if latencies else 0.0,
+            "generation_p95_ms": p95,
+        }
+
+
 @dataclass
 class DualModeResponse:
     """Combined sacred quote + vector insights"""
@@ -154,6 +236,13 @@ class DualModeResponse:
 class EnhancedHylozoicsLibrary:
     """Enhanced Sacred Library with dual-mode responses and multi-language support"""
     
+    # Vector insight cache settings (seconds)
+    INSIGHT_CACHE_TTL = 7 * 24 * 3600
+    INSIGHT_FAILURE_TTL = 300
+    INSIGHT_CACHE_MAX_SIZE = 2000
+    INSIGHT_PRECOMPUTE_INTERVAL = 900
+    INSIGHT_PRECOMPUTE_TOP_N = 20
+    
     def __init__(self):
         """Initialize the enhanced library"""
         self.supabase_client: Client = create_client(
@@ -162,7 +251,7 @@ class EnhancedHylozoicsLibrary:
         )
         
         self.pinecone_client = PineconeClient()
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         
         # Namespace for sacred quotes (exact)
         self.sacred_namespace = "hylozoics_sacred"
@@ -173,32 +262,29 @@ class EnhancedHylozoicsLibrary:
         self.term_mappings = self._load_term_mappings()
         self.untranslatable_terms = self._load_untranslatable_terms()
         
+        # Vector insights are memoized per (quote, question cluster, language);
+        # the most requested keys are regenerated in the background before they expire
+        self.insight_cache_ttl = float(os.getenv("HYLOZOICS_INSIGHT_CACHE_TTL", self.INSIGHT_CACHE_TTL))
+        self.insight_failure_ttl = float(os.getenv("HYLOZOICS_INSIGHT_FAILURE_TTL", self.INSIGHT_FAILURE_TTL))
+        self.insight_precompute_interval = float(
+            os.getenv("HYLOZOICS_INSIGHT_PRECOMPUTE_INTERVAL", self.INSIGHT_PRECOMPUTE_INTERVAL)
+        )
+        self._insight_cache: Dict[InsightKey, Tuple[float, VectorInsight]] = {}
+        self._insight_inflight: Dict[InsightKey, asyncio.Task] = {}
+        self._insight_hits: Counter = Counter()
+        # Consecutive parse failures per key, for the negative-cache backoff
+        self._insight_failures: Counter = Counter()
+        # Latest request per key, so the background job can regenerate it
+        self._insight_requests: Dict[InsightKey, Tuple[MultiLanguageQuote, List[MultiLanguageQuote], str]] = {}
+        self._precompute_task: Optional[asyncio.Task] = None
+        self.insight_metrics = InsightMetrics()
+        
         logger.info("Enhanced Hylozoics Library initialized with dual-mode support")
     
     def _load_term_mappings(self) -> Dict[str, Dict[str, str]]:
-        """Load cross-language term mappings"""
-        return {
-            "medvetenhet": {
-                "en": "consciousness",
-                "de": "Bewusstsein",
-                "concept": "fundamental property of all existence"
-            },
-            "monad": {
-                "en": "monad", 
-                "de": "Monade",
-                "concept": "ultimate unit of consciousness"
-            },
-            "hölje": {
-                "en": "envelope",
-                "de": "Hülle", 
-                "concept": "temporary vehicle of consciousness"
-            },
-            "rike": {
-                "en": "kingdom",
-                "de": "Reich",
-                "concept": "stage of evolutionary development"
-            }
-        }
+        """Load cross-language term mappings from the multilingual term index"""
+        self.term_index = get_term_index()
+        return self.term_index.term_mappings()
     
     def _load_untranslatable_terms(self) -> List[str]:
         """Terms that lose meaning in translation"""
@@ -237,7 +323,7 @@ class EnhancedHylozoicsLibrary:
             vector_insights = None
             if response_mode in [ResponseMode.DUAL_MODE, ResponseMode.VECTOR_ONLY]:
                 vector_insights = await self._generate_vector_insights(
-                    primary_quote, user_question, related_quotes
+                    primary_quote, user_question, related_quotes, language
                 )
             
             return DualModeResponse(
@@ -259,8 +345,9 @@ class EnhancedHylozoicsLibrary:
     ) -> List[MultiLanguageQuote]:
         """Search for exact quotes in sacred namespace"""
         try:
-            # Generate query embedding
-            query_embedding = await self.pinecone_client.get_embedding(query)
+            # Embed the query together with its Swedish/German term forms so it
+            # lands near quotes in every language
+            query_embedding = await self.pinecone_client.get_embedding(self.term_index.expand(query))
             
             # Search in sacred namespace only
             search_results = await self.pinecone_client.search_similar(
@@ -312,33 +399,203 @@ class EnhancedHylozoicsLibrary:
         self,
         primary_quote: MultiLanguageQuote,
         user_question: str,
-        related_quotes: List[MultiLanguageQuote]
+        related_quotes: List[MultiLanguageQuote],
+        language: Language = Language.ENGLISH
     ) -> VectorInsight:
-        """Generate AI insights using vector analysis"""
+        """Vector insights for a quote, memoized per (quote, question cluster, language)"""
+        self._ensure_insight_precompute()
+        self.insight_metrics.requests += 1
+        
+        key: InsightKey = (primary_quote.quote_id, question_cluster(user_question), language.value)
+        self._insight_hits[key] += 1
+        self._remember_insight_request(key, primary_quote, related_quotes, user_question)
+        
+        cached = self._insight_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.insight_metrics.cache_hits += 1
+            return cached[1]
+        
+        # Concurrent requests for the same key share one generation
+        task = self._insight_inflight.get(key)
+        if task:
+            self.insight_metrics.shared_inflight += 1
+        else:
+            task = self._start_insight_generation(key, primary_quote, user_question, related_quotes, language)
+        
         try:
-            # Search vector namespace for broader context
-            query_embedding = await self.pinecone_client.get_embedding(user_question)
-            
-            vector_results = await self.pinecone_client.search_similar(
-                query_embedding=query_embedding,
-                namespace=self.vector_namespace,
-                top_k=10
+            return await asyncio.shield(task)
+        except Exception as e:
+            logger.error(f"Error generating vector insights: {e}")
+            return VectorInsight(
+                concept_connections=[],
+                cross_references=[],
+                synthesis_summary="Insights temporarily unavailable",
+                study_suggestions=[],
+                confidence_score=0.0,
+                parse_failed=True
             )
+    
+    def _start_insight_generation(
+        self,
+        key: InsightKey,
+        primary_quote: MultiLanguageQuote,
+        user_question: str,
+        related_quotes: List[MultiLanguageQuote],
+        language: Language
+    ) -> asyncio.Task:
+        task = asyncio.create_task(
+            self._generate_and_cache_insights(key, primary_quote, user_question, related_quotes, language)
+        )
+        self._insight_inflight[key] = task
+        task.add_done_callback(lambda _: self._insight_inflight.pop(key, None))
+        return task
+    
+    async def _generate_and_cache_insights(
+        self,
+        key: InsightKey,
+        primary_quote: MultiLanguageQuote,
+        user_question: str,
+        related_quotes: List[MultiLanguageQuote],
+        language: Language
+    ) -> VectorInsight:
+        start = time.perf_counter()
+        try:
+            insight = await self._synthesize_vector_insights(primary_quote, user_question, related_quotes, language)
+        except Exception:
+            self.insight_metrics.failures += 1
+            raise
+        self.insight_metrics.generated += 1
+        self.insight_metrics.generation_ms.append((time.perf_counter() - start) * 1000)
+        
+        if not insight.parse_failed:
+            self._insight_failures.pop(key, None)
+            self._cache_insight(key, insight)
+        else:
+            # Parse failures are cached briefly, backing off while they repeat,
+            # so neither requests nor the precompute job call the model every time
+            self.insight_metrics.parse_failures += 1
+            self._insight_failures[key] += 1
+            backoff = 2 ** min(self._insight_failures[key] - 1, 16)
+            self._cache_insight(key, insight, min(self.insight_failure_ttl * backoff, self.insight_cache_ttl))
+        return insight
+    
+    def _cache_insight(self, key: InsightKey, insight: VectorInsight, ttl: Optional[float] = None):
+        """Store an insight in the local TTL cache (default TTL: insight_cache_ttl)"""
+        if len(self._insight_cache) >= self.INSIGHT_CACHE_MAX_SIZE:
+            now = time.monotonic()
+            self._insight_cache = {
+                k: entry for k, entry in self._insight_cache.items() if entry[0] > now
+            }
+            if len(self._insight_cache) >= self.INSIGHT_CACHE_MAX_SIZE:
+                # Still full of live entries - drop the oldest insertion
+                self._insight_cache.pop(next(iter(self._insight_cache)))
+        
+        self._insight_cache[key] = (time.monotonic() + (ttl if ttl is not None else self.insight_cache_ttl), insight)
+    
+    def _remember_insight_request(self, key: InsightKey, primary_quote: MultiLanguageQuote,
+                                  related_quotes: List[MultiLanguageQuote], user_question: str):
+        if key not in self._insight_requests and len(self._insight_requests) >= self.INSIGHT_CACHE_MAX_SIZE:
+            # Forget the least requested key
+            coldest = min(self._insight_requests, key=lambda k: self._insight_hits[k])
+            self._insight_requests.pop(coldest)
+            self._insight_hits.pop(coldest, None)
+            self._insight_failures.pop(coldest, None)
+        self._insight_requests[key] = (primary_quote, related_quotes, user_question)
+    
+    def _ensure_insight_precompute(self):
+        """Start the background precompute job on first use (needs a running loop)"""
+        if self.insight_precompute_interval <= 0:
+            return
+        if self._precompute_task is None or self._precompute_task.done():
+            self._precompute_task = asyncio.create_task(self._insight_precompute_loop())
+    
+    async def _insight_precompute_loop(self):
+        while True:
+            await asyncio.sleep(self.insight_precompute_interval)
+            try:
+                await self.precompute_popular_insights()
+            except Exception as e:
+                logger.warning(f"Insight precompute failed: {e}")
+    
+    async def precompute_popular_insights(self, top_n: Optional[int] = None) -> int:
+        """Generate insights for the most requested keys that are missing or about to expire
+        
+        Returns the number of insights generated.
+        """
+        top_n = top_n or self.INSIGHT_PRECOMPUTE_TOP_N
+        # Anything expiring before the next run is refreshed now
+        now = time.monotonic()
+        refresh_before = now + self.insight_precompute_interval
+        
+        generated = 0
+        for key, _ in self._insight_hits.most_common(top_n):
+            cached = self._insight_cache.get(key)
+            if (cached and cached[0] > refresh_before) or key in self._insight_inflight or key not in self._insight_requests:
+                continue
+            # Keys whose last generation failed to parse wait out their backoff
+            if key in self._insight_failures and cached and cached[0] > now:
+                continue
             
-            # Create context for AI synthesis
-            context_texts = [primary_quote.original_text, primary_quote.get_text(Language.ENGLISH)]
-            context_texts.extend([q.get_text(Language.ENGLISH) for q in related_quotes])
-            
-            # Add vector search results for broader context
-            for result in vector_results[:5]:  # Top 5 for context
-                if "text" in result["metadata"]:
-                    context_texts.append(result["metadata"]["text"])
-            
-            # Generate synthesis using OpenAI
-            synthesis_prompt = f"""You are analyzing Hylozoics teachings by Henry T. Laurency.
+            primary_quote, related_quotes, user_question = self._insight_requests[key]
+            try:
+                await self._start_insight_generation(
+                    key, primary_quote, user_question, related_quotes, Language(key[2])
+                )
+            except Exception as e:
+                logger.warning(f"Could not precompute insights for {key[0]}: {e}")
+                continue
+            generated += 1
+            self.insight_metrics.precomputed += 1
+        
+        if generated:
+            logger.info(f"Precomputed {generated} vector insights")
+        return generated
+    
+    def get_insight_stats(self) -> Dict[str, Any]:
+        """Insight cache metrics for the commands layer"""
+        now = time.monotonic()
+        stats = self.insight_metrics.summary()
+        stats["cache_size"] = sum(1 for expires, _ in self._insight_cache.values() if expires > now)
+        stats["tracked_keys"] = len(self._insight_requests)
+        
+        quote_hits: Counter = Counter()
+        for (quote_id, _, _), hits in self._insight_hits.items():
+            quote_hits[quote_id] += hits
+        stats["top_quotes"] = quote_hits.most_common(5)
+        return stats
+    
+    async def _synthesize_vector_insights(
+        self,
+        primary_quote: MultiLanguageQuote,
+        user_question: str,
+        related_quotes: List[MultiLanguageQuote],
+        language: Language
+    ) -> VectorInsight:
+        """Vector search for context plus one GPT synthesis call (raises on API errors)"""
+        # Search vector namespace for broader context
+        query_embedding = await self.pinecone_client.get_embedding(user_question)
+        
+        vector_results = await self.pinecone_client.search_similar(
+            query_embedding=query_embedding,
+            namespace=self.vector_namespace,
+            top_k=10
+        )
+        
+        # Create context for AI synthesis
+        context_texts = [primary_quote.original_text, primary_quote.get_text(Language.ENGLISH)]
+        context_texts.extend([q.get_text(Language.ENGLISH) for q in related_quotes])
+        
+        # Add vector search results for broader context
+        for result in vector_results[:5]:  # Top 5 for context
+            if "text" in result["metadata"]:
+                context_texts.append(result["metadata"]["text"])
+        
+        # Generate synthesis using OpenAI
+        synthesis_prompt = f"""You are analyzing Hylozoics teachings by Henry T. Laurency.
 
 Primary Quote: "{primary_quote.get_text(Language.ENGLISH)}"
 User Question: "{user_question}"
+Answer Language: {LANGUAGE_NAMES[language]}
 
 Context from Hylozoics corpus:
 {chr(10).join(context_texts[:8])}  # Limit context
@@ -353,46 +610,37 @@ Provide insights in this JSON format:
 
 Use ONLY Hylozoics terminology. Be concise and accurate."""
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a Hylozoics analysis assistant. Provide structured insights using only Laurency's terminology."},
-                    {"role": "user", "content": synthesis_prompt}
-                ],
-                max_tokens=300,
-                temperature=0.2  # Low temperature for consistency
-            )
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are a Hylozoics analysis assistant. Provide structured insights using only Laurency's terminology."},
+                {"role": "user", "content": synthesis_prompt}
+            ],
+            max_tokens=300,
+            temperature=0.2  # Low temperature for consistency
+        )
+        
+        # Parse JSON response
+        try:
+            insights_data = json.loads(response.choices[0].message.content)
             
-            # Parse JSON response
-            try:
-                insights_data = json.loads(response.choices[0].message.content)
-                
-                return VectorInsight(
-                    concept_connections=insights_data.get("concept_connections", []),
-                    cross_references=[],  # Could be populated from vector results
-                    synthesis_summary=insights_data.get("synthesis_summary", ""),
-                    study_suggestions=insights_data.get("study_suggestions", []),
-                    confidence_score=insights_data.get("confidence_score", 0.5)
-                )
-                
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                return VectorInsight(
-                    concept_connections=[],
-                    cross_references=[],
-                    synthesis_summary="Analysis temporarily unavailable",
-                    study_suggestions=[],
-                    confidence_score=0.3
-                )
+            return VectorInsight(
+                concept_connections=insights_data.get("concept_connections", []),
+                cross_references=[],  # Could be populated from vector results
+                synthesis_summary=insights_data.get("synthesis_summary", ""),
+                study_suggestions=insights_data.get("study_suggestions", []),
+                confidence_score=insights_data.get("confidence_score", 0.5)
+            )
             
-        except Exception as e:
-            logger.error(f"Error generating vector insights: {e}")
+        except json.JSONDecodeError:
+            # Fallback if JSON parsing fails
             return VectorInsight(
                 concept_connections=[],
                 cross_references=[],
-                synthesis_summary="Insights temporarily unavailable",
+                synthesis_summary="Analysis temporarily unavailable",
                 study_suggestions=[],
-                confidence_score=0.0
+                confidence_score=0.3,
+                parse_failed=True
             )
     
     async def add_multilang_quote(self, quote: MultiLanguageQuote) -> bool:
@@ -0,0 +1,163 @@
+"""
+Sacred Library Browse Catalog
+=============================
+In-memory navigation structures for the Telegram browse and study menus:
+
+- per-language and per-book quote lists in reading order
+- study topic -> quote lists (ranked once with BM25 at build time)
+- a shuffled ring of all quotes for "random quote"
+
+Everything is built once at startup from the lexical index (which already
+holds every quote), so paging through an inline keyboard is a list slice
+with no disk or database access.
+"""
+
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from loguru import logger
+
+from core.sacred_library_retrieval import BM25Index, load_or_build_index
+from core.hylozoics_terms import get_term_index
+
+SACRED_DIR = Path(__file__).parent.parent.parent / "sacred_library_files"
+
+# Study room topics and the search terms that define them
+STUDY_TOPICS = {
+    'consciousness': 'consciousness awareness mind',
+    'development': 'development evolution growth',
+    'mind': 'mind thinking thought mental',
+    'love': 'love emotion feeling heart',
+    'purpose': 'purpose will goal aim',
+    'energy': 'energy power force',
+    'reincarnation': 'reincarnation rebirth incarnation',
+    'cosmic': 'cosmic universe order law',
+}
+
+# Quotes kept per topic - enough for many pages of "More Quotes"
+TOPIC_QUOTES = 60
+
+
+@dataclass
+class CatalogPage:
+    """One page of a catalog list"""
+    items: List[Any]
+    page: int
+    total_pages: int
+    total: int
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 0
+
+    @property
+    def has_next(self) -> bool:
+        return self.page + 1 < self.total_pages
+
+
+def paginate(items: List[Any], page: int, page_size: int) -> CatalogPage:
+    """Slice out one page; out-of-range pages are clamped"""
+    total_pages = max(1, -(-len(items) // page_size))
+    page = min(max(page, 0), total_pages - 1)
+    start = page * page_size
+    return CatalogPage(items[start:start + page_size], page, total_pages, len(items))
+
+
+class BrowseCatalog:
+    """Ordered quote lists for browsing, held in memory"""
+
+    def __init__(self, quotes: List[Dict[str, Any]], index: Optional[BM25Index] = None,
+                 seed: Optional[int] = None):
+        self.quotes = quotes
+
+        def reading_order(i: int) -> Tuple[str, str, str]:
+            metadata = quotes[i]['metadata']
+            return (metadata.get('language', ''), metadata.get('chapter', ''), metadata.get('quote_id') or '')
+
+        ordered = sorted(range(len(quotes)), key=reading_order)
+
+        self.languages: Dict[str, List[int]] = {}
+        self.books: Dict[str, List[int]] = {}
+        for i in ordered:
+            metadata = quotes[i]['metadata']
+            language = metadata.get('language', 'unknown')
+            self.languages.setdefault(language, []).append(i)
+            self.books.setdefault(f"{language}/{metadata.get('chapter', 'Unknown')}", []).append(i)
+        # Position in book_names is the stable id used in callback data
+        self.book_names: List[str] = list(self.books)
+
+        self.topics: Dict[str, List[int]] = {}
+        if index is not None and index.docs is quotes:
+            terms = get_term_index()
+            for topic, search_terms in STUDY_TOPICS.items():
+                ranked = index.score_query(search_terms, extra_terms=terms.expansion_terms(search_terms))
+                self.topics[topic] = [doc for doc, _ in ranked[:TOPIC_QUOTES]]
+
+        self._ring = list(range(len(quotes)))
+        self._random = random.Random(seed)
+        self._random.shuffle(self._ring)
+        self._ring_cursors: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    @classmethod
+    def build(cls, sacred_dir: Path = SACRED_DIR) -> "BrowseCatalog":
+        index = load_or_build_index(sacred_dir)
+        if index is None:
+            return cls([])
+        catalog = cls(index.docs, index)
+        logger.info(f"Browse catalog: {len(catalog)} quotes, {len(catalog.languages)} languages, "
+                    f"{len(catalog.books)} books, {len(catalog.topics)} topics")
+        return catalog
+
+    def _quotes_page(self, ids: List[int], page: int, page_size: int) -> CatalogPage:
+        result = paginate(ids, page, page_size)
+        result.items = [self.quotes[i] for i in result.items]
+        return result
+
+    def language_page(self, language: str, page: int = 0, page_size: int = 3) -> CatalogPage:
+        return self._quotes_page(self.languages.get(language, []), page, page_size)
+
+    def book_page(self, book_number: int, page: int = 0, page_size: int = 3) -> CatalogPage:
+        if not 0 <= book_number < len(self.book_names):
+            return paginate([], 0, page_size)
+        return self._quotes_page(self.books[self.book_names[book_number]], page, page_size)
+
+    def books_page(self, page: int = 0, page_size: int = 10) -> CatalogPage:
+        """Page of (book number, "language/chapter", quote count)"""
+        entries = [(number, name, len(self.books[name])) for number, name in enumerate(self.book_names)]
+        return paginate(entries, page, page_size)
+
+    def topic_page(self, topic: str, page: int = 0, page_size: int = 3) -> CatalogPage:
+        return self._quotes_page(self.topics.get(topic, []), page, page_size)
+
+    def random_quote(self, reader: str = "") -> Optional[Dict[str, Any]]:
+        """Next quote on the shuffled ring; each reader walks it from their own start"""
+        if not self._ring:
+            return None
+        cursor = self._ring_cursors.get(reader)
+        if cursor is None:
+            cursor = self._random.randrange(len(self._ring))
+        self._ring_cursors[reader] = (cursor + 1) % len(self._ring)
+        return self.quotes[self._ring[cursor]]
+
+
+_browse_catalog: Optional[BrowseCatalog] = None
+_browse_catalog_lock = threading.Lock()
+
+
+def get_browse_catalog() -> BrowseCatalog:
+    """Shared browse catalog, built on first use (normally when the bot starts)"""
+    global _browse_catalog
+    if _browse_catalog is None:
+        with _browse_catalog_lock:
+            if _browse_catalog is None:
+                try:
+                    _browse_catalog = BrowseCatalog.build()
+                except Exception as e:
+                    logger.error(f"Could not build browse catalog: {e}")
+                    _browse_catalog = BrowseCatalog([])
+    return _browse_catalog
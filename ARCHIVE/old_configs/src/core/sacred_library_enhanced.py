@@ -1,15 +1,17 @@
 """
 Enhanced Sacred Library with Vector Search + Exact Quote Retrieval
 ================================================================
-Two-stage search: Vector understanding → Exact quote retrieval
+Hybrid search: BM25 lexical + vector search in parallel, fused with
+reciprocal-rank fusion. LLM query expansion is optional and cached.
 """
 
+import asyncio
 import json
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from loguru import logger
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 try:
     from integrations.pinecone_client import PineconeClient
@@ -19,12 +21,22 @@ except ImportError:
     logger.warning("Pinecone not available, using local search only")
 
 from core.sacred_library_local import local_sacred_library
+from core.sacred_library_retrieval import BM25Index, load_or_build_index, reciprocal_rank_fusion
+from core.hylozoics_terms import get_term_index
 
 class EnhancedSacredLibrary:
     """Enhanced Sacred Library with vector search + exact quotes"""
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
+    EXPANSION_CACHE_MAX_SIZE = 1000
+    
+    def __init__(self, use_llm_expansion: Optional[bool] = None):
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
+        
+        # LLM query expansion costs a GPT round-trip per new query, so it is opt-in
+        if use_llm_expansion is None:
+            use_llm_expansion = os.getenv("SACRED_LLM_QUERY_EXPANSION", "false").lower() == "true"
+        self.use_llm_expansion = use_llm_expansion
+        self._expansion_cache: Dict[str, Dict[str, Any]] = {}
         
         # Only initialize Pinecone if available and API key is set
         self.pinecone_client = None
@@ -38,6 +50,19 @@ class EnhancedSacredLibrary:
         project_root = Path(__file__).parent.parent.parent
         self.sacred_dir = project_root / "sacred_library_files"
         
+        # BM25 index, loaded (or built) on first search
+        self.lexical_index: Optional[BM25Index] = None
+        self._lexical_index_loaded = False
+        
+    def _get_lexical_index(self) -> Optional[BM25Index]:
+        if not self._lexical_index_loaded:
+            self._lexical_index_loaded = True
+            try:
+                self.lexical_index = load_or_build_index(self.sacred_dir)
+            except Exception as e:
+                logger.warning(f"BM25 index unavailable, using keyword scan: {e}")
+        return self.lexical_index
+        
     async def enhanced_search(self, query: str, limit: int = 3, target_language: str = "en") -> List[Dict[str, Any]]:
         """
         Enhanced search with vector understanding + exact quote retrieval
@@ -50,25 +75,34 @@ class EnhancedSacredLibrary:
         try:
             logger.info(f"Enhanced Sacred Library search: '{query}' (target: {target_language})")
             
-            # Stage 1: Understand the query semantically
-            search_strategy = await self._analyze_query(query)
+            candidates = limit * 4
+            
+            # Stage 1: Vector search starts right away - it only needs the raw query
+            vector_task = None
+            if self.pinecone_client:
+                vector_task = asyncio.create_task(self._vector_search(query, {}, candidates))
+            
+            # Stage 2: Query expansion - Hylozoics term dictionary, or (cached) LLM analysis when enabled
+            if self.use_llm_expansion:
+                search_strategy = await self._analyze_query(query)
+            else:
+                search_strategy = self._term_strategy(query)
             logger.info(f"Search strategy: {search_strategy}")
             
-            # Stage 2: Vector search (if available)
+            # Stage 3: BM25 lexical search, in parallel with the vector search
+            enhanced_keywords = search_strategy.get('keywords', [])
+            local_results = await self._lexical_search(query, enhanced_keywords, candidates)
+            logger.info(f"Lexical search found {len(local_results)} results")
+            
             vector_results = []
-            if self.pinecone_client:
+            if vector_task:
                 try:
-                    vector_results = await self._vector_search(query, search_strategy, limit * 2)
+                    vector_results = await vector_task
                     logger.info(f"Vector search found {len(vector_results)} results")
                 except Exception as e:
                     logger.warning(f"Vector search failed: {e}")
             
-            # Stage 3: Enhanced local search with better keywords
-            enhanced_keywords = search_strategy.get('keywords', [])
-            local_results = await self._enhanced_local_search(query, enhanced_keywords, limit * 2)
-            logger.info(f"Enhanced local search found {len(local_results)} results")
-            
-            # Stage 4: Combine and rank results
+            # Stage 4: Reciprocal-rank fusion
             combined_results = self._combine_and_rank_results(vector_results, local_results, search_strategy)
             
             # Stage 5: Filter by language preference and limit
@@ -82,10 +116,18 @@ class EnhancedSacredLibrary:
             # Fallback to basic local search
             return local_sacred_library.search_quotes(query, limit=limit)
     
+    def _term_strategy(self, query: str) -> Dict[str, Any]:
+        """Search strategy from the multilingual term dictionary - no network call"""
+        return {"type": "general", "keywords": get_term_index().expansion_terms(query), "focus": query}
+    
     async def _analyze_query(self, query: str) -> Dict[str, Any]:
         """Analyze the query to understand search intent and generate better keywords"""
         if not self.openai_client:
-            return {"type": "general", "keywords": query.lower().split()}
+            return self._term_strategy(query)
+        
+        cache_key = " ".join(query.lower().split())
+        if cache_key in self._expansion_cache:
+            return self._expansion_cache[cache_key]
         
         try:
             analysis_prompt = f"""Analyze this question about Hylozoics/Henry T. Laurency and provide search strategy:
@@ -103,7 +145,7 @@ Examples:
 
 Respond only with valid JSON:"""
 
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-4-turbo-preview",
                 messages=[{"role": "user", "content": analysis_prompt}],
                 temperature=0.3,
@@ -111,11 +153,16 @@ Respond only with valid JSON:"""
             )
             
             result = json.loads(response.choices[0].message.content.strip())
+            
+            if len(self._expansion_cache) >= self.EXPANSION_CACHE_MAX_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                self._expansion_cache.pop(next(iter(self._expansion_cache)))
+            self._expansion_cache[cache_key] = result
             return result
             
         except Exception as e:
             logger.warning(f"Query analysis failed: {e}")
-            return {"type": "general", "keywords": query.lower().split(), "focus": query}
+            return self._term_strategy(query)
     
     async def _vector_search(self, query: str, strategy: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
         """Use Pinecone vector search to find semantically similar content"""
@@ -154,8 +201,20 @@ Respond only with valid JSON:"""
             logger.error(f"Vector search error: {e}")
             return []
     
+    async def _lexical_search(self, query: str, keywords: List[str], limit: int) -> List[Dict[str, Any]]:
+        """BM25 search over the prebuilt index; keyword scan if there is no index"""
+        index = await asyncio.to_thread(self._get_lexical_index)
+        if index is None:
+            return await self._enhanced_local_search(query, keywords, limit)
+        
+        try:
+            return await asyncio.to_thread(index.search, query, None, limit, keywords)
+        except Exception as e:
+            logger.error(f"BM25 search error: {e}")
+            return await self._enhanced_local_search(query, keywords, limit)
+    
     async def _enhanced_local_search(self, query: str, keywords: List[str], limit: int) -> List[Dict[str, Any]]:
-        """Enhanced local search using better keywords from query analysis"""
+        """Keyword scan fallback using the local library"""
         try:
             # Use both original query and enhanced keywords
             all_terms = [query] + keywords
@@ -183,31 +242,15 @@ Respond only with valid JSON:"""
             return []
     
     def _combine_and_rank_results(self, vector_results: List[Dict], local_results: List[Dict], strategy: Dict) -> List[Dict]:
-        """Combine vector and local results, ranking by relevance"""
-        all_results = []
-        
-        # Add vector results with high priority
-        for result in vector_results:
-            result['source'] = 'vector'
-            result['priority'] = 2.0  # High priority for vector matches
-            all_results.append(result)
-        
-        # Add local results
-        for result in local_results:
-            result['source'] = 'local'
-            result['priority'] = 1.0  # Normal priority for keyword matches
-            all_results.append(result)
-        
-        # Remove duplicates (prefer vector results)
-        seen = set()
-        unique_results = []
-        for result in sorted(all_results, key=lambda x: x['priority'], reverse=True):
-            quote_id = result.get('metadata', {}).get('quote_id', result.get('title', ''))
-            if quote_id not in seen:
-                seen.add(quote_id)
-                unique_results.append(result)
-        
-        return unique_results
+        """Fuse vector and lexical rankings with reciprocal-rank fusion"""
+        fused = reciprocal_rank_fusion({'vector': vector_results, 'local': local_results})
+        
+        for result in fused:
+            # A result found by both retrievers is reported as 'hybrid'
+            result['source'] = result['sources'][0] if len(result['sources']) == 1 else 'hybrid'
+            result['priority'] = result['rrf_score']
+        
+        return fused
     
     def _filter_and_format_results(self, results: List[Dict], target_language: str, limit: int) -> List[Dict]:
         """Filter by language preference and format for consistent output"""
@@ -240,7 +283,9 @@ Respond only with valid JSON:"""
                     'author': result.get('metadata', {}).get('author', 'Henry T. Laurency'),
                     'source_book': result.get('metadata', {}).get('source_book', 'Hylozoics'),
                     'search_source': result.get('source', 'local'),
-                    'similarity_score': result.get('metadata', {}).get('similarity_score', 0.0)
+                    'similarity_score': result.get('metadata', {}).get('similarity_score', 0.0),
+                    'bm25_score': result.get('bm25_score', 0.0),
+                    'rrf_score': round(result.get('rrf_score', 0.0), 6)
                 }
             }
             formatted_results.append(formatted_result)
@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
+from core.sacred_library_packed import PackedSacredLibrary, quote_to_result
+
 class LocalSacredLibrary:
     """Local Sacred Library search when Supabase is unavailable"""
     
@@ -19,11 +21,54 @@ class LocalSacredLibrary:
         project_root = Path(__file__).parent.parent.parent
         self.sacred_dir = project_root / "sacred_library_files"
         self.quotes_dir = self.sacred_dir / "quotes"
+        self.packed_dir = self.sacred_dir / "packed"
         self.cache = {}  # Simple in-memory cache
+        self._packed: Optional[PackedSacredLibrary] = None
+        self._packed_mtime: Optional[int] = None
+        self._packed_stale = False
+    
+    def _packed_library(self) -> Optional[PackedSacredLibrary]:
+        """Packed library if it has been built (scripts/pack_sacred_library.py) and is current
+        
+        Quote files added after the last pack make the packed store stale;
+        searches then fall back to the quote files until it is repacked.
+        """
+        if not PackedSacredLibrary.is_current(self.packed_dir, self.quotes_dir):
+            if self._packed is not None or PackedSacredLibrary.exists(self.packed_dir):
+                if not self._packed_stale:
+                    logger.warning("Packed Sacred Library is older than the quote files, "
+                                   "using quote files until it is repacked")
+                    self._packed_stale = True
+                self._close_packed()
+            return None
+        self._packed_stale = False
+        
+        manifest_mtime = (self.packed_dir / "manifest.json").stat().st_mtime_ns
+        if self._packed is not None and manifest_mtime != self._packed_mtime:
+            # Repacked since it was opened
+            self._close_packed()
+        if self._packed is None:
+            try:
+                self._packed = PackedSacredLibrary(self.packed_dir)
+                self._packed_mtime = manifest_mtime
+            except Exception as e:
+                logger.warning(f"Packed Sacred Library unusable, falling back to quote files: {e}")
+        return self._packed
+    
+    def _close_packed(self):
+        if self._packed is not None:
+            self._packed.close()
+            self._packed = None
         
     def search_quotes(self, query: str, language: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
         """Search quotes locally"""
         try:
+            packed = self._packed_library()
+            if packed:
+                results = packed.search_quotes(query, language=language, limit=limit)
+                logger.info(f"Local Sacred Library search for '{query}': found {len(results)} results")
+                return results
+            
             # Extract search terms (longer words)
             words = [w.lower() for w in re.findall(r'\b\w{4,}\b', query)]
             if not words:
@@ -53,20 +98,7 @@ class LocalSacredLibrary:
                     quote_text = quote_data.get('text', '').lower()
                     if any(word in quote_text for word in words):
                         # Format for compatibility with AI engine
-                        result = {
-                            'title': f"Hylozoics Quote {quote_data.get('quote_id', 'Unknown')}",
-                            'content': quote_data.get('text', ''),
-                            'metadata': {
-                                'quote_id': quote_data.get('quote_id'),
-                                'chapter': quote_data.get('chapter', 'Unknown'),
-                                'language': quote_data.get('language', 'unknown'),
-                                'author': quote_data.get('author', 'Henry T. Laurency'),
-                                'source_book': quote_data.get('source_book', 'Hylozoics'),
-                                'tradition': quote_data.get('tradition', 'Hylozoics'),
-                                'verified': quote_data.get('verified', True)
-                            }
-                        }
-                        results.append(result)
+                        results.append(quote_to_result(quote_data))
                         
                         if len(results) >= limit:
                             break
@@ -87,6 +119,10 @@ class LocalSacredLibrary:
         try:
             import random
             
+            packed = self._packed_library()
+            if packed:
+                return packed.get_random_quotes(limit)
+            
             quote_files = list(self.quotes_dir.glob("*.json"))
             if not quote_files:
                 return []
@@ -100,20 +136,7 @@ class LocalSacredLibrary:
                     with open(quote_file, 'r', encoding='utf-8') as f:
                         quote_data = json.load(f)
                     
-                    result = {
-                        'title': f"Hylozoics Quote {quote_data.get('quote_id', 'Unknown')}",
-                        'content': quote_data.get('text', ''),
-                        'metadata': {
-                            'quote_id': quote_data.get('quote_id'),
-                            'chapter': quote_data.get('chapter', 'Unknown'),
-                            'language': quote_data.get('language', 'unknown'),
-                            'author': quote_data.get('author', 'Henry T. Laurency'),
-                            'source_book': quote_data.get('source_book', 'Hylozoics'),
-                            'tradition': quote_data.get('tradition', 'Hylozoics'),
-                            'verified': quote_data.get('verified', True)
-                        }
-                    }
-                    results.append(result)
+                    results.append(quote_to_result(quote_data))
                     
                 except Exception as e:
                     logger.debug(f"Error processing random quote file {quote_file}: {e}")
@@ -127,6 +150,9 @@ class LocalSacredLibrary:
     
     def is_available(self) -> bool:
         """Check if local Sacred Library is available"""
+        packed = self._packed_library()
+        if packed:
+            return len(packed) > 0
         return self.quotes_dir.exists() and any(self.quotes_dir.glob("*.json"))
 
 # Global instance
@@ -0,0 +1,339 @@
+"""
+Sacred Library Packed Store
+===========================
+Packed, memory-mapped quote library replacing one JSON file per quote.
+
+Layout (one set of files per language in sacred_library_files/packed/):
+- <lang>.blob          append-only UTF-8 text: quote text + "\n", quote_id + "\n",
+                       and a compact JSON line with the per-quote metadata
+- <lang>.idx           header + fixed-width records pointing into the blob
+- <lang>.strings.json  string table for repeated fields (book, chapter, author, tradition)
+- manifest.json        format version and quote counts per language
+
+A full scan reads one mmap per language instead of opening and parsing
+thousands of JSON files.
+"""
+
+import json
+import mmap
+import random
+import re
+import struct
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from loguru import logger
+
+FORMAT_VERSION = 1
+INDEX_MAGIC = b"SLIDX001"
+
+# text_off, text_len, qid_off, qid_len, meta_off, meta_len,
+# book, chapter, author, tradition (string table ids), verified
+RECORD = struct.Struct("<QIQHQIIIIIB")
+HEADER = struct.Struct("<8sI")
+
+STRING_FIELDS = ("source_book", "chapter", "author", "tradition")
+DEFAULTS = {
+    "source_book": "Hylozoics",
+    "chapter": "Unknown",
+    "author": "Henry T. Laurency",
+    "tradition": "Hylozoics",
+}
+
+
+class PackedLanguageWriter:
+    """Appends quotes for one language to its blob and index"""
+
+    def __init__(self, packed_dir: Path, language: str):
+        self.packed_dir = Path(packed_dir)
+        self.language = language
+        self.blob_path = self.packed_dir / f"{language}.blob"
+        self.idx_path = self.packed_dir / f"{language}.idx"
+        self.strings_path = self.packed_dir / f"{language}.strings.json"
+
+        self.strings: List[str] = []
+        if self.strings_path.exists():
+            with open(self.strings_path, 'r', encoding='utf-8') as f:
+                self.strings = json.load(f)
+        self.string_ids = {value: i for i, value in enumerate(self.strings)}
+
+        self.count = 0
+        if self.idx_path.exists():
+            with open(self.idx_path, 'rb') as f:
+                magic, self.count = HEADER.unpack(f.read(HEADER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"Not a packed sacred library index: {self.idx_path}")
+
+        self.blob = open(self.blob_path, 'ab')
+        self.offset = self.blob.tell()
+        self.idx = open(self.idx_path, 'r+b' if self.idx_path.exists() else 'w+b')
+        if self.count == 0:
+            self.idx.write(HEADER.pack(INDEX_MAGIC, 0))
+        self.idx.seek(0, 2)
+
+    def _string_id(self, value: str) -> int:
+        if value not in self.string_ids:
+            self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return self.string_ids[value]
+
+    def _append(self, text: str) -> Tuple[int, int]:
+        data = text.encode('utf-8') + b"\n"
+        offset = self.offset
+        self.blob.write(data)
+        self.offset += len(data)
+        return offset, len(data) - 1
+
+    def add(self, quote: Dict[str, Any]):
+        """Append one quote (same shape as the per-quote JSON files)"""
+        # The blob is newline-delimited; normalise any stray newlines in the text
+        text_off, text_len = self._append(quote.get('text', '').replace("\n", " "))
+        qid_off, qid_len = self._append(str(quote.get('quote_id', '')))
+        meta_off, meta_len = self._append(json.dumps(quote.get('metadata', {}), ensure_ascii=False))
+
+        self.idx.write(RECORD.pack(
+            text_off, text_len,
+            qid_off, qid_len,
+            meta_off, meta_len,
+            *(self._string_id(str(quote.get(name) or DEFAULTS[name])) for name in STRING_FIELDS),
+            1 if quote.get('verified', True) else 0
+        ))
+        self.count += 1
+
+    def close(self):
+        self.blob.close()
+        self.idx.seek(0)
+        self.idx.write(HEADER.pack(INDEX_MAGIC, self.count))
+        self.idx.close()
+        with open(self.strings_path, 'w', encoding='utf-8') as f:
+            json.dump(self.strings, f, ensure_ascii=False)
+
+
+class PackedLanguage:
+    """Read-only view of one language: mmapped blob + in-memory index table"""
+
+    def __init__(self, packed_dir: Path, language: str):
+        self.language = language
+        blob_path = packed_dir / f"{language}.blob"
+
+        with open(packed_dir / f"{language}.idx", 'rb') as f:
+            data = f.read()
+        magic, count = HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not a packed sacred library index: {language}.idx")
+        self.records = list(RECORD.iter_unpack(data[HEADER.size:HEADER.size + count * RECORD.size]))
+
+        with open(packed_dir / f"{language}.strings.json", 'r', encoding='utf-8') as f:
+            self.strings = json.load(f)
+
+        self._blob_file = open(blob_path, 'rb')
+        self.blob = mmap.mmap(self._blob_file.fileno(), 0, access=mmap.ACCESS_READ) if count else b""
+
+        self._lowered: Optional[str] = None
+        self._line_starts: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _read(self, offset: int, length: int) -> str:
+        return self.blob[offset:offset + length].decode('utf-8')
+
+    def text(self, index: int) -> str:
+        record = self.records[index]
+        return self._read(record[0], record[1])
+
+    def quote(self, index: int) -> Dict[str, Any]:
+        """Rebuild the full quote dict for one record"""
+        (text_off, text_len, qid_off, qid_len, meta_off, meta_len,
+         book, chapter, author, tradition, verified) = self.records[index]
+        return {
+            'quote_id': self._read(qid_off, qid_len),
+            'text': self._read(text_off, text_len),
+            'source_book': self.strings[book],
+            'chapter': self.strings[chapter],
+            'language': self.language,
+            'author': self.strings[author],
+            'tradition': self.strings[tradition],
+            'verified': bool(verified),
+            'metadata': json.loads(self._read(meta_off, meta_len)),
+        }
+
+    def _search_view(self) -> Tuple[str, List[int]]:
+        """Lower-cased blob and its line starts, built once on first search"""
+        if self._lowered is None:
+            self._lowered = bytes(self.blob).decode('utf-8').lower()
+            starts = [0]
+            find = self._lowered.find
+            position = find("\n")
+            while position != -1:
+                starts.append(position + 1)
+                position = find("\n", position + 1)
+            self._line_starts = starts
+        return self._lowered, self._line_starts
+
+    def matching_indices(self, words: List[str]) -> List[int]:
+        """Record indices (in library order) whose text contains any of the words"""
+        lowered, line_starts = self._search_view()
+        matches = set()
+        for word in words:
+            find = lowered.find
+            position = find(word)
+            while position != -1:
+                line = bisect_right(line_starts, position) - 1
+                # Each record owns three lines; only the first is quote text
+                if line % 3 == 0:
+                    matches.add(line // 3)
+                # Skip to the next line - one hit per record is enough
+                next_line = line_starts[line + 1] if line + 1 < len(line_starts) else len(lowered)
+                position = find(word, next_line)
+        return sorted(matches)
+
+    def close(self):
+        if isinstance(self.blob, mmap.mmap):
+            self.blob.close()
+        self._blob_file.close()
+
+
+def quote_to_result(quote: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a quote the way LocalSacredLibrary results look"""
+    return {
+        'title': f"Hylozoics Quote {quote.get('quote_id', 'Unknown')}",
+        'content': quote.get('text', ''),
+        'metadata': {
+            'quote_id': quote.get('quote_id'),
+            'chapter': quote.get('chapter', 'Unknown'),
+            'language': quote.get('language', 'unknown'),
+            'author': quote.get('author', 'Henry T. Laurency'),
+            'source_book': quote.get('source_book', 'Hylozoics'),
+            'tradition': quote.get('tradition', 'Hylozoics'),
+            'verified': quote.get('verified', True)
+        }
+    }
+
+
+class PackedSacredLibrary:
+    """Reader API over the packed library"""
+
+    def __init__(self, packed_dir: Path):
+        self.packed_dir = Path(packed_dir)
+        with open(self.packed_dir / "manifest.json", 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed library version: {self.manifest.get('format_version')}")
+        self.languages: Dict[str, PackedLanguage] = {}
+
+    @staticmethod
+    def exists(packed_dir: Path) -> bool:
+        return (Path(packed_dir) / "manifest.json").exists()
+
+    @staticmethod
+    def is_current(packed_dir: Path, quotes_dir: Path) -> bool:
+        """Whether the packed library exists and was packed after quotes_dir last changed
+
+        Adding or removing quote files bumps the directory's mtime, so one
+        stat per directory is enough to notice a build that did not repack.
+        """
+        manifest = Path(packed_dir) / "manifest.json"
+        if not manifest.exists():
+            return False
+        quotes_dir = Path(quotes_dir)
+        return not quotes_dir.exists() or quotes_dir.stat().st_mtime_ns <= manifest.stat().st_mtime_ns
+
+    def language_codes(self) -> List[str]:
+        return list(self.manifest.get("languages", {}))
+
+    def _language(self, code: str) -> PackedLanguage:
+        if code not in self.languages:
+            self.languages[code] = PackedLanguage(self.packed_dir, code)
+        return self.languages[code]
+
+    def _selected(self, language: Optional[str]) -> List[PackedLanguage]:
+        codes = self.language_codes()
+        if language:
+            codes = [c for c in codes if c.lower() == language.lower()]
+        return [self._language(code) for code in codes]
+
+    def __len__(self) -> int:
+        return sum(self.manifest.get("languages", {}).values())
+
+    def iter_quotes(self, language: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        for packed in self._selected(language):
+            for index in range(len(packed)):
+                yield packed.quote(index)
+
+    def get_quote(self, quote_id: str, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        for packed in self._selected(language):
+            needle = f"\n{quote_id}\n"
+            lowered, line_starts = packed._search_view()
+            position = lowered.find(needle.lower())
+            if position != -1:
+                line = bisect_right(line_starts, position + 1) - 1
+                return packed.quote(line // 3)
+        return None
+
+    def search_quotes(self, query: str, language: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
+        """Same matching rule as LocalSacredLibrary.search_quotes, over the packed blobs"""
+        words = [w.lower() for w in re.findall(r'\b\w{4,}\b', query)]
+        if not words:
+            words = ['life', 'development']  # Default fallback
+
+        results = []
+        for packed in self._selected(language):
+            for index in packed.matching_indices(words):
+                results.append(quote_to_result(packed.quote(index)))
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def get_random_quotes(self, limit: int = 3) -> List[Dict[str, Any]]:
+        pool = [(packed, i) for packed in self._selected(None) for i in range(len(packed))]
+        if not pool:
+            return []
+        return [quote_to_result(packed.quote(i)) for packed, i in random.sample(pool, min(limit, len(pool)))]
+
+    def close(self):
+        for packed in self.languages.values():
+            packed.close()
+        self.languages = {}
+
+
+def convert_quote_directory(quotes_dir: Path, packed_dir: Path) -> Dict[str, int]:
+    """Pack a directory of per-quote JSON files; returns quote counts per language"""
+    quotes_dir = Path(quotes_dir)
+    packed_dir = Path(packed_dir)
+    packed_dir.mkdir(parents=True, exist_ok=True)
+
+    # Start from scratch so a re-run doesn't duplicate records
+    for stale in packed_dir.glob("*"):
+        if stale.suffix in (".blob", ".idx") or stale.name.endswith(".strings.json") or stale.name == "manifest.json":
+            stale.unlink()
+
+    writers: Dict[str, PackedLanguageWriter] = {}
+    errors = 0
+    try:
+        for quote_file in sorted(quotes_dir.glob("*.json")):
+            try:
+                with open(quote_file, 'r', encoding='utf-8') as f:
+                    quote = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable quote file {quote_file.name}: {e}")
+                errors += 1
+                continue
+
+            language = (quote.get('language') or 'unknown').lower()
+            if language not in writers:
+                writers[language] = PackedLanguageWriter(packed_dir, language)
+            writers[language].add(quote)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    counts = {language: writer.count for language, writer in writers.items()}
+    write_manifest(packed_dir, counts)
+    logger.info(f"Packed {sum(counts.values())} quotes ({errors} errors) into {packed_dir}")
+    return counts
+
+
+def write_manifest(packed_dir: Path, counts: Dict[str, int]):
+    with open(Path(packed_dir) / "manifest.json", 'w', encoding='utf-8') as f:
+        json.dump({"format_version": FORMAT_VERSION, "languages": counts}, f, indent=2)
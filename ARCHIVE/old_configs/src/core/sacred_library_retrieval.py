@@ -0,0 +1,258 @@
+"""
+Sacred Library Retrieval
+========================
+Lexical BM25 index over the Sacred Library quotes and reciprocal-rank
+fusion for combining it with vector search results.
+
+The index is built once from the packed library (or the quote files) and
+saved next to them as bm25_index.json; it is rebuilt automatically when
+the quotes change.
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from loguru import logger
+
+from core.sacred_library_packed import PackedSacredLibrary, quote_to_result
+
+INDEX_VERSION = 1
+INDEX_FILE_NAME = "bm25_index.json"
+
+# Standard Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Query weight of an expansion term relative to a word of the query itself
+EXPANSION_WEIGHT = 0.5
+# Expansion terms this long also match indexed words they are a prefix of,
+# up to EXPANSION_PREFIX_LIMIT of the most frequent ones
+EXPANSION_PREFIX_MIN = 5
+EXPANSION_PREFIX_LIMIT = 8
+
+# Reciprocal-rank fusion constant (Cormack et al. use 60)
+RRF_K = 60
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; single characters are dropped"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Identity of a search result across retrievers"""
+    return result.get('metadata', {}).get('quote_id') or result.get('title', '')
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[Dict[str, Any]]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """Fuse ranked result lists: score = sum of 1 / (k + rank) over the lists a result appears in
+
+    The first list a result appears in provides its content; `rrf_score`
+    and `sources` are added to each fused result.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for source, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            key = result_key(result)
+            if key not in fused:
+                fused[key] = {**result, 'rrf_score': 0.0, 'sources': []}
+            fused[key]['rrf_score'] += 1.0 / (k + rank)
+            fused[key]['sources'].append(source)
+
+    return sorted(fused.values(), key=lambda result: result['rrf_score'], reverse=True)
+
+
+class BM25Index:
+    """In-memory inverted index with BM25 scoring over quote results"""
+
+    def __init__(self, docs: List[Dict[str, Any]], doc_lengths: List[int],
+                 postings: Dict[str, List[int]], source: Dict[str, Any]):
+        self.docs = docs                # quote results (LocalSacredLibrary format)
+        self.doc_lengths = doc_lengths
+        self.postings = postings        # term -> flat [doc, tf, doc, tf, ...]
+        self.source = source            # fingerprint of the quotes it was built from
+        self.avg_doc_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        self._vocabulary: Optional[List[str]] = None  # sorted terms, for prefix lookups
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @classmethod
+    def build(cls, quotes: Iterable[Dict[str, Any]], source: Optional[Dict[str, Any]] = None) -> "BM25Index":
+        docs, doc_lengths = [], []
+        postings: Dict[str, List[int]] = {}
+
+        for quote in quotes:
+            doc = len(docs)
+            tokens = tokenize(quote.get('text', ''))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).extend((doc, tf))
+            docs.append(quote_to_result(quote))
+            doc_lengths.append(len(tokens))
+
+        return cls(docs, doc_lengths, postings, source or {})
+
+    def prefix_terms(self, prefix: str, limit: int = EXPANSION_PREFIX_LIMIT) -> List[str]:
+        """The `limit` most frequent indexed terms starting with `prefix`"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff', start)
+        matches = self._vocabulary[start:end]
+        if len(matches) > limit:
+            matches = sorted(matches, key=lambda term: len(self.postings[term]), reverse=True)[:limit]
+        return matches
+
+    def idf(self, term: str) -> float:
+        doc_freq = len(self.postings.get(term, ())) // 2
+        return math.log(1 + (len(self.docs) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def score(self, terms: List[str], language: Optional[str] = None,
+              weights: Optional[Dict[str, float]] = None) -> List[Tuple[int, float]]:
+        """(doc, score) for every doc matching any term, best first
+
+        `weights` adds weighted query terms on top of `terms` (expansion terms).
+        """
+        scores: Dict[int, float] = {}
+        avg_length = self.avg_doc_length or 1.0
+
+        query_weights: Dict[str, float] = dict(Counter(terms))
+        for term, weight in (weights or {}).items():
+            query_weights[term] = query_weights.get(term, 0.0) + weight
+
+        for term, query_tf in query_weights.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for i in range(0, len(postings), 2):
+                doc, tf = postings[i], postings[i + 1]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc] / avg_length)
+                scores[doc] = scores.get(doc, 0.0) + query_tf * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        if language:
+            language = language.lower()
+            scores = {doc: s for doc, s in scores.items()
+                      if self.docs[doc]['metadata'].get('language', '').lower() == language}
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def score_query(self, query: str, language: Optional[str] = None,
+                    extra_terms: Optional[List[str]] = None) -> List[Tuple[int, float]]:
+        """(doc, score) for the query plus any expansion terms, best first
+
+        Expansion terms count EXPANSION_WEIGHT each, so they widen recall
+        without outranking quotes that match the query's own words.
+        """
+        terms = tokenize(query)
+        expansion: Dict[str, float] = {}
+        for term in extra_terms or []:
+            for token in tokenize(term):
+                # Dictionary forms are base forms; pick up inflections and compounds
+                # ("kausalhölje" -> "kausalhöljet", "kausalhöljets") from the vocabulary
+                variants = self.prefix_terms(token) if len(token) >= EXPANSION_PREFIX_MIN else [token]
+                for variant in variants or [token]:
+                    if variant not in terms:
+                        expansion[variant] = EXPANSION_WEIGHT
+        return self.score(terms, language, expansion)
+
+    def search(self, query: str, language: Optional[str] = None, limit: int = 10,
+               extra_terms: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Top quotes for the query (plus any expansion terms), with bm25_score set"""
+        results = []
+        for doc, score in self.score_query(query, language, extra_terms)[:limit]:
+            result = dict(self.docs[doc])
+            result['bm25_score'] = round(score, 4)
+            results.append(result)
+        return results
+
+    def save(self, path: Path):
+        tmp_path = Path(path).with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'source': self.source,
+                'docs': self.docs,
+                'doc_lengths': self.doc_lengths,
+                'postings': self.postings,
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BM25Index"]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read BM25 index {path}: {e}")
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        return cls(data['docs'], data['doc_lengths'], data['postings'], data.get('source', {}))
+
+
+def _source_fingerprint(sacred_dir: Path) -> Dict[str, Any]:
+    """Cheap identity of the current quotes: packed manifest or quote file listing"""
+    packed_dir = sacred_dir / "packed"
+    if PackedSacredLibrary.is_current(packed_dir, sacred_dir / "quotes"):
+        manifest = packed_dir / "manifest.json"
+        return {'kind': 'packed', 'mtime_ns': manifest.stat().st_mtime_ns}
+
+    count, latest = 0, 0
+    quotes_dir = sacred_dir / "quotes"
+    if quotes_dir.exists():
+        with os.scandir(quotes_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    count += 1
+                    latest = max(latest, entry.stat().st_mtime_ns)
+    return {'kind': 'files', 'count': count, 'mtime_ns': latest}
+
+
+def _iter_source_quotes(sacred_dir: Path) -> Iterable[Dict[str, Any]]:
+    packed_dir = sacred_dir / "packed"
+    if PackedSacredLibrary.is_current(packed_dir, sacred_dir / "quotes"):
+        library = PackedSacredLibrary(packed_dir)
+        try:
+            yield from library.iter_quotes()
+        finally:
+            library.close()
+        return
+
+    for quote_file in sorted((sacred_dir / "quotes").glob("*.json")):
+        try:
+            with open(quote_file, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Skipping quote file {quote_file}: {e}")
+
+
+def load_or_build_index(sacred_dir: Path, index_path: Optional[Path] = None) -> Optional[BM25Index]:
+    """Load the saved BM25 index, rebuilding it if the quotes changed since it was built"""
+    sacred_dir = Path(sacred_dir)
+    index_path = Path(index_path) if index_path else sacred_dir / INDEX_FILE_NAME
+    fingerprint = _source_fingerprint(sacred_dir)
+
+    if index_path.exists():
+        index = BM25Index.load(index_path)
+        if index and index.source == fingerprint:
+            return index
+
+    index = BM25Index.build(_iter_source_quotes(sacred_dir), fingerprint)
+    if not len(index):
+        logger.warning(f"No Sacred Library quotes found under {sacred_dir}; lexical index is empty")
+        return None
+
+    try:
+        index.save(index_path)
+    except OSError as e:
+        logger.warning(f"Could not save BM25 index to {index_path}: {e}")
+    logger.info(f"Built BM25 index over {len(index)} quotes ({len(index.postings)} terms)")
+    return index
@@ -0,0 +1,174 @@
+"""
+Sacred Quote Bulk Loader
+========================
+Multi-row upserts into hylozoics_sacred_quotes through the PostgREST API.
+
+Rows are sent in pages (one HTTP request per page) with bounded
+concurrency. Upserts resolve on quote_id, so re-running a load is safe.
+Pages that fail after their retries are kept on the report and can be
+re-sent with `retry_failed` without touching the pages that succeeded.
+"""
+
+import os
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterable
+
+import httpx
+from loguru import logger
+
+SACRED_QUOTES_TABLE = "hylozoics_sacred_quotes"
+
+# Responses worth retrying; anything else in 4xx is a bad page
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class FailedPage:
+    """A page that could not be written, with the last error seen"""
+    index: int
+    rows: List[Dict[str, Any]]
+    error: str
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a bulk load"""
+    rows_total: int = 0
+    rows_loaded: int = 0
+    pages_total: int = 0
+    requests: int = 0
+    seconds: float = 0.0
+    failed_pages: List[FailedPage] = field(default_factory=list)
+
+    @property
+    def rows_failed(self) -> int:
+        return sum(len(page.rows) for page in self.failed_pages)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_loaded / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.rows_loaded}/{self.rows_total} rows in {self.pages_total} pages, "
+                f"{self.requests} requests, {self.seconds:.2f}s "
+                f"({self.rows_per_second:,.0f} rows/sec), {len(self.failed_pages)} failed pages")
+
+
+class BulkQuoteLoader:
+    """Paged, concurrent, idempotent upserts over PostgREST
+
+    All rows in a page must have the same keys (PostgREST bulk insert rule).
+    """
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        table: str = SACRED_QUOTES_TABLE,
+        conflict_column: str = "quote_id",
+        page_size: int = 500,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        timeout: float = 60.0,
+    ):
+        self.supabase_url = (supabase_url or os.getenv('SUPABASE_URL', '')).rstrip('/')
+        self.api_key = api_key or os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_ANON_KEY')
+        if not self.supabase_url or not self.api_key:
+            raise ValueError("Supabase URL and API key are required for bulk loading")
+
+        self.table = table
+        self.conflict_column = conflict_column
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+
+        self.endpoint = f"{self.supabase_url}/rest/v1/{self.table}"
+        self.headers = {
+            'apikey': self.api_key,
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            # Upsert on the conflict column and skip echoing rows back
+            'Prefer': 'resolution=merge-duplicates,return=minimal',
+        }
+
+    def _pages(self, rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        return [rows[i:i + self.page_size] for i in range(0, len(rows), self.page_size)]
+
+    async def _send_page(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                         index: int, rows: List[Dict[str, Any]], report: LoadReport) -> Optional[FailedPage]:
+        """Upsert one page, retrying transient failures with exponential backoff"""
+        error = ""
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+                report.requests += 1
+                try:
+                    response = await client.post(
+                        self.endpoint,
+                        params={'on_conflict': self.conflict_column},
+                        json=rows,
+                    )
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                    continue
+
+                if response.status_code < 300:
+                    report.rows_loaded += len(rows)
+                    return None
+
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRYABLE_STATUS:
+                    break
+
+        logger.warning(f"Page {index} ({len(rows)} rows) failed: {error}")
+        return FailedPage(index=index, rows=rows, error=error)
+
+    async def _load_pages(self, pages: List[List[Dict[str, Any]]], indices: List[int],
+                          report: LoadReport) -> LoadReport:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        async with httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=limits) as client:
+            results = await asyncio.gather(*(
+                self._send_page(client, semaphore, index, page, report)
+                for index, page in zip(indices, pages)
+            ))
+
+        report.failed_pages = [failed for failed in results if failed]
+        report.seconds += time.perf_counter() - start
+        return report
+
+    async def load(self, rows: Iterable[Dict[str, Any]]) -> LoadReport:
+        """Upsert all rows; returns a report including any pages that failed"""
+        rows = list(rows)
+        pages = self._pages(rows)
+        report = LoadReport(rows_total=len(rows), pages_total=len(pages))
+        if not rows:
+            return report
+
+        await self._load_pages(pages, list(range(len(pages))), report)
+        logger.info(f"Bulk load into {self.table}: {report.summary()}")
+        return report
+
+    async def retry_failed(self, report: LoadReport) -> LoadReport:
+        """Re-send only the pages that failed in `report` (updated in place)"""
+        if not report.failed_pages:
+            return report
+
+        failed = report.failed_pages
+        await self._load_pages([page.rows for page in failed], [page.index for page in failed], report)
+        logger.info(f"Retried {len(failed)} failed pages: {report.summary()}")
+        return report
+
+    def load_sync(self, rows: Iterable[Dict[str, Any]]) -> LoadReport:
+        """Blocking wrapper for scripts that aren't async"""
+        return asyncio.run(self.load(rows))
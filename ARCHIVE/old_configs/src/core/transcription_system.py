@@ -14,13 +14,16 @@ Supports:
 - Audio: .mp3, .wav, .m4a, .flac, .ogg
 - Video: .mp4, .mov, .avi, .mkv (extracts audio)
 - Batch processing of multiple files
+- Long recordings (split on silence into overlapping chunks, transcribed in parallel)
 - Speaker identification and timestamping
 - Automatic INBOX integration
 """
 
 import os
+import re
 import json
 import asyncio
+import hashlib
 import subprocess
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
@@ -30,7 +33,26 @@ from enum import Enum
 import tempfile
 import shutil
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+
+# OpenAI Whisper API upload limit
+API_MAX_FILE_MB = 25
+
+# Whisper API pricing: $0.006 per minute
+API_COST_PER_MINUTE = 0.006
+
+# Long-audio chunking defaults
+DEFAULT_CHUNK_SECONDS = 600.0  # ~4.8MB per chunk at 64kbps mono mp3
+DEFAULT_CHUNK_OVERLAP_SECONDS = 2.0
+SILENCE_NOISE_DB = -30
+SILENCE_MIN_SECONDS = 0.5
+
+# Transcript cache location, kept out of the source tree
+DEFAULT_TRANSCRIPT_CACHE_DIR = os.getenv(
+    "TRANSCRIPT_CACHE_DIR",
+    os.path.join(os.getenv("XDG_DATA_HOME", os.path.expanduser("~/.local/share")), "compass", "transcript_cache")
+)
 
 
 class TranscriptionMethod(Enum):
@@ -72,15 +94,287 @@ class TranscriptionResult:
     speakers_detected: int = 0
     cost_estimate: float = 0.0  # For API usage
     error_message: str = ""
+    from_cache: bool = False  # Served from TranscriptCache, nothing re-transcribed
     created_at: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class AudioChunk:
+    """A slice of a long recording
+    
+    start/end bound the audio that is extracted (including the overlap with
+    the previous chunk); keep_from/keep_until bound the part of the timeline
+    this chunk is authoritative for when segments are stitched back together.
+    """
+    index: int
+    start: float
+    end: float
+    keep_from: float
+    keep_until: float
+
+
+def plan_audio_chunks(duration: float,
+                      silences: List[Tuple[float, float]],
+                      chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                      overlap_seconds: float = DEFAULT_CHUNK_OVERLAP_SECONDS) -> List[AudioChunk]:
+    """Split a recording into ~chunk_seconds pieces, cutting inside silences where possible"""
+    
+    if duration <= 0:
+        return []
+    
+    # Candidate cut points are the middles of detected silences
+    cut_points = sorted((start + end) / 2 for start, end in silences if end > start)
+    
+    chunks = []
+    boundary = 0.0
+    while boundary < duration:
+        target = boundary + chunk_seconds
+        if target >= duration:
+            cut = duration
+        else:
+            # Latest silence in the second half of the window, else a hard cut
+            window_start = boundary + chunk_seconds / 2
+            candidates = [p for p in cut_points if window_start <= p <= target]
+            cut = candidates[-1] if candidates else target
+        
+        chunks.append(AudioChunk(
+            index=len(chunks),
+            start=max(0.0, boundary - overlap_seconds),
+            end=min(duration, cut + overlap_seconds),
+            keep_from=boundary,
+            keep_until=cut
+        ))
+        boundary = cut
+    
+    return chunks
+
+
+def stitch_chunk_segments(chunks: List[AudioChunk],
+                          chunk_segments: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Shift chunk-relative segments onto the recording timeline and drop overlap duplicates"""
+    
+    stitched = []
+    for chunk, segments in zip(chunks, chunk_segments):
+        for seg in segments:
+            start = seg.get("start", 0.0) + chunk.start
+            end = seg.get("end", 0.0) + chunk.start
+            
+            # Each overlap region is owned by exactly one chunk, decided by segment midpoint
+            midpoint = (start + end) / 2
+            is_last = chunk.index == len(chunks) - 1
+            if midpoint < chunk.keep_from or (midpoint >= chunk.keep_until and not is_last):
+                continue
+            
+            stitched.append({**seg, "start": start, "end": end})
+    
+    return stitched
+
+
+async def run_command(cmd: List[str]) -> Tuple[int, str, str]:
+    """Run an external tool without blocking the event loop"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return (
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace")
+    )
+
+
+class TranscriptCache:
+    """Content-addressed transcript store
+    
+    Transcripts are stored as JSON under a fingerprint of the audio (file
+    bytes, or the decoded 16kHz mono PCM stream so re-encoded copies also
+    hit), so re-dropped or renamed recordings are never transcribed twice.
+    The directory is kept under max_size_mb by evicting least recently used
+    entries.
+    """
+    
+    STATS_FILE = "cache_stats.json"
+    
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_size_mb: float = 500,
+                 fingerprint: str = "bytes"):
+        if fingerprint not in ("bytes", "pcm"):
+            raise ValueError(f"Unknown fingerprint mode: {fingerprint}")
+        
+        self.cache_dir = Path(cache_dir or DEFAULT_TRANSCRIPT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.fingerprint_mode = fingerprint
+        
+        # This session's numbers; lifetime totals live in STATS_FILE
+        self.session_stats = {"hits": 0, "misses": 0, "saved_minutes": 0.0, "saved_cost": 0.0}
+    
+    async def fingerprint(self, file_path: Path) -> str:
+        """SHA-256 of the file bytes or of the decoded PCM audio"""
+        
+        if self.fingerprint_mode == "pcm":
+            return await self._fingerprint_pcm(file_path)
+        return await asyncio.to_thread(self._fingerprint_bytes, file_path)
+    
+    @staticmethod
+    def _fingerprint_bytes(file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    async def _fingerprint_pcm(self, file_path: Path) -> str:
+        """Hash the decoded audio stream, independent of container and metadata"""
+        
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-v", "quiet", "-i", str(file_path),
+            "-vn", "-ac", "1", "-ar", "16000", "-f", "s16le", "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        
+        digest = hashlib.sha256()
+        while True:
+            block = await process.stdout.read(1024 * 1024)
+            if not block:
+                break
+            digest.update(block)
+        
+        if await process.wait() != 0:
+            # Undecodable by ffmpeg - fall back to the raw bytes
+            return await asyncio.to_thread(self._fingerprint_bytes, file_path)
+        return "pcm-" + digest.hexdigest()
+    
+    def _entry_path(self, fingerprint: str, method: TranscriptionMethod) -> Path:
+        return self.cache_dir / f"{fingerprint}_{method.value}.json"
+    
+    def get(self, fingerprint: str, method: TranscriptionMethod) -> Optional[TranscriptionResult]:
+        """Return the cached transcript, or None on a miss"""
+        
+        entry_path = self._entry_path(fingerprint, method)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.session_stats["misses"] += 1
+            return None
+        
+        # Touch for LRU eviction
+        os.utime(entry_path)
+        
+        saved_minutes = entry.get("duration_seconds", 0.0) / 60
+        saved_cost = entry.get("cost_estimate", 0.0)
+        self.session_stats["hits"] += 1
+        self.session_stats["saved_minutes"] += saved_minutes
+        self.session_stats["saved_cost"] += saved_cost
+        self._update_lifetime_stats(saved_minutes, saved_cost)
+        
+        return TranscriptionResult(
+            source_file="",  # Will be set by caller
+            transcript_text=entry.get("transcript_text", ""),
+            method_used=method,
+            duration_seconds=entry.get("duration_seconds", 0.0),
+            confidence_score=entry.get("confidence_score", 0.0),
+            language_detected=entry.get("language_detected", "unknown"),
+            segments=entry.get("segments", []),
+            cost_estimate=0.0,  # Nothing was spent this time
+            from_cache=True
+        )
+    
+    def put(self, fingerprint: str, result: TranscriptionResult):
+        """Store a successful transcript and evict old entries if over budget"""
+        
+        entry = {
+            "fingerprint": fingerprint,
+            "source_file": Path(result.source_file).name,
+            "method_used": result.method_used.value,
+            "transcript_text": result.transcript_text,
+            "duration_seconds": result.duration_seconds,
+            "confidence_score": result.confidence_score,
+            "language_detected": result.language_detected,
+            "segments": result.segments,
+            "cost_estimate": result.cost_estimate,
+            "cached_at": datetime.now().isoformat()
+        }
+        
+        entry_path = self._entry_path(fingerprint, result.method_used)
+        temp_path = entry_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, entry_path)
+        
+        self._evict(keep=entry_path)
+    
+    def _evict(self, keep: Optional[Path] = None):
+        """Remove least recently used entries until the cache fits max_size"""
+        
+        entries = []
+        total_size = 0
+        for path in self.cache_dir.glob("*.json"):
+            if path.name == self.STATS_FILE:
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total_size -= size
+    
+    def _update_lifetime_stats(self, saved_minutes: float, saved_cost: float):
+        stats_path = self.cache_dir / self.STATS_FILE
+        stats = self.lifetime_stats()
+        stats["hits"] += 1
+        stats["saved_minutes"] += saved_minutes
+        stats["saved_cost"] += saved_cost
+        temp_path = stats_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(temp_path, stats_path)
+    
+    def lifetime_stats(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_dir / self.STATS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"hits": 0, "saved_minutes": 0.0, "saved_cost": 0.0}
+    
+    def report(self) -> Dict[str, Any]:
+        """Saved transcription minutes and cost, this session and overall"""
+        return {
+            "session": dict(self.session_stats),
+            "lifetime": self.lifetime_stats()
+        }
+
+
 class TranscriptionEngine:
     """Main transcription engine with multiple backend options"""
     
-    def __init__(self, method: TranscriptionMethod = TranscriptionMethod.OPENAI_WHISPER_API):
+    def __init__(self,
+                 method: TranscriptionMethod = TranscriptionMethod.OPENAI_WHISPER_API,
+                 max_concurrent_chunks: int = 4,
+                 max_concurrent_files: int = 2,
+                 chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+                 chunk_overlap_seconds: float = DEFAULT_CHUNK_OVERLAP_SECONDS,
+                 cache: Optional[TranscriptCache] = None):
         self.method = method
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.cache = cache
+        self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        
+        # Concurrency and chunking settings
+        self.max_concurrent_files = max_concurrent_files
+        self.chunk_seconds = chunk_seconds
+        self.chunk_overlap_seconds = chunk_overlap_seconds
+        # Shared across files so a batch never exceeds the backend's budget
+        self._chunk_semaphore = asyncio.Semaphore(max_concurrent_chunks)
         
         # Supported formats
         self.audio_formats = {fmt.value for fmt in AudioFormat}
@@ -132,9 +426,25 @@ class TranscriptionEngine:
                 error_message=f"Unsupported format: {file_path.suffix}"
             )
         
-        print(f"🎵 Transcribing: {file_path.name}")
         start_time = datetime.now()
         
+        fingerprint = None
+        if self.cache:
+            # Any cache failure is a cache miss, never a failed transcription
+            try:
+                fingerprint = await self.cache.fingerprint(file_path)
+                cached = self.cache.get(fingerprint, self.method)
+            except Exception as e:
+                print(f"⚠️  Transcript cache lookup failed for {file_path.name}: {e}")
+                cached = None
+            if cached:
+                cached.source_file = str(file_path)
+                cached.processing_time = (datetime.now() - start_time).total_seconds()
+                print(f"♻️  Cached transcript: {file_path.name}")
+                return cached
+        
+        print(f"🎵 Transcribing: {file_path.name}")
+        
         try:
             # Convert video to audio if needed
             audio_file = await self._prepare_audio_file(file_path)
@@ -142,29 +452,32 @@ class TranscriptionEngine:
             # Get duration
             duration = await self._get_audio_duration(audio_file)
             
-            # Transcribe based on method
-            if self.method == TranscriptionMethod.OPENAI_WHISPER_API:
-                result = await self._transcribe_with_openai_api(audio_file)
-            elif self.method == TranscriptionMethod.LOCAL_WHISPER:
-                result = await self._transcribe_with_local_whisper(audio_file)
-            elif self.method == TranscriptionMethod.HYBRID:
-                result = await self._transcribe_hybrid(audio_file)
-            else:
-                raise ValueError(f"Unknown transcription method: {self.method}")
-            
-            # Clean up temporary audio file if it was created
-            if audio_file != file_path:
-                os.unlink(audio_file)
+            try:
+                if self._needs_chunking(audio_file, duration):
+                    result = await self._transcribe_chunked(audio_file, duration)
+                else:
+                    result = await self._transcribe_single(audio_file, self.method)
+            finally:
+                # Clean up temporary audio file if it was created
+                if audio_file != file_path:
+                    os.unlink(audio_file)
             
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
             
             # Update result with metadata
             result.source_file = str(file_path)
-            result.duration_seconds = duration
+            result.duration_seconds = duration or result.duration_seconds
             result.processing_time = processing_time
             result.method_used = self.method
             
+            # An empty transcript is a failure in disguise - never make it permanent
+            if self.cache and fingerprint and result.transcript_text.strip() and not result.error_message:
+                try:
+                    self.cache.put(fingerprint, result)
+                except Exception as e:
+                    print(f"⚠️  Could not cache transcript for {file_path.name}: {e}")
+            
             print(f"✅ Transcribed {file_path.name} in {processing_time:.1f}s")
             return result
             
@@ -200,10 +513,10 @@ class TranscriptionEngine:
             str(temp_audio)
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, _, stderr = await run_command(cmd)
         
-        if result.returncode != 0:
-            raise Exception(f"FFmpeg failed: {result.stderr}")
+        if returncode != 0:
+            raise Exception(f"FFmpeg failed: {stderr}")
         
         return temp_audio
     
@@ -216,21 +529,124 @@ class TranscriptionEngine:
                 "-v", "quiet", "-of", "csv=p=0"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                return float(result.stdout.strip())
+            returncode, stdout, _ = await run_command(cmd)
+            if returncode == 0:
+                return float(stdout.strip())
         except:
             pass
         
         return 0.0
     
+    def _needs_chunking(self, audio_file: Path, duration: float) -> bool:
+        """Long recordings, or files over the API upload limit, are chunked"""
+        
+        if duration > self.chunk_seconds * 1.5:
+            return True
+        
+        file_size_mb = audio_file.stat().st_size / (1024 * 1024)
+        return self.method != TranscriptionMethod.LOCAL_WHISPER and file_size_mb > API_MAX_FILE_MB
+    
+    async def _transcribe_single(self, audio_file: Path, method: TranscriptionMethod) -> TranscriptionResult:
+        """Transcribe one file (or chunk) with the given backend"""
+        
+        if method == TranscriptionMethod.OPENAI_WHISPER_API:
+            return await self._transcribe_with_openai_api(audio_file)
+        elif method == TranscriptionMethod.LOCAL_WHISPER:
+            return await self._transcribe_with_local_whisper(audio_file)
+        elif method == TranscriptionMethod.HYBRID:
+            return await self._transcribe_hybrid(audio_file)
+        else:
+            raise ValueError(f"Unknown transcription method: {method}")
+    
+    async def _detect_silences(self, audio_file: Path) -> List[Tuple[float, float]]:
+        """Find silent stretches with ffmpeg's silencedetect filter"""
+        
+        cmd = [
+            "ffmpeg", "-i", str(audio_file),
+            "-af", f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_SECONDS}",
+            "-f", "null", "-"
+        ]
+        
+        returncode, _, stderr = await run_command(cmd)
+        if returncode != 0:
+            print("  ⚠️  Silence detection failed, using fixed-length chunks")
+            return []
+        
+        starts = [float(v) for v in re.findall(r"silence_start: (-?[\d.]+)", stderr)]
+        ends = [float(v) for v in re.findall(r"silence_end: ([\d.]+)", stderr)]
+        return list(zip(starts, ends))
+    
+    async def _extract_chunk(self, audio_file: Path, chunk: AudioChunk, output_dir: Path) -> Path:
+        """Cut one chunk out as compact mono mp3 (well under the API upload limit)"""
+        
+        chunk_file = output_dir / f"chunk_{chunk.index:04d}.mp3"
+        cmd = [
+            "ffmpeg", "-ss", f"{chunk.start:.3f}", "-t", f"{chunk.end - chunk.start:.3f}",
+            "-i", str(audio_file),
+            "-vn", "-ac", "1", "-ar", "16000",
+            "-c:a", "libmp3lame", "-b:a", "64k",
+            "-y", str(chunk_file)
+        ]
+        
+        returncode, _, stderr = await run_command(cmd)
+        if returncode != 0:
+            raise Exception(f"FFmpeg chunk extraction failed: {stderr}")
+        
+        return chunk_file
+    
+    async def _transcribe_chunked(self, audio_file: Path, duration: float) -> TranscriptionResult:
+        """Split on silence, transcribe chunks concurrently and stitch the segments"""
+        
+        # Hybrid keeps its per-recording rule: large recordings stay local
+        chunk_method = self.method
+        if self.method == TranscriptionMethod.HYBRID:
+            file_size_mb = audio_file.stat().st_size / (1024 * 1024)
+            chunk_method = (TranscriptionMethod.LOCAL_WHISPER if file_size_mb > 20
+                            else TranscriptionMethod.OPENAI_WHISPER_API)
+        
+        silences = await self._detect_silences(audio_file)
+        chunks = plan_audio_chunks(duration, silences, self.chunk_seconds, self.chunk_overlap_seconds)
+        if not chunks:
+            # No duration (ffprobe failed) means nothing to cut - not an empty recording
+            raise Exception(f"Cannot chunk {audio_file.name}: audio duration unknown")
+        print(f"  ✂️  Split {duration / 60:.1f} min into {len(chunks)} chunks")
+        
+        with tempfile.TemporaryDirectory(prefix="transcription_chunks_") as temp_dir:
+            
+            async def transcribe_chunk(chunk: AudioChunk) -> TranscriptionResult:
+                async with self._chunk_semaphore:
+                    chunk_file = await self._extract_chunk(audio_file, chunk, Path(temp_dir))
+                    try:
+                        return await self._transcribe_single(chunk_file, chunk_method)
+                    finally:
+                        os.unlink(chunk_file)
+            
+            chunk_results = await asyncio.gather(*(transcribe_chunk(chunk) for chunk in chunks))
+        
+        segments = stitch_chunk_segments(chunks, [r.segments for r in chunk_results])
+        if segments:
+            transcript_text = " ".join(seg["text"].strip() for seg in segments)
+        else:
+            transcript_text = " ".join(r.transcript_text.strip() for r in chunk_results)
+        
+        return TranscriptionResult(
+            source_file="",  # Will be set by caller
+            transcript_text=transcript_text,
+            method_used=self.method,
+            duration_seconds=duration,
+            language_detected=chunk_results[0].language_detected if chunk_results else "unknown",
+            segments=segments,
+            cost_estimate=sum(r.cost_estimate for r in chunk_results),
+            confidence_score=min((r.confidence_score for r in chunk_results), default=0.0)
+        )
+    
     async def _transcribe_with_openai_api(self, audio_file: Path) -> TranscriptionResult:
         """Transcribe using OpenAI Whisper API"""
         
         # Check file size (OpenAI limit is 25MB)
         file_size_mb = audio_file.stat().st_size / (1024 * 1024)
-        if file_size_mb > 25:
-            raise Exception(f"File too large for OpenAI API: {file_size_mb:.1f}MB (max 25MB)")
+        if file_size_mb > API_MAX_FILE_MB:
+            raise Exception(f"File too large for OpenAI API: {file_size_mb:.1f}MB (max {API_MAX_FILE_MB}MB)")
         
         with open(audio_file, "rb") as audio:
             transcript = await self.openai_client.audio.transcriptions.create(
@@ -240,9 +656,9 @@ class TranscriptionEngine:
                 language="en"  # Specify if you know the language
             )
         
-        # Calculate cost estimate (OpenAI pricing: $0.006 per minute)
+        # Calculate cost estimate
         duration_minutes = transcript.duration / 60
-        cost_estimate = duration_minutes * 0.006
+        cost_estimate = duration_minutes * API_COST_PER_MINUTE
         
         # Extract segments with timestamps
         segments = []
@@ -271,9 +687,8 @@ class TranscriptionEngine:
     async def _transcribe_with_local_whisper(self, audio_file: Path) -> TranscriptionResult:
         """Transcribe using local Whisper installation"""
         
-        # Create output directory
-        output_dir = audio_file.parent / "whisper_output"
-        output_dir.mkdir(exist_ok=True)
+        # Create output directory (unique, so concurrent chunks don't collide)
+        output_dir = Path(tempfile.mkdtemp(prefix="whisper_output_"))
         
         # Run whisper command
         cmd = [
@@ -285,22 +700,23 @@ class TranscriptionEngine:
             "--verbose", "False"
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            raise Exception(f"Local Whisper failed: {result.stderr}")
-        
-        # Read the JSON output
-        json_file = output_dir / f"{audio_file.stem}.json"
-        
-        if not json_file.exists():
-            raise Exception("Whisper output file not found")
-        
-        with open(json_file, 'r', encoding='utf-8') as f:
-            whisper_output = json.load(f)
-        
-        # Clean up output files
-        shutil.rmtree(output_dir)
+        try:
+            returncode, _, stderr = await run_command(cmd)
+            
+            if returncode != 0:
+                raise Exception(f"Local Whisper failed: {stderr}")
+            
+            # Read the JSON output
+            json_file = output_dir / f"{audio_file.stem}.json"
+            
+            if not json_file.exists():
+                raise Exception("Whisper output file not found")
+            
+            with open(json_file, 'r', encoding='utf-8') as f:
+                whisper_output = json.load(f)
+        finally:
+            # Clean up output files
+            shutil.rmtree(output_dir, ignore_errors=True)
         
         # Extract segments
         segments = []
@@ -342,22 +758,29 @@ class TranscriptionEngine:
             return await self._transcribe_with_openai_api(audio_file)
     
     async def transcribe_batch(self, file_paths: List[str]) -> List[TranscriptionResult]:
-        """Transcribe multiple files"""
-        results = []
+        """Transcribe multiple files through a bounded worker pool (results keep input order)"""
         
-        print(f"🎵 Starting batch transcription of {len(file_paths)} files")
+        print(f"🎵 Starting batch transcription of {len(file_paths)} files "
+              f"({self.max_concurrent_files} at a time)")
         
-        for i, file_path in enumerate(file_paths, 1):
-            print(f"\n📁 Processing file {i}/{len(file_paths)}")
-            result = await self.transcribe_file(file_path)
-            results.append(result)
+        file_semaphore = asyncio.Semaphore(self.max_concurrent_files)
+        
+        async def transcribe_one(i: int, file_path: str) -> TranscriptionResult:
+            async with file_semaphore:
+                print(f"\n📁 Processing file {i}/{len(file_paths)}")
+                result = await self.transcribe_file(file_path)
             
             # Show progress
             if result.error_message:
-                print(f"❌ Failed: {result.error_message}")
+                print(f"❌ Failed: {Path(file_path).name}: {result.error_message}")
             else:
                 duration_min = result.duration_seconds / 60
                 print(f"✅ Success: {duration_min:.1f} min audio → {len(result.transcript_text)} chars")
+            return result
+        
+        results = list(await asyncio.gather(
+            *(transcribe_one(i, file_path) for i, file_path in enumerate(file_paths, 1))
+        ))
         
         # Summary
         successful = [r for r in results if not r.error_message]
@@ -371,6 +794,12 @@ class TranscriptionEngine:
             total_cost = sum(r.cost_estimate for r in successful)
             print(f"   💰 Estimated cost: ${total_cost:.2f}")
         
+        if self.cache:
+            cache_hits = [r for r in successful if r.from_cache]
+            saved_minutes = sum(r.duration_seconds for r in cache_hits) / 60
+            print(f"   ♻️  From cache: {len(cache_hits)} files ({saved_minutes:.1f} min not re-transcribed)")
+            print(f"   💰 Saved this session: ${self.cache.session_stats['saved_cost']:.2f}")
+        
         return results
 
 
@@ -379,8 +808,14 @@ class TranscriptionPipeline:
     
     def __init__(self, 
                  method: TranscriptionMethod = TranscriptionMethod.OPENAI_WHISPER_API,
-                 inbox_folder: Optional[str] = None):
-        self.transcription_engine = TranscriptionEngine(method)
+                 inbox_folder: Optional[str] = None,
+                 max_concurrent_files: int = 2,
+                 cache_dir: Optional[str] = None,
+                 use_cache: bool = True):
+        cache = TranscriptCache(cache_dir) if use_cache else None
+        self.transcription_engine = TranscriptionEngine(
+            method, max_concurrent_files=max_concurrent_files, cache=cache
+        )
         self.inbox_folder = Path(inbox_folder) if inbox_folder else None
     
     async def process_media_folder(self, media_folder: str, auto_inbox: bool = True):
@@ -401,6 +836,9 @@ class TranscriptionPipeline:
             print(f"📭 No media files found in {media_path}")
             return
         
+        # The flat and recursive globs overlap; never transcribe a file twice
+        media_files = sorted(set(media_files))
+        
         print(f"🎵 Found {len(media_files)} media files")
         
         # Transcribe all files
@@ -441,6 +879,10 @@ class TranscriptionPipeline:
             "failed": len([r for r in results if r.error_message]),
             "total_duration_minutes": sum(r.duration_seconds for r in results if not r.error_message) / 60,
             "total_cost_estimate": sum(r.cost_estimate for r in results if not r.error_message),
+            "from_cache": len([r for r in results if r.from_cache]),
+            "cache_report": (
+                self.transcription_engine.cache.report() if self.transcription_engine.cache else None
+            ),
             "results": [
                 {
                     "file": Path(r.source_file).name,
@@ -448,6 +890,7 @@ class TranscriptionPipeline:
                     "duration_minutes": r.duration_seconds / 60,
                     "transcript_length": len(r.transcript_text),
                     "cost_estimate": r.cost_estimate,
+                    "from_cache": r.from_cache,
                     "error": r.error_message
                 }
                 for r in results
@@ -500,6 +943,10 @@ async def main():
                        help="Transcription method (default: api)")
     parser.add_argument("--inbox", help="INBOX folder to auto-copy transcripts")
     parser.add_argument("--batch", action="store_true", help="Process all files in folder")
+    parser.add_argument("--workers", type=int, default=2,
+                       help="Files transcribed concurrently in batch mode (default: 2)")
+    parser.add_argument("--cache-dir", help="Transcript cache folder (default: $TRANSCRIPT_CACHE_DIR or ~/.local/share/compass/transcript_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-transcribe")
     
     args = parser.parse_args()
     
@@ -514,11 +961,17 @@ async def main():
     
     if args.batch:
         # Process folder
-        pipeline = TranscriptionPipeline(method, args.inbox)
+        pipeline = TranscriptionPipeline(
+            method, args.inbox,
+            max_concurrent_files=args.workers,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache
+        )
         await pipeline.process_media_folder(args.input_path, auto_inbox=bool(args.inbox))
     else:
         # Process single file
-        engine = TranscriptionEngine(method)
+        cache = None if args.no_cache else TranscriptCache(args.cache_dir)
+        engine = TranscriptionEngine(method, cache=cache)
         result = await engine.transcribe_file(args.input_path)
         
         if result.error_message:
@@ -117,7 +117,7 @@ class CompletePipeline:
         """Run INBOX processor"""
         try:
             # Start the processor (this blocks)
-            self.inbox_processor.start_watching()
+            await self.inbox_processor.start_watching()
         except Exception as e:
             print(f"❌ INBOX processor error: {e}")
     
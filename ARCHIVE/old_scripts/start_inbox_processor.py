@@ -141,7 +141,7 @@ The processor will:
         
         # Start watching
         print("👁️  Starting file watcher...")
-        processor.start_watching()
+        await processor.start_watching()
         
     except KeyboardInterrupt:
         print("\n🛑 INBOX processor stopped by user")
@@ -79,7 +79,7 @@ class LocalBecomingOneSystem:
         
         try:
             # Start INBOX processor
-            self.inbox_processor.start_watching()
+            await self.inbox_processor.start_watching()
         except KeyboardInterrupt:
             print("\n🛑 Local system stopped by user")
         except Exception as e:
@@ -1,6 +1,7 @@
 # build this
 
 import os
+import sys
 import shutil
 from pathlib import Path
 from datetime import datetime
@@ -9,8 +10,15 @@ import yaml
 from typing import Dict, List, Optional
 import hashlib
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from text_similarity import MinHasher, MinHashLSH
+
+# Formats whose bytes are not text; they only get exact-duplicate detection
+BINARY_EXTENSIONS = {'.pdf', '.docx', '.doc', '.xlsx', '.xls', '.pptx', '.zip',
+                     '.png', '.jpg', '.jpeg', '.gif', '.mp3', '.mp4', '.wav', '.m4a'}
+
 class ArchiveManager:
-    def __init__(self, base_dir: str = "archive"):
+    def __init__(self, base_dir: str = "archive", near_duplicate_threshold: float = 0.8):
         self.base_dir = Path(base_dir)
         self.setup_archive_structure()
         
@@ -18,6 +26,13 @@ class ArchiveManager:
         self.index_file = self.base_dir / "archive_index.yaml"
         self.archive_index = self.load_archive_index()
         
+        # Near-duplicate index: MinHash signatures of archived files, keyed by file hash
+        self.hasher = MinHasher()
+        self.near_duplicates = MinHashLSH(near_duplicate_threshold, self.hasher.num_perm)
+        self.near_duplicate_file = self.base_dir / "metadata" / "near_duplicate_index.jsonl"
+        self._pending_signatures = {}
+        self.load_near_duplicate_index()
+        
     def setup_archive_structure(self):
         """Create archive directory structure"""
         # Main archive directories
@@ -75,10 +90,81 @@ class ArchiveManager:
         with open(self.index_file, 'w') as f:
             yaml.dump(self.archive_index, f, sort_keys=False)
     
+    def load_near_duplicate_index(self):
+        """Load stored signatures and index archived files that have none yet"""
+        if self.near_duplicate_file.exists():
+            with open(self.near_duplicate_file, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.near_duplicates.add(entry["file_hash"], entry["signature"])
+        
+        # Files archived before the near-duplicate index existed
+        for file_hash, info in self.archive_index["files"].items():
+            if file_hash not in self.near_duplicates and Path(info["archive_path"]).exists():
+                self.index_near_duplicate(file_hash, self.calculate_signature(info["archive_path"]))
+    
+    def index_near_duplicate(self, file_hash: str, signature: List[int]):
+        """Add a signature to the near-duplicate index and persist it"""
+        if not signature or file_hash in self.near_duplicates:
+            return
+        self.near_duplicates.add(file_hash, signature)
+        with open(self.near_duplicate_file, 'a') as f:
+            f.write(json.dumps({"file_hash": file_hash, "signature": signature}) + "\n")
+    
+    def calculate_signature(self, file_path: str) -> List[int]:
+        """MinHash signature of the file's text, streamed line by line (empty for binary files)"""
+        if Path(file_path).suffix.lower() in BINARY_EXTENSIONS:
+            return []
+        with open(file_path, 'rb') as f:
+            if b'\0' in f.read(8192):
+                return []
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return self.hasher.signature_from_lines(f)
+    
+    def find_duplicate(self, file_path: str, file_hash: str = None) -> Optional[Dict]:
+        """Find an archived file that is identical or a near-duplicate of this one
+        
+        Cheap enough to run before any analysis: exact matches are a hash
+        lookup, near-duplicates an LSH lookup over shingled text. Only the
+        LSH query is sub-millisecond; computing the file's MinHash signature
+        dominates (tens of ms for a typical document, bounded by
+        MAX_SIGNATURE_WORDS).
+        """
+        file_hash = file_hash or self.calculate_file_hash(file_path)
+        if file_hash in self.archive_index["files"]:
+            return {
+                "file_hash": file_hash,
+                "match": "exact",
+                "canonical_hash": file_hash,
+                "similarity": 1.0
+            }
+        
+        signature = self._pending_signatures.get(file_hash)
+        if signature is None:
+            signature = self.calculate_signature(file_path)
+            self._pending_signatures = {file_hash: signature}
+        
+        matches = [(key, similarity) for key, similarity in self.near_duplicates.query(signature)
+                   if key in self.archive_index["files"]]
+        if not matches:
+            return None
+        
+        canonical_hash, similarity = matches[0]
+        return {
+            "file_hash": file_hash,
+            "match": "near",
+            "canonical_hash": canonical_hash,
+            "similarity": round(similarity, 3)
+        }
+    
     def calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA-256 hash of file contents"""
+        sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
     
     def determine_archive_category(self, file_path: str, analysis: Dict) -> str:
         """Determine appropriate archive category"""
@@ -101,9 +187,10 @@ class ArchiveManager:
         # Calculate file hash
         file_hash = self.calculate_file_hash(file_path)
         
-        # Check for duplicates
-        if file_hash in self.archive_index["files"]:
-            return self.handle_duplicate(file_path, file_hash)
+        # Check for exact and near duplicates
+        duplicate = self.find_duplicate(file_path, file_hash)
+        if duplicate:
+            return self.handle_duplicate(file_path, duplicate)
         
         # Determine archive location
         if status == "processed":
@@ -113,6 +200,8 @@ class ArchiveManager:
             archive_subdir = self.base_dir / "quarantined" / "fluff"
         elif status == "rescued":
             archive_subdir = self.base_dir / "rescued" / "auto_rescued"
+        elif status == "preserved":
+            archive_subdir = self.base_dir / "processed" / "prompts"
         else:
             raise ValueError(f"Unknown status: {status}")
         
@@ -156,11 +245,18 @@ class ArchiveManager:
         
         self.save_archive_index()
         
+        # Later near-duplicates link back to this file as the canonical version
+        signature = self._pending_signatures.pop(file_hash, None)
+        if signature is None:
+            signature = self.calculate_signature(archive_path)
+        self.index_near_duplicate(file_hash, signature)
+        
         return metadata
     
-    def handle_duplicate(self, file_path: Path, file_hash: str) -> Dict:
-        """Handle duplicate file"""
-        existing = self.archive_index["files"][file_hash]
+    def handle_duplicate(self, file_path: Path, duplicate: Dict) -> Dict:
+        """Handle an exact or near-duplicate file (see find_duplicate)"""
+        file_path = Path(file_path)
+        existing = self.archive_index["files"][duplicate["canonical_hash"]]
         
         # Move to duplicates folder
         duplicate_dir = self.base_dir / "quarantined" / "duplicates"
@@ -170,11 +266,18 @@ class ArchiveManager:
         metadata = {
             "original_path": str(file_path),
             "archived_at": datetime.now().isoformat(),
-            "status": "duplicate",
+            "status": "duplicate" if duplicate["match"] == "exact" else "near_duplicate",
             "duplicate_of": existing["archive_path"],
-            "file_hash": file_hash
+            "canonical_metadata": existing["metadata_path"],
+            "canonical_hash": duplicate["canonical_hash"],
+            "similarity": duplicate["similarity"],
+            "file_hash": duplicate["file_hash"]
         }
         
+        metadata_path = self.base_dir / "metadata" / "processing_logs" / f"{duplicate_path.name}.meta.yaml"
+        with open(metadata_path, 'w') as f:
+            yaml.dump(metadata, f, sort_keys=False)
+        
         return metadata
     
     def get_archive_stats(self) -> Dict:
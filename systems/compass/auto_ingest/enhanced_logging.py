@@ -1,14 +1,18 @@
 # build this
 
+import os
+import sys
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
-import yaml
 from dataclasses import dataclass, asdict
 import jsonlines
 
+sys.path.append(os.path.dirname(__file__))
+from fluff_patterns import FLUFF_PATTERNS_FILE, get_fluff_patterns
+
 @dataclass
 class ProcessingLog:
     timestamp: str
@@ -23,7 +27,7 @@ class ProcessingLog:
     rescue_indicators: List[str] = None
 
 class EnhancedLogger:
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self, log_dir: str = "logs", patterns_file: str = FLUFF_PATTERNS_FILE):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         
@@ -35,8 +39,8 @@ class EnhancedLogger:
         # Set up logging handlers
         self._setup_logging()
         
-        # Load fluff patterns
-        self.patterns = self._load_patterns()
+        # Shared fluff patterns (loaded once, reloaded when the file changes)
+        self.fluff_patterns = get_fluff_patterns(patterns_file)
         
         # Session statistics
         self.session_stats = {
@@ -60,11 +64,6 @@ class EnhancedLogger:
         )
         self.move_logger.addHandler(move_handler)
     
-    def _load_patterns(self) -> Dict:
-        """Load fluff detection patterns"""
-        with open("enhanced_fluff_patterns.yaml", 'r') as f:
-            return yaml.safe_load(f)
-    
     def log_processing(self, file_path: str, analysis: Dict):
         """Log file processing with enhanced details"""
         # Calculate fluff score
@@ -128,16 +127,11 @@ class EnhancedLogger:
             "rescue_indicators": []
         }
         
-        # Check each pattern type
-        for pattern_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in content.lower():
-                    results["patterns"].append(f"{pattern_type}: {pattern}")
-        
-        # Check rescue indicators
-        for indicator in self.patterns["rescue_indicators"]:
-            if indicator.lower() in content.lower():
-                results["rescue_indicators"].append(indicator)
+        # One scan finds every pattern type, rescue indicators included
+        for pattern_type, pattern in self.fluff_patterns.find(content):
+            results["patterns"].append(f"{pattern_type}: {pattern}")
+            if pattern_type == "rescue_indicators":
+                results["rescue_indicators"].append(pattern)
         
         return results
     
@@ -1,8 +1,107 @@
 # build this
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+from collections import Counter
+from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import add, eq, mul
 import re
 
+@dataclass
+class RepeatedSpan:
+    """An n-word phrase that repeats; positions are the word offsets of each occurrence"""
+    phrase: str
+    n: int
+    count: int
+    positions: List[int]
+
+def _ngram_hashes(tokens: List[int], n: int, base: int) -> List[int]:
+    """Hash of every n-gram, built from doubled 2^k-gram hashes (log2(n) list passes)"""
+    result, result_len = None, 0
+    power, power_len = tokens, 1
+    while True:
+        if n & power_len:
+            if result is None:
+                result, result_len = power, power_len
+            else:
+                shift = repeat(base ** power_len)
+                result = list(map(add, map(mul, result, shift), power[result_len:]))
+                result_len += power_len
+        if power_len * 2 > n:
+            return result
+        power = list(map(add, map(mul, power, repeat(base ** power_len)), power[power_len:]))
+        power_len *= 2
+
+def find_repeated_spans(words: List[str], ngram_sizes: Iterable[int] = (4,),
+                        min_count: int = 3) -> List[RepeatedSpan]:
+    """Find n-word phrases occurring at least min_count times, for several n at once
+    
+    Words are mapped to integer ids and each n-gram gets a polynomial hash
+    over those ids with base = vocabulary size, so hashes are exact. The
+    (n+1)-gram hash at a position is the n-gram hash times the base plus
+    the next id, and it is only computed where the n-grams at that position
+    and the next one both repeat - an (n+1)-gram cannot repeat more often
+    than either of them. All sizes are found in one pass over shrinking
+    candidate lists, with the per-position work done by C-level iterators.
+    A single size skips the pruning and hashes by doubling instead.
+    """
+    ngram_sizes = set(ngram_sizes)
+    if not words or not ngram_sizes:
+        return []
+    
+    ids = {word: i for i, word in enumerate(dict.fromkeys(words))}
+    tokens = list(map(ids.__getitem__, words))
+    base = max(len(ids), 2)
+    
+    if len(ngram_sizes) == 1:
+        n, = ngram_sizes
+        hashes = _ngram_hashes(tokens, n, base)
+        repeated = {h for h, count in Counter(hashes).items() if count >= min_count}
+        occurrences = {}
+        for position in compress(range(len(hashes)), map(repeated.__contains__, hashes)):
+            occurrences.setdefault(hashes[position], []).append(position)
+        return [RepeatedSpan(" ".join(words[offsets[0]:offsets[0] + n]), n, len(offsets), offsets)
+                for offsets in occurrences.values()]
+    
+    spans = []
+    positions = None  # None while dense: hashes[i] is the n-gram starting at word i
+    hashes = tokens
+    for n in range(1, max(ngram_sizes) + 1):
+        if n > 1:
+            if positions is None:
+                hashes = list(map(add, map(mul, hashes, repeat(base)), tokens[n - 1:]))
+            else:
+                # Extend only n-grams whose successor n-gram also repeats
+                extendable = list(map(eq, map(add, positions, repeat(1)), positions[1:]))
+                positions = list(compress(positions, extendable))
+                next_ids = map(tokens.__getitem__, map(add, positions, repeat(n - 1)))
+                hashes = list(map(add, map(mul, compress(hashes, extendable), repeat(base)), next_ids))
+        
+        if n == 1 and n not in ngram_sizes:
+            # Nearly every word repeats - pruning on single words does not pay off
+            continue
+        
+        counts = Counter(hashes)
+        repeated = {h for h, count in counts.items() if count >= min_count}
+        if not repeated:
+            break
+        
+        # Switch to sparse candidates once enough positions drop out
+        if positions is not None or n in ngram_sizes or sum(map(counts.__getitem__, repeated)) * 2 < len(hashes):
+            keep = list(map(repeated.__contains__, hashes))
+            positions = list(compress(range(len(hashes)) if positions is None else positions, keep))
+            hashes = list(compress(hashes, keep))
+        
+        if n in ngram_sizes:
+            occurrences = {}
+            for position, h in zip(positions, hashes):
+                occurrences.setdefault(h, []).append(position)
+            for offsets in occurrences.values():
+                start = offsets[0]
+                spans.append(RepeatedSpan(" ".join(words[start:start + n]), n, len(offsets), offsets))
+    
+    return spans
+
 class FluffDetector:
     def __init__(self):
         # Buzzword patterns that often indicate AI fluff
@@ -29,6 +128,7 @@ class FluffDetector:
         
         # Repetitive phrase detection
         self.repetition_threshold = 3
+        self.repetition_ngram_sizes = [4]
         
         # Vague qualifier patterns
         self.vague_qualifiers = [
@@ -60,31 +160,35 @@ class FluffDetector:
             "repetitive_phrases": [],
             "vague_qualifiers": [],
             "template_markers": [],
+            "repeated_spans": [],
             "score": 0
         }
+        text_lower = text.lower()
         
         # Check for buzzwords
         for pattern in self.buzzword_patterns:
-            matches = re.finditer(pattern, text.lower())
+            matches = re.finditer(pattern, text_lower)
             results["buzzwords"].extend([m.group() for m in matches])
         
         # Check for circular reasoning
         for pattern in self.circular_patterns:
-            matches = re.finditer(pattern, text.lower())
+            matches = re.finditer(pattern, text_lower)
             results["circular_reasoning"].extend([m.group() for m in matches])
         
         # Check for repetitive phrases
-        phrases = self._find_repetitive_phrases(text)
-        results["repetitive_phrases"] = phrases
+        spans = find_repeated_spans(text_lower.split(), self.repetition_ngram_sizes,
+                                    self.repetition_threshold)
+        results["repeated_spans"] = spans
+        results["repetitive_phrases"] = [span.phrase for span in spans]
         
         # Check for vague qualifiers
         for pattern in self.vague_qualifiers:
-            matches = re.finditer(pattern, text.lower())
+            matches = re.finditer(pattern, text_lower)
             results["vague_qualifiers"].extend([m.group() for m in matches])
         
         # Check for template markers
         for pattern in self.template_markers:
-            matches = re.finditer(pattern, text.lower())
+            matches = re.finditer(pattern, text_lower)
             results["template_markers"].extend([m.group() for m in matches])
         
         # Calculate fluff score
@@ -93,16 +197,9 @@ class FluffDetector:
         return results
     
     def _find_repetitive_phrases(self, text: str, min_length: int = 4) -> List[str]:
-        """Find phrases that repeat more than threshold times"""
-        words = text.lower().split()
-        phrases = {}
-        
-        for i in range(len(words) - min_length):
-            phrase = " ".join(words[i:i+min_length])
-            phrases[phrase] = phrases.get(phrase, 0) + 1
-        
-        return [phrase for phrase, count in phrases.items() 
-                if count >= self.repetition_threshold]
+        """Find phrases that repeat at least threshold times"""
+        spans = find_repeated_spans(text.lower().split(), [min_length], self.repetition_threshold)
+        return [span.phrase for span in spans]
     
     def _calculate_fluff_score(self, results: Dict) -> float:
         """Calculate a fluff score from 0 to 1"""
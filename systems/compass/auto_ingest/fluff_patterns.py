@@ -0,0 +1,127 @@
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import yaml
+
+# Pattern file shared by RescueSystem and EnhancedLogger
+FLUFF_PATTERNS_FILE = "enhanced_fluff_patterns.yaml"
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: one scan of the text finds every pattern
+
+    Patterns are lowercased, and so is the text before matching, so
+    matches are case-insensitive like the `pattern.lower() in
+    text.lower()` checks this replaces. Each match reports the indices
+    of the patterns it ends.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern.lower():
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(index)
+
+        # Breadth-first: a node's failure link is the longest proper suffix in the trie.
+        # Missing transitions are filled in from the failure link, turning the trie
+        # into a DFA so matching is one dict lookup per character.
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            fallback = self.goto[self.fail[node]]
+            self.output[node] = self.output[node] + self.output[self.fail[node]]
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                self.fail[child] = fallback.get(char, 0)
+            for char, target in fallback.items():
+                self.goto[node].setdefault(char, target)
+
+    def matches(self, text: str, stop_at_first: bool = False) -> Set[int]:
+        """Indices of the patterns occurring in text"""
+        found = set()
+        goto, output = self.goto, self.output
+        node = 0
+        for char in text.lower():
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+                if stop_at_first:
+                    break
+        return found
+
+class FluffPatternRegistry:
+    """Fluff patterns loaded once per process and reloaded when the file changes
+
+    The YAML maps a category to a list of phrases. Every phrase goes into
+    one Aho-Corasick matcher, so checking a header or a document costs one
+    pass over its text however many patterns there are.
+    """
+
+    def __init__(self, path: str = FLUFF_PATTERNS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self._mtime = None
+        self._patterns: Dict[str, List[str]] = {}
+        # (category, pattern) entries and their matcher, swapped together on reload
+        self._compiled: Tuple[List[Tuple[str, str]], AhoCorasick] = ([], AhoCorasick([]))
+
+    def _refresh(self):
+        """Reload and recompile if the file's mtime changed since the last load"""
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with self.lock:
+            if mtime == self._mtime:
+                return
+            with open(self.path, 'r') as f:
+                patterns = yaml.safe_load(f) or {}
+            entries = [
+                (category, pattern)
+                for category, pattern_list in patterns.items()
+                for pattern in (pattern_list or [])
+                if isinstance(pattern, str) and pattern
+            ]
+            self._compiled = (entries, AhoCorasick([pattern for _, pattern in entries]))
+            self._patterns = patterns
+            self._mtime = mtime
+
+    @property
+    def patterns(self) -> Dict[str, List[str]]:
+        """Patterns by category, as in the YAML file"""
+        self._refresh()
+        return self._patterns
+
+    def find(self, text: str, categories: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """(category, pattern) pairs occurring in text, in file order"""
+        self._refresh()
+        entries, matcher = self._compiled
+        return [
+            entries[index] for index in sorted(matcher.matches(text))
+            if categories is None or entries[index][0] in categories
+        ]
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any pattern of any category occurs in text"""
+        self._refresh()
+        return bool(self._compiled[1].matches(text, stop_at_first=True))
+
+_registries: Dict[str, FluffPatternRegistry] = {}
+_registries_lock = threading.Lock()
+
+def get_fluff_patterns(path: str = FLUFF_PATTERNS_FILE) -> FluffPatternRegistry:
+    """Shared registry for a pattern file"""
+    key = os.path.abspath(path)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = FluffPatternRegistry(key)
+        return _registries[key]
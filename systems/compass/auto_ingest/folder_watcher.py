@@ -91,6 +91,20 @@ class DocumentHandler(FileSystemEventHandler):
             # Wait a moment to ensure file is fully written
             await asyncio.sleep(1)
             
+            # Skip exact and near-duplicates of archived files before the expensive stages
+            duplicate = self.processor.archive_manager.find_duplicate(file_path)
+            if duplicate:
+                metadata = self.processor.archive_manager.handle_duplicate(file_path, duplicate)
+                logging.info(
+                    f"Skipping {duplicate['match']} duplicate {file_path} "
+                    f"(similarity {duplicate['similarity']}) of {metadata['duplicate_of']}"
+                )
+            
+                dest_folder = os.path.join(os.path.dirname(file_path), 'processed', 'duplicates')
+                os.makedirs(dest_folder, exist_ok=True)
+                os.rename(file_path, os.path.join(dest_folder, Path(file_path).name))
+                return
+            
             # Check if this is a chat file with prompts
             if self.processor.preserver.is_chat_file(file_path):
                 logging.info(f"Processing chat file: {file_path}")
@@ -182,27 +196,31 @@ class DocumentHandler(FileSystemEventHandler):
                 status="processed"
             )
             
-            # ALL documents in this folder are treated as potential master prompt changes
+            # ALL documents in this folder are screened as potential master prompt changes
             logging.info(f"Processing as potential master prompt document: {file_path}")
-            logging.info("Creating review request for potential master prompt change...")
             
             # Read the document content
             with open(file_path, 'r') as f:
                 new_master_prompt = f.read()
             
-            # Create review request
-            review_result = self.processor.review_system.create_review_request(
-                new_master_prompt,
-                "Auto_Compass_System",
-                f"Automatically detected potential master prompt change from file: {os.path.basename(file_path)}"
-            )
-            
-            if review_result['success']:
-                logging.info(f"Review request created successfully: {review_result['review_id']}")
-                logging.info(f"Impact Level: {review_result['analysis'].get('impact_level', 'Unknown')}")
-                logging.info(f"AI Recommendation: {review_result['analysis'].get('recommendation', 'Unknown')}")
+            # Only plausible master prompt candidates go to the LLM analysis
+            prescreen = self.processor.review_system.screen_review_candidate(new_master_prompt)
+            if prescreen.escalate:
+                logging.info(f"Creating review request for potential master prompt change ({prescreen.reason})...")
+                review_result = self.processor.review_system.create_review_request(
+                    new_master_prompt,
+                    "Auto_Compass_System",
+                    f"Automatically detected potential master prompt change from file: {os.path.basename(file_path)}"
+                )
+                
+                if review_result['success']:
+                    logging.info(f"Review request created successfully: {review_result['review_id']}")
+                    logging.info(f"Impact Level: {review_result['analysis'].get('impact_level', 'Unknown')}")
+                    logging.info(f"AI Recommendation: {review_result['analysis'].get('recommendation', 'Unknown')}")
+                else:
+                    logging.error(f"Failed to create review request: {review_result['error']}")
             else:
-                logging.error(f"Failed to create review request: {review_result['error']}")
+                logging.info(f"Pre-screen skipped master prompt review for {file_path}: {prescreen.reason}")
             
             # Check if this document should be added to consider list
             consider_categories = ["ai_agents", "technical", "method_core", "personality_systems"]
@@ -320,6 +338,7 @@ class AutoProcessor:
                 logging.info(f"Found existing file: {file_path}")
                 event_handler = DocumentHandler(self)
                 event_handler._process_document(file_path)
+        self.review_system.prescreen.log_batch_report("existing files")
         
         # Start watching for new files
         event_handler = DocumentHandler(self)
@@ -345,6 +364,7 @@ class AutoProcessor:
                     with open(report_path, 'w') as f:
                         f.write(report)
                     logging.info(f"Report generated: {report_path}")
+                    self.review_system.prescreen.log_batch_report("last hour")
                     
         except KeyboardInterrupt:
             observer.stop()
@@ -1,85 +1,176 @@
 # build this
 
+import os
 import re
+import shutil
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 import json
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl that shares a file's extents with another (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Lines kept before each prompt as context
+CONTEXT_LINES = 5
+
+def read_lines(f: TextIO) -> Iterator[str]:
+    """Lines of an open file without newlines, matching content.split('\\n')"""
+    ends_with_newline = True
+    for line in f:
+        ends_with_newline = line.endswith('\n')
+        yield line[:-1] if ends_with_newline else line
+    if ends_with_newline:
+        yield ""
+
+def reflink(source: str, destination: str):
+    """Copy-on-write clone of source at destination (raises OSError where unsupported)"""
+    if fcntl is None:
+        raise OSError("reflink is not supported on this platform")
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+def preserve_file(source: str, destination: Path, allow_hardlink: bool = False) -> str:
+    """Place source at destination without rewriting it: reflink, else copy
+
+    A hard link shares the inode, so later writes to the source would change
+    the preserved copy; it is only used with allow_hardlink, for callers that
+    move the original out of the inbox afterwards.
+    """
+    if allow_hardlink and destination.exists() and os.path.samefile(source, destination):
+        # Already linked by an earlier run; replacing a link with itself is a no-op
+        return "hardlink"
+    temp_path = destination.with_name(destination.name + ".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+    try:
+        method = None
+        if allow_hardlink:
+            try:
+                os.link(source, temp_path)
+                method = "hardlink"
+            except OSError:
+                pass
+        if method is None:
+            try:
+                reflink(source, str(temp_path))
+                method = "reflink"
+            except OSError:
+                if temp_path.exists():
+                    temp_path.unlink()
+                shutil.copyfile(source, temp_path)
+                method = "copy"
+        os.replace(temp_path, destination)
+    finally:
+        # os.replace leaves both names when they are links to the same inode
+        if temp_path.exists():
+            temp_path.unlink()
+    return method
+
 class PromptPreserver:
     def __init__(self):
         # Markers for user prompts in chat files
-        self.prompt_markers = [
-            r"Human:|User:|Johan:|<user>|<user_message>|<user_query>",
-            r"system message:|system:|<system>|<system_message>"
-        ]
+        self.prompt_markers = {
+            "user": r"Human:|User:|Johan:|<user>|<user_message>|<user_query>",
+            "system": r"system message:|system:|<system>|<system_message>"
+        }
+        
+        # One pattern for all markers; the matching group names the prompt type
+        self.marker_pattern = re.compile(
+            "|".join(f"(?P<{kind}>{marker})" for kind, marker in self.prompt_markers.items())
+        )
         
         # Track extracted prompts
         self.extracted_prompts = {}
         
-    def extract_prompts(self, content: str, file_path: str) -> List[Dict]:
-        """Extract original prompts from chat content"""
-        prompts = []
-        current_prompt = None
-        
-        # Split content into lines
-        lines = content.split('\n')
+    def _finish_prompt(self, prompt: Dict) -> Dict:
+        prompt["content"] = "\n".join(prompt["content"])
+        return prompt
         
-        for i, line in enumerate(lines):
+    def iter_prompts(self, lines: Iterable[str], file_path: str) -> Iterator[Dict]:
+        """Stream prompts from lines (without newlines), looking two lines ahead"""
+        source_file = str(file_path)
+        lines = iter(lines)
+        window = deque()  # current line plus lookahead
+        context = deque(maxlen=CONTEXT_LINES)
+        current_prompt = None
+        line_number = 0
+        exhausted = False
+        
+        while True:
+            while not exhausted and len(window) < 3:
+                try:
+                    window.append(next(lines))
+                except StopIteration:
+                    exhausted = True
+            if not window:
+                break
+            
+            line = window[0]
+            line_number += 1
+            
             # Check if line starts a prompt
-            for marker in self.prompt_markers:
-                if re.match(marker, line):
-                    # If we were collecting a previous prompt, save it
-                    if current_prompt:
-                        prompts.append(current_prompt)
-                    
-                    # Start new prompt
-                    current_prompt = {
-                        "type": "user" if "Human:|User:|Johan:" in marker else "system",
-                        "source_file": str(file_path),
-                        "line_number": i + 1,
-                        "content": [],
-                        "context_before": lines[max(0, i-5):i],  # Preserve 5 lines of context
-                        "extracted_at": datetime.now().isoformat()
-                    }
-                    continue
+            match = self.marker_pattern.match(line)
+            if match:
+                # If we were collecting a previous prompt, save it
+                if current_prompt:
+                    yield self._finish_prompt(current_prompt)
+                
+                # Start new prompt
+                current_prompt = {
+                    "type": match.lastgroup,
+                    "source_file": source_file,
+                    "line_number": line_number,
+                    "content": [],
+                    "context_before": list(context),
+                    "extracted_at": datetime.now().isoformat()
+                }
             
             # If we're collecting a prompt, add the line
             if current_prompt:
                 current_prompt["content"].append(line)
                 
-                # Check if prompt ends (next marker or significant whitespace)
-                next_line = lines[i+1] if i+1 < len(lines) else ""
-                if any(re.match(marker, next_line) for marker in self.prompt_markers) or \
-                   (not next_line.strip() and not lines[i+2].strip() if i+2 < len(lines) else False):
-                    current_prompt["content"] = "\n".join(current_prompt["content"])
-                    prompts.append(current_prompt)
+                # Check if prompt ends (next marker or two blank lines)
+                next_line = window[1] if len(window) > 1 else ""
+                if self.marker_pattern.match(next_line) or \
+                   (len(window) > 2 and not next_line.strip() and not window[2].strip()):
+                    yield self._finish_prompt(current_prompt)
                     current_prompt = None
+            
+            context.append(line)
+            window.popleft()
         
         # Save last prompt if exists
         if current_prompt:
-            current_prompt["content"] = "\n".join(current_prompt["content"])
-            prompts.append(current_prompt)
+            yield self._finish_prompt(current_prompt)
         
-        return prompts
+    def extract_prompts(self, content: str, file_path: str) -> List[Dict]:
+        """Extract original prompts from chat content"""
+        return list(self.iter_prompts(content.split('\n'), file_path))
+    
+    def extract_prompts_from_file(self, file_path: str) -> List[Dict]:
+        """Extract prompts from a chat file without loading it into memory"""
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            return list(self.iter_prompts(read_lines(f), file_path))
     
     def preserve_chat_file(self, file_path: str, output_dir: str) -> Tuple[Path, List[Dict]]:
         """Preserve chat file with all prompts intact"""
-        # Read original content
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
         # Extract prompts
-        prompts = self.extract_prompts(content, file_path)
+        prompts = self.extract_prompts_from_file(file_path)
         
         # Create preservation directory
         preserve_dir = Path(output_dir) / "preserved_chats"
         preserve_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save original file
+        # Keep the original file byte for byte
         original_path = preserve_dir / Path(file_path).name
-        with open(original_path, 'w') as f:
-            f.write(content)
+        preserved_as = preserve_file(file_path, original_path)
         
         # Save extracted prompts with metadata
         prompts_path = preserve_dir / f"{Path(file_path).stem}_prompts.json"
@@ -87,6 +178,7 @@ class PromptPreserver:
             json.dump({
                 "source_file": str(file_path),
                 "extracted_at": datetime.now().isoformat(),
+                "preserved_as": preserved_as,
                 "prompts": prompts
             }, f, indent=2)
         
@@ -101,7 +193,7 @@ class PromptPreserver:
         try:
             with open(file_path, 'r') as f:
                 content = f.read(1000)  # Read first 1000 chars
-                return any(re.search(marker, content) for marker in self.prompt_markers)
+                return self.marker_pattern.search(content) is not None
         except:
             return False
     
@@ -1,12 +1,16 @@
 # build this
 
+import os
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-import yaml
 from datetime import datetime
 
+sys.path.append(os.path.dirname(__file__))
+from fluff_patterns import FLUFF_PATTERNS_FILE, get_fluff_patterns
+
 @dataclass
 class RescueSnippet:
     filename: str
@@ -18,11 +22,15 @@ class RescueSnippet:
     rescue_reason: Optional[str] = None
 
 class RescueSystem:
-    def __init__(self, quarantine_dir: str = "99_trash_quarantine"):
+    def __init__(self, quarantine_dir: str = "99_trash_quarantine",
+                 patterns_file: str = FLUFF_PATTERNS_FILE):
         self.quarantine_dir = Path(quarantine_dir)
         self.rescue_backup_dir = self.quarantine_dir / "_rescue_backup"
         self.rescue_backup_dir.mkdir(exist_ok=True)
         
+        # Shared fluff patterns (loaded once, reloaded when the file changes)
+        self.fluff_patterns = get_fluff_patterns(patterns_file)
+        
         # Load glossary terms
         self.glossary_terms = self._load_glossary()
         
@@ -66,19 +74,15 @@ class RescueSystem:
         """Extract non-fluff headers"""
         headers = re.findall(r'^#{2,3}\s+(.+)$', content, re.MULTILINE)
         
-        # Load fluff patterns
-        with open("enhanced_fluff_patterns.yaml", 'r') as f:
-            patterns = yaml.safe_load(f)
-        
         # Filter out headers containing fluff
         clean_headers = []
         for header in headers:
-            if not any(pattern.lower() in header.lower() 
-                      for pattern_list in patterns.values()
-                      for pattern in pattern_list):
+            if not self.fluff_patterns.contains_any(header):
                 clean_headers.append(header)
+                if len(clean_headers) == 3:
+                    break
         
-        return clean_headers[:3]  # Return first 3 clean headers
+        return clean_headers  # Return first 3 clean headers
     
     def count_glossary_terms(self, content: str) -> List[str]:
         """Count occurrences of glossary terms"""
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark the structural YAML diff on large prompt files
+
+Compares PromptVersioner's tree-aware change set and the indexed
+modification pairing against the previous yaml.dump + unified_diff
+comparison and quadratic pairing. Pass two YAML files as arguments to
+benchmark a real pair of versions; without arguments synthetic prompt
+files of 2k, 5k and 10k lines are generated and edited.
+"""
+
+import os
+import sys
+import time
+import yaml
+import random
+import difflib
+from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(__file__), 'versioning'))
+from compare import PromptVersioner, Version
+from structural_diff import pair_similar
+
+def legacy_compare_yaml(old_content, new_content):
+    """The previous PromptVersioner.compare_yaml: unified diff of re-dumped YAML"""
+    old_lines = yaml.dump(old_content, sort_keys=False).splitlines()
+    new_lines = yaml.dump(new_content, sort_keys=False).splitlines()
+    return list(difflib.unified_diff(old_lines, new_lines, lineterm=''))
+
+def legacy_pair_modifications(deletions, additions):
+    """The previous DiffExplainer pairing: every deletion against every addition"""
+    deletions, additions = deletions[:], additions[:]
+    modifications = []
+    for del_line in deletions[:]:
+        for add_line in additions[:]:
+            if difflib.SequenceMatcher(None, del_line, add_line).ratio() > 0.5:
+                modifications.append((del_line, add_line))
+                deletions.remove(del_line)
+                additions.remove(add_line)
+                break
+    return modifications
+
+def split_diff(diff_lines):
+    additions = [line[1:].strip() for line in diff_lines if line.startswith('+') and not line.startswith('+++')]
+    deletions = [line[1:].strip() for line in diff_lines if line.startswith('-') and not line.startswith('---')]
+    return deletions, additions
+
+def synthetic_prompt_library(target_lines: int, seed: int = 42) -> dict:
+    """Prompt library with modules of rules, examples and multi-line templates"""
+    rng = random.Random(seed)
+    common = ["the", "a", "to", "and", "of", "when", "user", "always", "never", "respond", "with"]
+    vocabulary = [f"term{i}" for i in range(2000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    def sentence(k):
+        words = [rng.choice(common) if rng.random() < 0.4 else rng.choices(vocabulary, weights)[0]
+                 for _ in range(k)]
+        return " ".join(words).capitalize() + "."
+
+    modules = []
+    lines = 0
+    while lines < target_lines:
+        number = len(modules)
+        module = {
+            "id": f"module-{number}",
+            "name": f"Module {number}",
+            "description": sentence(12),
+            "rules": [sentence(rng.randint(6, 14)) for _ in range(rng.randint(5, 15))],
+            "examples": [{"input": sentence(8), "output": sentence(10)} for _ in range(rng.randint(1, 3))],
+            "template": "\n".join(sentence(rng.randint(8, 16)) for _ in range(rng.randint(10, 30))) + "\n",
+        }
+        modules.append(module)
+        lines += len(yaml.dump([module], sort_keys=False).splitlines())
+    return {"title": "Synthetic prompt library", "version": "1.0.0", "modules": modules}
+
+def edit_library(library: dict, rate: float = 0.03, seed: int = 7) -> dict:
+    """Copy of the library with edited, added and removed rules and template lines"""
+    rng = random.Random(seed)
+    edited = yaml.safe_load(yaml.safe_dump(library))
+    edited["version"] = "1.1.0"
+    for module in edited["modules"]:
+        for i, rule in enumerate(module["rules"]):
+            if rng.random() < rate:
+                module["rules"][i] = rule.replace(".", " unless the user asks otherwise.")
+        if rng.random() < rate:
+            module["rules"].insert(0, "Always confirm the output format first.")
+        if rng.random() < rate and len(module["rules"]) > 1:
+            module["rules"].pop()
+        template = module["template"].splitlines()
+        for i, line in enumerate(template):
+            if rng.random() < rate:
+                template[i] = "Note: " + line.lower()
+        module["template"] = "\n".join(template) + "\n"
+    # Move a module to the end, which a line diff reports as a full delete and re-add
+    edited["modules"].append(edited["modules"].pop(1))
+    return edited
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def benchmark(name: str, old_content: dict, new_content: dict) -> bool:
+    line_count = len(yaml.dump(old_content, sort_keys=False).splitlines())
+    print(f"\n📄 {name}: {line_count:,} YAML lines")
+    versioner = PromptVersioner()
+    old_version = Version(old_content, datetime.now(), "1")
+    new_version = Version(new_content, datetime.now(), "2")
+
+    legacy_diff, legacy_time = timed(legacy_compare_yaml, old_content, new_content)
+    changes, structural_time = timed(versioner.diff_versions, old_version, new_version)
+    legacy_deletions, legacy_additions = split_diff(legacy_diff)
+    print(f"  legacy dump + unified_diff: {legacy_time:6.2f}s  "
+          f"{len(legacy_deletions) + len(legacy_additions):,} changed lines")
+    print(f"  structural diff:            {structural_time:6.2f}s  {len(changes):,} changes "
+          f"({legacy_time / structural_time:.1f}x)")
+
+    legacy_pairs, legacy_pair_time = timed(legacy_pair_modifications, legacy_deletions, legacy_additions)
+    (pairs, _, _), pair_time = timed(pair_similar, legacy_deletions, legacy_additions)
+    print(f"  legacy quadratic pairing:   {legacy_pair_time:6.2f}s  {len(legacy_pairs):,} modifications")
+    print(f"  indexed pairing:            {pair_time:6.2f}s  {len(pairs):,} modifications "
+          f"({legacy_pair_time / pair_time:.1f}x)")
+
+    # Applying the change set must account for every difference
+    if bool(changes) != (old_content != new_content):
+        print("  ❌ Change set does not match the documents")
+        return False
+    if any(change.op == "modified" and change.old == change.new for change in changes):
+        print("  ❌ Change set contains unchanged values")
+        return False
+    print("  ✅ Change set is consistent")
+    return True
+
+def main():
+    print("\n" + "=" * 60)
+    print("⏱️  STRUCTURAL YAML DIFF BENCHMARK")
+    print("=" * 60)
+
+    if len(sys.argv) == 3:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            old_content = yaml.safe_load(f)
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            new_content = yaml.safe_load(f)
+        pairs = [(f"{os.path.basename(sys.argv[1])} → {os.path.basename(sys.argv[2])}", old_content, new_content)]
+    else:
+        pairs = []
+        for size in (2000, 5000, 10000):
+            library = synthetic_prompt_library(size)
+            pairs.append((f"synthetic prompt library {size // 1000}k", library, edit_library(library)))
+
+    all_passed = all([benchmark(name, old, new) for name, old, new in pairs])
+
+    print("\n" + "=" * 60)
+    if all_passed:
+        print("✅ BENCHMARK COMPLETE")
+    else:
+        print("❌ STRUCTURAL DIFF PRODUCED AN INCONSISTENT CHANGE SET")
+    print("=" * 60)
+    return all_passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,7 +1,11 @@
 import streamlit as st
 import json
+import time
 from datetime import datetime
-from consider_list_manager import ConsiderListManager
+from consider_list_manager import ConsiderListManager, PAGE_SIZE
+
+# Seconds before a view showing only its first page fetches it again
+FIRST_PAGE_TTL_SECONDS = 60
 
 def main():
     st.set_page_config(
@@ -22,6 +26,8 @@ def main():
         "Choose a page",
         ["📋 Consider List", "➕ Add New Item", "📊 Statistics", "✅ Implemented Items", "❌ Rejected Items"]
     )
+    if st.sidebar.button("🔄 Refresh"):
+        clear_loaded_items()
     
     if page == "📋 Consider List":
         show_consider_list(consider_manager)
@@ -34,6 +40,55 @@ def main():
     elif page == "❌ Rejected Items":
         show_rejected_items(consider_manager)
 
+def pages_key(key, status, priority, category):
+    return f"pages_{key}_{status}_{priority}_{category}"
+
+def load_items(consider_manager, key, status, priority=None, category=None, include_content=False):
+    """Items loaded so far for a view; the first page is fetched on first use
+    
+    A view still on its first page refetches it after FIRST_PAGE_TTL_SECONDS
+    so items added elsewhere show up; once more pages are loaded it is kept
+    until the Refresh button or a status change clears it.
+    """
+    state_key = pages_key(key, status, priority, category)
+    loaded = st.session_state.get(state_key)
+    if loaded is None or (loaded["pages"] == 1 and
+                          time.monotonic() - loaded["loaded_at"] > FIRST_PAGE_TTL_SECONDS):
+        page = consider_manager.get_consider_page(status, priority, category, include_content=include_content)
+        st.session_state[state_key] = {"items": page.items, "cursor": page.next_cursor,
+                                       "pages": 1, "loaded_at": time.monotonic()}
+    return st.session_state[state_key]
+
+def load_more_button(consider_manager, key, status, priority=None, category=None, include_content=False):
+    """Fetch the next page after the last loaded item"""
+    state_key = pages_key(key, status, priority, category)
+    loaded = st.session_state.get(state_key)
+    if loaded and loaded["cursor"] is not None:
+        if st.button(f"⬇️ Load {PAGE_SIZE} more", key=f"more_{state_key}"):
+            page = consider_manager.get_consider_page(status, priority, category, after=loaded["cursor"],
+                                                      include_content=include_content)
+            loaded["items"].extend(page.items)
+            loaded["cursor"] = page.next_cursor
+            loaded["pages"] += 1
+            st.rerun()
+
+def clear_loaded_items():
+    """Drop cached pages so views reload after an item changes status"""
+    for state_key in [k for k in st.session_state.keys() if k.startswith("pages_")]:
+        del st.session_state[state_key]
+
+def show_content(consider_manager, item, key_prefix):
+    """Content text area, fetched on demand when the list was loaded without content"""
+    content_key = f"{key_prefix}_content_{item.consider_id}"
+    if item.content is None and content_key not in st.session_state:
+        if st.button("📄 Show content", key=f"{key_prefix}_load_{item.consider_id}"):
+            st.session_state[content_key] = consider_manager.get_consider_content(item.consider_id)
+            st.rerun()
+        return
+    content = item.content if item.content is not None else st.session_state[content_key]
+    st.write("**Content:**")
+    st.text_area("Content", value=content, height=150, disabled=True, key=content_key + "_area")
+
 def show_consider_list(consider_manager):
     st.header("📋 Consider List")
     
@@ -44,90 +99,91 @@ def show_consider_list(consider_manager):
     with col2:
         category_filter = st.selectbox("Filter by Category", ["All", "method_core", "technical", "ai_agents", "documentation", "other"])
     
-    # Get consider list
+    # Get consider list (filtered server-side, one page at a time)
     priority = priority_filter if priority_filter != "All" else None
-    consider_items = consider_manager.get_consider_list(status="consider", priority=priority)
+    category = category_filter if category_filter != "All" else None
+    loaded = load_items(consider_manager, "consider", "consider", priority, category, include_content=True)
+    consider_items = loaded["items"]
     
     if not consider_items:
-        st.info("No items in the consider list.")
-        return
-    
-    # Filter by category if needed
-    if category_filter != "All":
-        consider_items = [item for item in consider_items if item['category'] == category_filter]
-    
-    if not consider_items:
-        st.info(f"No items found with the selected filters.")
+        if priority or category:
+            st.info(f"No items found with the selected filters.")
+        else:
+            st.info("No items in the consider list.")
         return
     
     # Display items
     for item in consider_items:
-        with st.expander(f"📋 {item['title']} - {item['priority'].upper()} Priority"):
+        with st.expander(f"📋 {item.title} - {item.priority.upper()} Priority"):
             col1, col2 = st.columns([3, 1])
             
             with col1:
-                st.write(f"**Category:** {item['category']}")
-                st.write(f"**Added by:** {item['added_by']}")
-                st.write(f"**Date:** {item['added_date']}")
+                st.write(f"**Category:** {item.category}")
+                st.write(f"**Added by:** {item.added_by}")
+                st.write(f"**Date:** {item.added_date}")
                 
-                if item['notes']:
-                    st.write(f"**Notes:** {item['notes']}")
+                if item.notes:
+                    st.write(f"**Notes:** {item.notes}")
                 
-                st.write("**Content:**")
-                st.text_area("Content", value=item['content'], height=150, disabled=True, key=f"content_{item['consider_id']}")
+                show_content(consider_manager, item, "consider")
             
             with col2:
                 st.write("**Actions:**")
                 
                 # Implement button
-                if st.button(f"✅ Implement", key=f"implement_{item['consider_id']}"):
-                    st.session_state[f"implement_{item['consider_id']}"] = True
+                if st.button(f"✅ Implement", key=f"implement_{item.consider_id}"):
+                    st.session_state[f"implement_{item.consider_id}"] = True
                 
-                if st.session_state.get(f"implement_{item['consider_id']}", False):
-                    implementation_notes = st.text_area("Implementation notes:", key=f"impl_notes_{item['consider_id']}")
-                    if st.button("Confirm Implementation", key=f"confirm_impl_{item['consider_id']}"):
+                if st.session_state.get(f"implement_{item.consider_id}", False):
+                    implementation_notes = st.text_area("Implementation notes:", key=f"impl_notes_{item.consider_id}")
+                    if st.button("Confirm Implementation", key=f"confirm_impl_{item.consider_id}"):
                         result = consider_manager.update_consider_item(
-                            item['consider_id'], 
+                            item.consider_id, 
                             "implement", 
                             "Approved for implementation", 
                             implementation_notes
                         )
                         if result['success']:
                             st.success("Item implemented!")
+                            clear_loaded_items()
                             st.rerun()
                         else:
                             st.error(f"Error: {result['error']}")
                 
                 # Reject button
-                if st.button(f"❌ Reject", key=f"reject_{item['consider_id']}"):
-                    st.session_state[f"reject_{item['consider_id']}"] = True
+                if st.button(f"❌ Reject", key=f"reject_{item.consider_id}"):
+                    st.session_state[f"reject_{item.consider_id}"] = True
                 
-                if st.session_state.get(f"reject_{item['consider_id']}", False):
-                    reject_reason = st.text_area("Rejection reason:", key=f"reject_reason_{item['consider_id']}")
-                    if st.button("Confirm Rejection", key=f"confirm_reject_{item['consider_id']}"):
+                if st.session_state.get(f"reject_{item.consider_id}", False):
+                    reject_reason = st.text_area("Rejection reason:", key=f"reject_reason_{item.consider_id}")
+                    if st.button("Confirm Rejection", key=f"confirm_reject_{item.consider_id}"):
                         result = consider_manager.update_consider_item(
-                            item['consider_id'], 
+                            item.consider_id, 
                             "reject", 
                             reject_reason
                         )
                         if result['success']:
                             st.success("Item rejected!")
+                            clear_loaded_items()
                             st.rerun()
                         else:
                             st.error(f"Error: {result['error']}")
                 
                 # Archive button
-                if st.button(f"📁 Archive", key=f"archive_{item['consider_id']}"):
+                if st.button(f"📁 Archive", key=f"archive_{item.consider_id}"):
                     result = consider_manager.update_consider_item(
-                        item['consider_id'], 
+                        item.consider_id, 
                         "archive", 
                         "Archived for future reference"
                     )
                     if result['success']:
                         st.success("Item archived!")
+                        clear_loaded_items()
                         st.rerun()
                     else:
                         st.error(f"Error: {result['error']}")
+    
+    load_more_button(consider_manager, "consider", "consider", priority, category, include_content=True)
 
 def add_new_item(consider_manager):
     st.header("➕ Add New Item to Consider List")
@@ -151,6 +207,7 @@ def add_new_item(consider_manager):
             )
             
             if result['success']:
+                clear_loaded_items()
                 st.success(f"✅ {result['message']}")
                 st.info("The item has been added to the consider list for review.")
             else:
@@ -205,46 +262,48 @@ def show_statistics(consider_manager):
 def show_implemented_items(consider_manager):
     st.header("✅ Implemented Items")
     
-    implemented_items = consider_manager.get_consider_list(status="implement")
+    implemented_items = load_items(consider_manager, "history", "implement")["items"]
     
     if not implemented_items:
         st.info("No implemented items found.")
         return
     
     for item in implemented_items:
-        with st.expander(f"✅ {item['title']}"):
-            st.write(f"**Category:** {item['category']}")
-            st.write(f"**Priority:** {item['priority']}")
-            st.write(f"**Added by:** {item['added_by']}")
-            st.write(f"**Added date:** {item['added_date']}")
+        with st.expander(f"✅ {item.title}"):
+            st.write(f"**Category:** {item.category}")
+            st.write(f"**Priority:** {item.priority}")
+            st.write(f"**Added by:** {item.added_by}")
+            st.write(f"**Added date:** {item.added_date}")
             
-            if item['notes']:
-                st.write(f"**Notes:** {item['notes']}")
+            if item.notes:
+                st.write(f"**Notes:** {item.notes}")
             
-            st.write("**Content:**")
-            st.text_area("Content", value=item['content'], height=150, disabled=True, key=f"impl_content_{item['consider_id']}")
+            show_content(consider_manager, item, "impl")
+    
+    load_more_button(consider_manager, "history", "implement")
 
 def show_rejected_items(consider_manager):
     st.header("❌ Rejected Items")
     
-    rejected_items = consider_manager.get_consider_list(status="reject")
+    rejected_items = load_items(consider_manager, "history", "reject")["items"]
     
     if not rejected_items:
         st.info("No rejected items found.")
         return
     
     for item in rejected_items:
-        with st.expander(f"❌ {item['title']}"):
-            st.write(f"**Category:** {item['category']}")
-            st.write(f"**Priority:** {item['priority']}")
-            st.write(f"**Added by:** {item['added_by']}")
-            st.write(f"**Added date:** {item['added_date']}")
+        with st.expander(f"❌ {item.title}"):
+            st.write(f"**Category:** {item.category}")
+            st.write(f"**Priority:** {item.priority}")
+            st.write(f"**Added by:** {item.added_by}")
+            st.write(f"**Added date:** {item.added_date}")
             
-            if item['notes']:
-                st.write(f"**Notes:** {item['notes']}")
+            if item.notes:
+                st.write(f"**Notes:** {item.notes}")
             
-            st.write("**Content:**")
-            st.text_area("Content", value=item['content'], height=150, disabled=True, key=f"reject_content_{item['consider_id']}")
+            show_content(consider_manager, item, "reject")
+    
+    load_more_button(consider_manager, "history", "reject")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,8 @@
 import os
 import json
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 from dotenv import load_dotenv
 import requests
@@ -9,6 +10,84 @@ import requests
 # Load environment variables
 load_dotenv('../.env')
 
+# Items per page for consider list queries
+PAGE_SIZE = 25
+
+# Columns fetched for list views - content is large and only loaded on request
+LIST_COLUMNS = "material_id,title,upload_date,status,metadata"
+
+# (upload_date, material_id) of the last item on a page
+Cursor = Tuple[str, Any]
+
+
+def parse_metadata(raw) -> Dict:
+    """Metadata as a dict, whether stored as a JSON string or a JSON object"""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        return json.loads(raw) if raw else {}
+    except (TypeError, ValueError):
+        return {}
+
+
+@dataclass
+class ConsiderItem:
+    """A consider list row with its metadata parsed once"""
+    consider_id: Any
+    title: str
+    upload_date: str
+    status: str
+    metadata: Dict = field(default_factory=dict)
+    content: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "ConsiderItem":
+        metadata = parse_metadata(row.get('metadata'))
+        return cls(
+            consider_id=row['material_id'],
+            title=row.get('title', ''),
+            upload_date=row.get('upload_date', ''),
+            status=row.get('status') or metadata.get('status', 'Unknown'),
+            metadata=metadata,
+            content=row.get('content')
+        )
+
+    @property
+    def added_by(self) -> str:
+        return self.metadata.get('added_by', 'Unknown')
+
+    @property
+    def added_date(self) -> str:
+        return self.metadata.get('added_date', 'Unknown')
+
+    @property
+    def category(self) -> str:
+        return self.metadata.get('category', 'Unknown')
+
+    @property
+    def priority(self) -> str:
+        return self.metadata.get('priority', 'Unknown')
+
+    @property
+    def notes(self) -> str:
+        return self.metadata.get('notes', '')
+
+    @property
+    def reviewed(self) -> bool:
+        return self.metadata.get('reviewed', False)
+
+    @property
+    def cursor(self) -> Cursor:
+        return (self.upload_date, self.consider_id)
+
+
+@dataclass
+class ConsiderPage:
+    """One page of consider items; next_cursor is None on the last page"""
+    items: List[ConsiderItem]
+    next_cursor: Optional[Cursor] = None
+
+
 class ConsiderListManager:
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
@@ -65,7 +144,7 @@ class ConsiderListManager:
             
             if response.status_code == 201:
                 # Query for the inserted record
-                query_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?content_hash=eq.{str(hash(content))}&order=upload_date.desc&limit=1"
+                query_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?content_hash=eq.{str(hash(content))}&select=material_id&order=upload_date.desc&limit=1"
                 query_response = requests.get(query_url, headers=self.headers)
                 
                 if query_response.status_code == 200:
@@ -96,40 +175,81 @@ class ConsiderListManager:
                 "error": str(e)
             }
     
-    def get_consider_list(self, status: str = "consider", priority: str = None) -> List[Dict]:
-        """Get items from the consider list"""
+    def get_consider_page(self, status: str = "consider", priority: str = None, category: str = None,
+                          after: Optional[Cursor] = None, limit: int = PAGE_SIZE,
+                          include_content: bool = False) -> ConsiderPage:
+        """Get one page of consider items, newest first
+
+        Filters run server-side on the status column and the promoted
+        consider_priority/consider_category columns (see
+        consider_list_schema.sql). Pass the previous page's next_cursor as
+        `after` to continue; pagination is keyset-based, so pages stay
+        stable while items are added.
+        """
+        params = {
+            "select": LIST_COLUMNS + (",content" if include_content else ""),
+            "material_type": "eq.consider_item",
+            "status": f"eq.{status}",
+            "order": "upload_date.desc,material_id.desc",
+            # One extra row tells whether another page follows
+            "limit": str(limit + 1)
+        }
+        if priority:
+            params["consider_priority"] = f"eq.{priority}"
+        if category:
+            params["consider_category"] = f"eq.{category}"
+        if after:
+            upload_date, material_id = after
+            params["or"] = (f'(upload_date.lt."{upload_date}",'
+                            f'and(upload_date.eq."{upload_date}",material_id.lt."{material_id}"))')
+
         try:
-            # Build query
-            query_params = f"material_type=eq.consider_item&status=eq.{status}"
-            if priority:
-                query_params += f"&metadata->>'priority'=eq.{priority}"
-            
-            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?{query_params}&order=upload_date.desc"
-            response = requests.get(api_url, headers=self.headers)
-            
-            if response.status_code == 200:
-                items = response.json()
-                return [
-                    {
-                        "consider_id": item['material_id'],
-                        "title": item['title'],
-                        "content": item['content'],
-                        "added_by": json.loads(item['metadata']).get('added_by', 'Unknown'),
-                        "added_date": json.loads(item['metadata']).get('added_date', 'Unknown'),
-                        "category": json.loads(item['metadata']).get('category', 'Unknown'),
-                        "priority": json.loads(item['metadata']).get('priority', 'Unknown'),
-                        "notes": json.loads(item['metadata']).get('notes', ''),
-                        "status": json.loads(item['metadata']).get('status', 'Unknown'),
-                        "reviewed": json.loads(item['metadata']).get('reviewed', False)
-                    }
-                    for item in items
-                ]
-            else:
-                return []
-                
+            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials"
+            response = requests.get(api_url, headers=self.headers, params=params)
+
+            if response.status_code != 200:
+                logging.error(f"Failed to get consider list: {response.status_code} - {response.text}")
+                return ConsiderPage(items=[])
+
+            items = [ConsiderItem.from_row(row) for row in response.json()]
+            if len(items) > limit:
+                items = items[:limit]
+                return ConsiderPage(items=items, next_cursor=items[-1].cursor)
+            return ConsiderPage(items=items)
+
         except Exception as e:
             logging.error(f"Error getting consider list: {str(e)}")
-            return []
+            return ConsiderPage(items=[])
+
+    def get_consider_list(self, status: str = "consider", priority: str = None, category: str = None,
+                          limit: Optional[int] = None, include_content: bool = False) -> List[ConsiderItem]:
+        """Get items from the consider list, following pages up to limit (all if None)"""
+        items = []
+        cursor = None
+        while limit is None or len(items) < limit:
+            page_size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - len(items))
+            page = self.get_consider_page(status, priority, category, after=cursor,
+                                          limit=page_size, include_content=include_content)
+            items.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        return items
+
+    def get_consider_content(self, consider_id: str) -> str:
+        """Get the content of a single consider item"""
+        try:
+            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials"
+            params = {"select": "content", "material_id": f"eq.{consider_id}"}
+            response = requests.get(api_url, headers=self.headers, params=params)
+
+            if response.status_code == 200 and response.json():
+                return response.json()[0]['content'] or ""
+            return ""
+
+        except Exception as e:
+            logging.error(f"Error getting consider item content: {str(e)}")
+            return ""
     
     def update_consider_item(self, consider_id: str, action: str, 
                            decision_reason: str = "", implementation_notes: str = "") -> Dict:
@@ -140,14 +260,14 @@ class ConsiderListManager:
         
         try:
             # Get current item
-            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_id=eq.{consider_id}"
+            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_id=eq.{consider_id}&select=material_id,title,content,metadata"
             response = requests.get(api_url, headers=self.headers)
             
-            if response.status_code != 200:
+            if response.status_code != 200 or not response.json():
                 return {"success": False, "error": "Item not found"}
             
             item_data = response.json()[0]
-            metadata = json.loads(item_data['metadata'])
+            metadata = parse_metadata(item_data['metadata'])
             
             # Update metadata
             metadata['status'] = action
@@ -214,7 +334,11 @@ class ConsiderListManager:
             logging.error(f"Error creating implementation record: {str(e)}")
     
     def get_consider_stats(self) -> Dict:
-        """Get statistics about the consider list"""
+        """Get statistics about the consider list
+
+        Counts are grouped server-side by the consider_list_stats RPC, so
+        only one row per (status, priority, category) is transferred.
+        """
         try:
             stats = {
                 "total_consider": 0,
@@ -225,37 +349,29 @@ class ConsiderListManager:
                 "by_category": {}
             }
             
-            # Get all consider items
-            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_type=eq.consider_item"
-            response = requests.get(api_url, headers=self.headers)
+            api_url = f"{self.supabase_url}/rest/v1/rpc/consider_list_stats"
+            response = requests.post(api_url, headers=self.headers, json={})
+            
+            if response.status_code != 200:
+                logging.error(f"Failed to get consider stats: {response.status_code} - {response.text}")
+                return {}
             
-            if response.status_code == 200:
-                items = response.json()
+            for group in response.json():
+                count = group['items']
+                status = group['status'] or 'consider'
+                priority = group['priority'] or 'medium'
+                category = group['category'] or 'unknown'
+                
+                # Count by status
+                if f"total_{status}" in stats:
+                    stats[f"total_{status}"] += count
+                
+                # Count by priority
+                if priority in stats['by_priority']:
+                    stats['by_priority'][priority] += count
                 
-                for item in items:
-                    metadata = json.loads(item['metadata'])
-                    status = metadata.get('status', 'consider')
-                    priority = metadata.get('priority', 'medium')
-                    category = metadata.get('category', 'unknown')
-                    
-                    # Count by status
-                    if status == 'consider':
-                        stats['total_consider'] += 1
-                    elif status == 'implement':
-                        stats['total_implement'] += 1
-                    elif status == 'reject':
-                        stats['total_reject'] += 1
-                    elif status == 'archive':
-                        stats['total_archive'] += 1
-                    
-                    # Count by priority
-                    if priority in stats['by_priority']:
-                        stats['by_priority'][priority] += 1
-                    
-                    # Count by category
-                    if category not in stats['by_category']:
-                        stats['by_category'][category] = 0
-                    stats['by_category'][category] += 1
+                # Count by category
+                stats['by_category'][category] = stats['by_category'].get(category, 0) + count
             
             return stats
             
@@ -0,0 +1,74 @@
+-- 📋 Consider List query support
+-- Promoted filter columns, keyset-pagination indexes and a grouped stats RPC
+-- for consider items in internal_teaching_materials.
+-- Run this in your Supabase SQL Editor (safe to run more than once)
+
+-- =====================================================
+-- STEP 1: PROMOTED FILTER COLUMNS
+-- =====================================================
+
+-- metadata is written as a JSON-encoded string, so JSONB operators on it
+-- are unreliable; priority and category get real columns instead
+ALTER TABLE public.internal_teaching_materials
+    ADD COLUMN IF NOT EXISTS consider_priority TEXT,
+    ADD COLUMN IF NOT EXISTS consider_category TEXT;
+
+-- Parses metadata whether it is stored as TEXT, a JSONB object or a JSONB string
+CREATE OR REPLACE FUNCTION public.consider_metadata(value anyelement)
+RETURNS JSONB
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT (to_jsonb(value) #>> '{}')::jsonb;
+$$;
+
+-- Keep the promoted columns in sync with metadata on every write
+CREATE OR REPLACE FUNCTION public.sync_consider_columns()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.material_type = 'consider_item' THEN
+        NEW.consider_priority := public.consider_metadata(NEW.metadata) ->> 'priority';
+        NEW.consider_category := public.consider_metadata(NEW.metadata) ->> 'category';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS sync_consider_columns ON public.internal_teaching_materials;
+CREATE TRIGGER sync_consider_columns
+    BEFORE INSERT OR UPDATE OF metadata, material_type ON public.internal_teaching_materials
+    FOR EACH ROW EXECUTE FUNCTION public.sync_consider_columns();
+
+-- Backfill existing consider items
+UPDATE public.internal_teaching_materials
+SET consider_priority = public.consider_metadata(metadata) ->> 'priority',
+    consider_category = public.consider_metadata(metadata) ->> 'category'
+WHERE material_type = 'consider_item';
+
+-- =====================================================
+-- STEP 2: INDEXES FOR FILTERED KEYSET PAGINATION
+-- =====================================================
+
+-- Pages are ordered by (upload_date DESC, material_id DESC) within a status
+CREATE INDEX IF NOT EXISTS idx_consider_items_page
+    ON public.internal_teaching_materials (status, upload_date DESC, material_id DESC)
+    WHERE material_type = 'consider_item';
+
+CREATE INDEX IF NOT EXISTS idx_consider_items_filters
+    ON public.internal_teaching_materials (status, consider_priority, consider_category)
+    WHERE material_type = 'consider_item';
+
+-- =====================================================
+-- STEP 3: GROUPED STATS RPC
+-- =====================================================
+
+-- One row per (status, priority, category) with its item count
+CREATE OR REPLACE FUNCTION public.consider_list_stats()
+RETURNS TABLE (status TEXT, priority TEXT, category TEXT, items BIGINT)
+LANGUAGE sql STABLE AS $$
+    SELECT m.status::text, m.consider_priority, m.consider_category, COUNT(*)
+    FROM public.internal_teaching_materials m
+    WHERE m.material_type = 'consider_item'
+    GROUP BY 1, 2, 3;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.consider_list_stats() TO anon, authenticated;
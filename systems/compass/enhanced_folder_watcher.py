@@ -156,18 +156,22 @@ class EnhancedDocumentProcessor:
             
             # Legacy processing for backward compatibility
             
-            # Master Prompt Review (all documents)
-            logging.info(f"Creating master prompt review request for {file_path}")
-            review_result = self.review_system.create_review_request(
-                content,
-                "Enhanced_Compass_System",
-                f"Enhanced processing detected potential master prompt change from {os.path.basename(file_path)}"
-            )
-            
-            if review_result and review_result.get("success"):
-                logging.info(f"Review request created: {review_result.get('review_id')}")
+            # Master Prompt Review (all documents are pre-screened, candidates go to the LLM)
+            prescreen = self.review_system.screen_review_candidate(content)
+            if prescreen.escalate:
+                logging.info(f"Creating master prompt review request for {file_path} ({prescreen.reason})")
+                review_result = self.review_system.create_review_request(
+                    content,
+                    "Enhanced_Compass_System",
+                    f"Enhanced processing detected potential master prompt change from {os.path.basename(file_path)}"
+                )
+                
+                if review_result and review_result.get("success"):
+                    logging.info(f"Review request created: {review_result.get('review_id')}")
+                else:
+                    logging.error(f"Failed to create review request: {review_result}")
             else:
-                logging.error(f"Failed to create review request: {review_result}")
+                logging.info(f"Pre-screen skipped master prompt review for {file_path}: {prescreen.reason}")
             
             # Consider List (for technical/method content)
             consider_categories = ["ai_agents", "technical", "method_core", "personality_systems"]
@@ -275,6 +279,8 @@ class EnhancedFolderWatcher(FileSystemEventHandler):
             if os.path.isfile(file_path) and self._is_valid_document(file_path):
                 logging.info(f"Found existing file: {file_path}")
                 self._process_file(file_path)
+        
+        self.processor.review_system.prescreen.log_batch_report("existing files")
     
     def _is_valid_document(self, file_path: str) -> bool:
         """Check if file is a valid document for processing"""
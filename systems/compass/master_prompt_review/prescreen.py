@@ -0,0 +1,96 @@
+import os
+import sys
+import logging
+from dataclasses import dataclass
+from typing import Dict
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from text_similarity import MinHasher
+from strategic_scorer import StrategicScorer
+
+# Estimated Jaccard similarity to the current master prompt that marks a revision of it
+PRESCREEN_SIMILARITY_THRESHOLD = float(os.getenv("PRESCREEN_SIMILARITY_THRESHOLD", "0.15"))
+# StrategicScorer prompt-pattern signal that marks a prompt-like document (2.0 = one pattern)
+PRESCREEN_PATTERN_THRESHOLD = float(os.getenv("PRESCREEN_PATTERN_THRESHOLD", "2.0"))
+
+@dataclass
+class PrescreenResult:
+    escalate: bool
+    similarity: float
+    pattern_score: float
+    reason: str
+
+class MasterPromptPrescreen:
+    """Cheap local gate in front of the LLM master prompt impact analysis
+
+    A document is escalated when its shingle MinHash similarity to the
+    current master prompt reaches similarity_threshold (it looks like a
+    revision of it), or when StrategicScorer finds enough prompt patterns
+    to make it a plausible replacement. Everything else skips the LLM.
+    Counts per batch are kept for the avoided-calls report.
+    """
+
+    def __init__(self, similarity_threshold: float = PRESCREEN_SIMILARITY_THRESHOLD,
+                 pattern_threshold: float = PRESCREEN_PATTERN_THRESHOLD):
+        self.similarity_threshold = similarity_threshold
+        self.pattern_threshold = pattern_threshold
+        self.hasher = MinHasher()
+        self.scorer = StrategicScorer()
+
+        # Signature of the master prompt last screened against
+        self._master_prompt = None
+        self._master_signature = None
+
+        self.reset_batch()
+
+    def screen(self, content: str, master_prompt: str) -> PrescreenResult:
+        """Decide whether a document should go to the LLM impact analysis"""
+        if master_prompt != self._master_prompt:
+            self._master_prompt = master_prompt
+            self._master_signature = self.hasher.signature(master_prompt)
+
+        similarity = MinHasher.similarity(self.hasher.signature(content), self._master_signature)
+        pattern_score = self.scorer.prompt_pattern_score(content)
+
+        if similarity >= self.similarity_threshold:
+            result = PrescreenResult(True, similarity, pattern_score,
+                                     f"similar to current master prompt ({similarity:.2f})")
+        elif pattern_score >= self.pattern_threshold:
+            result = PrescreenResult(True, similarity, pattern_score,
+                                     f"contains prompt patterns (score {pattern_score:.1f})")
+        else:
+            result = PrescreenResult(False, similarity, pattern_score,
+                                     f"unrelated to master prompt (similarity {similarity:.2f}, "
+                                     f"prompt patterns {pattern_score:.1f})")
+
+        self.batch["screened"] += 1
+        if result.escalate:
+            self.batch["escalated"] += 1
+        else:
+            self.batch["llm_calls_avoided"] += 1
+        return result
+
+    def reset_batch(self):
+        """Start counting a new batch"""
+        self.batch = {"screened": 0, "escalated": 0, "llm_calls_avoided": 0}
+
+    def batch_report(self) -> Dict:
+        """Counts for the current batch plus the thresholds in use"""
+        return {
+            **self.batch,
+            "similarity_threshold": self.similarity_threshold,
+            "pattern_threshold": self.pattern_threshold
+        }
+
+    def log_batch_report(self, label: str = "batch"):
+        """Log the avoided-calls report for the current batch and start a new one"""
+        report = self.batch_report()
+        if report["screened"]:
+            logging.info(
+                f"Master prompt pre-screen ({label}): {report['screened']} screened, "
+                f"{report['escalated']} sent to LLM analysis, "
+                f"{report['llm_calls_avoided']} LLM calls avoided "
+                f"(similarity >= {report['similarity_threshold']}, "
+                f"prompt patterns >= {report['pattern_threshold']})"
+            )
+        self.reset_batch()
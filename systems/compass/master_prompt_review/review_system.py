@@ -1,5 +1,8 @@
 import os
+import sys
 import json
+import time
+import threading
 import yaml
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -10,6 +13,60 @@ import requests
 # Load environment variables
 load_dotenv('../.env')
 
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'versioning'))
+from prescreen import MasterPromptPrescreen, PrescreenResult
+from version_store import VersionStore
+
+# Seconds a cached master prompt is served before its version is re-checked
+MASTER_PROMPT_POLL_SECONDS = float(os.getenv("MASTER_PROMPT_POLL_SECONDS", "60"))
+# Local delta-compressed history of applied master prompts, kept out of the source tree
+MASTER_PROMPT_HISTORY_DIR = os.getenv(
+    "MASTER_PROMPT_HISTORY_DIR",
+    os.path.join(os.getenv("XDG_DATA_HOME", os.path.expanduser("~/.local/share")), "compass", "master_prompt_history")
+)
+
+
+class MasterPromptCache:
+    """Process-wide cache of the active master prompt, keyed by its version
+
+    The version is the material_id of the active master_prompt row - every
+    approved change inserts a new row. Reads within poll_seconds of the
+    last check come straight from memory; after that a version-only query
+    (no content) decides whether the content has to be fetched again, so
+    changes applied by other processes show up within one poll interval.
+    """
+
+    def __init__(self, poll_seconds: float = MASTER_PROMPT_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self.version = None
+        self.content = None
+        self.checked_at = 0.0
+        self.fetches = 0
+        self.lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        return self.content is not None and time.monotonic() - self.checked_at < self.poll_seconds
+
+    def store(self, version: str, content: str):
+        self.version = version
+        self.content = content
+        self.checked_at = time.monotonic()
+        self.fetches += 1
+
+    def touch(self):
+        self.checked_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a refetch on next use; the old content stays as a fallback if it fails"""
+        self.version = None
+        self.checked_at = 0.0
+
+
+# Shared by every MasterPromptReviewSystem in this process
+master_prompt_cache = MasterPromptCache()
+
+
 class MasterPromptReviewSystem:
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
@@ -29,6 +86,16 @@ class MasterPromptReviewSystem:
             "REJECTED": "rejected",
             "NEEDS_REVISION": "needs_revision"
         }
+        
+        # Local gate in front of the LLM analysis for automatically ingested documents
+        self.prescreen = MasterPromptPrescreen()
+        
+        # Opened on first applied change
+        self._history = None
+    
+    def screen_review_candidate(self, content: str) -> PrescreenResult:
+        """Pre-screen a document before create_review_request sends it to the LLM"""
+        return self.prescreen.screen(content, self.get_current_master_prompt())
     
     def analyze_master_prompt_change(self, new_content: str, current_content: str = None) -> Dict:
         """Analyze the impact of a proposed master prompt change"""
@@ -124,12 +191,12 @@ class MasterPromptReviewSystem:
     def create_review_request(self, new_content: str, submitted_by: str, description: str = "") -> Dict:
         """Create a new review request for master prompt changes"""
         
-        # Analyze the change
-        analysis = self.analyze_master_prompt_change(new_content)
-        
         # Get current master prompt
         current_content = self.get_current_master_prompt()
         
+        # Analyze the change
+        analysis = self.analyze_master_prompt_change(new_content, current_content)
+        
         # Create review record
         review_data = {
             "title": f"Master Prompt Review - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
@@ -207,24 +274,61 @@ class MasterPromptReviewSystem:
                 "error": str(e)
             }
     
-    def get_current_master_prompt(self) -> str:
-        """Get the current canonical master prompt"""
+    def get_current_master_prompt(self, refresh: bool = False) -> str:
+        """Get the current canonical master prompt (cached, see MasterPromptCache)"""
+        cache = master_prompt_cache
+        with cache.lock:
+            if refresh:
+                cache.invalidate()
+            if cache.is_fresh():
+                return cache.content
+            
+            if cache.content is not None:
+                version = self._get_master_prompt_version()
+                if version == cache.version or version is None:
+                    # Unchanged - or the check failed, keep serving the cached prompt
+                    cache.touch()
+                    return cache.content
+            
+            try:
+                # Query for the current master prompt
+                api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_type=eq.master_prompt&status=eq.active&select=material_id,content&order=upload_date.desc&limit=1"
+                response = requests.get(api_url, headers=self.headers)
+                
+                if response.status_code == 200:
+                    results = response.json()
+                    if results:
+                        cache.store(str(results[0]['material_id']), results[0]['content'])
+                        return cache.content
+                    else:
+                        return "No current master prompt found"
+                error = f"Error retrieving master prompt: {response.status_code}"
+                    
+            except Exception as e:
+                error = f"Error: {str(e)}"
+            
+            if cache.content is not None:
+                # Keep serving the last prompt we had; the next poll retries the fetch
+                logging.warning(f"Master prompt refetch failed, serving cached version {cache.version}: {error}")
+                cache.touch()
+                return cache.content
+            return error
+    
+    def _get_master_prompt_version(self) -> Optional[str]:
+        """Version of the active master prompt, without its content; None if the query fails"""
         try:
-            # Query for the current master prompt
-            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_type=eq.master_prompt&status=eq.active&order=upload_date.desc&limit=1"
+            api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials?material_type=eq.master_prompt&status=eq.active&select=material_id&order=upload_date.desc&limit=1"
             response = requests.get(api_url, headers=self.headers)
             
             if response.status_code == 200:
                 results = response.json()
-                if results:
-                    return results[0]['content']
-                else:
-                    return "No current master prompt found"
-            else:
-                return f"Error retrieving master prompt: {response.status_code}"
-                
+                return str(results[0]['material_id']) if results else ""
+            logging.warning(f"Master prompt version check failed: {response.status_code}")
+            return None
+            
         except Exception as e:
-            return f"Error: {str(e)}"
+            logging.warning(f"Master prompt version check failed: {str(e)}")
+            return None
     
     def approve_review(self, review_id: str, approver: str, reason: str = "") -> Dict:
         """Approve a master prompt review"""
@@ -301,6 +405,7 @@ class MasterPromptReviewSystem:
             requests.patch(current_url, headers=self.headers, json=deactivate_data)
             
             # Create new active master prompt
+            version = datetime.now().strftime('%Y%m%d_%H%M%S')
             new_master_data = {
                 "title": f"Master Prompt - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
                 "content": new_content,
@@ -309,7 +414,7 @@ class MasterPromptReviewSystem:
                 "source_creator": "Master_Prompt_Review_System",
                 "source_url": "approved_review",
                 "metadata": json.dumps({
-                    "version": datetime.now().strftime('%Y%m%d_%H%M%S'),
+                    "version": version,
                     "approved_date": datetime.now().isoformat(),
                     "previous_version": "deactivated"
                 }),
@@ -321,15 +426,40 @@ class MasterPromptReviewSystem:
             }
             
             api_url = f"{self.supabase_url}/rest/v1/internal_teaching_materials"
-            response = requests.post(api_url, headers=self.headers, json=new_master_data)
+            # return=representation: the response carries the new row's material_id
+            headers = {**self.headers, "Prefer": "return=representation"}
+            response = requests.post(api_url, headers=headers, json=new_master_data)
             
             if response.status_code == 201:
                 logging.info("Master prompt successfully updated")
+                try:
+                    rows = response.json()
+                except ValueError:
+                    rows = []
+                material_id = rows[0].get("material_id") if rows else None
+                self._record_master_prompt_version(new_content, str(material_id) if material_id is not None else None)
             else:
                 logging.error(f"Failed to update master prompt: {response.status_code}")
                 
         except Exception as e:
             logging.error(f"Error applying master prompt change: {str(e)}")
+        finally:
+            # The active row changed (or may have) - refetch on next use
+            with master_prompt_cache.lock:
+                master_prompt_cache.invalidate()
+    
+    def _record_master_prompt_version(self, content: str, version: Optional[str]):
+        """Keep the applied master prompt in the local version history
+        
+        The version id is the row's material_id, the same id the master
+        prompt cache uses; without one the store names it by content hash.
+        """
+        try:
+            if self._history is None:
+                self._history = VersionStore(MASTER_PROMPT_HISTORY_DIR)
+            self._history.save(content, version_id=version)
+        except Exception as e:
+            logging.warning(f"Could not record master prompt version {version or '(content hash)'}: {str(e)}")
     
     def get_pending_reviews(self) -> List[Dict]:
         """Get all pending review requests"""
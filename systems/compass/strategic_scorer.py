@@ -214,9 +214,7 @@ class StrategicScorer:
         content_lower = content.lower()
         
         # Check prompt patterns
-        for pattern in self.signal_indicators["prompt_patterns"]["patterns"]:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                score += self.signal_indicators["prompt_patterns"]["weight"]
+        score += self.prompt_pattern_score(content_lower)
         
         # Check original phrases length
         word_count = len(content.split())
@@ -252,6 +250,14 @@ class StrategicScorer:
         
         return round(min(score, 10.0), 3)  # Cap at 10.0
 
+    def prompt_pattern_score(self, content: str) -> float:
+        """Signal contributed by actual prompt patterns (system prompt headers, role:, persona:, ...)"""
+        score = 0.0
+        for pattern in self.signal_indicators["prompt_patterns"]["patterns"]:
+            if re.search(pattern, content, re.IGNORECASE):
+                score += self.signal_indicators["prompt_patterns"]["weight"]
+        return score
+
     def _calculate_danger_score(self, content: str) -> float:
         """Calculate danger score based on risky content indicators"""
         score = 0.0
@@ -58,7 +58,7 @@ def test_consider_list():
     print(f"Found {len(consider_items)} items in consider list")
     
     for item in consider_items:
-        print(f"  - {item['title']} ({item['priority']} priority)")
+        print(f"  - {item.title} ({item.priority} priority)")
     
     # Test 3: Get statistics
     print("\n3. Testing statistics...")
@@ -73,14 +73,14 @@ def test_consider_list():
         print("\n4. Testing item implementation...")
         first_item = consider_items[0]
         result = consider_manager.update_consider_item(
-            first_item['consider_id'],
+            first_item.consider_id,
             "implement",
             "Approved for implementation",
             "This feature aligns with our roadmap"
         )
         
         if result['success']:
-            print(f"✅ Implemented: {first_item['title']}")
+            print(f"✅ Implemented: {first_item.title}")
         else:
             print(f"❌ Failed to implement: {result['error']}")
     
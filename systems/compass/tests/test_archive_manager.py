@@ -0,0 +1,45 @@
+import os
+import random
+import yaml
+from ..auto_ingest.archive_manager import ArchiveManager
+
+def write_words(path, words):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(" ".join(words[i:i + 12]) for i in range(0, len(words), 12)))
+    return str(path)
+
+def test_near_duplicate_detection_survives_restart(tmp_path):
+    """Test near-duplicates are found, persisted across restarts and linked to the canonical file"""
+    rng = random.Random(3)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    words = rng.choices(vocabulary, k=400)
+    original = write_words(tmp_path / "inbox" / "notes.md", words)
+    edited_words = list(words)
+    edited_words[200] = "changed"
+    edited = write_words(tmp_path / "inbox" / "notes_v2.md", edited_words)
+    unrelated = write_words(tmp_path / "inbox" / "other.md", rng.choices(vocabulary, k=400))
+    
+    manager = ArchiveManager(str(tmp_path / "archive"))
+    canonical = manager.archive_file(original, {})
+    
+    match = manager.find_duplicate(edited)
+    assert match["match"] == "near"
+    assert match["canonical_hash"] == canonical["file_hash"]
+    assert match["similarity"] >= 0.8
+    assert manager.find_duplicate(unrelated) is None
+    
+    # The restarted manager can only know the signature from near_duplicate_index.jsonl
+    with open(manager.near_duplicate_file) as f:
+        assert len([line for line in f if line.strip()]) == 1
+    os.remove(manager.archive_index["files"][canonical["file_hash"]]["archive_path"])
+    restarted = ArchiveManager(str(tmp_path / "archive"))
+    assert canonical["file_hash"] in restarted.near_duplicates
+    
+    result = restarted.archive_file(edited, {})
+    assert result["status"] == "near_duplicate"
+    assert result["canonical_hash"] == canonical["file_hash"]
+    with open(result["canonical_metadata"]) as f:
+        assert yaml.safe_load(f)["file_hash"] == canonical["file_hash"]
+    
+    assert restarted.archive_file(original, {})["status"] == "duplicate"
+    assert restarted.archive_file(unrelated, {})["status"] == "processed"
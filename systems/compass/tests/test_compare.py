@@ -1,8 +1,12 @@
 # write test for this
 
+import random
 import pytest
 from datetime import datetime
+from ..versioning import compare
 from ..versioning.compare import PromptVersioner, Version
+from ..versioning.version_store import VersionStore
+from ..versioning.diff_explainer import DiffExplainer
 
 @pytest.fixture
 def old_version():
@@ -58,3 +62,151 @@ def test_summarize_changes(old_version, new_version):
     
     assert "Added" in summary or "Removed" in summary
     assert isinstance(summary, str)
+
+def test_diff_versions_matches_keys_structurally():
+    """Test structural change set"""
+    versioner = PromptVersioner()
+    old = Version(
+        content={
+            "modules": [{"id": "a", "rules": ["Be concise."]}, {"id": "b", "rules": ["Cite sources."]}],
+            "template": "Line one\nLine two\nLine three"
+        },
+        timestamp=datetime.now(),
+        version_id="1"
+    )
+    new = Version(
+        content={
+            "modules": [{"id": "b", "rules": ["Cite sources."]}, {"id": "a", "rules": ["Be very concise."]}],
+            "template": "Line one\nLine two, revised\nLine three"
+        },
+        timestamp=datetime.now(),
+        version_id="2"
+    )
+    changes = versioner.diff_versions(old, new)
+    
+    assert [(c.op, c.path) for c in changes] == [
+        ("modified", "modules[1].rules[0]"),
+        ("modified", "template:2")
+    ]
+    assert changes[1].old == "Line two"
+    assert changes[1].new == "Line two, revised"
+
+def test_compare_yaml_identical_versions(old_version):
+    """Test that identical versions produce no diff"""
+    versioner = PromptVersioner()
+    assert versioner.compare_yaml(old_version, old_version) == []
+
+def test_version_history_roundtrip(tmp_path):
+    """Test saving, loading and comparing stored versions"""
+    versioner = PromptVersioner(str(tmp_path))
+    rules = [f"Rule {i}: keep answers focused." for i in range(200)]
+    versioner.save_version({"title": "Test Prompt", "rules": "\n".join(rules)}, version_id="1")
+    rules[50] = "Rule 50: keep answers short and focused."
+    versioner.save_version({"title": "Test Prompt", "rules": "\n".join(rules)}, version_id="2")
+    
+    reopened = PromptVersioner(str(tmp_path))
+    assert reopened.get_version("2").content["rules"] == "\n".join(rules)
+    assert reopened.store.versions["2"]["depth"] == 1
+    changes = reopened.compare_versions("1", "2")
+    assert [(c.op, c.path) for c in changes] == [("modified", "rules:51")]
+
+def test_version_history_compact(tmp_path):
+    """Test compaction keeps every version readable"""
+    versioner = PromptVersioner(str(tmp_path))
+    for i in range(5):
+        versioner.save_version({"content": "\n".join(f"line {n}" for n in range(100 + i))}, version_id=str(i))
+    stats = versioner.store.compact()
+    
+    assert stats["versions"] == 5
+    assert PromptVersioner(str(tmp_path)).get_version("4").content["content"].endswith("line 103")
+
+def test_version_store_series_with_reverts(tmp_path):
+    """Test a revision series with reverts survives reload and compaction"""
+    rng = random.Random(7)
+    words = ["answer", "focus", "source", "cite", "brief", "context", "user", "clarify", "tone", "avoid"]
+    lines = [f"Rule {i}: {' '.join(rng.choices(words, k=8))}\n" for i in range(400)]
+    store = VersionStore(str(tmp_path))
+    texts = {"0": "".join(lines)}
+    store.save(texts["0"], version_id="0")
+    
+    delta_growth = []
+    for i in range(1, 40):
+        if i % 6 == 0:
+            # Revert to the revision two steps back
+            text = texts[str(i - 2)]
+            lines = text.splitlines(keepends=True)
+        else:
+            lines[rng.randrange(len(lines))] = f"Rule edited in revision {i}: {' '.join(rng.choices(words, k=8))}\n"
+            text = "".join(lines)
+        size_before = store.storage_size()
+        record = store.save(text, version_id=str(i))
+        texts[str(i)] = text
+        growth = store.storage_size() - size_before
+        if i % 6 == 0:
+            # Only a log record; the reverted content is already stored
+            assert growth < 300
+        elif record["depth"] > 0:
+            delta_growth.append(growth)
+    
+    # One-line edits grow the store by a small delta, not a copy of the text
+    assert delta_growth and max(delta_growth) < 1024 < len(texts["0"]) // 10
+    
+    reopened = VersionStore(str(tmp_path))
+    assert reopened.head == "39"
+    assert all(reopened.get(version_id) == text for version_id, text in texts.items())
+    
+    stats = reopened.compact()
+    assert stats["versions"] == 40
+    assert stats["objects"] == len(set(texts.values()))
+    assert stats["bytes_after"] < len(texts["0"])
+    compacted = VersionStore(str(tmp_path))
+    assert all(compacted.get(version_id) == text for version_id, text in texts.items())
+
+def test_compare_main_unknown_version(tmp_path, monkeypatch, capsys):
+    """Test the command line reports an unknown version id with usage"""
+    PromptVersioner(str(tmp_path)).save_version({"content": "text"}, version_id="1")
+    monkeypatch.setenv("VERSION_HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(compare.sys, "argv", ["compare.py", "1", "missing"])
+    compare.main()
+    
+    output = capsys.readouterr().out
+    assert "Unknown version: missing" in output
+    assert "Use: python compare.py" in output
+
+def test_categorize_changes_pairs_modifications():
+    """Test line-diff categorization"""
+    explainer = DiffExplainer(api_key="test")
+    diff = explainer.extract_diff(
+        "title: Test Prompt\nrule: Be concise.\nold: removed entirely\n",
+        "title: Test Prompt\nrule: Be very concise.\nsettings: 42\n"
+    )
+    changes = explainer.categorize_changes(diff)
+    
+    assert changes["modifications"] == [("rule: Be concise.", "rule: Be very concise.")]
+    assert changes["deletions"] == ["old: removed entirely"]
+    assert changes["additions"] == ["settings: 42"]
+
+def test_categorize_structural():
+    """Test tree-aware categorization and the line-diff fallback"""
+    explainer = DiffExplainer(api_key="test")
+    changes = explainer.categorize_structural(
+        "title: Test Prompt\nversion: 1.0.0\nmodules:\n- id: a\n  rule: Be concise.\n- id: b\n  rule: Cite sources.\n",
+        "title: Test Prompt\nversion: 1.0.1\nmodules:\n- id: b\n  rule: Cite sources.\n- id: a\n  rule: Be concise.\n"
+        "settings:\n  advanced: true\n"
+    )
+    
+    assert changes["modifications"] == [("version: 1.0.0", "1.0.1")]
+    assert changes["additions"] == ['settings: {"advanced": true}']
+    assert changes["deletions"] == []
+    
+    fallback = explainer.categorize_structural("plain text", "plain text, revised")
+    assert fallback["modifications"] == [("plain text", "plain text, revised")]
+
+def test_generate_summary_report():
+    """Test the report lists every change"""
+    explainer = DiffExplainer(api_key="test")
+    report = explainer.generate_summary_report("a: 1\nb: 2\n", "a: 1\nb: 3\nc: 4\n", "Explanation")
+    
+    assert "- Modifications: 1" in report
+    assert "- b: 2 → 3\n" in report
+    assert "- c: 4\n" in report
@@ -0,0 +1,75 @@
+import io
+import re
+import random
+from ..auto_ingest.prompt_preservers import PromptPreserver, read_lines
+
+LEGACY_MARKERS = [
+    r"Human:|User:|Johan:|<user>|<user_message>|<user_query>",
+    r"system message:|system:|<system>|<system_message>"
+]
+
+def legacy_extract_prompts(content, file_path):
+    """The previous whole-content extractor, kept as the reference behaviour"""
+    prompts = []
+    current_prompt = None
+    lines = content.split('\n')
+    
+    for i, line in enumerate(lines):
+        for marker in LEGACY_MARKERS:
+            if re.match(marker, line):
+                if current_prompt:
+                    prompts.append(current_prompt)
+                current_prompt = {
+                    "type": "user" if "Human:|User:|Johan:" in marker else "system",
+                    "source_file": str(file_path),
+                    "line_number": i + 1,
+                    "content": [],
+                    "context_before": lines[max(0, i-5):i]
+                }
+                continue
+        
+        if current_prompt:
+            current_prompt["content"].append(line)
+            next_line = lines[i+1] if i+1 < len(lines) else ""
+            if any(re.match(marker, next_line) for marker in LEGACY_MARKERS) or \
+               (not next_line.strip() and not lines[i+2].strip() if i+2 < len(lines) else False):
+                current_prompt["content"] = "\n".join(current_prompt["content"])
+                prompts.append(current_prompt)
+                current_prompt = None
+    
+    if current_prompt:
+        current_prompt["content"] = "\n".join(current_prompt["content"])
+        prompts.append(current_prompt)
+    return prompts
+
+def without_timestamps(prompts):
+    return [{key: value for key, value in prompt.items() if key != "extracted_at"} for prompt in prompts]
+
+def random_chat(rng):
+    pieces = ["Human: hi", "User: question", "Johan: note", "<user_query>x", "system: be brief",
+              "<system_message>", "system message: rules", "Assistant: answer", "plain text",
+              "  indented", "", "", " ", "more User: not at start"]
+    content = "\n".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+    return content + rng.choice(["", "\n", "\n\n"])
+
+def test_iter_prompts_matches_legacy_extractor():
+    """Test streaming extraction over read_lines matches the old extractor on random chats"""
+    rng = random.Random(11)
+    preserver = PromptPreserver()
+    for _ in range(500):
+        content = random_chat(rng)
+        expected = legacy_extract_prompts(content, "chat.txt")
+        streamed = preserver.iter_prompts(read_lines(io.StringIO(content)), "chat.txt")
+        
+        assert without_timestamps(streamed) == expected, content
+        assert without_timestamps(preserver.extract_prompts(content, "chat.txt")) == expected, content
+
+def test_extract_prompts_from_file_matches_legacy_extractor(tmp_path):
+    """Test file extraction matches the old extractor, including a trailing newline"""
+    content = "Human: first\nline two\n\n\nUser: second\n<system>\nrules\n"
+    path = tmp_path / "chat.txt"
+    path.write_text(content, encoding="utf-8")
+    
+    prompts = PromptPreserver().extract_prompts_from_file(str(path))
+    assert without_timestamps(prompts) == legacy_extract_prompts(content, str(path))
+    assert [prompt["type"] for prompt in prompts] == ["user", "user", "system"]
@@ -0,0 +1,176 @@
+import re
+import hashlib
+import random
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Words of a document that go into its signature; the rest is not read
+MAX_SIGNATURE_WORDS = 50_000
+
+# Shingle hashes permuted per numpy batch (num_perm x batch matrix)
+HASH_BATCH = 4096
+
+# Probability that a pair exactly at the LSH threshold becomes a candidate
+MIN_RECALL = 0.95
+
+class MinHasher:
+    """Word-shingle MinHash signatures for estimating Jaccard similarity
+
+    Signatures from the same MinHasher (same num_perm, shingle_size and
+    seed) are comparable; the fraction of equal slots estimates the
+    Jaccard similarity of the two shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> Set[str]:
+        """Overlapping word n-grams of the normalized text"""
+        return set(self.iter_shingles((text,)))
+
+    def iter_shingles(self, lines: Iterable[str]) -> Iterator[str]:
+        """Word n-grams over a stream of lines, from the first MAX_SIGNATURE_WORDS words"""
+        words = islice((word for line in lines for word in re.findall(r"\w+", line.lower())),
+                       MAX_SIGNATURE_WORDS)
+        window = deque(islice(words, self.shingle_size), maxlen=self.shingle_size)
+        if not window:
+            return
+        yield " ".join(window)
+        for word in words:
+            window.append(word)
+            yield " ".join(window)
+
+    def signature(self, text: str) -> List[int]:
+        """MinHash signature of the text's shingles (empty for text without words)"""
+        return self.signature_from_lines((text,))
+
+    def signature_from_lines(self, lines: Iterable[str]) -> List[int]:
+        """MinHash signature of a stream of lines, e.g. an open text file
+
+        Only the first MAX_SIGNATURE_WORDS words are read, so the cost of a
+        signature is bounded however long the document is.
+        """
+        hashes = list({
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+            for shingle in self.iter_shingles(lines)
+        })
+        if not hashes:
+            return []
+        if np is None:
+            return [
+                min([(a * h + b) % MERSENNE_PRIME for h in hashes]) & MAX_HASH
+                for a, b in self.permutations
+            ]
+        return self._vectorized_minima(hashes)
+
+    def _vectorized_minima(self, hashes: List[int]) -> List[int]:
+        """Same minima as the pure-Python loop, computed num_perm x HASH_BATCH at a time
+
+        (a * h + b) mod p needs up to 93 bits, so a is split into 29 high and
+        32 low bits and both partial products are folded with 2^61 = 1 (mod p)
+        to stay within uint64.
+        """
+        a = np.array([a for a, _ in self.permutations], dtype=np.uint64)[:, None]
+        b = np.array([b for _, b in self.permutations], dtype=np.uint64)[:, None]
+        a_high, a_low = a >> np.uint64(32), a & np.uint64(MAX_HASH)
+        prime = np.uint64(MERSENNE_PRIME)
+        minima = np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+
+        for start in range(0, len(hashes), HASH_BATCH):
+            h = np.array(hashes[start:start + HASH_BATCH], dtype=np.uint64)[None, :]
+            low = a_low * h
+            high = a_high * h
+            # high * 2^32 = (high >> 29) * 2^61 + (high mod 2^29) * 2^32
+            values = ((low & prime) + (low >> np.uint64(61)) + (high >> np.uint64(29))
+                      + ((high & np.uint64((1 << 29) - 1)) << np.uint64(32)) + b)
+            values = (values & prime) + (values >> np.uint64(61))
+            values = np.where(values >= prime, values - prime, values)
+            np.minimum(minima, values.min(axis=1), out=minima)
+
+        return [int(value) & MAX_HASH for value in minima]
+
+    @staticmethod
+    def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures (0.0 if either is empty)"""
+        if not signature_a or len(signature_a) != len(signature_b):
+            return 0.0
+        matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+        return matches / len(signature_a)
+
+def optimal_bands(threshold: float, num_perm: int, min_recall: float = MIN_RECALL) -> Tuple[int, int]:
+    """(bands, rows) with the most rows per band that still catches a pair at the threshold
+
+    A pair with Jaccard similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands. Centering that S-curve on the threshold misses
+    about a third of the pairs right at it, so the curve is shifted below
+    the threshold until at least min_recall of them are caught; the extra
+    candidates are removed by the full-signature check in query.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= min_recall:
+            return bands, rows
+    return num_perm, 1
+
+class MinHashLSH:
+    """Banded locality-sensitive hashing index over MinHash signatures
+
+    Each signature is split into bands; documents sharing any band land in
+    the same bucket and become candidates, which are then verified against
+    the threshold with the full signatures. A lookup touches one bucket per
+    band instead of every indexed document.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self.signatures: Dict[str, List[int]] = {}
+        self.buckets: List[Dict[tuple, List[str]]] = [defaultdict(list) for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        return [tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, key: str, signature: List[int]):
+        """Index a signature under key (ignored if key is already indexed)"""
+        if key in self.signatures or len(signature) != self.num_perm:
+            return
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            bucket[band_key].append(key)
+
+    def query(self, signature: List[int]) -> List[Tuple[str, float]]:
+        """Indexed keys at or above the threshold, most similar first"""
+        if len(signature) != self.num_perm:
+            return []
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = MinHasher.similarity(signature, self.signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
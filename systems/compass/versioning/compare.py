@@ -1,35 +1,80 @@
 # build this
 
+import os
+import sys
 import yaml
-import difflib
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+sys.path.append(os.path.dirname(__file__))
+from structural_diff import Change, diff_trees, render_change
+from version_store import VersionStore
+
 @dataclass
 class Version:
     content: Dict
     timestamp: datetime
     version_id: str
     
+class _BlockDumper(yaml.SafeDumper):
+    """Dumps multi-line strings as literal blocks so revisions delta line by line"""
+
+def _represent_str(dumper, value):
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+_BlockDumper.add_representer(str, _represent_str)
+
 class PromptVersioner:
     def __init__(self, storage_dir: str = "version_history"):
         self.storage_dir = storage_dir
+        self._store = None
         
-    def compare_yaml(self, old_version: Version, new_version: Version) -> List[str]:
-        """Compare two versions and return differences"""
-        old_lines = yaml.dump(old_version.content, sort_keys=False).splitlines()
-        new_lines = yaml.dump(new_version.content, sort_keys=False).splitlines()
+    @property
+    def store(self) -> VersionStore:
+        """Version history under storage_dir, opened on first use"""
+        if self._store is None:
+            self._store = VersionStore(self.storage_dir)
+        return self._store
+        
+    def save_version(self, content: Dict, version_id: Optional[str] = None,
+                     parent: Optional[str] = None) -> Version:
+        """Store a revision in the version history"""
+        text = yaml.dump(content, Dumper=_BlockDumper, sort_keys=False, allow_unicode=True)
+        record = self.store.save(text, version_id=version_id, parent=parent)
+        return Version(content=content, timestamp=datetime.fromisoformat(record["timestamp"]),
+                       version_id=record["version_id"])
+        
+    def get_version(self, version_id: str) -> Version:
+        """Load a revision from the version history"""
+        record = self.store.versions.get(version_id)
+        if record is None:
+            raise KeyError(f"Unknown version: {version_id}")
+        return Version(content=yaml.safe_load(self.store.get(version_id)),
+                       timestamp=datetime.fromisoformat(record["timestamp"]),
+                       version_id=version_id)
         
-        diff = list(difflib.unified_diff(
-            old_lines,
-            new_lines,
-            fromfile=f'v{old_version.version_id}',
-            tofile=f'v{new_version.version_id}',
-            lineterm=''
-        ))
+    def compare_versions(self, old_id: str, new_id: str) -> List[Change]:
+        """Structural change set between two stored versions"""
+        for version_id in (old_id, new_id):
+            if version_id not in self.store.versions:
+                raise KeyError(f"Unknown version: {version_id}")
+        if self.store.versions[old_id]["hash"] == self.store.versions[new_id]["hash"]:
+            return []
+        return self.diff_versions(self.get_version(old_id), self.get_version(new_id))
         
-        return diff
+    def diff_versions(self, old_version: Version, new_version: Version) -> List[Change]:
+        """Structural change set between two versions"""
+        return diff_trees(old_version.content, new_version.content)
+        
+    def compare_yaml(self, old_version: Version, new_version: Version) -> List[str]:
+        """Compare two versions and return differences as diff-style lines"""
+        diff = [f'--- v{old_version.version_id}', f'+++ v{new_version.version_id}']
+        for change in self.diff_versions(old_version, new_version):
+            diff.extend(render_change(change))
+        
+        return diff if len(diff) > 2 else []
         
     def extract_changes(self, diff_lines: List[str]) -> List[Tuple[str, str]]:
         """Extract meaningful changes from diff output"""
@@ -61,12 +106,39 @@ class PromptVersioner:
                 
         return "\n".join(summary)
 
+def print_usage():
+    print("Use: python compare.py <old_version> <new_version>")
+    print("     python compare.py list")
+    print("     python compare.py compact")
+
 def main():
     """Main comparison routine"""
-    versioner = PromptVersioner()
-    # TODO: Add CLI interface for comparing specific versions
-    print("Version comparison tool ready")
-    print("Use: python compare.py <old_version> <new_version>")
+    versioner = PromptVersioner(os.getenv("VERSION_HISTORY_DIR", "version_history"))
+    args = sys.argv[1:]
+    
+    if args == ["list"]:
+        for record in versioner.store.list_versions():
+            print(f"{record['version_id']}  {record['timestamp']}  {record['hash'][:12]}")
+    elif args == ["compact"]:
+        stats = versioner.store.compact()
+        print(f"Compacted {stats['versions']} versions into {stats['objects']} objects "
+              f"({stats['objects_removed']} unreferenced removed): "
+              f"{stats['bytes_before']:,} -> {stats['bytes_after']:,} bytes")
+    elif len(args) == 2:
+        try:
+            changes = versioner.compare_versions(*args)
+        except KeyError as e:
+            print(e.args[0])
+            print("Run 'python compare.py list' to see the stored versions.")
+            print()
+            print_usage()
+            return
+        diff = [line for change in changes for line in render_change(change)]
+        print("\n".join(diff) if diff else "No changes")
+        print()
+        print(versioner.summarize_changes(versioner.extract_changes(diff)))
+    else:
+        print_usage()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
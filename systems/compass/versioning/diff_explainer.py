@@ -1,11 +1,16 @@
 # build this
 
+import os
+import sys
 import yaml
 import difflib
 from typing import Dict, List, Tuple
 import openai
 from datetime import datetime
 
+sys.path.append(os.path.dirname(__file__))
+from structural_diff import diff_trees, format_value, pair_similar
+
 class DiffExplainer:
     def __init__(self, api_key: str):
         self.openai = openai
@@ -42,26 +47,42 @@ class DiffExplainer:
             elif line.startswith('@'):
                 current_section = line
                 
-        # Identify modifications (pairs of additions/deletions)
-        for del_line in changes["deletions"][:]:
-            for add_line in changes["additions"][:]:
-                if self._similarity_score(del_line, add_line) > 0.5:
-                    changes["modifications"].append((del_line, add_line))
-                    changes["deletions"].remove(del_line)
-                    changes["additions"].remove(add_line)
-                    break
+        # Identify modifications (pairs of additions/deletions) via the similarity index
+        pairs, deleted, added = pair_similar(changes["deletions"], changes["additions"])
+        changes["modifications"] = [(changes["deletions"][i], changes["additions"][j]) for i, j in pairs]
+        changes["deletions"] = [changes["deletions"][i] for i in deleted]
+        changes["additions"] = [changes["additions"][j] for j in added]
                     
         return changes
     
-    def _similarity_score(self, str1: str, str2: str) -> float:
-        """Calculate similarity between two strings"""
-        matcher = difflib.SequenceMatcher(None, str1, str2)
-        return matcher.ratio()
+    def categorize_structural(self, old_yaml: str, new_yaml: str) -> Dict[str, List[str]]:
+        """Categorize changes by walking both YAML trees; falls back to the line diff"""
+        try:
+            old_tree = yaml.safe_load(old_yaml)
+            new_tree = yaml.safe_load(new_yaml)
+        except yaml.YAMLError:
+            return self.categorize_changes(self.extract_diff(old_yaml, new_yaml))
+        if not isinstance(old_tree, (dict, list)) or not isinstance(new_tree, (dict, list)):
+            return self.categorize_changes(self.extract_diff(old_yaml, new_yaml))
+        
+        changes = {
+            "additions": [],
+            "deletions": [],
+            "modifications": []
+        }
+        for change in diff_trees(old_tree, new_tree):
+            prefix = f"{change.path}: " if change.path else ""
+            if change.op == "added":
+                changes["additions"].append(f"{prefix}{format_value(change.new)}")
+            elif change.op == "removed":
+                changes["deletions"].append(f"{prefix}{format_value(change.old)}")
+            else:
+                changes["modifications"].append((f"{prefix}{format_value(change.old)}", format_value(change.new)))
+        return changes
     
     async def explain_changes(self, old_yaml: str, new_yaml: str) -> str:
         """Generate a human-readable explanation of changes"""
-        diff = self.extract_diff(old_yaml, new_yaml)
-        changes = self.categorize_changes(diff)
+        changes = self.categorize_structural(old_yaml, new_yaml)
         
         # Prepare context for GPT
         context = f"""
@@ -89,7 +110,10 @@ class DiffExplainer:
     
     def generate_summary_report(self, old_yaml: str, new_yaml: str, explanation: str) -> str:
         """Generate a complete summary report"""
-        changes = self.categorize_changes(self.extract_diff(old_yaml, new_yaml))
+        changes = self.categorize_structural(old_yaml, new_yaml)
+        additions = ''.join(f'- {item}\n' for item in changes['additions'])
+        deletions = ''.join(f'- {item}\n' for item in changes['deletions'])
+        modifications = ''.join(f'- {old} → {new}\n' for old, new in changes['modifications'])
         
         report = f"""
         # 📊 YAML Change Analysis
@@ -106,13 +130,13 @@ class DiffExplainer:
         ## 🔍 Detailed Changes
         
         ### ➕ Additions
-        {''.join([f'- {item}\\n' for item in changes['additions']])}
+        {additions}
         
         ### ➖ Deletions
-        {''.join([f'- {item}\\n' for item in changes['deletions']])}
+        {deletions}
         
         ### 🔄 Modifications
-        {''.join([f'- {old} → {new}\\n' for old, new in changes['modifications']])}
+        {modifications}
         """
         
         return report
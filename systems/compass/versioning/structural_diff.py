@@ -0,0 +1,189 @@
+import re
+import json
+import difflib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+# Keys that identify list items, so reordered items are matched instead of rewritten
+IDENTITY_KEYS = ("id", "name", "key", "title")
+
+# Line pairs at or above this similarity count as one modified line
+SIMILARITY_THRESHOLD = 0.5
+
+# Candidate additions checked per deletion when pairing modified lines
+MAX_CANDIDATES = 8
+
+# Rarest index keys of a deleted line used to look up candidates
+MAX_LOOKUP_KEYS = 6
+
+@dataclass
+class Change:
+    """One entry of a change set; path is like 'modules[2].rules[0]' or 'content:14' for a text line"""
+    op: str  # "added", "removed" or "modified"
+    path: str
+    old: Any = None
+    new: Any = None
+
+def _join(path: str, key) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+def _fingerprint(value) -> str:
+    return json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+
+def _index_keys(line: str) -> set:
+    """Words and word bigrams of the line (the line itself when it has no words)"""
+    words = re.findall(r"\w+", line.lower())
+    if not words:
+        return {line.strip()}
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+def pair_similar(deleted: List[str], added: List[str],
+                 threshold: float = SIMILARITY_THRESHOLD) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """Pair deleted with added lines that are modifications of each other
+
+    An inverted index from words and word bigrams to added lines yields
+    candidates for each deletion via its rarest keys, ranked by shared keys;
+    only the top few are scored with SequenceMatcher (cheapest bounds
+    first). Each line is used at most once. Returns (pairs of indices,
+    unpaired deletions, unpaired additions).
+    """
+    index = defaultdict(list)
+    for j, line in enumerate(added):
+        for key in _index_keys(line):
+            index[key].append(j)
+
+    used = set()
+    pairs = []
+    for i, old_line in enumerate(deleted):
+        keys = sorted((key for key in _index_keys(old_line) if key in index), key=lambda key: len(index[key]))
+        shared = defaultdict(int)
+        for key in keys[:MAX_LOOKUP_KEYS]:
+            for j in index[key]:
+                if j not in used:
+                    shared[j] += 1
+        candidates = sorted(shared, key=lambda j: (-shared[j], j))[:MAX_CANDIDATES]
+
+        best, best_score = None, threshold
+        for j in candidates:
+            matcher = difflib.SequenceMatcher(None, old_line, added[j], autojunk=False)
+            if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score >= best_score:
+                best, best_score = j, score
+        if best is not None:
+            used.add(best)
+            pairs.append((i, best))
+
+    paired_deleted = {i for i, _ in pairs}
+    return (pairs,
+            [i for i in range(len(deleted)) if i not in paired_deleted],
+            [j for j in range(len(added)) if j not in used])
+
+def _diff_text(old: str, new: str, path: str, changes: List[Change]):
+    """Line-level changes inside a multi-line string"""
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        deleted, added = old_lines[i1:i2], new_lines[j1:j2]
+        pairs, removed, inserted = pair_similar(deleted, added)
+        for i, j in pairs:
+            changes.append(Change("modified", f"{path}:{j1 + j + 1}", deleted[i], added[j]))
+        for i in removed:
+            changes.append(Change("removed", f"{path}:{i1 + i + 1}", deleted[i]))
+        for j in inserted:
+            changes.append(Change("added", f"{path}:{j1 + j + 1}", new=added[j]))
+
+def _identity(item) -> Optional[Tuple[str, Any]]:
+    if isinstance(item, dict):
+        for key in IDENTITY_KEYS:
+            if key in item and isinstance(item[key], (str, int)):
+                return key, item[key]
+    return None
+
+def _diff_list(old: list, new: list, path: str, changes: List[Change]):
+    old_ids = [_identity(item) for item in old]
+    new_ids = [_identity(item) for item in new]
+    if all(old_ids) and all(new_ids) and len(set(old_ids)) == len(old) and len(set(new_ids)) == len(new):
+        # Items carry identities: match by identity, ignoring order
+        old_by_id = dict(zip(old_ids, range(len(old))))
+        new_by_id = dict(zip(new_ids, range(len(new))))
+        for identity, i in old_by_id.items():
+            if identity not in new_by_id:
+                changes.append(Change("removed", _join(path, i), old[i]))
+        for identity, j in new_by_id.items():
+            if identity in old_by_id:
+                _diff(old[old_by_id[identity]], new[j], _join(path, j), changes)
+            else:
+                changes.append(Change("added", _join(path, j), new=new[j]))
+        return
+
+    matcher = difflib.SequenceMatcher(None, [_fingerprint(item) for item in old],
+                                      [_fingerprint(item) for item in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        deleted, added = old[i1:i2], new[j1:j2]
+        if all(isinstance(item, str) for item in deleted + added):
+            pairs, removed, inserted = pair_similar(deleted, added)
+        else:
+            # Structured items: pair by position within the changed block
+            pairs = list(zip(range(len(deleted)), range(len(added))))
+            removed = list(range(len(added), len(deleted)))
+            inserted = list(range(len(deleted), len(added)))
+        for i, j in pairs:
+            _diff(deleted[i], added[j], _join(path, j1 + j), changes)
+        for i in removed:
+            changes.append(Change("removed", _join(path, i1 + i), deleted[i]))
+        for j in inserted:
+            changes.append(Change("added", _join(path, j1 + j), new=added[j]))
+
+def _diff(old, new, path: str, changes: List[Change]):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            if key not in new:
+                changes.append(Change("removed", _join(path, key), value))
+            else:
+                _diff(value, new[key], _join(path, key), changes)
+        for key, value in new.items():
+            if key not in old:
+                changes.append(Change("added", _join(path, key), new=value))
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, changes)
+    elif old != new or type(old) is not type(new):
+        if isinstance(old, str) and isinstance(new, str) and ("\n" in old or "\n" in new):
+            _diff_text(old, new, path, changes)
+        else:
+            changes.append(Change("modified", path, old, new))
+
+def diff_trees(old, new) -> List[Change]:
+    """Compact change set between two parsed YAML documents
+
+    Mappings are matched key by key, lists by item identity (id/name/key/
+    title) or sequence alignment, and multi-line strings line by line, so
+    unchanged parts of large prompt files cost one comparison each.
+    """
+    changes = []
+    _diff(old, new, "", changes)
+    return changes
+
+def format_value(value) -> str:
+    """Single-line rendering of a changed value"""
+    if isinstance(value, str):
+        return value.replace("\n", "\\n")
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+def render_change(change: Change) -> List[str]:
+    """Diff-style lines ('-' old, '+' new) for one change"""
+    prefix = f"{change.path}: " if change.path else ""
+    lines = []
+    if change.op in ("removed", "modified"):
+        lines.append(f"-{prefix}{format_value(change.old)}")
+    if change.op in ("added", "modified"):
+        lines.append(f"+{prefix}{format_value(change.new)}")
+    return lines
@@ -0,0 +1,213 @@
+import os
+import json
+import zlib
+import difflib
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Longest chain of deltas before a revision is stored in full again
+MAX_DELTA_CHAIN = 16
+
+# Reconstructed revisions kept in memory
+TEXT_CACHE_SIZE = 32
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def encode_delta(base: str, text: str) -> List:
+    """Line delta from base to text: [start, end] copies base lines, strings are inserted"""
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+def apply_delta(base: str, ops: List) -> str:
+    base_lines = base.splitlines(keepends=True)
+    return "".join(op if isinstance(op, str) else "".join(base_lines[op[0]:op[1]]) for op in ops)
+
+class VersionStore:
+    """Content-addressed revision history with delta compression
+
+    Each distinct revision is one zlib-compressed object under objects/,
+    named by the SHA-256 of its full text, holding either the text or a
+    line delta against its parent's object (chains are capped at
+    MAX_DELTA_CHAIN). versions.jsonl is an append-only log of version
+    records loaded into a dict, so lookup by version id is O(1) and
+    identical revisions share one object.
+    """
+
+    def __init__(self, storage_dir: str = "version_history"):
+        self.storage_dir = storage_dir
+        self.objects_dir = os.path.join(storage_dir, "objects")
+        self.index_path = os.path.join(storage_dir, "versions.jsonl")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.versions: Dict[str, Dict] = {}
+        self.depths: Dict[str, int] = {}
+        self.head: Optional[str] = None
+        self._cache: OrderedDict = OrderedDict()
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.versions[record["version_id"]] = record
+                self.depths[record["hash"]] = record["depth"]
+                self.head = record["version_id"]
+
+    def _object_path(self, object_hash: str) -> str:
+        return os.path.join(self.objects_dir, object_hash[:2], object_hash[2:])
+
+    def _write_object(self, object_hash: str, payload: Dict):
+        path = self._object_path(object_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(zlib.compress(json.dumps(payload).encode("utf-8"), 9))
+        os.replace(temp_path, path)
+
+    def _read_object(self, object_hash: str) -> Dict:
+        with open(self._object_path(object_hash), "rb") as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    def _encode(self, text: str, base_hash: Optional[str]) -> Dict:
+        """Delta payload against base_hash when it is smaller than the full text"""
+        if base_hash and self.depths.get(base_hash, MAX_DELTA_CHAIN) < MAX_DELTA_CHAIN:
+            ops = encode_delta(self.load_text(base_hash), text)
+            if len(json.dumps(ops)) < len(text):
+                return {"base": base_hash, "ops": ops}
+        return {"base": None, "text": text}
+
+    def _remember(self, object_hash: str, text: str):
+        self._cache[object_hash] = text
+        self._cache.move_to_end(object_hash)
+        while len(self._cache) > TEXT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def load_text(self, object_hash: str) -> str:
+        """Full text of an object, applying its delta chain"""
+        if object_hash in self._cache:
+            self._cache.move_to_end(object_hash)
+            return self._cache[object_hash]
+
+        chain = []
+        current = object_hash
+        while current not in self._cache:
+            payload = self._read_object(current)
+            if payload["base"] is None:
+                text = payload["text"]
+                break
+            chain.append(payload["ops"])
+            current = payload["base"]
+        else:
+            text = self._cache[current]
+
+        for ops in reversed(chain):
+            text = apply_delta(text, ops)
+        self._remember(object_hash, text)
+        return text
+
+    def save(self, text: str, version_id: Optional[str] = None, parent: Optional[str] = None,
+             timestamp: Optional[datetime] = None) -> Dict:
+        """Record a revision (deltas against parent, default the latest version) and return its record"""
+        object_hash = content_hash(text)
+        version_id = version_id or object_hash[:12]
+        existing = self.versions.get(version_id)
+        if existing:
+            if existing["hash"] != object_hash:
+                raise ValueError(f"Version {version_id} already exists with different content")
+            return existing
+
+        parent = parent if parent is not None else self.head
+        if parent is not None and parent not in self.versions:
+            raise KeyError(f"Unknown parent version: {parent}")
+
+        if object_hash not in self.depths:
+            base_hash = self.versions[parent]["hash"] if parent else None
+            payload = self._encode(text, base_hash)
+            self._write_object(object_hash, payload)
+            self.depths[object_hash] = self.depths[payload["base"]] + 1 if payload["base"] else 0
+        self._remember(object_hash, text)
+
+        record = {
+            "version_id": version_id,
+            "hash": object_hash,
+            "parent": parent,
+            "timestamp": (timestamp or datetime.now()).isoformat(),
+            "depth": self.depths[object_hash]
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self.versions[version_id] = record
+        self.head = version_id
+        return record
+
+    def get(self, version_id: str) -> str:
+        """Full text of a version"""
+        if version_id not in self.versions:
+            raise KeyError(f"Unknown version: {version_id}")
+        return self.load_text(self.versions[version_id]["hash"])
+
+    def list_versions(self) -> List[Dict]:
+        """Version records, oldest first"""
+        return list(self.versions.values())
+
+    def storage_size(self) -> int:
+        """Bytes used by objects and the version log"""
+        total = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        for root, _, files in os.walk(self.objects_dir):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def compact(self) -> Dict:
+        """Re-encode every object against its parent, drop unreferenced objects and rewrite the log"""
+        size_before = self.storage_size()
+        texts = {record["hash"]: self.get(record["version_id"]) for record in self.versions.values()}
+
+        self.depths = {}
+        self._cache.clear()
+        for record in self.versions.values():
+            object_hash = record["hash"]
+            if object_hash not in self.depths:
+                parent = self.versions.get(record["parent"])
+                base_hash = parent["hash"] if parent and parent["hash"] in self.depths else None
+                if base_hash:
+                    self._remember(base_hash, texts[base_hash])
+                payload = self._encode(texts[object_hash], base_hash)
+                self._write_object(object_hash, payload)
+                self.depths[object_hash] = self.depths[payload["base"]] + 1 if payload["base"] else 0
+            record["depth"] = self.depths[object_hash]
+
+        removed = 0
+        for root, _, files in os.walk(self.objects_dir):
+            for name in files:
+                if os.path.basename(root) + name not in self.depths:
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in self.versions.values():
+                f.write(json.dumps(record) + "\n")
+        os.replace(temp_path, self.index_path)
+
+        return {
+            "versions": len(self.versions),
+            "objects": len(self.depths),
+            "objects_removed": removed,
+            "bytes_before": size_before,
+            "bytes_after": self.storage_size()
+        }